@@ -0,0 +1,44 @@
+import argparse
+import os
+import sys
+import time
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure assistant latency against a local fake API server.")
+    parser.add_argument("--questions", type=int, default=20)
+    parser.add_argument("--token-delay", type=float, default=0.02)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("OPENAI_API_KEY", "fake-key")
+    from benchmarks.fake_openai_server import start_server
+    from combined_ratio.assistant import AssistantClient, OpenAIBackend
+
+    server, api_base = start_server(token_delay=args.token_delay)
+    client = AssistantClient(OpenAIBackend(api_base=api_base))
+    system = {"role": "system", "content": "You help estimate insurance metrics."}
+    try:
+        # The second pass repeats the same questions and is served from the response cache
+        for label in ("uncached", "cached"):
+            first_token, total = [], []
+            for i in range(args.questions):
+                messages = [system, {"role": "user", "content": f"What is a typical loss ratio for line {i}?"}]
+                start = time.perf_counter()
+                stream = client.stream(messages)
+                next(stream)
+                first_token.append(time.perf_counter() - start)
+                for _ in stream:
+                    pass
+                total.append(time.perf_counter() - start)
+            print(
+                f"{label:<9} first token {1000 * sum(first_token) / len(first_token):8.1f} ms   "
+                f"full reply {1000 * sum(total) / len(total):8.1f} ms"
+            )
+        print(client.stats())
+    finally:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROUTES = ("matplotlib", "matplotlib_closed", "altair", "altair_cached")
+
+
+def rss_mb():
+    """
+    Resident set size of this process in MB (peak RSS where /proc is unavailable).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10
+
+
+def make_renderer(route):
+    """
+    Build a function that draws the three main charts for one rerun of the app.
+
+    "matplotlib" is the original app path: new figures every rerun, rendered to PNG the
+    way st.pyplot does and never closed. "matplotlib_closed" closes each figure after
+    rendering. "altair" builds the Vega-Lite specs the app now sends, and
+    "altair_cached" reuses the cached chart objects and only serializes them.
+    """
+    import io
+
+    from combined_ratio.core import calculate_combined_ratio, project_financials
+
+    current = calculate_combined_ratio(65.0, 30.0)
+    new = calculate_combined_ratio(64.5, 29.0)
+    financial_df = project_financials(500.0, 2.0, 65.0, 30.0, 64.5, 29.0, 5, 1.5, 7.0, 0.4, 0.8, 1.5)[0]
+
+    if route.startswith("matplotlib"):
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+
+        def draw():
+            figures = []
+            fig, ax = plt.subplots()
+            ax.bar(["Current Combined Ratio", "Projected Combined Ratio"], [current, new], color=["#1f77b4", "#ff7f0e"])
+            figures.append(fig)
+            fig, ax = plt.subplots()
+            ax.plot(financial_df["Year"], financial_df["Current Operating Profit ($M)"], linestyle="--", marker="o")
+            ax.plot(financial_df["Year"], financial_df["Projected Operating Profit ($M)"], marker="o")
+            figures.append(fig)
+            fig, ax = plt.subplots()
+            ax.plot(financial_df["Year"], financial_df["Cumulative Savings ($M)"], marker="o", color="green")
+            figures.append(fig)
+            for fig in figures:
+                fig.savefig(io.BytesIO(), format="png")
+                if route == "matplotlib_closed":
+                    plt.close(fig)
+
+        return draw
+
+    from combined_ratio import charts
+
+    def build():
+        return [
+            charts.combined_ratio_chart(current, new),
+            charts.operating_profit_chart(financial_df),
+            charts.cumulative_savings_chart(financial_df),
+        ]
+
+    if route == "altair_cached":
+        cached = build()
+        return lambda: [chart.to_dict() for chart in cached]
+    return lambda: [chart.to_dict() for chart in build()]
+
+
+def run_route(route, reruns, samples):
+    """
+    Render the charts reruns times, sampling RSS at evenly spaced points.
+    """
+    draw = make_renderer(route)
+    draw()  # warm up imports and caches
+    every = max(reruns // samples, 1)
+    rss = [(0, rss_mb())]
+    start = time.perf_counter()
+    for i in range(1, reruns + 1):
+        draw()
+        if i % every == 0:
+            rss.append((i, rss_mb()))
+    elapsed = time.perf_counter() - start
+    return {"route": route, "ms_per_rerun": 1000 * elapsed / reruns, "rss": rss}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare per-rerun chart rendering time and memory.")
+    parser.add_argument("--reruns", type=int, default=500)
+    parser.add_argument("--samples", type=int, default=4)
+    # The unclosed matplotlib route grows by ~1.4 GB per 500 reruns; leave it out for long runs
+    parser.add_argument("--routes", nargs="+", choices=ROUTES, default=ROUTES)
+    parser.add_argument("--route", choices=ROUTES, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.route:
+        print(json.dumps(run_route(args.route, args.reruns, args.samples)))
+        return 0
+
+    # Each route runs in a fresh interpreter so memory is not shared between them
+    print(f"{args.reruns:,} reruns, three charts each")
+    print(f"{'route':<18} {'ms/rerun':>9} RSS MB (start -> end)")
+    for route in args.routes:
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.chart_rendering", "--route", route,
+             "--reruns", str(args.reruns), "--samples", str(args.samples)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        result = json.loads(output)
+        trace = " -> ".join(f"{mb:.0f}" for _, mb in result["rss"])
+        print(f"{route:<18} {result['ms_per_rerun']:9.2f} {trace}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROUTES = ("csv", "parquet", "arrow")
+
+
+def run_route(route, n_scenarios, chunk_size, path):
+    """
+    Export projections for n_scenarios through one route and measure it.
+
+    The "csv" route is today's app path scaled up: one project_financials DataFrame per
+    scenario, concatenated and serialized with to_csv into a single string.
+    """
+    import pandas as pd
+    import pyarrow as pa
+
+    from combined_ratio.batch import SCENARIO_COLUMNS
+    from combined_ratio.core import project_financials
+    from combined_ratio.export import export_projections
+    from benchmarks.scenarios import random_scenarios
+
+    scenarios = random_scenarios(n_scenarios)
+    tracemalloc.start()
+    start = time.perf_counter()
+    if route == "csv":
+        scenarios["new_loss_ratio"] = scenarios["current_loss_ratio"] - scenarios["loss_ratio_reduction"]
+        scenarios["new_expense_ratio"] = scenarios["current_expense_ratio"] - scenarios["expense_ratio_reduction"]
+        frames = []
+        for i, row in enumerate(scenarios[SCENARIO_COLUMNS].itertuples(index=False)):
+            args = list(row)
+            args[6] = int(args[6])
+            financial_df = project_financials(*args)[0]
+            financial_df.insert(0, "scenario", i)
+            frames.append(financial_df)
+        csv = pd.concat(frames).to_csv(index=False)
+        with open(path, "w") as f:
+            f.write(csv)
+    else:
+        export_projections(scenarios, path, format=route, chunk_size=chunk_size)
+    elapsed = time.perf_counter() - start
+    _, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "route": route,
+        "seconds": elapsed,
+        "python_peak_mb": python_peak / 2**20,
+        "arrow_peak_mb": pa.default_memory_pool().max_memory() / 2**20,
+        "file_mb": os.path.getsize(path) / 2**20,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare CSV export against streaming Parquet/Arrow export.")
+    parser.add_argument("--scenarios", type=int, default=10_000)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--route", choices=ROUTES, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.route:
+            path = os.path.join(tmp, f"projections.{args.route}")
+            print(json.dumps(run_route(args.route, args.scenarios, args.chunk_size, path)))
+            return 0
+
+        # Each route runs in a fresh interpreter so peaks are not shared between them
+        print(f"{args.scenarios:,} scenarios")
+        print(f"{'route':<8} {'seconds':>9} {'python MB':>10} {'arrow MB':>9} {'file MB':>8}")
+        for route in ROUTES:
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.export_memory", "--route", route,
+                 "--scenarios", str(args.scenarios), "--chunk-size", str(args.chunk_size)],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            result = json.loads(output)
+            print(
+                f"{route:<8} {result['seconds']:9.2f} {result['python_peak_mb']:10.1f} "
+                f"{result['arrow_peak_mb']:9.1f} {result['file_mb']:8.1f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
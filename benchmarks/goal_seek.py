@@ -0,0 +1,56 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+
+
+def grid_search(scenarios, target_roi, grid):
+    """
+    Brute force: evaluate every scenario at each grid reduction and keep the first that meets the target.
+    """
+    from combined_ratio.batch import project_financials_batch
+
+    required = np.full(len(scenarios), np.nan)
+    for value in grid:
+        summary, _ = project_financials_batch(scenarios.assign(loss_ratio_reduction=value))
+        newly_met = np.isnan(required) & (summary["roi"].to_numpy() >= target_roi)
+        required[newly_met] = value
+    return required
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time goal-seek solvers against a brute-force grid search.")
+    parser.add_argument("--scenarios", type=int, default=5_000)
+    parser.add_argument("--target-roi", type=float, default=100.0)
+    parser.add_argument("--grid-step", type=float, default=0.01)
+    parser.add_argument("--grid-max", type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    from benchmarks.scenarios import random_scenarios
+    from combined_ratio.goal_seek import solve_required_reduction
+
+    scenarios = random_scenarios(args.scenarios)
+    results = {}
+    for method in ("closed_form", "bisection"):
+        start = time.perf_counter()
+        results[method] = solve_required_reduction(scenarios, target_roi=args.target_roi, method=method).to_numpy()
+        results[method + "_seconds"] = time.perf_counter() - start
+
+    grid = np.arange(0, args.grid_max + args.grid_step / 2, args.grid_step)
+    start = time.perf_counter()
+    results["grid"] = grid_search(scenarios, args.target_roi, grid)
+    results["grid_seconds"] = time.perf_counter() - start
+
+    reference = results["closed_form"]
+    print(f"{args.scenarios:,} scenarios, target ROI {args.target_roi}%")
+    print(f"{'method':<12} {'seconds':>9} {'max abs diff vs closed form':>28}")
+    for method in ("closed_form", "bisection", "grid"):
+        comparable = ~np.isnan(reference) & ~np.isnan(results[method])
+        diff = np.abs(results[method] - reference)[comparable].max(initial=0.0)
+        print(f"{method:<12} {results[method + '_seconds']:9.4f} {diff:28.2e}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
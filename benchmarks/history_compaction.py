@@ -0,0 +1,45 @@
+import argparse
+import random
+import sys
+import time
+
+
+def synthetic_conversation(turns, seed=0):
+    """
+    Alternate user questions and assistant answers of varying length.
+    """
+    rng = random.Random(seed)
+    words = "loss expense ratio premium growth payback investment underwriting claims reserve".split()
+    messages = [{"role": "system", "content": "You are an AI assistant that helps users estimate insurance metrics."}]
+    for i in range(turns):
+        role = "user" if i % 2 == 0 else "assistant"
+        length = rng.randint(10, 40) if role == "user" else rng.randint(60, 250)
+        text = " ".join(rng.choice(words) for _ in range(length))
+        messages.append({"role": role, "content": f"{text.capitalize()}. Follow-up {i}: {text}."})
+    return messages
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show request size over a long synthetic conversation.")
+    parser.add_argument("--turns", type=int, default=400)
+    parser.add_argument("--budget", type=int, default=2000)
+    parser.add_argument("--every", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    from combined_ratio.history import ConversationHistory
+
+    conversation = synthetic_conversation(args.turns)
+    history = ConversationHistory(budget=args.budget)
+    print(f"{'turns':>6} {'full tokens':>12} {'request tokens':>15} {'folded':>7} {'ms':>7}")
+    for n in range(2, len(conversation) + 1, 2):
+        start = time.perf_counter()
+        _, stats = history.compact(conversation[:n])
+        elapsed = (time.perf_counter() - start) * 1000
+        if (n - 2) % args.every == 0 or n >= len(conversation) - 1:
+            print(f"{n - 1:6d} {stats['full_tokens']:12,d} {stats['tokens']:15,d} {stats['folded_turns']:7d} {elapsed:7.2f}")
+    print(f"Summaries built: {history.summaries_built}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
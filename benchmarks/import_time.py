@@ -0,0 +1,62 @@
+import argparse
+import os
+import subprocess
+import sys
+
+# Cold-import budgets in milliseconds. The package and its calculation core must stay
+# importable without pulling in pandas, Streamlit, matplotlib or OpenAI.
+BUDGETS_MS = {
+    "combined_ratio": 50.0,
+    "combined_ratio.core": 50.0,
+}
+FORBIDDEN_MODULES = ("pandas", "numpy", "streamlit", "matplotlib", "openai")
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure_import(module, repeat=5):
+    """
+    Import a module in fresh interpreters and report the best wall time.
+
+    Parameters:
+        module (str): Dotted module name.
+        repeat (int): Number of fresh interpreters to try.
+
+    Returns:
+        tuple: Best import time in milliseconds and the heavy modules it loaded.
+    """
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "elapsed = (time.perf_counter() - start) * 1000\n"
+        f"heavy = [m for m in {FORBIDDEN_MODULES!r} if m in sys.modules]\n"
+        "print(elapsed, ','.join(heavy))\n"
+    )
+    best, heavy = float("inf"), ""
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", code], cwd=REPO_ROOT, check=True, capture_output=True, text=True
+        ).stdout.split(" ")
+        best = min(best, float(output[0]))
+        heavy = output[1].strip()
+    return best, [name for name in heavy.split(",") if name]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check cold import time of the calculation core.")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module, budget in BUDGETS_MS.items():
+        elapsed, heavy = measure_import(module, args.repeat)
+        ok = elapsed <= budget and not heavy
+        failed |= not ok
+        note = f" (loaded {', '.join(heavy)})" if heavy else ""
+        print(f"{'ok  ' if ok else 'FAIL'} {module:<24} {elapsed:8.2f} ms  budget {budget:.0f} ms{note}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+import argparse
+import sys
+import time
+
+BASE = {
+    "current_gwp": 500.0, "premium_growth_rate": 2.0, "current_loss_ratio": 65.0, "current_expense_ratio": 30.0,
+    "loss_ratio_reduction": 0.5, "expense_ratio_reduction": 1.0, "analysis_period": 10, "initial_investment": 7.0,
+    "ongoing_costs_salesforce": 1.5, "ongoing_costs_other": 0.0,
+    "loss_ratio_reduction_salesforce": 0.4, "expense_ratio_reduction_salesforce": 0.8,
+    "periods_per_year": 1, "discount_rate": 8.0,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Nodes recomputed and time taken when one calculator input changes.")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    from combined_ratio.export import financial_df_to_parquet
+    from combined_ratio.graph import Evaluator
+    from combined_ratio.model import MODEL
+
+    # The calculator graph plus the downloads built from its table, as in the app
+    graph = MODEL.extend()
+    graph.node(lambda financial_df: financial_df.to_csv(index=False), name="csv_download")
+    graph.node(lambda financial_df: financial_df_to_parquet(financial_df), name="parquet_download")
+    outputs = list(graph.nodes)
+
+    def evaluate(evaluator, inputs):
+        evaluator.update(inputs)
+        for name in outputs:
+            evaluator[name]
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        evaluate(Evaluator(graph), BASE)
+    full = (time.perf_counter() - start) / args.repeat
+
+    print(f"{len(outputs)} nodes; full evaluation {full * 1000:.2f} ms")
+    print(f"{'changed input':<36} {'recomputed':>10} {'ms':>8} {'speedup':>8}")
+    for name, value in BASE.items():
+        evaluator = Evaluator(graph)
+        evaluate(evaluator, BASE)
+        changed = dict(BASE, **{name: value + 1})
+        elapsed = 0.0
+        for i in range(args.repeat):
+            # Alternate between the two values so every run sees a change
+            inputs = changed if i % 2 == 0 else BASE
+            start = time.perf_counter()
+            evaluate(evaluator, inputs)
+            elapsed += time.perf_counter() - start
+        recomputed = len(evaluator.stats()["recomputed"])
+        incremental = elapsed / args.repeat
+        print(f"{name:<36} {recomputed:>10} {incremental * 1000:8.3f} {full / incremental:7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
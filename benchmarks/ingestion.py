@@ -0,0 +1,154 @@
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+FORMATS = ("csv", "parquet")
+LINES = ["Personal Auto", "Homeowners", "Commercial Property", "General Liability", "Workers Compensation"]
+# Extract column names as a policy or claims system might write them
+CLAIMS_COLUMNS = {"lob": "line", "loss_date": "date", "incurred": "incurred_loss"}
+
+
+def write_extracts(directory, rows, fmt, seed=0):
+    """
+    Write a premium extract (one row per policy and accounting year) and a claims extract
+    (one row per claim transaction, dated) with rows rows each, in chunks.
+
+    Returns:
+        list: The two file paths.
+    """
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    lines = np.array(LINES)
+    paths = [os.path.join(directory, f"{name}.{fmt}") for name in ("premiums", "claims")]
+    writers = {}
+    chunk_size = 500_000
+    for start in range(0, rows, chunk_size):
+        n = min(chunk_size, rows - start)
+        premium = rng.uniform(500, 5000, n).round(2)
+        chunks = (
+            pd.DataFrame({
+                "policy": np.arange(start, start + n),
+                "line": lines[rng.integers(0, len(lines), n)],
+                "period": rng.integers(2020, 2025, n),
+                "written_premium": premium,
+                "earned_premium": (premium * rng.uniform(0.9, 1.0, n)).round(2),
+                "expenses": (premium * rng.uniform(0.2, 0.35, n)).round(2),
+            }),
+            pd.DataFrame({
+                "claim": np.arange(start, start + n),
+                "lob": lines[rng.integers(0, len(lines), n)],
+                "loss_date": pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 5 * 365, n), unit="D"),
+                "incurred": rng.gamma(0.5, 6000, n).round(2),
+            }),
+        )
+        for path, chunk in zip(paths, chunks):
+            if fmt == "csv":
+                chunk.to_csv(path, mode="a", header=start == 0, index=False)
+            else:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if path not in writers:
+                    writers[path] = pq.ParquetWriter(path, table.schema)
+                writers[path].write_table(table)
+    for writer in writers.values():
+        writer.close()
+    return paths
+
+
+def peak_rss_mb():
+    """
+    Peak resident set size of this process in MB.
+
+    Read from /proc where possible: getrusage's peak survives exec, so a child would report
+    the benchmark parent's peak.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            return next(int(line.split()[1]) for line in f if line.startswith("VmHWM:")) / 2**10
+    except (OSError, StopIteration):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10
+
+
+def run_route(paths, chunk_size):
+    """
+    Aggregate the extracts in this interpreter and measure it. A chunk size of 0 reads each
+    file whole and groups it in one go, for comparison.
+    """
+    import pandas as pd
+
+    from combined_ratio.ingest import RatioAggregator, ingest, read_chunks
+
+    base = peak_rss_mb()
+    start = time.perf_counter()
+    if chunk_size:
+        aggregator = ingest(paths, chunk_size, CLAIMS_COLUMNS)
+    else:
+        aggregator = RatioAggregator()
+        for path in paths:
+            whole = next(read_chunks(path, 2**62, CLAIMS_COLUMNS)) if path.endswith(".csv") else pd.read_parquet(path).rename(columns=CLAIMS_COLUMNS)
+            aggregator.add(whole)
+            del whole
+    seconds = time.perf_counter() - start
+    totals = aggregator.totals()
+    return {
+        "rows": aggregator.rows,
+        "seconds": seconds,
+        "base_mb": base,
+        "peak_mb": peak_rss_mb(),
+        "checksum": float(totals[["written_premium", "incurred_loss"]].to_numpy().sum()),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Stream synthetic premium and claims extracts through the ingestion stage and "
+        "report throughput in rows per second and peak memory."
+    )
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 4_000_000], help="Rows per extract.")
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=[50_000, 250_000, 1_000_000], help="Rows read at a time.")
+    parser.add_argument("--formats", choices=FORMATS, nargs="+", default=list(FORMATS))
+    parser.add_argument("--whole", action="store_true", help="Also read each file whole, for comparison.")
+    parser.add_argument("--route", nargs="+", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.route:
+        print(json.dumps(run_route(args.route, args.chunk_sizes[0])))
+        return 0
+
+    print(f"{'format':<8} {'rows':>10} {'file MB':>8} {'chunk':>10} {'seconds':>8} {'rows/s':>11} {'MB/s':>6} {'peak MB':>8} {'growth MB':>9}")
+    for fmt in args.formats:
+        for rows in args.rows:
+            with tempfile.TemporaryDirectory() as directory:
+                paths = write_extracts(directory, rows, fmt)
+                size = sum(os.path.getsize(path) for path in paths) / 2**20
+                checksums = set()
+                # Each run gets a fresh interpreter so peaks are not shared between them
+                for chunk_size in args.chunk_sizes + ([0] if args.whole else []):
+                    output = subprocess.run(
+                        [sys.executable, "-m", "benchmarks.ingestion", "--chunk-sizes", str(chunk_size), "--route", *paths],
+                        check=True, capture_output=True, text=True,
+                    ).stdout
+                    result = json.loads(output)
+                    checksums.add(f"{result['checksum']:.9g}")
+                    print(
+                        f"{fmt:<8} {result['rows']:>10,} {size:8.0f} {chunk_size or 'whole':>10} {result['seconds']:8.2f} "
+                        f"{result['rows'] / result['seconds']:11,.0f} {size / result['seconds']:6.1f} "
+                        f"{result['peak_mb']:8.0f} {result['peak_mb'] - result['base_mb']:9.0f}"
+                    )
+                if len(checksums) > 1:
+                    print(f"  totals differ between chunk sizes: {sorted(checksums)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
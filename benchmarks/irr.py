@@ -0,0 +1,72 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+
+
+def random_cash_flows(n, periods, seed=0):
+    """
+    Cash flows shaped like the calculator's: an investment at time 0, then net savings
+    that grow, with some scenarios never recovering the investment.
+    """
+    rng = np.random.default_rng(seed)
+    cash_flows = np.empty((n, periods + 1))
+    cash_flows[:, 0] = -rng.uniform(1, 50, n)
+    savings = rng.uniform(-2, 15, n)[:, None] * (1 + rng.uniform(0, 0.1, n)[:, None]) ** np.arange(periods)
+    cash_flows[:, 1:] = savings
+    return cash_flows
+
+
+def roots_irr(cash_flows):
+    """
+    Reference IRR from the polynomial roots: the real root of NPV in 1 / (1 + rate)
+    closest to the solver's starting point, or NaN when there is none.
+    """
+    roots = np.roots(cash_flows[::-1])
+    roots = roots[np.isreal(roots) & (roots.real > 0)].real
+    if roots.size == 0:
+        return np.nan
+    rates = 1 / roots - 1
+    return rates[np.argmin(np.abs(rates - 0.1))] * 100
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the vectorized IRR solver against a per-scenario loop.")
+    parser.add_argument("--scenarios", type=int, default=100_000)
+    parser.add_argument("--periods", type=int, default=10)
+    parser.add_argument("--loop-scenarios", type=int, default=5_000, help="Scenarios solved one at a time (the loop is slow).")
+    parser.add_argument("--check-scenarios", type=int, default=1_000, help="Scenarios checked against polynomial roots.")
+    args = parser.parse_args(argv)
+
+    from combined_ratio.discounting import IRR_CONVERGED, IRR_STATUS, irr, npv
+
+    cash_flows = random_cash_flows(args.scenarios, args.periods)
+    start = time.perf_counter()
+    rates, status = irr(cash_flows)
+    vectorized = time.perf_counter() - start
+
+    looped = cash_flows[:args.loop_scenarios]
+    start = time.perf_counter()
+    loop_rates = np.array([irr(row)[0][0] for row in looped])
+    loop = (time.perf_counter() - start) * args.scenarios / len(looped)
+
+    converged = status == IRR_CONVERGED
+    residual = np.abs(npv(cash_flows[converged], rates[converged])) / np.abs(cash_flows[converged]).sum(axis=1)
+    checked = slice(0, args.check_scenarios)
+    reference = np.array([roots_irr(row) for row in cash_flows[checked]])
+    both = converged[checked] & ~np.isnan(reference)
+
+    print(f"{args.scenarios:,} scenarios, {args.periods} periods")
+    print(f"{'method':<12} {'seconds':>9}")
+    print(f"{'vectorized':<12} {vectorized:9.4f}")
+    print(f"{'loop':<12} {loop:9.4f}  (extrapolated from {len(looped):,} scenarios)")
+    print("status counts: " + ", ".join(f"{name} {np.count_nonzero(status == code):,}" for code, name in enumerate(IRR_STATUS)))
+    print(f"max relative NPV at the IRR: {residual.max(initial=0.0):.2e}")
+    print(f"max abs diff vs loop: {np.nanmax(np.abs(loop_rates - rates[:len(looped)]), initial=0.0):.2e}")
+    print(f"max abs diff vs polynomial roots: {np.abs(rates[checked][both] - reference[both]).max(initial=0.0):.2e}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
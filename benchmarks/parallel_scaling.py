@@ -0,0 +1,61 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+
+def main(argv=None):
+    from combined_ratio.parallel import ShardedExecutor, available_cpus
+
+    cpus = available_cpus()
+    parser = argparse.ArgumentParser(description="Speedup of the sharded executor as worker processes are added.")
+    parser.add_argument("--scenarios", type=int, default=2_000_000)
+    parser.add_argument("--max-period", type=int, default=30, help="Longest analysis period drawn.")
+    parser.add_argument("--shard-size", type=int, default=100_000)
+    parser.add_argument(
+        "--workers", type=int, nargs="+",
+        default=sorted({1, 2, 4, 8, 16, 32, 64, cpus} & set(range(1, cpus + 1))),
+        help="Worker counts to time (default: powers of two up to the CPU count).",
+    )
+    parser.add_argument("--source", choices=("memory", "arrow"), nargs="+", default=["memory", "arrow"])
+    args = parser.parse_args(argv)
+
+    import pyarrow as pa
+
+    from benchmarks.scenarios import random_scenarios
+
+    scenarios = random_scenarios(args.scenarios, max_period=args.max_period)
+    print(f"{args.scenarios:,} scenarios, shards of {args.shard_size:,}, {cpus} CPU(s) available")
+    if max(args.workers) > cpus:
+        print("note: worker counts above the CPU count cannot speed up further")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "scenarios.arrow")
+        table = pa.Table.from_pandas(scenarios, preserve_index=False)
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        del table
+        sources = {"memory": scenarios, "arrow": path}
+
+        print(f"{'source':<8} {'workers':>7} {'seconds':>8} {'speedup':>8} {'efficiency':>10}")
+        for source in args.source:
+            baseline = None
+            for workers in args.workers:
+                with ShardedExecutor(workers, args.shard_size) as executor:
+                    # Start the pool outside the timing; a nightly run pays this once
+                    for _ in executor.map(scenarios.iloc[:1]):
+                        pass
+                    start = time.perf_counter()
+                    rows = sum(len(shard) for shard in executor.map(sources[source]))
+                    elapsed = time.perf_counter() - start
+                assert rows == args.scenarios
+                # Speedup over the first (smallest) worker count timed
+                baseline = baseline or (elapsed, workers)
+                speedup = baseline[0] / elapsed
+                print(f"{source:<8} {workers:>7} {elapsed:8.2f} {speedup:7.2f}x {speedup * baseline[1] / workers:9.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
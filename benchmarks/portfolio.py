@@ -0,0 +1,87 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def random_lines(n, seed=0):
+    """
+    Build a line table of n random lines of business in three segments.
+    """
+    rng = np.random.default_rng(seed)
+    loss_ratio_reduction = rng.uniform(0, 3, n)
+    expense_ratio_reduction = rng.uniform(0, 3, n)
+    return pd.DataFrame({
+        "line": [f"Line {i + 1}" for i in range(n)],
+        "segment": rng.choice(["Personal", "Commercial", "Specialty"], n),
+        "current_gwp": rng.uniform(5, 500, n),
+        "premium_growth_rate": rng.uniform(-2, 8, n),
+        "current_loss_ratio": rng.uniform(45, 85, n),
+        "current_expense_ratio": rng.uniform(18, 40, n),
+        "loss_ratio_reduction": loss_ratio_reduction,
+        "expense_ratio_reduction": expense_ratio_reduction,
+        "loss_ratio_reduction_salesforce": loss_ratio_reduction * 0.8,
+        "expense_ratio_reduction_salesforce": expense_ratio_reduction * 0.8,
+    })
+
+
+def scalar_portfolio(lines, analysis_period, ongoing_costs, initial_investment, ongoing_costs_salesforce):
+    """
+    The naive portfolio: one project_financials call per line, summed with pandas.
+    """
+    from combined_ratio.core import project_financials
+
+    share = lines["current_gwp"] / lines["current_gwp"].sum()
+    frames, total_savings = [], 0.0
+    for row, line_share in zip(lines.itertuples(index=False), share):
+        result = project_financials(
+            row.current_gwp, row.premium_growth_rate, row.current_loss_ratio, row.current_expense_ratio,
+            row.current_loss_ratio - row.loss_ratio_reduction, row.current_expense_ratio - row.expense_ratio_reduction,
+            analysis_period, ongoing_costs * line_share, initial_investment * line_share,
+            row.loss_ratio_reduction_salesforce, row.expense_ratio_reduction_salesforce,
+            ongoing_costs_salesforce * line_share,
+        )
+        frames.append(result[0])
+        total_savings += result[4]
+    return pd.concat(frames).groupby("Year").sum(), total_savings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time portfolio roll-ups against per-line scalar calls.")
+    parser.add_argument("--lines", type=int, default=500)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    from combined_ratio.portfolio import project_portfolio, summarize_by
+
+    lines = random_lines(args.lines)
+    costs = dict(ongoing_costs=20.0, initial_investment=50.0, ongoing_costs_salesforce=5.0)
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        line_summary, financial_df, enterprise = project_portfolio(lines, args.years, **costs)
+    vectorized = (time.perf_counter() - start) / args.repeat
+
+    start = time.perf_counter()
+    summarize_by(line_summary)
+    rollup = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reference, reference_savings = scalar_portfolio(lines, args.years, **costs)
+    scalar = time.perf_counter() - start
+
+    print(f"{args.lines} lines x {args.years} years")
+    print(f"{'project_portfolio':<28} {vectorized * 1000:10.2f} ms")
+    print(f"{'segment roll-up':<28} {rollup * 1000:10.2f} ms")
+    print(f"{'per-line scalar calls':<28} {scalar * 1000:10.2f} ms")
+    difference = np.abs(financial_df["Cumulative Savings ($M)"].to_numpy() - reference["Cumulative Savings ($M)"].to_numpy()).max()
+    print(f"max abs difference in cumulative savings: {difference:.2e}")
+    print(f"total savings difference: {abs(enterprise['total_savings'] - reference_savings):.2e}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
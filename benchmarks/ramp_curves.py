@@ -0,0 +1,69 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+
+
+def timed(function, repeat=3):
+    """
+    Best time of repeat calls.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Time batch projections with improvement ramp-up and cost escalation curves against flat improvements."
+    )
+    parser.add_argument("--scenarios", type=int, default=100_000)
+    parser.add_argument("--max-period", type=int, default=10, help="Longest analysis period drawn.")
+    parser.add_argument("--granularity", choices=("annual", "quarterly", "monthly"), default="annual")
+    args = parser.parse_args(argv)
+
+    from benchmarks.scenarios import random_scenarios
+    from combined_ratio.batch import project_financials_batch
+    from combined_ratio.core import GRANULARITIES
+    from combined_ratio.curves import escalation_curve, ramp_curve, yearly_curve
+
+    periods_per_year = GRANULARITIES[args.granularity]
+    n_periods = args.max_period * periods_per_year
+    scenarios = random_scenarios(args.scenarios, max_period=args.max_period)
+    rng = np.random.default_rng(1)
+    ramp_years = rng.uniform(0, 3, args.scenarios)
+    escalation = rng.uniform(0, 5, args.scenarios)
+
+    cases = {
+        "flat": {},
+        "linear ramp, shared": {"improvement_curve": ramp_curve("linear", 2, n_periods, periods_per_year)},
+        "yearly vector, shared": {"improvement_curve": yearly_curve([0.25, 0.6, 0.9, 1.0], n_periods, periods_per_year)},
+        "s-curve per scenario": {"improvement_curve": ramp_curve("s_curve", ramp_years, n_periods, periods_per_year)},
+        "s-curve + escalation per scenario": {
+            "improvement_curve": ramp_curve("s_curve", ramp_years, n_periods, periods_per_year),
+            "cost_curve": escalation_curve(escalation, n_periods, periods_per_year),
+        },
+    }
+    print(f"{args.scenarios:,} scenarios, up to {args.max_period} years, {args.granularity} periods")
+    print(f"{'case':<36} {'seconds':>9} {'vs flat':>8}")
+    flat = None
+    for label, curves in cases.items():
+        seconds = timed(lambda: project_financials_batch(scenarios, periods_per_year=periods_per_year, **curves))
+        flat = flat or seconds
+        print(f"{label:<36} {seconds:9.4f} {seconds / flat:7.2f}x")
+
+    # Building the curves is part of the cost when they differ per scenario
+    seconds = timed(lambda: (
+        ramp_curve("s_curve", ramp_years, n_periods, periods_per_year),
+        escalation_curve(escalation, n_periods, periods_per_year),
+    ))
+    print(f"{'building per-scenario curves':<36} {seconds:9.4f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
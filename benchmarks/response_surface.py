@@ -0,0 +1,96 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import timeit
+
+import numpy as np
+
+from benchmarks.sensitivity import BASE
+
+
+def per_call(function, number):
+    """
+    Best per-call time of function in microseconds.
+    """
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Time response surface lookups against the exact projection, and check their accuracy."
+    )
+    parser.add_argument("--growth-step", type=float, default=None, help="Grid step in growth rate points.")
+    parser.add_argument("--scenarios", type=int, default=10_000, help="Scenarios in the batch comparison.")
+    parser.add_argument("--samples", type=int, default=20_000, help="Scenarios compared with project_financials.")
+    args = parser.parse_args(argv)
+
+    from combined_ratio.batch import project_financials_arrays
+    from combined_ratio.core import project_financials
+    from combined_ratio.sensitivity import sweep_2d
+    from combined_ratio.surface import GROWTH_STEP, ResponseSurface, check_accuracy, random_inputs
+
+    growth_step = args.growth_step or GROWTH_STEP
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "surface.npy")
+        start = time.perf_counter()
+        built = ResponseSurface.build(growth_step)
+        build_seconds = time.perf_counter() - start
+        built.save(path)
+        start = time.perf_counter()
+        surface = ResponseSurface.load(path)
+        load_seconds = time.perf_counter() - start
+        size = os.path.getsize(path)
+
+        print(f"Grid: {surface.table.shape[1]:,} growth rates (0-{surface.max_growth:g}% by {growth_step:g}) "
+              f"x {surface.max_period} years, {size / 1024:.0f} KiB")
+        print(f"Build {build_seconds * 1000:.1f} ms, memory-map {load_seconds * 1000:.2f} ms")
+
+        # One scenario, as after a slider change, with payback early, late or not at all
+        print(f"\n{'one scenario (us)':<40} {'exact':>8} {'surface':>8} {'speedup':>8}")
+        ongoing_costs = BASE["ongoing_costs_salesforce"] + BASE["ongoing_costs_other"]
+        scenario = (
+            BASE["current_gwp"], 2.37, BASE["current_loss_ratio"], BASE["current_expense_ratio"],
+            BASE["current_loss_ratio"] - BASE["loss_ratio_reduction"], BASE["current_expense_ratio"] - BASE["expense_ratio_reduction"],
+            5, ongoing_costs, BASE["initial_investment"],
+            BASE["loss_ratio_reduction_salesforce"], BASE["expense_ratio_reduction_salesforce"], BASE["ongoing_costs_salesforce"],
+        )
+        cases = {
+            "5 years, payback in year 2": scenario,
+            "30 years, payback in year 2": scenario[:6] + (30,) + scenario[7:],
+            "30 years, no payback": scenario[:4] + scenario[2:4] + (30,) + scenario[7:9] + (0.0, 0.0) + scenario[11:],
+            "30 years, payback in year 24": scenario[:6] + (30, ongoing_costs, 200.0) + scenario[9:],
+        }
+        for label, case in cases.items():
+            exact = per_call(lambda: project_financials(*case), 2_000)
+            estimate = per_call(lambda: surface.estimate(*case), 2_000)
+            print(f"{label:<40} {exact:8.1f} {estimate:8.1f} {exact / estimate:7.1f}x")
+
+        # Many scenarios: the sensitivity heatmap's 50 x 50 grid and a large batch
+        print(f"\n{'many scenarios (ms)':<40} {'exact':>8} {'surface':>8} {'speedup':>8}")
+        x_values, y_values = np.linspace(0.25, 0.75, 50), np.linspace(0.5, 1.5, 50)
+        timings = {}
+        for label, sweep in (
+            ("heatmap 50 x 50, 5 years", lambda surface: sweep_2d(BASE, "loss_ratio_reduction", x_values, "expense_ratio_reduction", y_values, surface=surface)),
+            ("heatmap 50 x 50, 30 years", lambda surface: sweep_2d(dict(BASE, analysis_period=30), "loss_ratio_reduction", x_values, "expense_ratio_reduction", y_values, surface=surface)),
+        ):
+            timings[label] = (per_call(lambda: sweep(None), 10) / 1000, per_call(lambda: sweep(surface), 10) / 1000)
+        inputs = random_inputs(args.scenarios, surface.max_growth, surface.max_period, seed=1)
+        for granularity, periods_per_year in (("annual", 1), ("monthly", 12)):
+            label = f"{args.scenarios:,} scenarios, up to 30 years, {granularity}"
+            timings[label] = (
+                per_call(lambda: project_financials_arrays(**inputs, periods_per_year=periods_per_year), 1) / 1000,
+                per_call(lambda: surface.summarize(**inputs, periods_per_year=periods_per_year), 1) / 1000,
+            )
+        for label, (exact, estimate) in timings.items():
+            print(f"{label:<40} {exact:8.2f} {estimate:8.2f} {exact / estimate:7.1f}x")
+
+        print(f"\nAccuracy against project_financials ({args.samples:,} scenarios between grid points):")
+        print(json.dumps(check_accuracy(surface, args.samples), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
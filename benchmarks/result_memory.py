@@ -0,0 +1,144 @@
+import argparse
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROUTES = ("legacy", "result", "result_df")
+
+
+def legacy_project_financials(
+    current_gwp, premium_growth_rate, current_loss_ratio, current_expense_ratio,
+    new_loss_ratio, new_expense_ratio, analysis_period, ongoing_costs, initial_investment,
+    loss_ratio_reduction_salesforce, expense_ratio_reduction_salesforce, ongoing_costs_salesforce
+):
+    """
+    project_financials as it was before ProjectionResult: seven Python lists of floats
+    copied into a DataFrame, returned in a 9-tuple.
+    """
+    import pandas as pd
+
+    years = list(range(1, analysis_period + 1))
+    gwp_list, profit_current_list, profit_new_list = [], [], []
+    annual_savings, cumulative_savings = [], []
+    annual_savings_salesforce, cumulative_savings_salesforce = [], []
+    cumulative_cash_flow = cumulative_cash_flow_salesforce = -initial_investment
+    payback_period = payback_period_salesforce = None
+    running_cumulative_savings = running_cumulative_savings_salesforce = 0
+
+    for year in years:
+        gwp = current_gwp * (1 + premium_growth_rate / 100) ** (year - 1)
+        gwp_list.append(gwp)
+        profit_current = gwp - gwp * current_loss_ratio / 100 - gwp * current_expense_ratio / 100
+        profit_current_list.append(profit_current)
+        profit_new = gwp - gwp * new_loss_ratio / 100 - gwp * new_expense_ratio / 100
+        profit_new_list.append(profit_new)
+        savings = profit_new - profit_current
+        annual_savings.append(savings)
+        running_cumulative_savings += savings
+        cumulative_savings.append(running_cumulative_savings)
+        savings_salesforce = gwp * loss_ratio_reduction_salesforce / 100 + gwp * expense_ratio_reduction_salesforce / 100
+        savings_salesforce -= ongoing_costs_salesforce
+        annual_savings_salesforce.append(savings_salesforce)
+        running_cumulative_savings_salesforce += savings_salesforce
+        cumulative_savings_salesforce.append(running_cumulative_savings_salesforce)
+        cumulative_cash_flow += savings - ongoing_costs
+        cumulative_cash_flow_salesforce += savings_salesforce
+        if cumulative_cash_flow >= 0 and payback_period is None:
+            payback_period = year
+        if cumulative_cash_flow_salesforce >= 0 and payback_period_salesforce is None:
+            payback_period_salesforce = year
+
+    total_investment = initial_investment + ongoing_costs * analysis_period
+    total_investment_salesforce = initial_investment + ongoing_costs_salesforce * analysis_period
+    total_savings = running_cumulative_savings - (ongoing_costs * analysis_period)
+    total_savings_salesforce = running_cumulative_savings_salesforce
+    roi = (total_savings / total_investment) * 100 if total_investment != 0 else 0
+    roi_salesforce = (total_savings_salesforce / total_investment_salesforce) * 100 if total_investment_salesforce != 0 else 0
+
+    financial_df = pd.DataFrame({
+        "Year": years,
+        "Projected Premiums ($M)": gwp_list,
+        "Current Operating Profit ($M)": profit_current_list,
+        "Projected Operating Profit ($M)": profit_new_list,
+        "Annual Savings ($M)": annual_savings,
+        "Cumulative Savings ($M)": cumulative_savings,
+        "Annual Savings from Salesforce ($M)": annual_savings_salesforce,
+        "Cumulative Salesforce Savings ($M)": cumulative_savings_salesforce,
+    })
+    return (
+        financial_df, roi, payback_period, total_investment, total_savings,
+        roi_salesforce, payback_period_salesforce, total_investment_salesforce, total_savings_salesforce
+    )
+
+
+def run_route(route, n_scenarios):
+    """
+    Project n_scenarios one call at a time, keeping every result alive as a portfolio would.
+
+    "legacy" is the old lists-plus-DataFrame path, "result" keeps ProjectionResult objects
+    without building DataFrames, and "result_df" also reads financial_df from each.
+    """
+    import pandas as pd
+
+    from combined_ratio.batch import SCENARIO_COLUMNS
+    from combined_ratio.core import project_financials
+    from benchmarks.scenarios import random_scenarios
+
+    scenarios = random_scenarios(n_scenarios)
+    scenarios["new_loss_ratio"] = scenarios["current_loss_ratio"] - scenarios["loss_ratio_reduction"]
+    scenarios["new_expense_ratio"] = scenarios["current_expense_ratio"] - scenarios["expense_ratio_reduction"]
+    scenarios["analysis_period"] = scenarios["analysis_period"].astype(int)
+    rows = [tuple(row) for row in scenarios[SCENARIO_COLUMNS].astype(object).itertuples(index=False)]
+    function = legacy_project_financials if route == "legacy" else project_financials
+    pd.DataFrame({"warm": [0.0]})  # keep pandas' one-off setup out of the measurement
+
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    start = time.perf_counter()
+    results = [function(*row) for row in rows]
+    if route == "result_df":
+        for result in results:
+            result.financial_df
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "route": route,
+        "seconds": elapsed,
+        "retained_mb": retained / 2**20,
+        "peak_mb": peak / 2**20,
+        "live_blocks_per_scenario": (sys.getallocatedblocks() - blocks_before) / n_scenarios,
+        "results": len(results),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare memory of ProjectionResult against the legacy tuple output.")
+    parser.add_argument("--scenarios", type=int, default=100_000)
+    parser.add_argument("--route", choices=ROUTES, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.route:
+        print(json.dumps(run_route(args.route, args.scenarios)))
+        return 0
+
+    # Each route runs in a fresh interpreter so peaks are not shared between them
+    print(f"{args.scenarios:,} scenarios, results kept alive (seconds include tracemalloc overhead)")
+    print(f"{'route':<10} {'seconds':>9} {'retained MB':>12} {'peak MB':>9} {'blocks/scenario':>16}")
+    for route in ROUTES:
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.result_memory", "--route", route, "--scenarios", str(args.scenarios)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        result = json.loads(output)
+        print(
+            f"{route:<10} {result['seconds']:9.2f} {result['retained_mb']:12.1f} "
+            f"{result['peak_mb']:9.1f} {result['live_blocks_per_scenario']:16.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+
+def stored_scenarios(n, seed=0, carriers=50, tags=20):
+    """
+    A table of n named scenarios for the store: random inputs, carrier, as-of date and tags.
+    """
+    import pandas as pd
+
+    from benchmarks.scenarios import random_scenarios
+
+    rng = np.random.default_rng(seed)
+    table = random_scenarios(n, seed=seed)
+    table["ongoing_costs_other"] = table["ongoing_costs"] - table["ongoing_costs_salesforce"]
+    table["periods_per_year"] = rng.choice([1, 4, 12], n)
+    table["discount_rate"] = rng.uniform(0, 15, n)
+    table["name"] = [f"Scenario {i:06d}" for i in range(n)]
+    table["carrier"] = [f"Carrier {i:02d}" for i in rng.integers(0, carriers, n)]
+    table["as_of"] = (pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 3 * 365, n), unit="D")).date
+    pool = np.array([f"tag{i:02d}" for i in range(tags)])
+    table["tags"] = [list(pool[rng.choice(tags, k, replace=False)]) for k in rng.integers(0, 4, n)]
+    return table.drop(columns="ongoing_costs")
+
+
+def timed(function, repeat=5):
+    """
+    Best time of repeat calls, and the last call's result.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the scenario store's writes and indexed lookups with many stored entries.")
+    parser.add_argument("--scenarios", type=int, default=100_000)
+    parser.add_argument("--compare", type=int, default=50, help="Scenarios compared side by side.")
+    args = parser.parse_args(argv)
+
+    from combined_ratio.model import INPUTS
+    from combined_ratio.store import ScenarioStore
+
+    table = stored_scenarios(args.scenarios)
+    with tempfile.TemporaryDirectory() as directory, ScenarioStore(os.path.join(directory, "scenarios.sqlite3")) as store:
+        start = time.perf_counter()
+        store.save_many(table)
+        saved = time.perf_counter() - start
+        print(f"{args.scenarios:,} scenarios saved in {saved:.2f} s ({os.path.getsize(store.path) / 1e6:.1f} MB)")
+
+        # Re-saving identical inputs under new names serves the stored results
+        copies = table.iloc[:1_000].assign(name=lambda frame: frame["name"] + " copy")
+        start = time.perf_counter()
+        store.save_many(copies)
+        print(f"1,000 copies of saved inputs saved in {time.perf_counter() - start:.3f} s")
+
+        names = list(table["name"].iloc[::max(1, args.scenarios // args.compare)][:args.compare])
+        inputs = table[list(INPUTS)].iloc[args.scenarios // 2].to_dict()
+        lookups = {
+            "find by carrier (200 newest)": lambda: store.find(carrier="Carrier 07", limit=200),
+            "find by two tags": lambda: store.find(tags=["tag03", "tag11"], limit=200),
+            "find by carrier and date range": lambda: store.find(carrier="Carrier 07", since="2025-01-01", until="2025-03-31"),
+            "find by name text": lambda: store.find(name="00042", limit=200),
+            "count by carrier and tag": lambda: store.count(carrier="Carrier 07", tags="tag03"),
+            "load one": lambda: store.load(names[0]),
+            "lookup by inputs": lambda: store.lookup(inputs),
+            f"compare {len(names)}": lambda: store.compare(names),
+            "carriers": store.carriers,
+            "tag counts": store.tag_counts,
+            "date range": store.date_range,
+        }
+        print(f"{'query':<32} {'ms':>8} {'rows':>6}")
+        for label, function in lookups.items():
+            seconds, result = timed(function)
+            rows = len(result.columns) if label.startswith("compare") else len(result) if hasattr(result, "__len__") else 1
+            print(f"{label:<32} {seconds * 1000:8.2f} {rows:>6}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
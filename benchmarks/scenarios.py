@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+
+
+def random_scenarios(n, seed=0, max_period=10):
+    """
+    Build a table of n random scenarios spanning the calculator's input ranges.
+
+    Parameters:
+        n (int): Number of scenarios.
+        seed (int): Random seed.
+        max_period (int): Longest analysis period drawn.
+
+    Returns:
+        DataFrame: Columns named as in combined_ratio.batch.SCENARIO_COLUMNS, with
+        loss/expense ratio reductions in place of the new ratios.
+    """
+    rng = np.random.default_rng(seed)
+    loss_ratio_reduction = rng.uniform(0, 5, n)
+    expense_ratio_reduction = rng.uniform(0, 5, n)
+    ongoing_costs_salesforce = rng.uniform(0, 5, n)
+    return pd.DataFrame({
+        "current_gwp": rng.uniform(50, 2000, n),
+        "premium_growth_rate": rng.uniform(0, 10, n),
+        "current_loss_ratio": rng.uniform(40, 90, n),
+        "current_expense_ratio": rng.uniform(15, 45, n),
+        "loss_ratio_reduction": loss_ratio_reduction,
+        "expense_ratio_reduction": expense_ratio_reduction,
+        "analysis_period": rng.integers(1, max_period + 1, n),
+        "ongoing_costs": ongoing_costs_salesforce + rng.uniform(0, 2, n),
+        "initial_investment": rng.uniform(1, 50, n),
+        "loss_ratio_reduction_salesforce": loss_ratio_reduction * 0.8,
+        "expense_ratio_reduction_salesforce": expense_ratio_reduction * 0.8,
+        "ongoing_costs_salesforce": ongoing_costs_salesforce,
+    })
@@ -0,0 +1,65 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+
+BASE = {
+    "current_gwp": 500.0, "premium_growth_rate": 2.0, "current_loss_ratio": 65.0, "current_expense_ratio": 30.0,
+    "loss_ratio_reduction": 0.5, "expense_ratio_reduction": 1.0, "analysis_period": 5, "initial_investment": 7.0,
+    "ongoing_costs_salesforce": 1.5, "ongoing_costs_other": 0.0,
+    "loss_ratio_reduction_salesforce": 0.4, "expense_ratio_reduction_salesforce": 0.8,
+}
+
+
+def scalar_sweep(x_values, y_values):
+    """
+    The naive sweep: one project_financials call per grid cell.
+    """
+    from combined_ratio.core import project_financials
+
+    b = BASE
+    ongoing_costs = b["ongoing_costs_salesforce"] + b["ongoing_costs_other"]
+    values = np.empty((len(y_values), len(x_values)))
+    for i, expense_ratio_reduction in enumerate(y_values):
+        for j, loss_ratio_reduction in enumerate(x_values):
+            values[i, j] = project_financials(
+                b["current_gwp"], b["premium_growth_rate"], b["current_loss_ratio"], b["current_expense_ratio"],
+                b["current_loss_ratio"] - loss_ratio_reduction, b["current_expense_ratio"] - expense_ratio_reduction,
+                b["analysis_period"], ongoing_costs, b["initial_investment"],
+                loss_ratio_reduction * 0.8, expense_ratio_reduction * 0.8, b["ongoing_costs_salesforce"],
+            )[1]
+    return values
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time tornado and 2-D sweeps against scalar calls.")
+    parser.add_argument("--grid", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    from combined_ratio.sensitivity import sweep_2d, tornado
+
+    x_values = np.linspace(0, 5, args.grid)
+    y_values = np.linspace(0, 5, args.grid)
+    timings = {}
+
+    start = time.perf_counter()
+    tornado(BASE)
+    timings["tornado (9 inputs x 2)"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    grid = sweep_2d(BASE, "loss_ratio_reduction", x_values, "expense_ratio_reduction", y_values)
+    timings[f"{args.grid}x{args.grid} sweep, broadcast"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reference = scalar_sweep(x_values, y_values)
+    timings[f"{args.grid}x{args.grid} sweep, scalar calls"] = time.perf_counter() - start
+
+    for label, seconds in timings.items():
+        print(f"{label:<32} {seconds * 1000:10.2f} ms")
+    print(f"max abs difference: {np.abs(grid.to_numpy() - reference).max():.2e}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+import argparse
+import http.client
+import json
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+
+
+def request_bodies(endpoint, n, seed=0, max_period=10, include_series=False):
+    """
+    n encoded request bodies for the endpoint, drawn from benchmarks.scenarios.
+    """
+    from benchmarks.scenarios import random_scenarios
+    from combined_ratio.service import NEW_RATIOS_FIELDS, PROJECTION_FIELDS
+
+    scenarios = random_scenarios(n, seed=seed, max_period=max_period)
+    scenarios["new_loss_ratio"] = scenarios["current_loss_ratio"] - scenarios["loss_ratio_reduction"]
+    scenarios["new_expense_ratio"] = scenarios["current_expense_ratio"] - scenarios["expense_ratio_reduction"]
+    if endpoint == "calculate_new_ratios":
+        return [json.dumps(row).encode() for row in scenarios[list(NEW_RATIOS_FIELDS)].to_dict("records")]
+    return [
+        json.dumps(dict(row, include_series=include_series)).encode()
+        for row in scenarios[list(PROJECTION_FIELDS)].to_dict("records")
+    ]
+
+
+def start_local_server(server_args):
+    """
+    Start the service in a subprocess on a free port.
+
+    Returns:
+        tuple: The process and the server's base URL.
+    """
+    process = subprocess.Popen(
+        [sys.executable, "-m", "combined_ratio.service", "--port", "0", *server_args],
+        stdout=subprocess.PIPE, text=True,
+    )
+    line = process.stdout.readline()
+    if not line.startswith("Serving on "):
+        process.kill()
+        raise RuntimeError(f"The service did not start: {line!r}")
+    return process, line.split()[-1]
+
+
+def run_load(url, endpoint, bodies, concurrency, requests):
+    """
+    Send requests from concurrency client threads, each over one keep-alive connection.
+
+    Returns:
+        tuple: Latencies in seconds of the successful requests, status counts, and the
+        wall-clock seconds taken.
+    """
+    address = urlsplit(url)
+    latencies, statuses = [], {}
+    lock = threading.Lock()
+    counter = iter(range(requests))
+
+    def client():
+        connection = http.client.HTTPConnection(address.hostname, address.port)
+        local_latencies, local_statuses = [], {}
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                connection.request("POST", f"/v1/{endpoint}", bodies[i % len(bodies)], {"Content-Type": "application/json"})
+                response = connection.getresponse()
+                response.read()
+                status = response.status
+            except OSError:
+                connection.close()  # reconnects on the next request
+                status = "connection error"
+            elapsed = time.perf_counter() - start
+            local_statuses[status] = local_statuses.get(status, 0) + 1
+            if status == 200:
+                local_latencies.append(elapsed)
+        connection.close()
+        with lock:
+            latencies.extend(local_latencies)
+            for status, count in local_statuses.items():
+                statuses[status] = statuses.get(status, 0) + count
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return np.array(latencies), statuses, time.perf_counter() - start
+
+
+def server_stats(url):
+    address = urlsplit(url)
+    connection = http.client.HTTPConnection(address.hostname, address.port)
+    connection.request("GET", "/v1/stats")
+    stats = json.loads(connection.getresponse().read())
+    connection.close()
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the projection service and report latency percentiles and throughput.")
+    parser.add_argument("--url", help="Service to test (default: start one locally for each configuration).")
+    parser.add_argument("--endpoint", choices=("project_financials", "calculate_new_ratios"), default="project_financials")
+    parser.add_argument("--concurrency", type=int, default=32, help="Client threads, each with one connection.")
+    parser.add_argument("--requests", type=int, default=5_000, help="Requests per configuration.")
+    parser.add_argument("--max-period", type=int, default=10, help="Longest analysis period requested.")
+    parser.add_argument("--include-series", action="store_true", help="Request the per-year table too.")
+    parser.add_argument("--warmup", type=int, default=200, help="Untimed requests sent first.")
+    parser.add_argument(
+        "--max-batch", type=int, nargs="+", default=[1, 256],
+        help="Batch sizes of the locally started servers; 1 turns micro-batching off.",
+    )
+    parser.add_argument("--max-wait-ms", type=float, help="Batch fill wait of the locally started servers.")
+    parser.add_argument("--workers", type=int, help="Worker pool size of the locally started servers.")
+    args = parser.parse_args(argv)
+
+    bodies = request_bodies(args.endpoint, 1_000, max_period=args.max_period, include_series=args.include_series)
+    targets = [(args.url, None)] if args.url else [(None, max_batch) for max_batch in args.max_batch]
+    print(f"{args.requests:,} {args.endpoint} requests from {args.concurrency} clients")
+    print(f"{'server':<16} {'req/s':>8} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8} {'mean batch':>10} {'errors':>7}")
+    for url, max_batch in targets:
+        process = None
+        if url is None:
+            server_args = ["--max-batch", str(max_batch)]
+            if args.max_wait_ms is not None:
+                server_args += ["--max-wait-ms", str(args.max_wait_ms)]
+            if args.workers is not None:
+                server_args += ["--workers", str(args.workers)]
+            process, url = start_local_server(server_args)
+        try:
+            run_load(url, args.endpoint, bodies, args.concurrency, args.warmup)
+            before = server_stats(url)
+            latencies, statuses, seconds = run_load(url, args.endpoint, bodies, args.concurrency, args.requests)
+            after = server_stats(url)
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+        batches = after["batches"] - before["batches"]
+        mean_batch = (after["requests"] - before["requests"]) / batches if batches else 0.0
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99]) * 1000 if latencies.size else (np.nan,) * 3
+        errors = sum(count for status, count in statuses.items() if status != 200)
+        label = url if max_batch is None else f"max batch {max_batch}"
+        print(
+            f"{label:<16} {latencies.size / seconds:8.0f} {p50:8.2f} {p90:8.2f} {p99:8.2f} "
+            f"{latencies.max(initial=0) * 1000:8.2f} {mean_batch:10.1f} {errors:7d}"
+        )
+        if errors:
+            print(f"  statuses: {statuses}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
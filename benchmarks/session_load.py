@@ -0,0 +1,257 @@
+import argparse
+import contextlib
+import gc
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from unittest import mock
+
+import numpy as np
+
+from benchmarks.chart_rendering import rss_mb
+from benchmarks.suite import APP_PATH, REPO_ROOT
+
+# Sidebar inputs a simulated user moves, by label prefix: a (low, high) range values are
+# drawn from, rounded to one decimal, or the choices to pick from
+INPUT_MOVES = {
+    "Annual Gross Written Premiums": (100.0, 2000.0),
+    "Expected Reduction in Loss Ratio": (0.5, 5.0),
+    "Expected Reduction in Expense Ratio": (0.5, 5.0),
+    "Annual Premium Growth Rate": (0.0, 10.0),
+    "Analysis Period": list(range(1, 31)),
+    "Cash Flow Periods": ["annual", "quarterly", "monthly"],
+    "Initial Investment Cost": (1.0, 20.0),
+    "Annual Other Ongoing Costs": (0.0, 3.0),
+}
+SIMULATION_LABEL = "Simulate a range of outcomes"
+
+
+def find_widget(at, label_prefix):
+    """
+    The sidebar input whose label starts with label_prefix.
+    """
+    for kind in ("number_input", "slider", "selectbox", "checkbox"):
+        for widget in getattr(at.sidebar, kind):
+            if widget.label.startswith(label_prefix):
+                return widget
+    raise LookupError(f"No sidebar input labelled {label_prefix!r}")
+
+
+def run_session(at, steps, chat_share, simulate, think_seconds, seed, record):
+    """
+    Drive one session: a first run, then steps reruns that each move a sidebar input or,
+    with probability chat_share, ask the assistant a question.
+
+    Parameters:
+        at (AppTest): The session.
+        simulate (bool): Turn on the uncertainty simulation after the first run (as one
+            of the steps), so every later rerun simulates.
+        record (callable): Called with (step kind, seconds) after each run.
+    """
+    rng = random.Random(seed)
+
+    def timed(kind, run):
+        start = time.perf_counter()
+        run()
+        record(kind, time.perf_counter() - start)
+        if at.exception:
+            raise RuntimeError(f"App raised: {at.exception[0].message}")
+
+    timed("first_run", at.run)
+    for step in range(steps):
+        time.sleep(think_seconds)
+        if simulate and step == 0:
+            timed("input", find_widget(at, SIMULATION_LABEL).check().run)
+        elif rng.random() < chat_share:
+            at.text_input(key="input").input(f"What drives the payback period? (step {step}, seed {seed})")
+            send = next(button for button in at.button if button.label == "Send")
+            timed("chat", send.click().run)
+        else:
+            label, values = rng.choice(list(INPUT_MOVES.items()))
+            value = round(rng.uniform(*values), 1) if isinstance(values, tuple) else rng.choice(values)
+            timed("input", find_widget(at, label).set_value(value).run)
+
+
+def share_app_test_globals():
+    """
+    Let AppTest runs overlap in threads the way a server's sessions do.
+
+    Each AppTest run installs a runtime, patches the config and compiles the script, then
+    clears the runtime when it ends, which breaks any other run still in progress. A
+    server sets these up once per process, so this does too: the runtime stays installed,
+    the config patch is applied once and the compiled script is shared. (Compiling in
+    concurrent threads can also fail in Python 3.11's ast module.)
+    """
+    from streamlit import config
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import app_test, local_script_runner
+    from streamlit.testing.v1.util import build_mock_config_get_option
+
+    class KeepInstalled(type(Runtime)):
+        def __setattr__(cls, name, value):
+            if name == "_instance":
+                if value is not None:
+                    Runtime._instance = value
+            else:
+                super().__setattr__(name, value)
+
+    class SharedRuntime(Runtime, metaclass=KeepInstalled):
+        pass
+
+    app_test.Runtime = SharedRuntime
+    mock.patch.object(config, "get_option", new=build_mock_config_get_option({"global.appTest": True})).start()
+    app_test.patch_config_options = lambda overrides: contextlib.nullcontext()
+    script_cache = ScriptCache()
+    local_script_runner.ScriptCache = lambda: script_cache
+
+
+def worker(args):
+    """
+    Run one load configuration in this interpreter and print its measurements as JSON.
+
+    The sessions share the process the way a Streamlit server's sessions do: cached
+    resources, the warm session pool and the assistant's response cache.
+    """
+    from benchmarks.fake_openai_server import start_server
+
+    server, api_base = start_server()
+    store_directory = tempfile.TemporaryDirectory()
+    os.environ.update({
+        "OPENAI_API_KEY": "fake-key",
+        "CALCULATOR_ASSISTANT_BACKEND": "openai",
+        "CALCULATOR_ASSISTANT_API_BASE": api_base,
+        "CALCULATOR_STORE_PATH": os.path.join(store_directory.name, "scenarios.sqlite3"),
+    })
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    share_app_test_globals()
+    from streamlit.testing.v1 import AppTest
+
+    # Import the app's dependencies and fill process-wide caches before the baseline
+    warmup = AppTest.from_file(APP_PATH, default_timeout=300)
+    warmup.run()
+    del warmup
+    gc.collect()
+    base_rss = rss_mb()
+
+    sessions = [AppTest.from_file(APP_PATH, default_timeout=300) for _ in range(args.sessions)]
+    latencies, errors = {}, []
+    lock = threading.Lock()
+
+    def record(kind, seconds):
+        with lock:
+            latencies.setdefault(kind, []).append(seconds)
+
+    def session_thread(i):
+        try:
+            simulate = i < round(args.sessions * args.simulation_share)
+            run_session(sessions[i], args.steps, args.chat_share, simulate, args.think_ms / 1000, i, record)
+        except Exception as e:  # reported with the results; other sessions keep running
+            with lock:
+                errors.append(f"session {i}: {e}")
+
+    threads = [threading.Thread(target=session_thread, args=(i,)) for i in range(args.sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+
+    # All sessions are still open here, as they would be on a server
+    gc.collect()
+    end_rss = rss_mb()
+    from combined_ratio.sessions import get_warm_sessions
+
+    print(json.dumps({
+        "sessions": args.sessions,
+        "seconds": seconds,
+        "latencies": latencies,
+        "base_rss_mb": base_rss,
+        "end_rss_mb": end_rss,
+        "max_messages": max((len(at.session_state["messages"]) - 1 for at in sessions if "messages" in at.session_state), default=0),
+        "warm_sessions": get_warm_sessions().stats(),
+        "errors": errors,
+    }))
+    server.shutdown()
+    store_directory.cleanup()
+
+
+def run_worker(sessions, args):
+    """
+    Run the worker for a number of sessions in a fresh interpreter, so RSS starts clean.
+
+    Returns:
+        dict: The worker's measurements.
+    """
+    env = dict(os.environ)
+    if args.max_warm_sessions is not None:
+        env["CALCULATOR_MAX_WARM_SESSIONS"] = str(args.max_warm_sessions)
+    if args.max_messages is not None:
+        env["CALCULATOR_SESSION_MAX_MESSAGES"] = str(args.max_messages)
+    if args.cache_scope is not None:
+        env["CALCULATOR_CACHE_SCOPE"] = args.cache_scope
+    command = [
+        sys.executable, "-m", "benchmarks.session_load", "--worker", "--sessions", str(sessions),
+        "--steps", str(args.steps), "--chat-share", str(args.chat_share),
+        "--simulation-share", str(args.simulation_share), "--think-ms", str(args.think_ms),
+    ]
+    output = subprocess.run(command, cwd=REPO_ROOT, env=env, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Drive many concurrent app sessions through AppTest, with a fake OpenAI server, "
+        "and report rerun latency and memory per session."
+    )
+    parser.add_argument("--sessions", type=int, nargs="+", default=[10, 50, 100], help="Concurrent session counts to test.")
+    parser.add_argument("--steps", type=int, default=10, help="Reruns per session after its first run.")
+    parser.add_argument("--chat-share", type=float, default=0.3, help="Share of reruns that ask the assistant a question.")
+    parser.add_argument("--simulation-share", type=float, default=0.0, help="Share of sessions that run the uncertainty simulation.")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="Pause before each rerun, as a user would.")
+    parser.add_argument("--max-warm-sessions", type=int, help="CALCULATOR_MAX_WARM_SESSIONS for the app.")
+    parser.add_argument("--max-messages", type=int, help="CALCULATOR_SESSION_MAX_MESSAGES for the app.")
+    parser.add_argument("--cache-scope", choices=("global", "session"), help="CALCULATOR_CACHE_SCOPE for the app.")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        args.sessions = args.sessions[0]
+        worker(args)
+        return 0
+
+    print(
+        f"{args.steps} reruns per session, {args.chat_share:.0%} of them chat turns, "
+        f"{args.simulation_share:.0%} of sessions simulating, {args.think_ms:.0f} ms think time"
+    )
+    print(
+        f"{'sessions':>8} {'runs/s':>7} {'input p50':>10} {'input p95':>10} {'chat p50':>9} {'first p50':>10} "
+        f"{'max ms':>8} {'RSS MB':>7} {'MB/session':>10} {'messages':>8} {'warm':>5} {'evicted':>8} {'errors':>7}"
+    )
+    for sessions in args.sessions:
+        result = run_worker(sessions, args)
+        latencies = {kind: np.array(values) * 1000 for kind, values in result["latencies"].items()}
+        runs = sum(values.size for values in latencies.values())
+        percentile = lambda kind, q: np.percentile(latencies[kind], q) if kind in latencies else float("nan")
+        grown = result["end_rss_mb"] - result["base_rss_mb"]
+        warm = result["warm_sessions"]
+        print(
+            f"{sessions:>8} {runs / result['seconds']:7.1f} {percentile('input', 50):10.1f} {percentile('input', 95):10.1f} "
+            f"{percentile('chat', 50):9.1f} {percentile('first_run', 50):10.1f} "
+            f"{max(values.max() for values in latencies.values()):8.1f} {result['end_rss_mb']:7.0f} "
+            f"{grown / sessions:10.2f} {result['max_messages']:>8} {warm['sessions']:>5} {warm['evictions']:>8} {len(result['errors']):>7}"
+        )
+        for error in result["errors"][:3]:
+            print(f"  {error}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,344 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import timeit
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+APP_PATH = os.path.join(REPO_ROOT, "combined_ratio_calculator.py")
+
+# A result fails when it is slower than its baseline by more than this fraction
+DEFAULT_THRESHOLD = 0.25
+# Looser thresholds, by name prefix, for results that are noisy between runs
+NOISY_THRESHOLDS = {
+    "cold_import_": 1.0,
+    "app_": 0.5,
+}
+
+# Stages of a script run, as recorded by the app's diagnostics
+STAGES = (
+    "inputs", "calculations", "summary", "simulation", "goal_seek", "sensitivity", "portfolio", "scenarios",
+    "tables", "charts", "narrative", "downloads", "statistics", "guide", "chat", "guide_footer",
+)
+SCALAR_ARGS = (500.0, 2.0, 65.0, 30.0, 64.5, 29.0, None, 1.5, 7.0, 0.4, 0.8, 1.5)
+
+
+# --- Benchmarks ---
+# Each benchmark returns {name: seconds}; lower is better.
+def best_of(function, number, repeat=9):
+    """
+    Best per-call time of function over repeat rounds of number calls.
+    """
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+
+def bench_ratios():
+    from combined_ratio.core import calculate_combined_ratio, calculate_new_ratios
+
+    return {
+        "calculate_combined_ratio": best_of(lambda: calculate_combined_ratio(65.0, 30.0), 100_000),
+        "calculate_new_ratios": best_of(lambda: calculate_new_ratios(65.0, 0.5, 30.0, 1.0), 100_000),
+    }
+
+
+def bench_scalar():
+    from combined_ratio.core import project_financials
+
+    results = {}
+    for period in (1, 5, 10, 30):
+        args = SCALAR_ARGS[:6] + (period,) + SCALAR_ARGS[7:]
+        results[f"project_financials_{period}y"] = best_of(lambda: project_financials(*args), 2_000)
+        results[f"project_financials_{period}y_with_df"] = best_of(lambda: project_financials(*args).financial_df, 500)
+    return results
+
+
+def bench_batch():
+    import numpy as np
+
+    from combined_ratio.batch import project_financials_batch
+    from combined_ratio.curves import escalation_curve, ramp_curve
+    from benchmarks.scenarios import random_scenarios
+
+    scenarios = random_scenarios(100_000)
+    # Monthly cash flows over 30 years: 360 periods per scenario
+    long_scenarios = random_scenarios(10_000, max_period=30)
+    # Per-scenario S-curve ramp-up over up to 3 years, with 3% annual cost escalation
+    ramp_years = np.random.default_rng(1).uniform(0, 3, len(scenarios))
+    curves = {"improvement_curve": ramp_curve("s_curve", ramp_years, 10), "cost_curve": escalation_curve(3.0, 10)}
+    return {
+        "project_financials_batch_100k": best_of(lambda: project_financials_batch(scenarios), 1, repeat=3),
+        "project_financials_batch_100k_ramp": best_of(lambda: project_financials_batch(scenarios, **curves), 1, repeat=3),
+        "project_financials_batch_10k_monthly_30y": best_of(
+            lambda: project_financials_batch(long_scenarios, periods_per_year=12, interpolate_payback=True), 1, repeat=3
+        ),
+    }
+
+
+def bench_discounted():
+    from combined_ratio.batch import project_financials_batch
+    from combined_ratio.discounting import irr
+    from benchmarks.irr import random_cash_flows
+    from benchmarks.scenarios import random_scenarios
+
+    scenarios = random_scenarios(100_000)
+    cash_flows = random_cash_flows(100_000, 10)
+    return {
+        "project_financials_batch_100k_npv_irr": best_of(
+            lambda: project_financials_batch(scenarios, discount_rate=8.0), 1, repeat=3
+        ),
+        "irr_100k": best_of(lambda: irr(cash_flows), 1, repeat=3),
+    }
+
+
+def bench_surface():
+    import numpy as np
+
+    from benchmarks.sensitivity import BASE
+    from combined_ratio.sensitivity import sweep_2d
+    from combined_ratio.surface import ResponseSurface
+
+    surface = ResponseSurface.build()
+    args = SCALAR_ARGS[:6] + (30,) + SCALAR_ARGS[7:]
+    base = dict(BASE, analysis_period=30)
+    x_values, y_values = np.linspace(0.25, 0.75, 50), np.linspace(0.5, 1.5, 50)
+    return {
+        "surface_estimate_30y": best_of(lambda: surface.estimate(*args), 2_000),
+        "surface_heatmap_50x50_30y": best_of(
+            lambda: sweep_2d(base, "loss_ratio_reduction", x_values, "expense_ratio_reduction", y_values, surface=surface), 20
+        ),
+    }
+
+
+def bench_store():
+    import tempfile
+
+    from benchmarks.scenario_store import stored_scenarios
+    from combined_ratio.store import ScenarioStore
+
+    table = stored_scenarios(100_000)
+    names = list(table["name"].iloc[::2_000])
+    with tempfile.TemporaryDirectory() as directory, ScenarioStore(os.path.join(directory, "scenarios.sqlite3")) as store:
+        store.save_many(table)
+        return {
+            "store_find_by_carrier_100k": best_of(lambda: store.find(carrier="Carrier 07", limit=200), 5),
+            "store_find_by_tags_100k": best_of(lambda: store.find(tags=["tag03", "tag11"], limit=200), 5),
+            "store_compare_50_of_100k": best_of(lambda: store.compare(names), 5),
+            "store_load_one_of_100k": best_of(lambda: store.load(names[0]), 20),
+        }
+
+
+def bench_ingest():
+    import tempfile
+
+    from benchmarks.ingestion import CLAIMS_COLUMNS, write_extracts
+    from combined_ratio.ingest import ingest
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = {}
+        for fmt in ("csv", "parquet"):
+            paths = write_extracts(directory, 100_000, fmt)
+            results[f"ingest_{fmt}_200k_rows"] = best_of(lambda: ingest(paths, columns=CLAIMS_COLUMNS), 1)
+        return results
+
+
+def bench_import():
+    from benchmarks.import_time import measure_import
+
+    return {
+        f"cold_import_{module}": measure_import(module)[0] / 1000
+        for module in ("combined_ratio", "combined_ratio.core")
+    }
+
+
+def bench_diagnostics():
+    from combined_ratio.diagnostics import start_run
+
+    def one_run(enabled):
+        # A run shaped like the app's: a dozen stages and one span
+        run = start_run(enabled)
+        for name in STAGES:
+            run.stage(name)
+        with run.span("assistant"):
+            pass
+        run.finish()
+
+    return {
+        "diagnostics_disabled_run": best_of(lambda: one_run(False), 20_000),
+        "diagnostics_enabled_run": best_of(lambda: one_run(True), 2_000),
+    }
+
+
+def bench_app():
+    # AppTest runs in a fresh interpreter so the assistant picks up the fake server's
+    # configuration at import time and the first run is a true cold run
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.suite", "--app-worker"],
+        cwd=REPO_ROOT, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def app_worker():
+    """
+    Time the Streamlit script end to end through AppTest, with the OpenAI API served by
+    the local fake server.
+    """
+    from benchmarks.fake_openai_server import start_server
+
+    server, api_base = start_server()
+    os.environ.update({
+        "OPENAI_API_KEY": "fake-key",
+        "CALCULATOR_ASSISTANT_BACKEND": "openai",
+        "CALCULATOR_ASSISTANT_API_BASE": api_base,
+    })
+    from streamlit.testing.v1 import AppTest
+
+    def timed(run):
+        start = time.perf_counter()
+        run()
+        if at.exception:
+            raise RuntimeError(f"App raised: {at.exception}")
+        return time.perf_counter() - start
+
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+    results = {"app_first_run": timed(at.run)}
+    results["app_rerun"] = min(timed(at.run) for _ in range(5))
+
+    other_costs = next(widget for widget in at.sidebar.number_input if "Other Ongoing" in widget.label)
+    changes = []
+    for value in (1.0, 2.0, 3.0):
+        other_costs.set_value(value)
+        changes.append(timed(at.run))
+    results["app_rerun_cost_change"] = min(changes)
+
+    turns = []
+    for i in range(3):
+        at.text_input(key="input").input(f"What drives the payback period? ({i})")
+        send = next(button for button in at.button if button.label == "Send")
+        turns.append(timed(send.click().run))
+    if len(at.session_state["messages"]) < 2 * len(turns):
+        raise RuntimeError("The chat questions were not answered.")
+    results["app_chat_turn"] = min(turns)
+    server.shutdown()
+    print(json.dumps(results))
+
+
+BENCHMARKS = {
+    "ratios": bench_ratios,
+    "scalar": bench_scalar,
+    "batch": bench_batch,
+    "discounted": bench_discounted,
+    "surface": bench_surface,
+    "store": bench_store,
+    "ingest": bench_ingest,
+    "import": bench_import,
+    "diagnostics": bench_diagnostics,
+    "app": bench_app,
+}
+
+
+# --- Baselines ---
+def load_baselines(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def save_baselines(results, path=BASELINE_PATH):
+    with open(path, "w") as f:
+        json.dump({
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": results,
+        }, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compare(results, baselines, threshold):
+    """
+    Compare results against baselines, loosening threshold for NOISY_THRESHOLDS.
+
+    Returns:
+        list: (name, seconds, baseline seconds or None, ratio or None, regressed) tuples.
+    """
+    rows = []
+    for name, seconds in results.items():
+        baseline = baselines.get(name)
+        ratio = seconds / baseline if baseline else None
+        allowed = max([threshold] + [value for prefix, value in NOISY_THRESHOLDS.items() if name.startswith(prefix)])
+        rows.append((name, seconds, baseline, ratio, ratio is not None and ratio > 1 + allowed))
+    return rows
+
+
+def format_seconds(seconds):
+    if seconds is None:
+        return "-"
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.2f} us"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds:.2f} s"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run the benchmark suite and compare against stored baselines.",
+        epilog="Baselines are machine-specific; re-record them with --save-baseline after a hardware change.",
+    )
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, help="Benchmarks to run (default: all).")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown as a fraction of the baseline.")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline file.")
+    parser.add_argument("--rounds", type=int, default=1, help="Run each benchmark this many times and keep the best result.")
+    parser.add_argument("--confirm", type=int, default=2, help="Re-runs of a regressed benchmark before it is reported.")
+    parser.add_argument("--save-baseline", action="store_true", help="Record these results as the new baselines.")
+    parser.add_argument("--app-worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.app_worker:
+        app_worker()
+        return 0
+
+    results, groups = {}, {}
+
+    def run(name, rounds):
+        for round_ in range(rounds):
+            print(f"running {name} ({round_ + 1}/{rounds}) ...", file=sys.stderr)
+            for result, seconds in BENCHMARKS[name]().items():
+                results[result] = min(seconds, results.get(result, seconds))
+                groups[result] = name
+
+    for name in args.only or BENCHMARKS:
+        run(name, args.rounds)
+
+    baselines = load_baselines(args.baseline)
+    if not args.save_baseline:
+        # Timings on a busy machine spike; a regression must survive re-runs to count
+        for _ in range(args.confirm):
+            regressed = {groups[row[0]] for row in compare(results, baselines, args.threshold) if row[4]}
+            for name in regressed:
+                run(name, 1)
+    if args.save_baseline:
+        save_baselines(dict(baselines, **results), args.baseline)
+        print(f"Saved {len(results)} baselines to {args.baseline}")
+
+    rows = compare(results, baselines, args.threshold)
+    print(f"{'benchmark':<38} {'result':>11} {'baseline':>11} {'ratio':>7}")
+    for name, seconds, baseline, ratio, regressed in rows:
+        status = "REGRESSED" if regressed else ""
+        ratio_text = f"{ratio:.2f}" if ratio is not None else "-"
+        print(f"{name:<38} {format_seconds(seconds):>11} {format_seconds(baseline):>11} {ratio_text:>7} {status}")
+
+    regressions = [row[0] for row in rows if row[4]]
+    if regressions and not args.save_baseline:
+        print(f"\n{len(regressions)} benchmark(s) slower than baseline by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+import importlib
+
+# Public names and the submodule that defines them. Submodules are imported on first
+# attribute access so that `import combined_ratio` does not pull in NumPy or pandas.
+_EXPORTS = {
+    "calculate_combined_ratio": "core",
+    "calculate_new_ratios": "core",
+    "project_financials": "core",
+    "ProjectionResult": "core",
+    "project_financials_arrays": "batch",
+    "project_financials_batch": "batch",
+    "payback_period": "batch",
+    "npv": "discounting",
+    "irr": "discounting",
+    "ramp_curve": "curves",
+    "escalation_curve": "curves",
+    "projection_curves": "curves",
+    "simulate_financials": "monte_carlo",
+    "export_projections": "export",
+    "solve_required_reduction": "goal_seek",
+    "tornado": "sensitivity",
+    "sweep_2d": "sensitivity",
+    "project_portfolio": "portfolio",
+    "project_financials_parallel": "parallel",
+    "ScenarioStore": "store",
+    "ResponseSurface": "surface",
+    "RatioAggregator": "ingest",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,210 @@
+import os
+import re
+import threading
+import time
+
+from cachetools import TTLCache
+from tenacity import Retrying, retry_if_exception_type, stop_after_attempt, wait_exponential
+
+# --- Configurations ---
+ASSISTANT_MODEL = os.getenv("CALCULATOR_ASSISTANT_MODEL", "gpt-3.5-turbo")
+ASSISTANT_BACKEND = os.getenv("CALCULATOR_ASSISTANT_BACKEND", "openai")
+ASSISTANT_TIMEOUT = float(os.getenv("CALCULATOR_ASSISTANT_TIMEOUT", "30"))
+ASSISTANT_CACHE_SIZE = int(os.getenv("CALCULATOR_ASSISTANT_CACHE_SIZE", "512"))
+ASSISTANT_CACHE_TTL = float(os.getenv("CALCULATOR_ASSISTANT_CACHE_TTL", "3600"))
+
+
+# --- Backends ---
+# A backend opens a streamed chat completion: stream(messages, timeout) sends the request
+# and returns an iterator of text chunks. Errors listed in retryable_errors are retried.
+class OpenAIBackend:
+    """
+    Chat completions from the OpenAI API (or any server speaking its protocol).
+
+    Parameters:
+        model (str): Chat model name.
+        api_base (str): Alternative API base URL, e.g. a local fake server.
+    """
+
+    def __init__(self, model=ASSISTANT_MODEL, api_base=None):
+        import openai
+
+        self.model = model
+        self.api_base = api_base
+        self.retryable_errors = (
+            openai.error.Timeout,
+            openai.error.APIConnectionError,
+            openai.error.RateLimitError,
+            openai.error.ServiceUnavailableError,
+            openai.error.TryAgain,
+        )
+        self._openai = openai
+
+    def stream(self, messages, timeout=None):
+        options = {"api_base": self.api_base} if self.api_base else {}
+        response = self._openai.ChatCompletion.create(
+            model=self.model, messages=messages, stream=True, request_timeout=timeout, **options
+        )
+        return (chunk["choices"][0]["delta"].get("content", "") for chunk in response)
+
+
+class FakeBackend:
+    """
+    In-process stand-in for the API, for tests, benchmarks and offline demos.
+
+    Parameters:
+        reply (str or callable): Fixed reply, or a function of the messages returning one.
+            Defaults to echoing the last user message.
+        token_delay (float): Seconds to wait before each streamed token.
+        failures (int): Number of initial calls that raise ConnectionError.
+    """
+
+    retryable_errors = (TimeoutError, ConnectionError)
+
+    def __init__(self, reply=None, token_delay=0.0, failures=0):
+        self.reply = reply
+        self.token_delay = token_delay
+        self.failures = failures
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _reply_for(self, messages):
+        if callable(self.reply):
+            return self.reply(messages)
+        if self.reply is not None:
+            return self.reply
+        question = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+        return f"You asked: {question}"
+
+    def stream(self, messages, timeout=None):
+        with self._lock:
+            self.calls += 1
+            if self.failures > 0:
+                self.failures -= 1
+                raise ConnectionError("Simulated connection failure")
+        tokens = re.findall(r"\S+\s*", self._reply_for(messages))
+
+        def generate():
+            for token in tokens:
+                if self.token_delay:
+                    time.sleep(self.token_delay)
+                yield token
+
+        return generate()
+
+
+def make_backend(name=None):
+    """
+    Create the backend named by CALCULATOR_ASSISTANT_BACKEND ("openai" or "fake").
+    """
+    name = name or ASSISTANT_BACKEND
+    if name == "openai":
+        return OpenAIBackend(api_base=os.getenv("CALCULATOR_ASSISTANT_API_BASE"))
+    if name == "fake":
+        return FakeBackend(token_delay=float(os.getenv("CALCULATOR_ASSISTANT_FAKE_DELAY", "0")))
+    raise ValueError(f"Unknown assistant backend '{name}'. Expected 'openai' or 'fake'.")
+
+
+# --- Helper Functions ---
+def conversation_key(messages, model=None):
+    """
+    Normalize a conversation into a cache key: roles plus case-folded, whitespace-collapsed text.
+
+    Parameters:
+        messages (list): Conversation history as role/content dictionaries.
+        model (str): Model name, so replies from different models are kept apart.
+
+    Returns:
+        tuple: Hashable key.
+    """
+    return (model,) + tuple(
+        (m["role"], " ".join(m["content"].split()).casefold()) for m in messages
+    )
+
+
+class AssistantClient:
+    """
+    Streams assistant replies with a timeout, retries and a shared response cache.
+
+    Parameters:
+        backend: Backend object (see OpenAIBackend and FakeBackend).
+        timeout (float): Request timeout in seconds.
+        max_attempts (int): Attempts to open a stream before giving up.
+        cache_size (int): Maximum number of cached replies.
+        cache_ttl (float): Seconds a cached reply stays valid.
+    """
+
+    def __init__(
+        self, backend, timeout=ASSISTANT_TIMEOUT, max_attempts=3,
+        cache_size=ASSISTANT_CACHE_SIZE, cache_ttl=ASSISTANT_CACHE_TTL
+    ):
+        self.backend = backend
+        self.timeout = timeout
+        self._cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._lock = threading.Lock()
+        self._retrying = Retrying(
+            stop=stop_after_attempt(max_attempts),
+            wait=wait_exponential(multiplier=0.5, max=8),
+            retry=retry_if_exception_type(backend.retryable_errors),
+            reraise=True,
+        )
+        self.hits = 0
+        self.misses = 0
+        self.backend_calls = 0
+
+    def stream(self, messages):
+        """
+        Yield the reply to messages chunk by chunk.
+
+        A cached reply is yielded in one piece. Opening the stream is retried with
+        exponential backoff; once tokens have been yielded, errors propagate. Only
+        complete replies are cached.
+
+        Parameters:
+            messages (list): Conversation history as role/content dictionaries.
+
+        Yields:
+            str: Reply text chunks.
+        """
+        key = conversation_key(messages, getattr(self.backend, "model", None))
+        with self._lock:
+            reply = self._cache.get(key)
+            if reply is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if reply is not None:
+            yield reply
+            return
+
+        def open_stream():
+            with self._lock:
+                self.backend_calls += 1
+            return self.backend.stream(messages, timeout=self.timeout)
+
+        parts = []
+        for chunk in self._retrying.copy()(open_stream):
+            if chunk:
+                parts.append(chunk)
+                yield chunk
+        with self._lock:
+            self._cache[key] = "".join(parts)
+
+    def complete(self, messages):
+        """
+        Return the full reply to messages (see stream).
+        """
+        return "".join(self.stream(messages))
+
+    def stats(self):
+        """
+        Returns:
+            dict: Cached replies, hits, misses and calls made to the backend.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._cache),
+                "hits": self.hits,
+                "misses": self.misses,
+                "backend_calls": self.backend_calls,
+            }
@@ -0,0 +1,389 @@
+import numpy as np
+import pandas as pd
+
+from .curves import fit_curve
+from .discounting import discount_factors, irr
+
+# --- Column Layout ---
+# Input columns accepted by project_financials_batch. They mirror the parameters of
+# combined_ratio.core.project_financials so a row can be passed to either.
+SCENARIO_COLUMNS = [
+    "current_gwp",
+    "premium_growth_rate",
+    "current_loss_ratio",
+    "current_expense_ratio",
+    "new_loss_ratio",
+    "new_expense_ratio",
+    "analysis_period",
+    "ongoing_costs",
+    "initial_investment",
+    "loss_ratio_reduction_salesforce",
+    "expense_ratio_reduction_salesforce",
+    "ongoing_costs_salesforce",
+]
+
+# Per-year series, named as in the DataFrame returned by project_financials
+SERIES_COLUMNS = [
+    "Projected Premiums ($M)",
+    "Current Operating Profit ($M)",
+    "Projected Operating Profit ($M)",
+    "Annual Savings ($M)",
+    "Cumulative Savings ($M)",
+    "Annual Savings from Salesforce ($M)",
+    "Cumulative Salesforce Savings ($M)",
+]
+
+SUMMARY_COLUMNS = [
+    "roi",
+    "payback_period",
+    "total_investment",
+    "total_savings",
+    "roi_salesforce",
+    "payback_period_salesforce",
+    "total_investment_salesforce",
+    "total_savings_salesforce",
+]
+
+# Discounted cash flow metrics, added to the summary when a discount rate is given.
+# IRR status columns hold codes indexing discounting.IRR_STATUS.
+DISCOUNTED_COLUMNS = [
+    "npv",
+    "irr",
+    "irr_status",
+    "discounted_payback_period",
+    "npv_salesforce",
+    "irr_salesforce",
+    "irr_status_salesforce",
+    "discounted_payback_period_salesforce",
+]
+IRR_STATUS_COLUMNS = ["irr_status", "irr_status_salesforce"]
+
+
+def summary_columns(discount_rate=None):
+    """
+    Summary metric names produced for the given discount rate (None for undiscounted only).
+    """
+    return SUMMARY_COLUMNS + (DISCOUNTED_COLUMNS if discount_rate is not None else [])
+
+
+def payback_period(cumulative_cash_flow, initial_investment=0.0, periods_per_year=1, interpolate=False):
+    """
+    Payback in years of cumulative cash flow paths, as reported by project_financials_arrays.
+
+    Parameters:
+        cumulative_cash_flow (ndarray): Cumulative cash flow per period, one path or
+            scenarios x periods. NaN marks periods past the end of a path.
+        initial_investment (float or ndarray): Cumulative cash flow before the first period, negated.
+        periods_per_year (int): Periods per year.
+        interpolate (bool): Interpolate linearly within the payback period instead of
+            counting it in full.
+
+    Returns:
+        float or ndarray: Payback in years (per scenario for 2-D input), NaN where payback
+        is not achieved.
+    """
+    cumulative_cash_flow = np.asarray(cumulative_cash_flow, dtype=np.float64)
+    paths = np.atleast_2d(cumulative_cash_flow)
+    initial_investment = np.broadcast_to(np.asarray(initial_investment, dtype=np.float64), paths.shape[:1])
+    result = _payback_period(paths, initial_investment, ~np.isnan(paths), periods_per_year, interpolate)
+    return float(result[0]) if cumulative_cash_flow.ndim == 1 else result
+
+
+# --- Helper Functions ---
+def _payback_period(cumulative_cash_flow, initial_investment, mask, periods_per_year, interpolate):
+    """
+    Payback in years, to the period in which the cumulative cash flow turns non-negative.
+
+    Parameters:
+        cumulative_cash_flow (ndarray): Scenarios x periods cumulative cash flow.
+        initial_investment (ndarray): Cumulative cash flow before the first period, negated.
+        mask (ndarray): Boolean scenarios x periods matrix of periods inside each analysis period.
+        periods_per_year (int): Periods per year.
+        interpolate (bool): Interpolate linearly within the payback period instead of
+            counting it in full.
+
+    Returns:
+        ndarray: Payback in years per scenario, NaN where payback is not achieved.
+    """
+    reached = (cumulative_cash_flow >= 0) & mask
+    achieved = reached.any(axis=1)
+    index = reached.argmax(axis=1)
+    if not interpolate:
+        return np.where(achieved, (index + 1.0) / periods_per_year, np.nan)
+    current = np.take_along_axis(cumulative_cash_flow, index[:, None], axis=1)[:, 0]
+    previous = np.where(
+        index > 0,
+        np.take_along_axis(cumulative_cash_flow, np.maximum(index - 1, 0)[:, None], axis=1)[:, 0],
+        -initial_investment,
+    )
+    # The share of the payback period needed to recover what was still outstanding
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraction = np.where(previous < 0, -previous / (current - previous), 0.0)
+    return np.where(achieved, (index + fraction) / periods_per_year, np.nan)
+
+
+def _premium_path(current_gwp, premium_growth_rate, n_periods, periods_per_year=1):
+    """
+    Premium per period: each year's premium spread evenly over its periods, growing from
+    one year to the next. Scalars give one path; column arrays give scenarios x periods.
+
+    float_power goes through libm pow like Python's ** does; np.power may take a SIMD
+    path that differs in the last bit. Growth is per year, so it is computed once per
+    year and repeated over the year's periods; with one period per year this is the
+    annual projection exactly.
+    """
+    growth = np.float_power(1 + np.asarray(premium_growth_rate) / 100, np.arange(-(-n_periods // periods_per_year)))
+    if periods_per_year > 1:
+        growth = np.repeat(growth, periods_per_year, axis=-1)[..., :n_periods]
+    return current_gwp / periods_per_year * growth
+
+
+def _operating_profit(premiums, loss_ratio, expense_ratio):
+    """
+    Premiums less losses and expenses at the given ratio percentages.
+    """
+    return premiums - premiums * loss_ratio / 100 - premiums * expense_ratio / 100
+
+
+def _salesforce_savings(premiums, loss_ratio_reduction_salesforce, expense_ratio_reduction_salesforce):
+    """
+    Savings from the Salesforce share of the ratio reductions, before its ongoing costs.
+    """
+    return premiums * loss_ratio_reduction_salesforce / 100 + premiums * expense_ratio_reduction_salesforce / 100
+
+
+def _value_at_period(series, analysis_period, periods_per_year=1):
+    """
+    Pick each scenario's value in its final analysis period (0 for an empty period).
+    """
+    last = np.clip(analysis_period * periods_per_year - 1, 0, None)[:, None]
+    value = np.take_along_axis(series, last, axis=1)[:, 0]
+    return np.where(analysis_period > 0, value, 0.0)
+
+
+def project_financials_arrays(
+    current_gwp, premium_growth_rate, current_loss_ratio, current_expense_ratio,
+    new_loss_ratio, new_expense_ratio, analysis_period, ongoing_costs, initial_investment,
+    loss_ratio_reduction_salesforce, expense_ratio_reduction_salesforce, ongoing_costs_salesforce,
+    periods_per_year=1, interpolate_payback=False, discount_rate=None, improvement_curve=None, cost_curve=None
+):
+    """
+    Project financial metrics for many scenarios in one pass over a scenarios x periods matrix.
+
+    Takes the same parameters as project_financials, each as a scalar or a 1-D array
+    (arrays are broadcast against each other). Scenarios with a shorter analysis period
+    are masked, so their periods beyond the analysis period are NaN in the per-period
+    series and do not contribute to totals or payback.
+
+    With periods_per_year above 1 (see core.GRANULARITIES), each year's premium and ongoing
+    costs are spread evenly over its periods and premiums grow from one year to the
+    next, so yearly totals, ROI and total savings are those of the annual projection
+    while payback is resolved to the period.
+
+    Parameters:
+        periods_per_year (int): Cash flow periods per year: 1, 4 or 12.
+        interpolate_payback (bool): Interpolate payback linearly within the period in
+            which it is reached, instead of counting that period in full.
+        discount_rate (float or ndarray): Annual discount rate percentage. When given, the
+            summary also holds NPV, IRR and discounted payback (DISCOUNTED_COLUMNS) of the
+            cash flows behind the two payback periods: -initial_investment at time 0, then
+            each period's net savings.
+        improvement_curve (ndarray): Share of the loss and expense ratio reductions
+            realized in each period (see curves.ramp_curve), shared by all scenarios or
+            one row per scenario. None applies the full reductions from the first period.
+        cost_curve (ndarray): Multiplier of the ongoing costs in each period (see
+            curves.escalation_curve), shaped like improvement_curve. None keeps them flat.
+            Total investment then sums the escalated costs. A curve of all ones is the
+            same as None.
+
+    Returns:
+        tuple: Dict of per-period series (scenarios x periods arrays keyed by
+        SERIES_COLUMNS) and dict of summary metrics (1-D arrays keyed by
+        summary_columns(discount_rate)). Payback periods are in years, NaN where payback
+        is not achieved; IRR is NaN where its status is not converged.
+    """
+    (
+        current_gwp, premium_growth_rate, current_loss_ratio, current_expense_ratio,
+        new_loss_ratio, new_expense_ratio, ongoing_costs, initial_investment,
+        loss_ratio_reduction_salesforce, expense_ratio_reduction_salesforce, ongoing_costs_salesforce,
+        analysis_period,
+    ) = np.broadcast_arrays(*(np.atleast_1d(np.asarray(value, dtype=np.float64)) for value in (
+        current_gwp, premium_growth_rate, current_loss_ratio, current_expense_ratio,
+        new_loss_ratio, new_expense_ratio, ongoing_costs, initial_investment,
+        loss_ratio_reduction_salesforce, expense_ratio_reduction_salesforce, ongoing_costs_salesforce,
+    )), np.atleast_1d(np.asarray(analysis_period, dtype=np.int64)))
+
+    n_periods = max(int(analysis_period.max(initial=0)) * periods_per_year, 1)
+    periods = np.arange(1, n_periods + 1)
+    mask = periods <= analysis_period[:, None] * periods_per_year
+
+    def col(values):
+        return values[:, None]
+
+    gwp = _premium_path(col(current_gwp), col(premium_growth_rate), n_periods, periods_per_year)
+
+    # Current and New Scenarios
+    profit_current = _operating_profit(gwp, col(current_loss_ratio), col(current_expense_ratio))
+    profit_new = _operating_profit(gwp, col(new_loss_ratio), col(new_expense_ratio))
+
+    # A curve of all ones changes nothing, and is dropped so the results are those of
+    # the uncurved projection bit for bit
+    if improvement_curve is not None:
+        improvement = fit_curve(improvement_curve, n_periods)
+        improvement_curve = None if (improvement == 1).all() else improvement
+    if cost_curve is not None:
+        escalation = fit_curve(cost_curve, n_periods)
+        cost_curve = None if (escalation == 1).all() else escalation
+
+    # Improvement Ramp-Up: each period realizes its share of the full improvement
+    if improvement_curve is not None:
+        profit_new = profit_current + improvement * (profit_new - profit_current)
+
+    # Ongoing Costs per period, escalated by the cost curve
+    costs = col(ongoing_costs / periods_per_year)
+    costs_salesforce = col(ongoing_costs_salesforce / periods_per_year)
+    if cost_curve is not None:
+        costs = costs * escalation
+        costs_salesforce = costs_salesforce * escalation
+
+    # Total Savings (years outside the analysis period contribute nothing)
+    savings = np.where(mask, profit_new - profit_current, 0.0)
+    cumulative_savings = np.cumsum(savings, axis=1)
+
+    # Savings Attributable to Salesforce
+    savings_salesforce = _salesforce_savings(
+        gwp, col(loss_ratio_reduction_salesforce), col(expense_ratio_reduction_salesforce)
+    )
+    if improvement_curve is not None:
+        savings_salesforce = savings_salesforce * improvement
+    savings_salesforce = np.where(mask, savings_salesforce - costs_salesforce, 0.0)
+    cumulative_savings_salesforce = np.cumsum(savings_salesforce, axis=1)
+
+    # Cumulative Cash Flow, seeded with the initial investment so the running sum
+    # accumulates in the same order as the scalar loop
+    seed = col(-initial_investment)
+    cumulative_cash_flow = np.cumsum(
+        np.concatenate([seed, savings - costs], axis=1), axis=1
+    )[:, 1:]
+    cumulative_cash_flow_salesforce = np.cumsum(
+        np.concatenate([seed, savings_salesforce], axis=1), axis=1
+    )[:, 1:]
+
+    # Payback Periods
+    payback_period = _payback_period(
+        cumulative_cash_flow, initial_investment, mask, periods_per_year, interpolate_payback
+    )
+    payback_period_salesforce = _payback_period(
+        cumulative_cash_flow_salesforce, initial_investment, mask, periods_per_year, interpolate_payback
+    )
+
+    # Total Investments
+    if cost_curve is None:
+        total_costs = ongoing_costs * analysis_period
+        total_costs_salesforce = ongoing_costs_salesforce * analysis_period
+    else:
+        total_costs = np.where(mask, costs, 0.0).sum(axis=1)
+        total_costs_salesforce = np.where(mask, costs_salesforce, 0.0).sum(axis=1)
+    total_investment = initial_investment + total_costs
+    total_investment_salesforce = initial_investment + total_costs_salesforce
+
+    # Total Savings
+    total_savings = _value_at_period(cumulative_savings, analysis_period, periods_per_year) - total_costs
+    total_savings_salesforce = _value_at_period(cumulative_savings_salesforce, analysis_period, periods_per_year)
+
+    # ROI Calculations
+    with np.errstate(divide="ignore", invalid="ignore"):
+        roi = np.where(total_investment != 0, (total_savings / total_investment) * 100, 0.0)
+        roi_salesforce = np.where(
+            total_investment_salesforce != 0,
+            (total_savings_salesforce / total_investment_salesforce) * 100,
+            0.0,
+        )
+
+    series = {
+        name: np.where(mask, values, np.nan)
+        for name, values in zip(SERIES_COLUMNS, (
+            gwp, profit_current, profit_new, savings, cumulative_savings,
+            savings_salesforce, cumulative_savings_salesforce,
+        ))
+    }
+    summary = {
+        "roi": roi,
+        "payback_period": payback_period,
+        "total_investment": total_investment,
+        "total_savings": total_savings,
+        "roi_salesforce": roi_salesforce,
+        "payback_period_salesforce": payback_period_salesforce,
+        "total_investment_salesforce": total_investment_salesforce,
+        "total_savings_salesforce": total_savings_salesforce,
+    }
+    if discount_rate is not None:
+        rate = np.broadcast_to(np.asarray(discount_rate, dtype=np.float64), initial_investment.shape)
+        factors = discount_factors(rate, n_periods, periods_per_year)
+        for suffix, net_savings in (
+            ("", np.where(mask, savings - costs, 0.0)),
+            ("_salesforce", savings_salesforce),
+        ):
+            cash_flows = np.concatenate([seed, net_savings], axis=1)
+            discounted = cash_flows * factors
+            summary["npv" + suffix] = discounted.sum(axis=1)
+            summary["irr" + suffix], summary["irr_status" + suffix] = irr(cash_flows, periods_per_year)
+            summary["discounted_payback_period" + suffix] = _payback_period(
+                np.cumsum(discounted, axis=1)[:, 1:], initial_investment, mask, periods_per_year, interpolate_payback
+            )
+    return series, summary
+
+
+def scenario_inputs(scenarios):
+    """
+    Pull the arrays project_financials_arrays takes out of a scenario table.
+
+    Parameters:
+        scenarios (DataFrame or dict): Columns named as in SCENARIO_COLUMNS, or with
+            loss_ratio_reduction / expense_ratio_reduction in place of the new ratios.
+
+    Returns:
+        list: One array per name in SCENARIO_COLUMNS.
+    """
+    columns = {}
+    if "new_loss_ratio" not in scenarios and "loss_ratio_reduction" in scenarios:
+        columns["new_loss_ratio"] = np.asarray(scenarios["current_loss_ratio"]) - np.asarray(scenarios["loss_ratio_reduction"])
+    if "new_expense_ratio" not in scenarios and "expense_ratio_reduction" in scenarios:
+        columns["new_expense_ratio"] = np.asarray(scenarios["current_expense_ratio"]) - np.asarray(scenarios["expense_ratio_reduction"])
+
+    missing = [name for name in SCENARIO_COLUMNS if name not in scenarios and name not in columns]
+    if missing:
+        raise ValueError(f"Scenario table is missing columns: {', '.join(missing)}")
+
+    return [np.asarray(columns[name] if name in columns else scenarios[name]) for name in SCENARIO_COLUMNS]
+
+
+def project_financials_batch(
+    scenarios, periods_per_year=1, interpolate_payback=False, discount_rate=None, improvement_curve=None, cost_curve=None
+):
+    """
+    Project financial metrics for a table of scenarios.
+
+    Parameters:
+        scenarios (DataFrame or dict): Columnar inputs named as in SCENARIO_COLUMNS.
+            Instead of new_loss_ratio / new_expense_ratio, the table may carry
+            loss_ratio_reduction / expense_ratio_reduction, from which the new ratios
+            are derived as in calculate_new_ratios.
+        periods_per_year (int): Cash flow periods per year (see project_financials_arrays).
+        interpolate_payback (bool): Interpolate payback within its period.
+        discount_rate (float): Annual discount rate percentage for the discounted metrics.
+        improvement_curve (ndarray): Per-period share of the ratio reductions realized,
+            shared or one row per scenario in table order (see project_financials_arrays).
+        cost_curve (ndarray): Per-period multiplier of the ongoing costs, shaped likewise.
+
+    Returns:
+        tuple: Summary DataFrame (one row per scenario, indexed like the input) and a
+        dict of per-period series as scenarios x periods arrays.
+    """
+    scenarios = pd.DataFrame(scenarios)
+    series, summary = project_financials_arrays(
+        *scenario_inputs(scenarios), periods_per_year=periods_per_year,
+        interpolate_payback=interpolate_payback, discount_rate=discount_rate,
+        improvement_curve=improvement_curve, cost_curve=cost_curve,
+    )
+    return pd.DataFrame(summary, index=scenarios.index, columns=summary_columns(discount_rate)), series
@@ -0,0 +1,134 @@
+import altair as alt
+import pandas as pd
+
+# Colors of the original matplotlib charts
+CURRENT_COLOR = "#1f77b4"
+PROJECTED_COLOR = "#ff7f0e"
+SAVINGS_COLOR = "green"
+
+
+# --- Helper Functions ---
+def _time_axis(financial_df):
+    """
+    X encoding and time tooltips for a per-year table, or for a per-period table
+    (with a Period column), where points are too many for an ordinal axis.
+    """
+    if "Period" in financial_df:
+        return alt.X("Period:Q", axis=alt.Axis(tickMinStep=1)), ["Period", "Year"]
+    return alt.X("Year:O", axis=alt.Axis(labelAngle=0)), ["Year"]
+
+
+# --- Chart Builders ---
+# Each builder returns an Altair chart: a Vega-Lite spec drawn in the browser, so the
+# server does no rasterizing and keeps no figure objects alive between reruns.
+def combined_ratio_chart(current_combined_ratio, new_combined_ratio):
+    """
+    Bar chart comparing the current and projected combined ratios.
+    """
+    data = pd.DataFrame({
+        "Scenario": ["Current Combined Ratio", "Projected Combined Ratio"],
+        "Combined Ratio (%)": [current_combined_ratio, new_combined_ratio],
+    })
+    bars = alt.Chart(data, title="Improvement in Combined Ratio").mark_bar().encode(
+        x=alt.X("Scenario:N", sort=None, title=None, axis=alt.Axis(labelAngle=0)),
+        y=alt.Y("Combined Ratio (%):Q"),
+        color=alt.Color("Scenario:N", scale=alt.Scale(range=[CURRENT_COLOR, PROJECTED_COLOR]), legend=None),
+    )
+    labels = bars.mark_text(dy=-6).encode(
+        text=alt.Text("Combined Ratio (%):Q", format=".2f"),
+        color=alt.value("black"),
+    )
+    return bars + labels
+
+
+def operating_profit_chart(financial_df):
+    """
+    Line chart of current versus projected operating profit by year (or by period).
+    """
+    x, time_tooltip = _time_axis(financial_df)
+    data = financial_df.melt(
+        id_vars=time_tooltip,
+        value_vars=["Current Operating Profit ($M)", "Projected Operating Profit ($M)"],
+        var_name="Scenario",
+        value_name="Operating Profit ($M)",
+    )
+    data["Scenario"] = data["Scenario"].str.replace(" ($M)", "", regex=False)
+    return alt.Chart(data, title="Operating Profit Over Time").mark_line(point="Period" not in data).encode(
+        x=x,
+        y=alt.Y("Operating Profit ($M):Q", scale=alt.Scale(zero=False)),
+        color=alt.Color(
+            "Scenario:N",
+            scale=alt.Scale(range=[CURRENT_COLOR, PROJECTED_COLOR]),
+            legend=alt.Legend(orient="bottom", title=None),
+        ),
+        strokeDash=alt.StrokeDash(
+            "Scenario:N", scale=alt.Scale(range=[[5, 5], [1, 0]]), legend=None
+        ),
+        tooltip=time_tooltip + ["Scenario", alt.Tooltip("Operating Profit ($M):Q", format=",.2f")],
+    )
+
+
+def cumulative_savings_chart(financial_df):
+    """
+    Line chart of cumulative savings by year (or by period).
+    """
+    x, time_tooltip = _time_axis(financial_df)
+    return alt.Chart(financial_df, title="Cumulative Savings Over Time").mark_line(
+        point="Period" not in financial_df, color=SAVINGS_COLOR
+    ).encode(
+        x=x,
+        y=alt.Y("Cumulative Savings ($M):Q"),
+        tooltip=time_tooltip + [alt.Tooltip("Cumulative Savings ($M):Q", format=",.2f")],
+    )
+
+
+def tornado_chart(tornado_df, baseline_value, metric_label):
+    """
+    Tornado chart of a metric at each input's low and high value, largest swing on top.
+    """
+    metric = tornado_df.attrs["metric"]
+    data = pd.concat([
+        pd.DataFrame({
+            "Input": tornado_df["label"],
+            "Case": case,
+            "Input Value": tornado_df[f"{end}_value"],
+            metric_label: tornado_df[f"{metric}_{end}"],
+            "Baseline": baseline_value,
+        })
+        for end, case in (("low", "Low input"), ("high", "High input"))
+    ])
+    return alt.Chart(data, title=f"Sensitivity of {metric_label}").mark_bar().encode(
+        y=alt.Y("Input:N", sort=list(tornado_df["label"]), title=None),
+        x=alt.X(f"{metric_label}:Q", title=metric_label, scale=alt.Scale(zero=False)),
+        x2="Baseline:Q",
+        color=alt.Color(
+            "Case:N",
+            scale=alt.Scale(domain=["Low input", "High input"], range=[CURRENT_COLOR, PROJECTED_COLOR]),
+            legend=alt.Legend(orient="bottom", title=None),
+        ),
+        tooltip=["Input", "Case", alt.Tooltip("Input Value:Q", format=",.2f"), alt.Tooltip(f"{metric_label}:Q", format=",.2f")],
+    )
+
+
+def heatmap_chart(grid_df, x_label, y_label, metric_label):
+    """
+    Heatmap of a metric over a two-input sweep (a DataFrame from sweep_2d).
+    """
+    data = grid_df.stack().rename(metric_label).reset_index()
+    data.columns = [y_label, x_label, metric_label]
+    x_step = float(grid_df.columns[1] - grid_df.columns[0]) if len(grid_df.columns) > 1 else 1.0
+    y_step = float(grid_df.index[1] - grid_df.index[0]) if len(grid_df.index) > 1 else 1.0
+    data["x2"] = data[x_label] + x_step
+    data["y2"] = data[y_label] + y_step
+    return alt.Chart(data, title=f"{metric_label} by {x_label} and {y_label}").mark_rect().encode(
+        x=alt.X(f"{x_label}:Q", scale=alt.Scale(zero=False, nice=False)),
+        x2="x2:Q",
+        y=alt.Y(f"{y_label}:Q", scale=alt.Scale(zero=False, nice=False)),
+        y2="y2:Q",
+        color=alt.Color(f"{metric_label}:Q", scale=alt.Scale(scheme="viridis")),
+        tooltip=[
+            alt.Tooltip(f"{x_label}:Q", format=",.2f"),
+            alt.Tooltip(f"{y_label}:Q", format=",.2f"),
+            alt.Tooltip(f"{metric_label}:Q", format=",.2f"),
+        ],
+    )
@@ -0,0 +1,276 @@
+import argparse
+import sys
+import time
+
+
+# --- Helper Functions ---
+def read_scenarios(path, chunk_size):
+    """
+    Stream a scenario table from CSV, Parquet or Arrow IPC in chunks.
+
+    Parameters:
+        path (str): Input file; "-" reads CSV from standard input.
+        chunk_size (int): Rows per chunk (Arrow IPC files keep the batches they were written with).
+
+    Yields:
+        DataFrame: One chunk of scenarios.
+    """
+    import pandas as pd
+
+    from .export import infer_format
+
+    fmt = infer_format(path)
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    elif fmt == "arrow":
+        import pyarrow as pa
+
+        with pa.memory_map(path) as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                yield reader.get_batch(i).to_pandas()
+    else:
+        yield from pd.read_csv(sys.stdin if path == "-" else path, chunksize=chunk_size)
+
+
+def write_results(batches, path):
+    """
+    Write result record batches to CSV, Parquet or Arrow IPC as they arrive.
+
+    Parameters:
+        batches (iterable): pyarrow RecordBatches with identical columns.
+        path (str): Output file; "-" writes CSV to standard output.
+
+    Returns:
+        int: Number of rows written.
+    """
+    from .export import infer_format, write_batches
+
+    fmt = infer_format(path)
+    if fmt is not None:
+        return write_batches(batches, path, fmt)
+
+    rows = 0
+    output = None
+    header_written = False
+    try:
+        for batch in batches:
+            if output is None:
+                output = sys.stdout if path == "-" else open(path, "w", newline="")
+            # The header goes out with the first batch, even an empty one
+            batch.to_pandas().to_csv(output, index=False, header=not header_written)
+            header_written = True
+            rows += batch.num_rows
+    finally:
+        if output is not None and output is not sys.stdout:
+            output.close()
+    return rows
+
+
+def scenario_curves(analysis_period, periods_per_year=1, curves=None):
+    """
+    Improvement and cost curves from curve settings, long enough for the given analysis periods.
+
+    Parameters:
+        analysis_period (array-like): Analysis periods of the scenarios the curves apply to.
+        periods_per_year (int): Periods per year.
+        curves (dict): ramp_shape, ramp_years and cost_escalation (see
+            curves.projection_curves), or None for no curves.
+
+    Returns:
+        dict: improvement_curve and cost_curve keyword arguments, empty without settings.
+    """
+    import numpy as np
+
+    from .curves import projection_curves
+
+    if not curves:
+        return {}
+    n_periods = max(int(np.max(np.asarray(analysis_period), initial=0)), 1) * periods_per_year
+    return projection_curves(n_periods, periods_per_year, **curves)
+
+
+def summarize_chunks(chunks, periods_per_year=1, interpolate_payback=False, discount_rate=None, curves=None):
+    """
+    Run project_financials_batch over each chunk, appending the summary metrics to the inputs.
+    Curve settings (see scenario_curves) are turned into curves for each chunk.
+    """
+    import pandas as pd
+    import pyarrow as pa
+
+    from .batch import project_financials_batch
+
+    for chunk in chunks:
+        summary, _ = project_financials_batch(
+            chunk, periods_per_year, interpolate_payback, discount_rate,
+            **scenario_curves(chunk.get("analysis_period", ()), periods_per_year, curves),
+        )
+        yield pa.RecordBatch.from_pandas(pd.concat([chunk, summary], axis=1), preserve_index=False)
+
+
+def summarize_parallel(
+    path, chunk_size, workers, progress=None, periods_per_year=1, interpolate_payback=False, discount_rate=None,
+    curves=None
+):
+    """
+    Like summarize_chunks, with the scenarios spread over worker processes.
+
+    An Arrow IPC input is memory-mapped by the workers and cut into shards of chunk_size
+    rows. Other inputs are read chunk by chunk as usual, and each chunk is split among
+    the workers.
+    """
+    import pandas as pd
+    import pyarrow as pa
+
+    from .export import infer_format
+    from .parallel import ShardedExecutor
+
+    with ShardedExecutor(
+        workers, chunk_size, periods_per_year=periods_per_year,
+        interpolate_payback=interpolate_payback, discount_rate=discount_rate,
+    ) as executor:
+        if infer_format(path) == "arrow":
+            # The table's slices point into the map, so it stays open until the last shard
+            with pa.memory_map(path) as source:
+                table = pa.ipc.open_file(source).read_all()
+                if "analysis_period" in table.column_names:
+                    executor.options.update(scenario_curves(table.column("analysis_period"), periods_per_year, curves))
+                start = 0
+                for summary in executor.map(path, progress):
+                    chunk = table.slice(start, len(summary)).to_pandas()
+                    start += len(summary)
+                    yield pa.RecordBatch.from_pandas(
+                        pd.concat([chunk, summary.reset_index(drop=True)], axis=1), preserve_index=False
+                    )
+        else:
+            executor.shard_size = -(-chunk_size // executor.workers)
+            done = 0
+            for chunk in read_scenarios(path, chunk_size):
+                executor.options.update(scenario_curves(chunk.get("analysis_period", ()), periods_per_year, curves))
+                summary = pd.concat(executor.map(chunk))
+                done += len(chunk)
+                if progress is not None:
+                    progress(done, None)
+                yield pa.RecordBatch.from_pandas(pd.concat([chunk, summary], axis=1), preserve_index=False)
+
+
+def report_progress(done, total):
+    """
+    Overwrite a progress line on stderr.
+    """
+    print(f"\r{done:,} / {total:,} scenarios" if total else f"\r{done:,} scenarios", end="", file=sys.stderr, flush=True)
+
+
+def build_parser():
+    from .core import GRANULARITIES
+    from .curves import RAMP_SHAPES
+
+    parser = argparse.ArgumentParser(
+        prog="python -m combined_ratio",
+        description=(
+            "Project ROI, savings and payback for every scenario in a CSV, Parquet or Arrow table. "
+            "Columns are named after the parameters of project_financials; "
+            "loss_ratio_reduction / expense_ratio_reduction may replace the new ratios."
+        ),
+    )
+    parser.add_argument("input", help="Scenario table (.csv, .parquet or .arrow); '-' reads CSV from stdin.")
+    parser.add_argument("output", help="Result table (.csv, .parquet or .arrow); '-' writes CSV to stdout.")
+    parser.add_argument(
+        "--chunk-size", type=int, default=50_000,
+        help="Scenarios evaluated per vectorized pass (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--projections", action="store_true",
+        help="Write per-period projections (one row per scenario and period) instead of per-scenario summaries.",
+    )
+    parser.add_argument(
+        "--granularity", choices=GRANULARITIES, default="annual",
+        help="Cash flow periods; payback is resolved to the period (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--interpolate-payback", action="store_true",
+        help="Interpolate payback within the period in which it is reached.",
+    )
+    parser.add_argument(
+        "--discount-rate", type=float, metavar="PERCENT",
+        help="Add NPV, IRR and discounted payback at this annual discount rate to the summaries.",
+    )
+    parser.add_argument(
+        "--ramp", choices=RAMP_SHAPES, default="immediate",
+        help="How the ratio reductions build up over --ramp-years (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--ramp-years", type=float, default=1.0, metavar="YEARS",
+        help="Years until the ratio reductions are realized in full (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--cost-escalation", type=float, default=0.0, metavar="PERCENT",
+        help="Annual escalation of the ongoing costs (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Worker processes for per-scenario summaries; 0 uses every CPU (default: %(default)s).",
+    )
+    parser.add_argument("--quiet", action="store_true", help="Do not report progress on stderr.")
+    return parser
+
+
+def main(argv=None):
+    """
+    Command-line entry point: stream scenarios from input to output.
+
+    Returns:
+        int: Process exit status.
+    """
+    args = build_parser().parse_args(argv)
+    if args.chunk_size < 1:
+        print("error: --chunk-size must be positive", file=sys.stderr)
+        return 2
+    if args.workers < 0:
+        print("error: --workers must not be negative", file=sys.stderr)
+        return 2
+    curves = {"ramp_shape": args.ramp, "ramp_years": args.ramp_years, "cost_escalation": args.cost_escalation}
+    if args.projections and (
+        args.interpolate_payback or args.discount_rate is not None or args.ramp != "immediate" or args.cost_escalation
+    ):
+        print(
+            "error: --interpolate-payback, --discount-rate, --ramp and --cost-escalation apply to summaries, "
+            "not --projections",
+            file=sys.stderr,
+        )
+        return 2
+    from .core import GRANULARITIES
+
+    options = {
+        "periods_per_year": GRANULARITIES[args.granularity],
+        "interpolate_payback": args.interpolate_payback,
+        "discount_rate": args.discount_rate,
+        "curves": curves,
+    }
+
+    start = time.perf_counter()
+    try:
+        if args.projections:
+            from .export import projection_batches
+
+            batches = projection_batches(read_scenarios(args.input, args.chunk_size), periods_per_year=options["periods_per_year"])
+        elif args.workers != 1 and args.input != "-":
+            batches = summarize_parallel(
+                args.input, args.chunk_size, args.workers, progress=None if args.quiet else report_progress, **options
+            )
+        else:
+            batches = summarize_chunks(read_scenarios(args.input, args.chunk_size), **options)
+        rows = write_results(batches, args.output)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    if not args.quiet:
+        if args.workers != 1 and not args.projections:
+            print(file=sys.stderr)
+        elapsed = time.perf_counter() - start
+        print(f"Wrote {rows:,} rows in {elapsed:.2f}s", file=sys.stderr)
+    return 0
@@ -0,0 +1,217 @@
+from array import array
+
+# Cash flow periods per year for each supported granularity
+GRANULARITIES = {"annual": 1, "quarterly": 4, "monthly": 12}
+
+# --- Calculation Core ---
+def calculate_combined_ratio(loss_ratio, expense_ratio):
+    """
+    Calculate the combined ratio by summing the loss and expense ratios.
+    
+    Parameters:
+        loss_ratio (float): Current loss ratio percentage.
+        expense_ratio (float): Current expense ratio percentage.
+    
+    Returns:
+        float: Combined ratio percentage.
+    """
+    return loss_ratio + expense_ratio
+
+def calculate_new_ratios(current_loss_ratio, loss_ratio_reduction, current_expense_ratio, expense_ratio_reduction):
+    """
+    Calculate the new loss and expense ratios after reductions.
+    
+    Parameters:
+        current_loss_ratio (float): Current loss ratio percentage.
+        loss_ratio_reduction (float): Reduction in loss ratio percentage.
+        current_expense_ratio (float): Current expense ratio percentage.
+        expense_ratio_reduction (float): Reduction in expense ratio percentage.
+    
+    Returns:
+        tuple: New loss ratio and new expense ratio percentages.
+    """
+    new_loss_ratio = current_loss_ratio - loss_ratio_reduction
+    new_expense_ratio = current_expense_ratio - expense_ratio_reduction
+    return new_loss_ratio, new_expense_ratio
+
+class ProjectionResult:
+    """
+    Result of project_financials: summary metrics plus per-year series stored in
+    preallocated contiguous float64 arrays (array.array("d")).
+
+    The DataFrame is built only when financial_df is first read. The result unpacks and
+    indexes like the 9-tuple project_financials used to return:
+    (financial_df, roi, payback_period, total_investment, total_savings,
+    roi_salesforce, payback_period_salesforce, total_investment_salesforce, total_savings_salesforce).
+    """
+
+    __slots__ = (
+        "premiums", "profit_current", "profit_new", "annual_savings", "cumulative_savings",
+        "annual_savings_salesforce", "cumulative_savings_salesforce",
+        "roi", "payback_period", "total_investment", "total_savings",
+        "roi_salesforce", "payback_period_salesforce", "total_investment_salesforce", "total_savings_salesforce",
+        "_financial_df",
+    )
+
+    # Per-year series and their column names in financial_df
+    SERIES = (
+        ("premiums", "Projected Premiums ($M)"),
+        ("profit_current", "Current Operating Profit ($M)"),
+        ("profit_new", "Projected Operating Profit ($M)"),
+        ("annual_savings", "Annual Savings ($M)"),
+        ("cumulative_savings", "Cumulative Savings ($M)"),
+        ("annual_savings_salesforce", "Annual Savings from Salesforce ($M)"),
+        ("cumulative_savings_salesforce", "Cumulative Salesforce Savings ($M)"),
+    )
+
+    # Field order of the legacy tuple
+    FIELDS = (
+        "financial_df", "roi", "payback_period", "total_investment", "total_savings",
+        "roi_salesforce", "payback_period_salesforce", "total_investment_salesforce", "total_savings_salesforce",
+    )
+
+    def __init__(self, analysis_period):
+        for name, _ in self.SERIES:
+            setattr(self, name, array("d", [0.0]) * analysis_period)
+        self._financial_df = None
+
+    @property
+    def analysis_period(self):
+        return len(self.premiums)
+
+    @property
+    def financial_df(self):
+        """
+        Per-year projections as a DataFrame, built on first access.
+        """
+        if self._financial_df is None:
+            import pandas as pd  # imported here so the core stays cheap to import for batch jobs
+
+            data = {"Year": range(1, self.analysis_period + 1)}
+            data.update((column, getattr(self, name)) for name, column in self.SERIES)
+            self._financial_df = pd.DataFrame(data)
+        return self._financial_df
+
+    def __iter__(self):
+        return (getattr(self, name) for name in self.FIELDS)
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(getattr(self, name) for name in self.FIELDS[index])
+        return getattr(self, self.FIELDS[index])
+
+    def __repr__(self):
+        return (
+            f"ProjectionResult(analysis_period={self.analysis_period}, roi={self.roi!r}, "
+            f"payback_period={self.payback_period!r}, total_savings={self.total_savings!r})"
+        )
+
+
+def project_financials(
+    current_gwp, premium_growth_rate, current_loss_ratio, current_expense_ratio,
+    new_loss_ratio, new_expense_ratio, analysis_period, ongoing_costs, initial_investment,
+    loss_ratio_reduction_salesforce, expense_ratio_reduction_salesforce, ongoing_costs_salesforce
+):
+    """
+    Project financial metrics over the analysis period.
+    
+    Parameters:
+        current_gwp (float): Current Gross Written Premiums in millions.
+        premium_growth_rate (float): Annual premium growth rate percentage.
+        current_loss_ratio (float): Current loss ratio percentage.
+        current_expense_ratio (float): Current expense ratio percentage.
+        new_loss_ratio (float): New loss ratio percentage after reduction.
+        new_expense_ratio (float): New expense ratio percentage after reduction.
+        analysis_period (int): Number of years to analyze.
+        ongoing_costs (float): Total annual ongoing costs in millions.
+        initial_investment (float): Initial investment cost in millions.
+        loss_ratio_reduction_salesforce (float): Loss ratio reduction attributable to Salesforce.
+        expense_ratio_reduction_salesforce (float): Expense ratio reduction attributable to Salesforce.
+        ongoing_costs_salesforce (float): Annual ongoing costs for Salesforce in millions.
+    
+    Returns:
+        ProjectionResult: Financial metrics; unpacks as the financial DataFrame followed by
+        the summary metrics.
+    """
+    result = ProjectionResult(analysis_period)
+    premiums = result.premiums
+    profits_current = result.profit_current
+    profits_new = result.profit_new
+    annual_savings = result.annual_savings
+    cumulative_savings = result.cumulative_savings
+    annual_savings_salesforce = result.annual_savings_salesforce
+    cumulative_savings_salesforce = result.cumulative_savings_salesforce
+    cumulative_cash_flow = -initial_investment
+    cumulative_cash_flow_salesforce = -initial_investment
+    payback_period = None
+    payback_period_salesforce = None
+
+    running_cumulative_savings = 0
+    running_cumulative_savings_salesforce = 0
+
+    for i in range(analysis_period):
+        year = i + 1
+        gwp = current_gwp * (1 + premium_growth_rate / 100) ** (year - 1)
+        premiums[i] = gwp
+
+        # Current Scenario
+        loss_current = gwp * current_loss_ratio / 100
+        expense_current = gwp * current_expense_ratio / 100
+        profit_current = gwp - loss_current - expense_current
+        profits_current[i] = profit_current
+
+        # New Scenario
+        loss_new = gwp * new_loss_ratio / 100
+        expense_new = gwp * new_expense_ratio / 100
+        profit_new = gwp - loss_new - expense_new
+        profits_new[i] = profit_new
+
+        # Total Savings
+        savings = profit_new - profit_current
+        annual_savings[i] = savings
+        running_cumulative_savings += savings
+        cumulative_savings[i] = running_cumulative_savings
+
+        # Savings Attributable to Salesforce
+        loss_savings_salesforce = gwp * loss_ratio_reduction_salesforce / 100
+        expense_savings_salesforce = gwp * expense_ratio_reduction_salesforce / 100
+        savings_salesforce = loss_savings_salesforce + expense_savings_salesforce
+        savings_salesforce -= ongoing_costs_salesforce  # Subtract ongoing Salesforce costs
+        annual_savings_salesforce[i] = savings_salesforce
+        running_cumulative_savings_salesforce += savings_salesforce
+        cumulative_savings_salesforce[i] = running_cumulative_savings_salesforce
+
+        # Cumulative Cash Flow
+        cumulative_cash_flow += savings - ongoing_costs  # Subtract total ongoing costs
+        cumulative_cash_flow_salesforce += savings_salesforce
+
+        # Payback Periods
+        if cumulative_cash_flow >= 0 and payback_period is None:
+            payback_period = year
+        if cumulative_cash_flow_salesforce >= 0 and payback_period_salesforce is None:
+            payback_period_salesforce = year
+
+    # Total Investments
+    total_investment = initial_investment + ongoing_costs * analysis_period
+    total_investment_salesforce = initial_investment + ongoing_costs_salesforce * analysis_period
+
+    # Total Savings
+    total_savings = running_cumulative_savings - (ongoing_costs * analysis_period)
+    total_savings_salesforce = running_cumulative_savings_salesforce
+
+    # ROI Calculations
+    roi = (total_savings / total_investment) * 100 if total_investment != 0 else 0
+    roi_salesforce = (total_savings_salesforce / total_investment_salesforce) * 100 if total_investment_salesforce != 0 else 0
+
+    result.roi = roi
+    result.payback_period = payback_period
+    result.total_investment = total_investment
+    result.total_savings = total_savings
+    result.roi_salesforce = roi_salesforce
+    result.payback_period_salesforce = payback_period_salesforce
+    result.total_investment_salesforce = total_investment_salesforce
+    result.total_savings_salesforce = total_savings_salesforce
+    return result
@@ -0,0 +1,135 @@
+import numpy as np
+
+# --- Configurations ---
+# Ramp shapes: the improvement applies in full from the first period ("immediate"),
+# builds up evenly ("linear"), or builds up slowly, then quickly, then slowly again
+# ("s_curve", a smoothstep that reaches the full improvement at the end of the ramp)
+RAMP_SHAPES = ("immediate", "linear", "s_curve")
+
+
+# --- Curves ---
+# A curve holds one multiplier per cash flow period, either shared by all scenarios
+# (shape (periods,)) or one row per scenario (scenarios x periods), and is applied to
+# the scenarios x periods matrix of batch.project_financials_arrays by multiplication.
+def _period_years(n_periods, periods_per_year):
+    """
+    Time in years at the end of each period 1..n_periods.
+    """
+    return np.arange(1, n_periods + 1) / periods_per_year
+
+
+def ramp_curve(shape, ramp_years, n_periods, periods_per_year=1):
+    """
+    Share of the full improvement realized in each period while an improvement ramps in.
+
+    Parameters:
+        shape (str): One of RAMP_SHAPES.
+        ramp_years (float or ndarray): Years until the improvement is realized in full,
+            a scalar or one per scenario. A ramp of 0 years is immediate.
+        n_periods (int): Number of periods.
+        periods_per_year (int): Periods per year.
+
+    Returns:
+        ndarray: Multipliers between 0 and 1 of shape (n_periods,), or scenarios x
+        n_periods for per-scenario ramp_years.
+    """
+    if shape not in RAMP_SHAPES:
+        raise ValueError(f"Unknown ramp shape {shape!r}; expected one of {', '.join(RAMP_SHAPES)}")
+    ramp_years = np.asarray(ramp_years, dtype=np.float64)
+    if (ramp_years < 0).any():
+        raise ValueError("ramp_years must not be negative")
+    if shape == "immediate":
+        return np.ones(ramp_years.shape + (n_periods,))
+
+    years = _period_years(n_periods, periods_per_year)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        progress = np.clip(years / ramp_years[..., None], 0.0, 1.0)
+    progress = np.where(ramp_years[..., None] > 0, progress, 1.0)
+    if shape == "s_curve":
+        return progress * progress * (3 - 2 * progress)
+    return progress
+
+
+def escalation_curve(escalation_rate, n_periods, periods_per_year=1):
+    """
+    Cost multipliers for costs that escalate each year, as premiums grow in project_financials.
+
+    Parameters:
+        escalation_rate (float or ndarray): Annual escalation percentage, a scalar or one
+            per scenario.
+        n_periods (int): Number of periods.
+        periods_per_year (int): Periods per year; each year's multiplier holds for all
+            of its periods.
+
+    Returns:
+        ndarray: Multipliers of shape (n_periods,), or scenarios x n_periods, starting at 1
+        in the first year.
+    """
+    escalation_rate = np.asarray(escalation_rate, dtype=np.float64)
+    year_index = np.arange(n_periods) // periods_per_year
+    return np.float_power(1 + escalation_rate[..., None] / 100, year_index)
+
+
+def yearly_curve(values, n_periods, periods_per_year=1):
+    """
+    Expand user-supplied per-year multipliers to periods.
+
+    Parameters:
+        values (sequence or ndarray): One multiplier per year, or scenarios x years. Years
+            past the last value keep the last value.
+        n_periods (int): Number of periods.
+        periods_per_year (int): Periods per year; each year's value holds for all of its
+            periods.
+
+    Returns:
+        ndarray: Multipliers of shape (n_periods,), or scenarios x n_periods.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.shape[-1:] == (0,):
+        raise ValueError("A yearly curve needs at least one value")
+    year_index = np.minimum(np.arange(n_periods) // periods_per_year, values.shape[-1] - 1)
+    return values[..., year_index]
+
+
+def fit_curve(curve, n_periods):
+    """
+    Fit a curve to n_periods columns for multiplying into a scenarios x periods matrix.
+
+    Parameters:
+        curve (ndarray): Multipliers of shape (periods,) or scenarios x periods. Periods
+            past the last column keep the last column's value; extra columns are dropped.
+        n_periods (int): Number of periods.
+
+    Returns:
+        ndarray: A 1 x n_periods or scenarios x n_periods float64 array.
+    """
+    curve = np.atleast_2d(np.asarray(curve, dtype=np.float64))
+    if curve.ndim != 2 or curve.shape[1] == 0:
+        raise ValueError("A curve must be a non-empty 1-D array of periods or a scenarios x periods array")
+    if curve.shape[1] < n_periods:
+        return np.concatenate([curve, np.repeat(curve[:, -1:], n_periods - curve.shape[1], axis=1)], axis=1)
+    return curve[:, :n_periods]
+
+
+def projection_curves(n_periods, periods_per_year=1, ramp_shape="immediate", ramp_years=0.0, cost_escalation=0.0):
+    """
+    The improvement_curve and cost_curve arguments of project_financials_arrays for a
+    ramp-up and a cost escalation shared by all scenarios.
+
+    Parameters:
+        n_periods (int): Number of periods, at least the longest analysis period times
+            periods_per_year: fit_curve repeats the last column, which holds for a
+            finished ramp but not for escalating costs.
+        periods_per_year (int): Periods per year.
+        ramp_shape (str): One of RAMP_SHAPES.
+        ramp_years (float): Years until the improvement is realized in full.
+        cost_escalation (float): Annual escalation percentage of the ongoing costs.
+
+    Returns:
+        dict: improvement_curve and cost_curve. An immediate ramp and no escalation give
+        flat curves, which project_financials_arrays treats as no curve.
+    """
+    return {
+        "improvement_curve": ramp_curve(ramp_shape, ramp_years, n_periods, periods_per_year),
+        "cost_curve": escalation_curve(cost_escalation, n_periods, periods_per_year),
+    }
@@ -0,0 +1,223 @@
+import contextlib
+import json
+import logging
+import os
+import threading
+import time
+
+# --- Configurations ---
+DIAGNOSTICS = os.getenv("CALCULATOR_DIAGNOSTICS", "0").lower() in ("1", "true", "yes", "on")
+# Profiler used when a rerun is profiled: "cprofile" or "pyinstrument" (optional dependency)
+PROFILER = os.getenv("CALCULATOR_PROFILER", "cprofile")
+# When set, Prometheus text metrics are written here after every run (for a textfile collector)
+METRICS_FILE = os.getenv("CALCULATOR_METRICS_FILE")
+
+# Histogram bucket upper bounds in seconds
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+logger = logging.getLogger(__name__)
+
+
+# --- Metrics Registry ---
+class SpanMetrics:
+    """
+    Process-wide histograms of span durations, rendered as Prometheus text.
+
+    Parameters:
+        buckets (tuple): Histogram bucket upper bounds in seconds.
+    """
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._spans = {}
+        self.runs = 0
+
+    def observe(self, name, seconds):
+        with self._lock:
+            counts, total, count = self._spans.get(name, ([0] * len(self.buckets), 0.0, 0))
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    counts[i] += 1
+            self._spans[name] = (counts, total + seconds, count + 1)
+
+    def observe_run(self, spans):
+        with self._lock:
+            self.runs += 1
+        for name, seconds in spans:
+            self.observe(name, seconds)
+
+    def prometheus_text(self, prefix="calculator"):
+        """
+        Render the metrics in the Prometheus text exposition format.
+        """
+        with self._lock:
+            spans = {name: (list(counts), total, count) for name, (counts, total, count) in self._spans.items()}
+            runs = self.runs
+        lines = [
+            f"# HELP {prefix}_runs_total Script runs recorded with diagnostics enabled.",
+            f"# TYPE {prefix}_runs_total counter",
+            f"{prefix}_runs_total {runs}",
+            f"# HELP {prefix}_span_seconds Time spent in each stage of a script run.",
+            f"# TYPE {prefix}_span_seconds histogram",
+        ]
+        for name in sorted(spans):
+            counts, total, count = spans[name]
+            for bound, bucket_count in zip(self.buckets, counts):
+                lines.append(f'{prefix}_span_seconds_bucket{{span="{name}",le="{bound:g}"}} {bucket_count}')
+            lines.append(f'{prefix}_span_seconds_bucket{{span="{name}",le="+Inf"}} {count}')
+            lines.append(f'{prefix}_span_seconds_sum{{span="{name}"}} {total:.6f}')
+            lines.append(f'{prefix}_span_seconds_count{{span="{name}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        """
+        Write the metrics to path atomically, for node_exporter's textfile collector.
+        """
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as f:
+            f.write(self.prometheus_text())
+        os.replace(temporary, path)
+
+
+METRICS = SpanMetrics()
+
+
+# --- Profilers ---
+def _start_profiler(kind):
+    try:
+        if kind == "pyinstrument":
+            from pyinstrument import Profiler
+
+            profiler = Profiler()
+            profiler.start()
+            return profiler
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+    except (ImportError, ValueError) as e:  # not installed, or another profiler is active
+        logger.warning("Profiling disabled for this run: %s", e)
+        return None
+
+
+def _stop_profiler(profiler, limit=40):
+    if hasattr(profiler, "output_text"):
+        profiler.stop()
+        return profiler.output_text()
+    import io
+    import pstats
+
+    profiler.disable()
+    output = io.StringIO()
+    pstats.Stats(profiler, stream=output).sort_stats("cumulative").print_stats(limit)
+    return output.getvalue()
+
+
+# --- Run Recorders ---
+class RunRecorder:
+    """
+    Timing spans for one script run.
+
+    A run is timed as a sequence of stages (each stage lasts until the next one starts)
+    plus any number of spans around individual calls, which may fall inside a stage.
+
+    Parameters:
+        profiler (str): "cprofile" or "pyinstrument" to profile the run, or None.
+        metrics (SpanMetrics): Registry the finished run is added to.
+    """
+
+    enabled = True
+
+    def __init__(self, profiler=None, metrics=METRICS):
+        self.metrics = metrics
+        self.spans = []
+        self.profile = None
+        self.total = None
+        self._stage = None
+        self._start = time.perf_counter()
+        self._profiler = _start_profiler(profiler) if profiler else None
+
+    def stage(self, name):
+        """
+        End the current stage, if any, and start the stage called name.
+        """
+        now = time.perf_counter()
+        if self._stage is not None:
+            self.spans.append((self._stage[0], now - self._stage[1]))
+        self._stage = (name, now)
+
+    @contextlib.contextmanager
+    def span(self, name):
+        """
+        Time the enclosed block as a span called name.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans.append((name, time.perf_counter() - start))
+
+    def finish(self):
+        """
+        End the run: close the last stage, stop the profiler, and record the spans in the
+        metrics registry, the structured log and METRICS_FILE.
+        """
+        if self.total is not None:
+            return self
+        now = time.perf_counter()
+        if self._stage is not None:
+            self.spans.append((self._stage[0], now - self._stage[1]))
+            self._stage = None
+        self.total = now - self._start
+        if self._profiler is not None:
+            self.profile = _stop_profiler(self._profiler)
+        self.metrics.observe_run(self.spans + [("total", self.total)])
+        logger.info(json.dumps({
+            "event": "script_run",
+            "total_seconds": round(self.total, 6),
+            "spans": [{"name": name, "seconds": round(seconds, 6)} for name, seconds in self.spans],
+            "profiled": self.profile is not None,
+        }))
+        if METRICS_FILE:
+            self.metrics.write_textfile(METRICS_FILE)
+        return self
+
+
+class DisabledRecorder:
+    """
+    Stand-in recorder when diagnostics are off: every method is a no-op.
+    """
+
+    enabled = False
+    spans = ()
+    profile = None
+    total = None
+    _null_span = contextlib.nullcontext()
+
+    def stage(self, name):
+        pass
+
+    def span(self, name):
+        return self._null_span
+
+    def finish(self):
+        return self
+
+
+DISABLED = DisabledRecorder()
+
+
+def start_run(enabled=DIAGNOSTICS, profiler=None):
+    """
+    Start recording a script run.
+
+    Parameters:
+        enabled (bool): Whether to record; when False the shared no-op recorder is returned.
+        profiler (str): "cprofile" or "pyinstrument" to also profile the run.
+
+    Returns:
+        RunRecorder or DisabledRecorder: Recorder for the run.
+    """
+    return RunRecorder(profiler=profiler) if enabled else DISABLED
@@ -0,0 +1,159 @@
+import numpy as np
+
+# --- Configurations ---
+# IRR search range, as annual rates in percent
+IRR_BOUNDS = (-99.0, 10_000.0)
+
+# IRR status codes, by position: the solver converged; NPV does not change sign over
+# IRR_BOUNDS, so there is no IRR to find (for example, when nothing is invested or the
+# investment is never recovered); the solver stopped at max_iter; or the cash flows change
+# sign more than once, so NPV may have several roots (or none) and no rate is reported
+IRR_STATUS = ("converged", "no_root", "not_converged", "ambiguous")
+IRR_CONVERGED, IRR_NO_ROOT, IRR_NOT_CONVERGED, IRR_AMBIGUOUS = range(len(IRR_STATUS))
+
+
+# --- Discounting ---
+def discount_factors(discount_rate, n_periods, periods_per_year=1):
+    """
+    Discount factors for period ends 0..n_periods.
+
+    Parameters:
+        discount_rate (float or ndarray): Annual discount rate percentage, a scalar or one
+            per scenario.
+        n_periods (int): Number of periods after time 0.
+        periods_per_year (int): Periods per year.
+
+    Returns:
+        ndarray: Factors of shape (n_periods + 1,), or scenarios x (n_periods + 1).
+    """
+    rate = np.asarray(discount_rate, dtype=np.float64)
+    years = np.arange(n_periods + 1) / periods_per_year
+    return np.exp(-np.log1p(rate / 100)[..., None] * years)
+
+
+def npv(cash_flows, discount_rate, periods_per_year=1):
+    """
+    Net present value of cash flows at the end of each period.
+
+    Parameters:
+        cash_flows (ndarray): Scenarios x (periods + 1) cash flows; column 0 is time 0.
+        discount_rate (float or ndarray): Annual discount rate percentage.
+        periods_per_year (int): Periods per year.
+
+    Returns:
+        ndarray: NPV per scenario.
+    """
+    cash_flows = np.atleast_2d(cash_flows)
+    factors = discount_factors(discount_rate, cash_flows.shape[1] - 1, periods_per_year)
+    return (cash_flows * factors).sum(axis=1)
+
+
+def _npv_and_slope(cash_flows, rate, years):
+    """
+    NPV at per-scenario annual rates (fractions) and its derivative with respect to the rate.
+    """
+    log_growth = np.log1p(rate)[:, None]
+    discounted = cash_flows * np.exp(-log_growth * years)
+    value = discounted.sum(axis=1)
+    slope = -(discounted * years).sum(axis=1) / (1 + rate)
+    return value, slope
+
+
+def _sign_changes(cash_flows):
+    """
+    Number of sign changes in each row of cash flows, skipping zeros.
+
+    By Descartes' rule of signs this bounds the number of IRRs: one change gives exactly
+    one IRR (if it lies within the search range), none gives no IRR.
+    """
+    signs = np.sign(cash_flows)
+    nonzero = signs != 0
+    # Sign of the latest non-zero flow at or before each period
+    latest = np.maximum.accumulate(np.where(nonzero, np.arange(signs.shape[1]), 0), axis=1)
+    previous = np.take_along_axis(signs, latest, axis=1)[:, :-1]
+    return (nonzero[:, 1:] & (signs[:, 1:] * previous < 0)).sum(axis=1)
+
+
+def _initial_guess(cash_flows, years):
+    """
+    IRR estimate treating the later cash flows as one amount at their cash-weighted mean
+    time (exact for a single inflow); 10% a year where that does not apply.
+    """
+    investment = -cash_flows[:, 0]
+    inflows = cash_flows[:, 1:].sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        duration = (cash_flows[:, 1:] * years[1:]).sum(axis=1) / inflows
+        guess = np.expm1(np.log(inflows / investment) / duration)
+    return np.where((investment > 0) & (inflows > 0) & (duration > 0) & np.isfinite(guess), guess, 0.1)
+
+
+def irr(cash_flows, periods_per_year=1, tol=1e-10, max_iter=100, bounds=IRR_BOUNDS):
+    """
+    Internal rate of return of every scenario at once, by safeguarded Newton iteration.
+
+    Each scenario keeps a bracket on which NPV changes sign. A Newton step is taken when
+    it lands inside the bracket; otherwise the bracket is bisected, so every scenario
+    converges even where Newton alone would overshoot. Only scenarios still iterating
+    are evaluated on each pass.
+
+    Only cash flows that change sign once are solved. Flows that never change sign
+    (including all-zero flows) have no IRR; flows that change sign more than once, such
+    as an investment, inflows and a final outflow, are reported as ambiguous.
+
+    Parameters:
+        cash_flows (ndarray): Scenarios x (periods + 1) cash flows; column 0 is time 0.
+        periods_per_year (int): Periods per year; the IRR is an annual rate.
+        tol (float): Convergence tolerance on the rate (as a fraction).
+        max_iter (int): Maximum iterations.
+        bounds (tuple): Lowest and highest annual rate percentage searched.
+
+    Returns:
+        tuple: IRR percentage per scenario (NaN unless converged) and status codes per
+        scenario (indexes into IRR_STATUS).
+    """
+    cash_flows = np.atleast_2d(np.asarray(cash_flows, dtype=np.float64))
+    n = cash_flows.shape[0]
+    years = np.arange(cash_flows.shape[1]) / periods_per_year
+    low = np.full(n, bounds[0] / 100)
+    high = np.full(n, bounds[1] / 100)
+    value_low, _ = _npv_and_slope(cash_flows, low, years)
+    value_high, _ = _npv_and_slope(cash_flows, high, years)
+
+    status = np.full(n, IRR_NOT_CONVERGED, dtype=np.int8)
+    changes = _sign_changes(cash_flows)
+    bracketed = (changes == 1) & (np.sign(value_low) * np.sign(value_high) <= 0)
+    status[~bracketed] = IRR_NO_ROOT
+    status[changes > 1] = IRR_AMBIGUOUS
+    rate = np.full(n, np.nan)
+    exact = bracketed & (value_low == 0)
+    rate[exact], status[exact] = low[exact], IRR_CONVERGED
+
+    active = np.flatnonzero(bracketed & ~exact)
+    guess = np.clip(_initial_guess(cash_flows, years), low, high)
+    low, high, value_low, guess = low[active], high[active], value_low[active], guess[active]
+    flows = cash_flows[active]
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        value, slope = _npv_and_slope(flows, guess, years)
+
+        # Keep the root bracketed: replace the end whose NPV has the same sign
+        same_as_low = np.sign(value) == np.sign(value_low)
+        low = np.where(same_as_low, guess, low)
+        value_low = np.where(same_as_low, value, value_low)
+        high = np.where(same_as_low, high, guess)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = guess - value / slope
+        inside = np.isfinite(newton) & (newton >= low) & (newton <= high)
+        step = np.where(inside, newton, (low + high) / 2)
+
+        scale = tol * (1 + np.abs(guess))
+        done = (value == 0) | (np.abs(step - guess) <= scale) | (high - low <= scale)
+        rate[active[done]] = np.where(value == 0, guess, step)[done]
+        status[active[done]] = IRR_CONVERGED
+
+        keep = ~done
+        active, flows, guess = active[keep], flows[keep], step[keep]
+        low, high, value_low = low[keep], high[keep], value_low[keep]
+    return rate * 100, status
@@ -0,0 +1,182 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .batch import SERIES_COLUMNS, SUMMARY_COLUMNS, project_financials_batch
+
+# --- Schemas ---
+# Long format: one row per scenario and year inside its analysis period.
+PROJECTION_SCHEMA = pa.schema(
+    [("scenario", pa.int64()), ("Year", pa.int16())]
+    + [(name, pa.float64()) for name in SERIES_COLUMNS]
+)
+# The same with quarterly or monthly periods, numbered from 1 across the analysis period,
+# and the Year each falls in
+PROJECTION_PERIODS_SCHEMA = pa.schema([PROJECTION_SCHEMA.field("scenario"), ("Period", pa.int16())] + list(PROJECTION_SCHEMA)[1:])
+
+# One row per scenario. Payback periods are in years, fractional with quarterly or monthly
+# periods or interpolation, and null where payback is not achieved.
+SUMMARY_SCHEMA = pa.schema([("scenario", pa.int64())] + [(name, pa.float64()) for name in SUMMARY_COLUMNS])
+
+# The single-scenario table returned by project_financials
+FINANCIAL_DF_SCHEMA = pa.schema([("Year", pa.int16())] + [(name, pa.float64()) for name in SERIES_COLUMNS])
+# The same table with quarterly or monthly periods
+FINANCIAL_DF_PERIODS_SCHEMA = pa.schema([("Period", pa.int16())] + list(FINANCIAL_DF_SCHEMA))
+
+FORMATS = {
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+}
+
+
+# --- Helper Functions ---
+def infer_format(path):
+    """
+    Pick the export format from a file name's suffix.
+
+    Returns:
+        str: "parquet", "arrow" or None for anything else.
+    """
+    path = str(path).lower()
+    return next((fmt for suffix, fmt in FORMATS.items() if path.endswith(suffix)), None)
+
+
+def write_batches(batches, sink, format="parquet", schema=None, compression="zstd"):
+    """
+    Write record batches to a Parquet file or Arrow IPC file one batch at a time.
+
+    Only the batch being written is held in memory, so peak memory is bounded by the
+    batch size rather than by the total number of rows.
+
+    Parameters:
+        batches (iterable): pyarrow RecordBatches.
+        sink (str or file-like): Destination path or writable binary stream.
+        format (str): "parquet" or "arrow".
+        schema (Schema): Schema to write; defaults to that of the first batch.
+        compression (str): Parquet compression codec.
+
+    Returns:
+        int: Number of rows written.
+    """
+    if format not in ("parquet", "arrow"):
+        raise ValueError(f"Unknown export format '{format}'. Expected 'parquet' or 'arrow'.")
+
+    writer = None
+    rows = 0
+    try:
+        for batch in batches:
+            if writer is None:
+                schema = schema or batch.schema
+                writer = (
+                    pq.ParquetWriter(sink, schema, compression=compression)
+                    if format == "parquet" else pa.ipc.new_file(sink, schema)
+                )
+            writer.write_batch(batch.cast(schema) if batch.schema != schema else batch)
+            rows += batch.num_rows
+        if writer is None and schema is not None:
+            # Nothing to write: still produce a valid, empty file
+            writer = (
+                pq.ParquetWriter(sink, schema, compression=compression)
+                if format == "parquet" else pa.ipc.new_file(sink, schema)
+            )
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def _scenario_chunks(scenarios, chunk_size):
+    if isinstance(scenarios, (pd.DataFrame, dict)):
+        scenarios = pd.DataFrame(scenarios)
+        for start in range(0, len(scenarios), chunk_size):
+            yield scenarios.iloc[start:start + chunk_size]
+    else:
+        yield from scenarios
+
+
+def projection_schema(periods_per_year=1):
+    """
+    Schema of per-period projection rows: PROJECTION_SCHEMA for annual periods, else PROJECTION_PERIODS_SCHEMA.
+    """
+    return PROJECTION_SCHEMA if periods_per_year == 1 else PROJECTION_PERIODS_SCHEMA
+
+
+def projection_batches(scenarios, chunk_size=10_000, summary=False, periods_per_year=1, interpolate_payback=False):
+    """
+    Evaluate scenarios chunk by chunk and yield the results as typed record batches.
+
+    Parameters:
+        scenarios (DataFrame, dict or iterable of DataFrames): Scenario table, as accepted
+            by project_financials_batch, or an iterator of chunks of one.
+        chunk_size (int): Scenarios evaluated per chunk when a whole table is given.
+        summary (bool): Yield per-scenario summary metrics instead of per-period series.
+        periods_per_year (int): Cash flow periods per year (see project_financials_arrays).
+        interpolate_payback (bool): Interpolate payback within its period.
+
+    Yields:
+        RecordBatch: Rows in projection_schema(periods_per_year) (or SUMMARY_SCHEMA).
+        Scenarios are numbered by their position in the input.
+    """
+    schema = projection_schema(periods_per_year)
+    offset = 0
+    for chunk in _scenario_chunks(scenarios, chunk_size):
+        results, series = project_financials_batch(chunk, periods_per_year, interpolate_payback)
+        ids = np.arange(offset, offset + len(chunk), dtype=np.int64)
+        offset += len(chunk)
+
+        if summary:
+            columns = [pa.array(ids)] + [
+                pa.array(results[name].to_numpy(), from_pandas=True).cast(SUMMARY_SCHEMA.field(name).type)
+                for name in SUMMARY_COLUMNS
+            ]
+            yield pa.RecordBatch.from_arrays(columns, schema=SUMMARY_SCHEMA)
+            continue
+
+        mask = ~np.isnan(series[SERIES_COLUMNS[0]])
+        periods = np.arange(mask.shape[1], dtype=np.int16)
+        # Annual rows carry the Year; shorter periods carry the Period and the Year it falls in
+        time_columns = [periods + 1] if periods_per_year == 1 else [periods + 1, periods // periods_per_year + 1]
+        columns = [pa.array(np.broadcast_to(ids[:, None], mask.shape)[mask])] + [
+            pa.array(np.broadcast_to(values, mask.shape)[mask]) for values in time_columns
+        ] + [pa.array(series[name][mask]) for name in SERIES_COLUMNS]
+        yield pa.RecordBatch.from_arrays(columns, schema=schema)
+
+
+def export_projections(
+    scenarios, sink, format="parquet", chunk_size=10_000, summary=False, periods_per_year=1, interpolate_payback=False
+):
+    """
+    Stream projections for a scenario portfolio to Parquet or Arrow IPC.
+
+    Parameters:
+        scenarios (DataFrame, dict or iterable of DataFrames): Scenario inputs.
+        sink (str or file-like): Destination path or writable binary stream.
+        format (str): "parquet" or "arrow".
+        chunk_size (int): Scenarios evaluated and written per record batch.
+        summary (bool): Export per-scenario summary metrics instead of per-period series.
+        periods_per_year (int): Cash flow periods per year: 1, 4 or 12.
+        interpolate_payback (bool): Interpolate payback within its period.
+
+    Returns:
+        int: Number of rows written.
+    """
+    return write_batches(
+        projection_batches(scenarios, chunk_size, summary, periods_per_year, interpolate_payback),
+        sink,
+        format,
+        schema=SUMMARY_SCHEMA if summary else projection_schema(periods_per_year),
+    )
+
+
+def financial_df_to_parquet(financial_df):
+    """
+    Serialize the single-scenario projections table shown in the app to Parquet bytes.
+    """
+    schema = FINANCIAL_DF_PERIODS_SCHEMA if "Period" in financial_df else FINANCIAL_DF_SCHEMA
+    sink = pa.BufferOutputStream()
+    pq.write_table(pa.Table.from_pandas(financial_df, schema=schema, preserve_index=False), sink)
+    return sink.getvalue().to_pybytes()
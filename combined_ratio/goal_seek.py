@@ -0,0 +1,198 @@
+import numpy as np
+import pandas as pd
+
+from .batch import project_financials_arrays
+
+# Reductions that can be solved for. Solving for a Salesforce-attributed reduction
+# targets the Salesforce ROI / payback, otherwise the overall ROI / payback.
+SOLVE_FOR = (
+    "loss_ratio_reduction",
+    "expense_ratio_reduction",
+    "loss_ratio_reduction_salesforce",
+    "expense_ratio_reduction_salesforce",
+)
+
+
+# --- Helper Functions ---
+def _column(scenarios, name, default=0.0):
+    if name in scenarios:
+        return scenarios[name].to_numpy(dtype=np.float64)
+    return np.full(len(scenarios), default)
+
+
+def _inputs(scenarios, solve_for):
+    """
+    Collect the scenario inputs needed by the solvers as float arrays.
+    """
+    salesforce = solve_for.endswith("_salesforce")
+    if salesforce:
+        other = "expense_ratio_reduction_salesforce" if solve_for.startswith("loss") else "loss_ratio_reduction_salesforce"
+    else:
+        other = "expense_ratio_reduction" if solve_for.startswith("loss") else "loss_ratio_reduction"
+    ratio = "current_loss_ratio" if solve_for.startswith("loss") else "current_expense_ratio"
+    return {
+        "salesforce": salesforce,
+        "current_gwp": _column(scenarios, "current_gwp"),
+        "premium_growth_rate": _column(scenarios, "premium_growth_rate"),
+        "initial_investment": _column(scenarios, "initial_investment"),
+        "ongoing_costs": _column(scenarios, "ongoing_costs_salesforce" if salesforce else "ongoing_costs"),
+        "analysis_period": _column(scenarios, "analysis_period"),
+        "other_reduction": _column(scenarios, other),
+        "upper_bound": _column(scenarios, ratio, default=100.0),
+    }
+
+
+def cumulative_premiums(current_gwp, premium_growth_rate, years):
+    """
+    Closed-form total GWP over the first `years` years of geometric growth.
+
+    Parameters:
+        current_gwp (ndarray): Year-1 GWP per scenario.
+        premium_growth_rate (ndarray): Annual growth rate percentage per scenario.
+        years (ndarray): Number of years, broadcastable against the scenarios.
+
+    Returns:
+        ndarray: Sum of GWP over the years.
+    """
+    rate = premium_growth_rate / 100
+    safe_rate = np.where(rate != 0, rate, 1.0)
+    factor = np.where(rate != 0, np.expm1(years * np.log1p(rate)) / safe_rate, years)
+    return current_gwp * factor
+
+
+def _finalize(required, upper_bound):
+    """
+    Clip required reductions at zero and mark those above the current ratio as unattainable.
+    """
+    required = np.maximum(required, 0.0)
+    return np.where(required <= upper_bound, required, np.nan)
+
+
+def solve_closed_form(scenarios, solve_for="loss_ratio_reduction", target_roi=None, target_payback=None):
+    """
+    Solve analytically for the reduction that reaches a target ROI or payback.
+
+    Annual savings are GWP times the total ratio improvement, and GWP grows geometrically,
+    so cumulative savings are a geometric series and the break-even improvement follows
+    directly. For a payback target, the smallest improvement that breaks even in any year
+    up to the target is taken.
+
+    Parameters and returns as in solve_required_reduction.
+    """
+    p = _inputs(scenarios, solve_for)
+    if target_roi is not None:
+        period = p["analysis_period"]
+        total_investment = p["initial_investment"] + p["ongoing_costs"] * period
+        premiums = cumulative_premiums(p["current_gwp"], p["premium_growth_rate"], period)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            improvement = 100 * (target_roi / 100 * total_investment + p["ongoing_costs"] * period) / premiums
+        # With nothing invested, ROI is reported as 0 whatever the improvement
+        improvement = np.where(total_investment != 0, improvement, np.where(target_roi <= 0, 0.0, np.inf))
+    else:
+        years = np.arange(1, int(target_payback) + 1)
+        premiums = cumulative_premiums(p["current_gwp"][:, None], p["premium_growth_rate"][:, None], years)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            per_year = 100 * (p["initial_investment"][:, None] + p["ongoing_costs"][:, None] * years) / premiums
+        improvement = np.nan_to_num(per_year, nan=np.inf).min(axis=1, initial=np.inf)
+    return _finalize(improvement - p["other_reduction"], p["upper_bound"])
+
+
+def bisect_increasing(condition, low, high, tol=1e-9, max_iter=100):
+    """
+    Find, element-wise, the smallest x in [low, high] for which condition(x) holds.
+
+    condition must be monotone: once true for some x, true for every larger x.
+
+    Parameters:
+        condition (callable): Maps an array of candidates to a boolean array.
+        low (ndarray): Lower bounds.
+        high (ndarray): Upper bounds.
+        tol (float): Width at which the bracket is accepted.
+        max_iter (int): Maximum number of halvings.
+
+    Returns:
+        ndarray: Solutions (the bracket's upper end), low where condition(low) already holds,
+        NaN where condition(high) does not.
+    """
+    low, high = np.broadcast_arrays(np.asarray(low, dtype=np.float64), np.asarray(high, dtype=np.float64))
+    at_low, at_high = condition(low), condition(high)
+    lo, hi = low.copy(), high.copy()
+    active = ~at_low & at_high
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        mid = (lo + hi) / 2
+        met = condition(mid)
+        hi = np.where(active & met, mid, hi)
+        lo = np.where(active & ~met, mid, lo)
+        active &= (hi - lo) > tol
+    return np.where(at_low, low, np.where(at_high, hi, np.nan))
+
+
+def solve_bisection(scenarios, solve_for="loss_ratio_reduction", target_roi=None, target_payback=None, tol=1e-9):
+    """
+    Solve for the reduction by vectorized bisection over the full projection.
+
+    Works for any projection in which the metric improves monotonically with the
+    reduction; each step evaluates every scenario in one project_financials_arrays pass.
+
+    Parameters and returns as in solve_required_reduction.
+    """
+    p = _inputs(scenarios, solve_for)
+    period = _column(scenarios, "analysis_period").astype(np.int64)
+    if target_payback is not None:
+        period = np.full(len(scenarios), int(target_payback))
+    current_loss_ratio = _column(scenarios, "current_loss_ratio")
+    current_expense_ratio = _column(scenarios, "current_expense_ratio")
+    reductions = {name: _column(scenarios, name) for name in SOLVE_FOR}
+    suffix = "_salesforce" if p["salesforce"] else ""
+
+    def condition(candidate):
+        values = dict(reductions, **{solve_for: candidate})
+        _, summary = project_financials_arrays(
+            p["current_gwp"], p["premium_growth_rate"], current_loss_ratio, current_expense_ratio,
+            current_loss_ratio - values["loss_ratio_reduction"],
+            current_expense_ratio - values["expense_ratio_reduction"],
+            period, _column(scenarios, "ongoing_costs"), p["initial_investment"],
+            values["loss_ratio_reduction_salesforce"], values["expense_ratio_reduction_salesforce"],
+            _column(scenarios, "ongoing_costs_salesforce"),
+        )
+        if target_roi is not None:
+            return summary["roi" + suffix] >= target_roi
+        return summary["payback_period" + suffix] <= target_payback  # NaN (not achieved) compares False
+
+    return bisect_increasing(condition, np.zeros(len(scenarios)), p["upper_bound"], tol=tol)
+
+
+def solve_required_reduction(
+    scenarios, solve_for="loss_ratio_reduction", target_roi=None, target_payback=None, method="closed_form"
+):
+    """
+    Find the ratio reduction each scenario needs to reach a target ROI or payback period.
+
+    Parameters:
+        scenarios (DataFrame or dict): Scenario inputs named as in project_financials_batch,
+            with loss_ratio_reduction / expense_ratio_reduction columns. The column being
+            solved for is ignored.
+        solve_for (str): One of SOLVE_FOR.
+        target_roi (float): Target ROI percentage over the analysis period.
+        target_payback (int): Target payback period in years.
+        method (str): "closed_form" or "bisection".
+
+    Returns:
+        Series: Required reduction (percentage points) per scenario; 0 where the target is
+        met without it, NaN where it cannot be met without reducing the ratio below zero.
+    """
+    if solve_for not in SOLVE_FOR:
+        raise ValueError(f"Cannot solve for '{solve_for}'. Expected one of: {', '.join(SOLVE_FOR)}")
+    if (target_roi is None) == (target_payback is None):
+        raise ValueError("Specify exactly one of target_roi and target_payback.")
+    if target_payback is not None and target_payback < 1:
+        raise ValueError("target_payback must be at least one year.")
+
+    scenarios = pd.DataFrame(scenarios)
+    solvers = {"closed_form": solve_closed_form, "bisection": solve_bisection}
+    if method not in solvers:
+        raise ValueError(f"Unknown method '{method}'. Expected 'closed_form' or 'bisection'.")
+    required = solvers[method](scenarios, solve_for, target_roi=target_roi, target_payback=target_payback)
+    return pd.Series(required, index=scenarios.index, name=f"required_{solve_for}")
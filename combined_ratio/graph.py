@@ -0,0 +1,167 @@
+import inspect
+import sys
+import time
+
+
+# --- Helper Functions ---
+def same_value(a, b):
+    """
+    Whether a recomputed value equals the previous one, so nodes downstream can be reused.
+
+    Scalars, strings and tuples compare by value and NumPy arrays element-wise (NaN equal
+    to NaN); any other object is only the same if it is the identical object.
+    """
+    if a is b:
+        return True
+    if type(a) is not type(b):
+        return False
+    if a is None or isinstance(a, (bool, int, float, complex, str, bytes)):
+        return a == b
+    if isinstance(a, tuple):
+        return len(a) == len(b) and all(same_value(x, y) for x, y in zip(a, b))
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(a, np.ndarray):
+        return a.shape == b.shape and a.dtype == b.dtype and bool(np.array_equal(a, b, equal_nan=a.dtype.kind in "fc"))
+    return False
+
+
+# --- Dependency Graph ---
+class Graph:
+    """
+    Derived values (nodes), each computed by a function of inputs and other nodes.
+
+    A node's dependencies are its function's parameter names; a dependency that is not a
+    node is an input.
+
+    Parameters:
+        nodes (dict): Initial nodes as name -> (function, dependency names).
+    """
+
+    def __init__(self, nodes=None):
+        self.nodes = dict(nodes or {})
+
+    def node(self, function=None, name=None):
+        """
+        Register a function as a node, named after the function unless name is given.
+        Usable as a decorator with or without arguments.
+        """
+        def register(function):
+            self.nodes[name or function.__name__] = (function, tuple(inspect.signature(function).parameters))
+            return function
+
+        return register(function) if function is not None else register
+
+    def extend(self):
+        """
+        Copy of the graph to which further nodes can be added.
+        """
+        return Graph(self.nodes)
+
+    def inputs(self):
+        """
+        Names the nodes depend on that are not nodes themselves.
+        """
+        return {dep for _, deps in self.nodes.values() for dep in deps if dep not in self.nodes}
+
+    def downstream(self, names):
+        """
+        Nodes that depend, directly or transitively, on any of names.
+        """
+        affected = set()
+        frontier = set(names)
+        while frontier:
+            frontier = {
+                node for node, (_, deps) in self.nodes.items()
+                if node not in affected and frontier.intersection(deps)
+            }
+            affected |= frontier
+        return affected
+
+
+class Evaluator:
+    """
+    Evaluates graph nodes on demand, recomputing only those whose dependencies changed.
+
+    Each input and node carries a version that is bumped when its value changes. A node
+    remembers the versions it was computed from and is reused while they are unchanged;
+    a recomputed node whose value comes out the same keeps its version, so its dependents
+    are reused as well.
+
+    Parameters:
+        graph (Graph): Nodes to evaluate.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self._inputs = {}
+        self._values = {}
+        self._versions = {}
+        self._computed_from = {}
+        self._checked = {}
+        self.run = 0
+        self.changed_inputs = []
+        self.recomputed = []
+        self.seconds = {}
+        self.counts = {}
+
+    def update(self, inputs):
+        """
+        Start a new run with the given input values.
+
+        Parameters:
+            inputs (dict): Input values; inputs not given keep their previous value.
+
+        Returns:
+            list: Names of the inputs whose value changed.
+        """
+        self.run += 1
+        self.changed_inputs = []
+        self.recomputed = []
+        for name, value in inputs.items():
+            if name not in self._inputs or not same_value(self._inputs[name], value):
+                self._inputs[name] = value
+                self._versions[name] = self._versions.get(name, 0) + 1
+                self.changed_inputs.append(name)
+        return self.changed_inputs
+
+    def __getitem__(self, name):
+        if name not in self.graph.nodes:
+            if name not in self._inputs:
+                raise KeyError(f"'{name}' is neither a node nor an input that has been set")
+            return self._inputs[name]
+        if self._checked.get(name) == self.run:
+            return self._values[name]
+
+        function, deps = self.graph.nodes[name]
+        args = [self[dep] for dep in deps]
+        versions = tuple(self._versions[dep] for dep in deps)
+        if self._computed_from.get(name) != versions:
+            start = time.perf_counter()
+            value = function(*args)
+            self.seconds[name] = time.perf_counter() - start
+            self.counts[name] = self.counts.get(name, 0) + 1
+            self.recomputed.append(name)
+            if name not in self._values or not same_value(self._values[name], value):
+                self._values[name] = value
+                self._versions[name] = self._versions.get(name, 0) + 1
+            self._computed_from[name] = versions
+        self._checked[name] = self.run
+        return self._values[name]
+
+    def stats(self):
+        """
+        Instrumentation for the current run.
+
+        Returns:
+            dict: Changed inputs, nodes recomputed (in evaluation order) and reused, and
+            per-node computation counts and last computation seconds.
+        """
+        evaluated = [name for name, run in self._checked.items() if run == self.run]
+        return {
+            "run": self.run,
+            "changed_inputs": list(self.changed_inputs),
+            "recomputed": list(self.recomputed),
+            "reused": [name for name in evaluated if name not in self.recomputed],
+            "counts": dict(self.counts),
+            "seconds": dict(self.seconds),
+        }
@@ -0,0 +1,218 @@
+import functools
+import os
+import re
+
+# --- Configurations ---
+HISTORY_TOKEN_BUDGET = int(os.getenv("CALCULATOR_HISTORY_TOKEN_BUDGET", "2000"))
+SUMMARY_TOKEN_BUDGET = int(os.getenv("CALCULATOR_HISTORY_SUMMARY_BUDGET", "300"))
+# "extractive" (no API calls) or "assistant" (the model writes the summary)
+HISTORY_SUMMARIZER = os.getenv("CALCULATOR_HISTORY_SUMMARIZER", "extractive")
+
+# Tokens added per message and for priming the reply, per OpenAI's chat format guidance
+MESSAGE_OVERHEAD_TOKENS = 4
+REPLY_PRIMING_TOKENS = 3
+
+# When the window overflows, older turns are folded until the recent window uses at most
+# this share of the space left for it, so the summary is not rebuilt on every turn.
+WINDOW_REFILL_FRACTION = 0.6
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+
+# --- Token Counting ---
+@functools.lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:  # tiktoken is optional; fall back to the ~4 characters per token rule
+        return None
+
+
+@functools.lru_cache(maxsize=4096)
+def count_tokens(text):
+    """
+    Count the tokens in text with tiktoken when it is installed, else estimate them.
+
+    Parameters:
+        text (str): Text to measure.
+
+    Returns:
+        int: Token count.
+    """
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return (len(text) + 3) // 4
+
+
+def count_message_tokens(messages):
+    """
+    Count the tokens a list of chat messages costs as a request.
+    """
+    return REPLY_PRIMING_TOKENS + sum(MESSAGE_OVERHEAD_TOKENS + count_tokens(m["content"]) for m in messages)
+
+
+# --- Summarizers ---
+# A summarizer folds turns into the running summary: summarizer(previous_summary, turns,
+# max_tokens) returns the new summary text (previous_summary is None for the first fold).
+def extractive_summary(previous_summary, turns, max_tokens):
+    """
+    Summarize turns by keeping the first sentence of each, newest lines first within max_tokens.
+
+    Costs no API calls, so it is the default summarizer.
+    """
+    lines = previous_summary.splitlines() if previous_summary else []
+    for turn in turns:
+        first_sentence = re.split(r"(?<=[.!?])\s", " ".join(turn["content"].split()), maxsplit=1)[0]
+        words = first_sentence.split(" ")
+        lines.append(f"- {turn['role']}: {' '.join(words[:40])}{' ...' if len(words) > 40 else ''}")
+
+    kept, used = [], 0
+    for line in reversed(lines):
+        used += count_tokens(line) + 1
+        if used > max_tokens:
+            break
+        kept.append(line)
+    return "\n".join(reversed(kept))
+
+
+def make_assistant_summarizer(client):
+    """
+    Build a summarizer that asks the assistant model to condense the conversation.
+
+    Parameters:
+        client (AssistantClient): Client used for the summary requests (replies are cached).
+
+    Returns:
+        callable: Summarizer for ConversationHistory.
+    """
+    def summarize(previous_summary, turns, max_tokens):
+        transcript = "\n".join(f"{turn['role']}: {turn['content']}" for turn in turns)
+        if previous_summary:
+            transcript = f"Earlier summary:\n{previous_summary}\n\nLater messages:\n{transcript}"
+        words = max(20, int(max_tokens * 0.75))
+        summary = client.complete([
+            {"role": "system", "content": (
+                f"Summarize this conversation in at most {words} words. Keep every number, "
+                "financial metric and user preference that was mentioned."
+            )},
+            {"role": "user", "content": transcript},
+        ])
+        # Guard the budget even if the model ignores the length limit
+        return extractive_summary(None, [{"role": "summary", "content": summary}], max_tokens) \
+            if count_tokens(summary) > max_tokens else summary
+
+    return summarize
+
+
+class ConversationHistory:
+    """
+    Keeps assistant requests within a token budget by folding older turns into a summary.
+
+    The request is the system prompt, a summary message for folded turns and the most
+    recent turns. The summary is extended incrementally as more turns are folded and is
+    reused until the recent window overflows again.
+
+    Parameters:
+        budget (int): Maximum tokens per request.
+        summary_budget (int): Maximum tokens for the summary message.
+        summarizer (callable): See extractive_summary.
+    """
+
+    def __init__(self, budget=HISTORY_TOKEN_BUDGET, summary_budget=SUMMARY_TOKEN_BUDGET, summarizer=extractive_summary):
+        self.budget = budget
+        self.summary_budget = summary_budget
+        self.summarizer = summarizer
+        self._folded = 0
+        self._folded_fingerprint = hash(())
+        self._summary = None
+        self.summaries_built = 0
+        self.dropped_turns = 0
+        self.last_stats = None
+
+    def _fingerprint(self, turns):
+        return hash(tuple((turn["role"], turn["content"]) for turn in turns))
+
+    def _sync(self, turns):
+        # Start over if the conversation no longer begins with the folded turns
+        if self._folded > len(turns) or self._fingerprint(turns[:self._folded]) != self._folded_fingerprint:
+            self._folded, self._folded_fingerprint, self._summary = 0, hash(()), None
+
+    def trim(self, messages, max_turns):
+        """
+        Drop the oldest turns from messages, in place, keeping at most max_turns after the system prompt.
+
+        Dropped turns are folded into the summary first if they are not already, so later
+        requests still carry their gist.
+
+        Parameters:
+            messages (list): Full conversation, starting with the system prompt.
+            max_turns (int): Turns to keep.
+
+        Returns:
+            int: Number of turns dropped.
+        """
+        start = 1 if messages and messages[0]["role"] == "system" else 0
+        turns = messages[start:]
+        drop = len(turns) - max(max_turns, 1)
+        if drop <= 0:
+            return 0
+
+        self._sync(turns)
+        if drop > self._folded:
+            self._summary = self.summarizer(self._summary, turns[self._folded:drop], self.summary_budget)
+            self._folded = drop
+            self.summaries_built += 1
+        del messages[start:start + drop]
+        self._folded -= drop
+        self._folded_fingerprint = self._fingerprint(messages[start:start + self._folded])
+        self.dropped_turns += drop
+        return drop
+
+    def compact(self, messages):
+        """
+        Build the request for messages within the token budget.
+
+        Parameters:
+            messages (list): Full conversation, starting with the system prompt.
+
+        Returns:
+            tuple: Request messages and a stats dict with the request's token count
+            ("tokens"), the full history's ("full_tokens") and the number of folded turns.
+        """
+        system = [messages[0]] if messages and messages[0]["role"] == "system" else []
+        turns = messages[len(system):]
+        self._sync(turns)
+
+        def request_for(folded, summary):
+            summary_message = [{"role": "system", "content": SUMMARY_PREFIX + summary}] if summary else []
+            return system + summary_message + turns[folded:]
+
+        request = request_for(self._folded, self._summary)
+        if count_message_tokens(request) > self.budget:
+            # Fold the oldest turns until the rest fits in a fraction of the window budget,
+            # always keeping the latest turn
+            window_budget = self.budget - count_message_tokens(system) - self.summary_budget - MESSAGE_OVERHEAD_TOKENS
+            target = max(window_budget * WINDOW_REFILL_FRACTION, 0)
+            folded = len(turns) - 1
+            used = count_message_tokens(turns[folded:])
+            while folded > self._folded and used + MESSAGE_OVERHEAD_TOKENS + count_tokens(turns[folded - 1]["content"]) <= target:
+                folded -= 1
+                used += MESSAGE_OVERHEAD_TOKENS + count_tokens(turns[folded]["content"])
+
+            if folded > self._folded:
+                self._summary = self.summarizer(self._summary, turns[self._folded:folded], self.summary_budget)
+                self._folded = folded
+                self._folded_fingerprint = self._fingerprint(turns[:folded])
+                self.summaries_built += 1
+            request = request_for(self._folded, self._summary)
+
+        self.last_stats = {
+            "tokens": count_message_tokens(request),
+            "full_tokens": count_message_tokens(messages),
+            "messages": len(request),
+            "folded_turns": self._folded,
+        }
+        return request, self.last_stats
@@ -0,0 +1,381 @@
+import argparse
+import contextlib
+import csv
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# --- Configurations ---
+# Rows read from an extract at a time. Peak memory grows with this, not with file size.
+CHUNK_SIZE = int(os.getenv("CALCULATOR_INGEST_CHUNK_SIZE", "250000"))
+# Bytes read from a file at a time. The CSV reader runs a few dozen such blocks ahead.
+READ_BUFFER_BYTES = 1 << 20
+
+# --- Column Layout ---
+# Extract rows are summed per line of business and period. The period is read from a
+# period column (e.g. an accounting year) or derived from a date column.
+KEY_COLUMNS = ["line", "period"]
+DATE_COLUMN = "date"
+# Amounts summed per line and period. Each extract carries the ones it has: a premium
+# extract written and earned premium (often expenses too), a claims extract incurred losses.
+MEASURE_COLUMNS = ["written_premium", "earned_premium", "incurred_loss", "expenses"]
+
+# Period lengths for date columns, as pandas period frequencies, and how periods of
+# each length are written (2023, 2023Q1, 2023-01), which a period column must follow
+# to be summed with date-derived periods
+PERIOD_FREQUENCIES = {"year": "Y", "quarter": "Q", "month": "M"}
+PERIOD_PATTERNS = {"year": r"\d{4}", "quarter": r"\d{4}Q[1-4]", "month": r"\d{4}-(?:0[1-9]|1[0-2])"}
+EXPENSE_BASES = ("earned", "written")
+
+RATIO_COLUMNS = ["loss_ratio", "expense_ratio", "combined_ratio"]
+
+
+# --- Reading ---
+def _csv_columns(source):
+    """
+    A CSV extract's column names, from its header line. A file-like source is rewound afterwards.
+    """
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            header = f.readline()
+    else:
+        header = source.readline()
+        source.seek(0)
+    return next(csv.reader([header.decode("utf-8-sig").rstrip("\r\n")]))
+
+
+def _rebatch(batches, rows):
+    """
+    Regroup record batches into tables of rows rows (the last may be shorter).
+    """
+    import pyarrow as pa
+
+    pending, pending_rows = [], 0
+    for batch in batches:
+        pending.append(batch)
+        pending_rows += batch.num_rows
+        while pending_rows >= rows:
+            table = pa.Table.from_batches(pending)
+            yield table.slice(0, rows)
+            pending = table.slice(rows).to_batches()
+            pending_rows -= rows
+    if pending_rows:
+        yield pa.Table.from_batches(pending)
+
+
+def read_chunks(source, chunk_size=CHUNK_SIZE, columns=None, name=None):
+    """
+    Stream an extract from CSV, Parquet or Arrow IPC, reading only the columns used here.
+
+    Parameters:
+        source (str or file): Path or seekable file-like object (e.g. a Streamlit upload).
+        chunk_size (int): Rows per chunk (Arrow IPC files keep the batches they were written with).
+        columns (dict): Extract column names to rename to the names above, e.g. {"LOB": "line"}.
+        name (str): File name used to pick the format; defaults to the path or source.name.
+
+    Yields:
+        DataFrame: One chunk with the extract's key, date and measure columns, renamed.
+    """
+    import pyarrow as pa
+
+    from .export import infer_format
+
+    columns = columns or {}
+    wanted = set(KEY_COLUMNS + MEASURE_COLUMNS + [DATE_COLUMN])
+    use = lambda column: columns.get(column, column) in wanted
+    fmt = infer_format(name or getattr(source, "name", None) or str(source))
+    with contextlib.ExitStack() as stack:
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+
+            # Without pre-buffering, the reader keeps only the row group being decoded
+            parquet = pq.ParquetFile(source, pre_buffer=False, buffer_size=READ_BUFFER_BYTES)
+            batches = parquet.iter_batches(
+                batch_size=chunk_size, columns=[column for column in parquet.schema_arrow.names if use(column)]
+            )
+        elif fmt == "arrow":
+            reader = pa.ipc.open_file(stack.enter_context(pa.memory_map(source)) if isinstance(source, str) else source)
+            selected = [column for column in reader.schema.names if use(column)]
+            batches = (reader.get_batch(i).select(selected) for i in range(reader.num_record_batches))
+        else:
+            import pyarrow.csv as pv
+
+            names = _csv_columns(source)
+            # Keys stay text however they look and amounts are parsed straight to floats
+            types = {
+                column: pa.float64() if columns.get(column, column) in MEASURE_COLUMNS else pa.string()
+                for column in names if columns.get(column, column) in KEY_COLUMNS + MEASURE_COLUMNS
+            }
+            # The reader parses a few dozen blocks ahead, so blocks are kept small and
+            # regrouped into chunks
+            batches = _rebatch(pv.open_csv(
+                source,
+                read_options=pv.ReadOptions(use_threads=False, block_size=READ_BUFFER_BYTES),
+                convert_options=pv.ConvertOptions(
+                    include_columns=[column for column in names if use(column)], column_types=types, strings_can_be_null=True
+                ),
+            ), chunk_size)
+        for batch in batches:
+            yield batch.to_pandas(date_as_object=False).rename(columns=columns)
+
+
+# --- Aggregation ---
+class RatioAggregator:
+    """
+    Running sums of premiums, losses and expenses per line of business and period.
+
+    Chunks of any extract are added one at a time and only the sums are kept, one row per
+    line and period, so memory stays bounded however many rows are added.
+
+    Parameters:
+        period_frequency (str): Period length when periods come from a date column:
+            "year", "quarter" or "month".
+    """
+
+    def __init__(self, period_frequency="year"):
+        if period_frequency not in PERIOD_FREQUENCIES:
+            raise ValueError(f"period_frequency must be one of: {', '.join(PERIOD_FREQUENCIES)}")
+        self.period_frequency = period_frequency
+        self._totals = None
+        # A period column value not written like the date-derived periods, and whether
+        # any periods were derived from dates: together they would never match
+        self._unmatched_period = None
+        self._dated = False
+        self.rows = 0
+        self.skipped_rows = 0
+
+    def add(self, chunk):
+        """
+        Add a chunk of extract rows to the sums.
+
+        Rows without a line or period are counted in skipped_rows; missing amounts count as zero.
+
+        Parameters:
+            chunk (DataFrame): Rows with a line column, a period or date column and at
+                least one of MEASURE_COLUMNS.
+
+        Raises:
+            ValueError: If the extracts mix a period column and a date column whose periods
+                are written differently, for example 2023 and 2023Q1 (see PERIOD_PATTERNS).
+        """
+        measures = [name for name in MEASURE_COLUMNS if name in chunk]
+        if "line" not in chunk or ("period" not in chunk and DATE_COLUMN not in chunk):
+            raise ValueError("Extract needs a line column and a period or date column.")
+        if not measures:
+            raise ValueError(f"Extract has none of the amount columns: {', '.join(MEASURE_COLUMNS)}")
+
+        if "period" in chunk:
+            period = chunk["period"]
+        else:
+            self._dated = True
+            dates = chunk[DATE_COLUMN]
+            if not pd.api.types.is_datetime64_any_dtype(dates):
+                dates = pd.to_datetime(dates, errors="coerce")
+            period = dates.dt.to_period(PERIOD_FREQUENCIES[self.period_frequency])
+        partial = chunk[measures].groupby([chunk["line"], period.rename("period")], sort=False).sum()
+        # Keys are kept as text, so a date-derived 2023 and a period column's 2023 match
+        partial.index = pd.MultiIndex.from_arrays(
+            [partial.index.get_level_values(name).astype(str) for name in KEY_COLUMNS], names=KEY_COLUMNS
+        )
+        if "period" in chunk and self._unmatched_period is None:
+            periods = partial.index.get_level_values("period").unique()
+            unmatched = periods[~periods.str.fullmatch(PERIOD_PATTERNS[self.period_frequency])]
+            self._unmatched_period = unmatched[0] if len(unmatched) else None
+        if self._dated and self._unmatched_period is not None:
+            example = pd.Period("2023-01-01", PERIOD_FREQUENCIES[self.period_frequency])
+            raise ValueError(
+                f"Period {self._unmatched_period!r} from a period column does not match the "
+                f"{self.period_frequency} periods derived from dates (such as {str(example)!r}); "
+                f"set the period frequency to match the period column."
+            )
+
+        self.rows += len(chunk)
+        self.skipped_rows += len(chunk) - int(chunk["line"].notna().mul(period.notna()).sum())
+        # Measures the chunk does not carry stay NaN, and line-periods only another
+        # extract covered keep NaN for this one's measures, rather than a false zero
+        partial = partial.reindex(columns=MEASURE_COLUMNS)
+        self._totals = partial if self._totals is None else self._totals.add(partial, fill_value=0.0)
+
+    def totals(self):
+        """
+        Returns:
+            DataFrame: Sums indexed by line and period (both text, sorted), with a column
+            per MEASURE_COLUMNS entry; NaN where no extract carried the measure for that
+            line and period.
+        """
+        if self._totals is None:
+            raise ValueError("No extract rows have been added.")
+        return self._totals.sort_index()
+
+
+def ingest(sources, chunk_size=CHUNK_SIZE, columns=None, period_frequency="year", progress=None):
+    """
+    Stream premium, claims and expense extracts into per line and period sums.
+
+    Parameters:
+        sources (iterable): Paths or file-like objects, in any mix of CSV, Parquet and Arrow IPC.
+        chunk_size (int): Rows read at a time.
+        columns (dict): Extract column names to rename (see read_chunks).
+        period_frequency (str): Period length for date columns (see RatioAggregator).
+        progress (callable): Called with the rows read so far after each chunk.
+
+    Returns:
+        RatioAggregator: The sums; see RatioAggregator.totals.
+    """
+    aggregator = RatioAggregator(period_frequency)
+    for source in sources:
+        if hasattr(source, "seek"):
+            source.seek(0)  # an upload may have been read on an earlier rerun
+        try:
+            for chunk in read_chunks(source, chunk_size, columns):
+                aggregator.add(chunk)
+                if progress is not None:
+                    progress(aggregator.rows)
+        except ValueError as e:
+            raise ValueError(f"{getattr(source, 'name', source)}: {e}") from e
+    return aggregator
+
+
+# --- Ratios ---
+def ratio_table(totals, by="line", expense_basis="earned"):
+    """
+    Roll the sums up and compute loss, expense and combined ratios (%).
+
+    The loss ratio is incurred losses over earned premium. The expense ratio is expenses
+    over earned premium, or over written premium for expense_basis="written" (the
+    statutory basis). Each ratio is taken over the line-periods where both its amount and
+    its premium are known, so a line the claims extract did not cover counts neither its
+    losses nor its premium. Ratios are NaN where that premium is zero or no line-period
+    has both.
+
+    Parameters:
+        totals (DataFrame): From RatioAggregator.totals.
+        by (str or list): "line", "period", both as a list, or None for the whole book.
+        expense_basis (str): "earned" or "written".
+
+    Returns:
+        DataFrame: Sums and RATIO_COLUMNS per group (one row for by=None).
+    """
+    if expense_basis not in EXPENSE_BASES:
+        raise ValueError(f"expense_basis must be one of: {', '.join(EXPENSE_BASES)}")
+
+    def roll_up(frame):
+        if by is None:
+            return frame.sum(min_count=1).to_frame("All lines").T
+        return frame.groupby(level=by, sort=True).sum(min_count=1)
+
+    table = roll_up(totals)
+    premium = totals[f"{expense_basis}_premium"]
+    # Amounts and premiums of the line-periods where both are known
+    matched = roll_up(pd.DataFrame({
+        "incurred_loss": totals["incurred_loss"].where(totals["earned_premium"].notna()),
+        "loss_premium": totals["earned_premium"].where(totals["incurred_loss"].notna()),
+        "expenses": totals["expenses"].where(premium.notna()),
+        "expense_premium": premium.where(totals["expenses"].notna()),
+    }, index=totals.index))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        loss_premium = matched["loss_premium"].to_numpy()
+        expense_premium = matched["expense_premium"].to_numpy()
+        table["loss_ratio"] = np.where(loss_premium != 0, matched["incurred_loss"].to_numpy() / loss_premium * 100, np.nan)
+        table["expense_ratio"] = np.where(expense_premium != 0, matched["expenses"].to_numpy() / expense_premium * 100, np.nan)
+    table["combined_ratio"] = table["loss_ratio"] + table["expense_ratio"]
+    return table
+
+
+def calculator_inputs(totals, period=None, line=None, units=1e6, expense_basis="earned"):
+    """
+    The calculator's current financial metrics for one period, from the sums.
+
+    Parameters:
+        totals (DataFrame): From RatioAggregator.totals.
+        period (str): Period to use; defaults to the latest.
+        line (str): Line of business to use; defaults to the whole book.
+        units (float): Extract amounts per million dollars (1e6 for amounts in dollars).
+        expense_basis (str): See ratio_table.
+
+    Returns:
+        dict: current_gwp (written premium, or earned premium if no extract had written
+        premium, in millions), current_loss_ratio and current_expense_ratio, ready for
+        project_financials; None where the extracts lack the amounts.
+    """
+    periods = totals.index.get_level_values("period")
+    period = periods.max() if period is None else str(period)
+    selected = totals[periods == period]
+    if line is not None:
+        selected = selected[selected.index.get_level_values("line") == line]
+    if selected.empty:
+        raise ValueError(f"No extract rows for period {period}" + (f" and line {line}." if line is not None else "."))
+
+    book = ratio_table(selected, by=None, expense_basis=expense_basis).iloc[0]
+    premium = book["written_premium"] if not np.isnan(book["written_premium"]) else book["earned_premium"]
+    known = lambda value: None if np.isnan(value) else float(value)
+    return {
+        "current_gwp": known(premium / units),
+        "current_loss_ratio": known(book["loss_ratio"]),
+        "current_expense_ratio": known(book["expense_ratio"]),
+    }
+
+
+def report_progress(rows):
+    """
+    Overwrite a progress line on stderr.
+    """
+    print(f"\r{rows:,} rows", end="", file=sys.stderr, flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m combined_ratio.ingest",
+        description=(
+            "Stream premium, claims and expense extracts (CSV, Parquet or Arrow) and derive loss, "
+            "expense and combined ratios per line of business and period. Prints the calculator's "
+            "current metrics as JSON, or the ratio table as CSV with --by."
+        ),
+    )
+    parser.add_argument("extracts", nargs="+", help="Extract files with line, period (or date) and amount columns.")
+    parser.add_argument("--rename", action="append", default=[], metavar="OLD=NEW", help=f"Rename an extract column to one of: {', '.join(KEY_COLUMNS + [DATE_COLUMN] + MEASURE_COLUMNS)}.")
+    parser.add_argument("--period-frequency", choices=list(PERIOD_FREQUENCIES), default="year", help="Period length for date columns (default: %(default)s).")
+    parser.add_argument("--expense-basis", choices=EXPENSE_BASES, default="earned", help="Premium the expense ratio is measured against (default: %(default)s).")
+    parser.add_argument("--by", choices=["line", "period", "line,period"], help="Print the ratio table by line, period or both instead.")
+    parser.add_argument("--period", help="Period for the calculator metrics (default: the latest).")
+    parser.add_argument("--line", help="Line of business for the calculator metrics (default: all lines).")
+    parser.add_argument("--units", type=float, default=1e6, help="Extract amounts per million dollars (default: %(default)g).")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Rows read at a time (default: %(default)s).")
+    args = parser.parse_args(argv)
+    try:
+        columns = dict(rename.split("=", 1) for rename in args.rename)
+    except ValueError:
+        print("error: --rename takes OLD=NEW", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    try:
+        aggregator = ingest(args.extracts, args.chunk_size, columns, args.period_frequency, report_progress)
+        totals = aggregator.totals()
+        if args.by:
+            output = ratio_table(totals, args.by.split(",") if "," in args.by else args.by, args.expense_basis)
+        else:
+            output = calculator_inputs(totals, args.period, args.line, args.units, args.expense_basis)
+    except (OSError, ValueError) as e:
+        print(f"\nerror: {e}", file=sys.stderr)
+        return 1
+    seconds = time.perf_counter() - start
+    print(
+        f"\rRead {aggregator.rows:,} rows in {seconds:.1f} s ({aggregator.rows / seconds:,.0f} rows/s), "
+        f"{len(totals):,} line-periods, {aggregator.skipped_rows:,} rows without a line or period",
+        file=sys.stderr,
+    )
+
+    if args.by:
+        output.to_csv(sys.stdout)
+    else:
+        print(json.dumps(output, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
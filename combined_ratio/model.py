@@ -0,0 +1,263 @@
+import numpy as np
+import pandas as pd
+
+from .batch import _operating_profit, _payback_period, _premium_path, _salesforce_savings
+from .core import ProjectionResult, calculate_combined_ratio, calculate_new_ratios
+from .discounting import IRR_STATUS, discount_factors, irr
+from .graph import Graph
+
+# --- Calculator Graph ---
+# The calculator's derived values as graph nodes, so a changed input only recomputes
+# what depends on it: a cost input, for example, leaves the premium path, the operating
+# profit series and everything built from them untouched. Inputs are the app's sidebar
+# values, named as in project_financials plus ongoing_costs_salesforce /
+# ongoing_costs_other, the two ratio reductions, periods_per_year and discount_rate
+# (annual percentage, for the discounted metrics). The nodes share their arithmetic
+# with batch.project_financials_arrays, one step per node. With one period per year,
+# values match project_financials exactly; with more, the per-year series become
+# per-period series as in project_financials_arrays.
+MODEL = Graph()
+
+INPUTS = (
+    "current_gwp",
+    "premium_growth_rate",
+    "current_loss_ratio",
+    "current_expense_ratio",
+    "loss_ratio_reduction",
+    "expense_ratio_reduction",
+    "analysis_period",
+    "initial_investment",
+    "ongoing_costs_salesforce",
+    "ongoing_costs_other",
+    "loss_ratio_reduction_salesforce",
+    "expense_ratio_reduction_salesforce",
+    "periods_per_year",
+    "discount_rate",
+)
+
+
+# --- Ratios ---
+@MODEL.node
+def current_combined_ratio(current_loss_ratio, current_expense_ratio):
+    return calculate_combined_ratio(current_loss_ratio, current_expense_ratio)
+
+
+@MODEL.node
+def new_ratios(current_loss_ratio, loss_ratio_reduction, current_expense_ratio, expense_ratio_reduction):
+    return calculate_new_ratios(current_loss_ratio, loss_ratio_reduction, current_expense_ratio, expense_ratio_reduction)
+
+
+@MODEL.node
+def new_loss_ratio(new_ratios):
+    return new_ratios[0]
+
+
+@MODEL.node
+def new_expense_ratio(new_ratios):
+    return new_ratios[1]
+
+
+@MODEL.node
+def new_combined_ratio(new_loss_ratio, new_expense_ratio):
+    return calculate_combined_ratio(new_loss_ratio, new_expense_ratio)
+
+
+@MODEL.node
+def ongoing_costs(ongoing_costs_salesforce, ongoing_costs_other):
+    return ongoing_costs_salesforce + ongoing_costs_other
+
+
+# --- Per-Period Series ---
+@MODEL.node
+def premiums(current_gwp, premium_growth_rate, analysis_period, periods_per_year):
+    return _premium_path(current_gwp, premium_growth_rate, analysis_period * periods_per_year, periods_per_year)
+
+
+@MODEL.node
+def profit_current(premiums, current_loss_ratio, current_expense_ratio):
+    return _operating_profit(premiums, current_loss_ratio, current_expense_ratio)
+
+
+@MODEL.node
+def profit_new(premiums, new_loss_ratio, new_expense_ratio):
+    return _operating_profit(premiums, new_loss_ratio, new_expense_ratio)
+
+
+@MODEL.node
+def annual_savings(profit_current, profit_new):
+    return profit_new - profit_current
+
+
+@MODEL.node
+def cumulative_savings(annual_savings):
+    return np.cumsum(annual_savings)
+
+
+@MODEL.node
+def annual_savings_salesforce(
+    premiums, loss_ratio_reduction_salesforce, expense_ratio_reduction_salesforce, ongoing_costs_salesforce, periods_per_year
+):
+    savings = _salesforce_savings(premiums, loss_ratio_reduction_salesforce, expense_ratio_reduction_salesforce)
+    return savings - ongoing_costs_salesforce / periods_per_year
+
+
+@MODEL.node
+def cumulative_savings_salesforce(annual_savings_salesforce):
+    return np.cumsum(annual_savings_salesforce)
+
+
+# --- Summary Metrics ---
+def _payback(cash_flows, periods_per_year, interpolate=False):
+    """
+    Payback in years of a time-0 flow followed by per-period cash flows, as
+    batch._payback_period finds it for one scenario: None where it is not reached, a
+    whole year number with one period per year unless interpolated.
+    """
+    if len(cash_flows) < 2:
+        return None
+    cumulative_cash_flow = np.cumsum(cash_flows)[None, 1:]
+    value = float(_payback_period(
+        cumulative_cash_flow, -cash_flows[:1], np.ones(cumulative_cash_flow.shape, dtype=bool), periods_per_year, interpolate
+    )[0])
+    if np.isnan(value):
+        return None
+    return int(value) if periods_per_year == 1 and not interpolate else value
+
+
+@MODEL.node
+def cash_flows(annual_savings, ongoing_costs, initial_investment, periods_per_year):
+    # -initial_investment at time 0, then each period's savings net of ongoing costs
+    return np.concatenate([[-initial_investment], annual_savings - ongoing_costs / periods_per_year])
+
+
+@MODEL.node
+def cash_flows_salesforce(annual_savings_salesforce, initial_investment):
+    return np.concatenate([[-initial_investment], annual_savings_salesforce])
+
+
+@MODEL.node
+def payback_period(cash_flows, periods_per_year):
+    return _payback(cash_flows, periods_per_year)
+
+
+@MODEL.node
+def payback_period_salesforce(cash_flows_salesforce, periods_per_year):
+    return _payback(cash_flows_salesforce, periods_per_year)
+
+
+@MODEL.node
+def payback_period_interpolated(cash_flows, periods_per_year):
+    return _payback(cash_flows, periods_per_year, interpolate=True)
+
+
+@MODEL.node
+def payback_period_salesforce_interpolated(cash_flows_salesforce, periods_per_year):
+    return _payback(cash_flows_salesforce, periods_per_year, interpolate=True)
+
+
+@MODEL.node
+def total_investment(initial_investment, ongoing_costs, analysis_period):
+    return initial_investment + ongoing_costs * analysis_period
+
+
+@MODEL.node
+def total_investment_salesforce(initial_investment, ongoing_costs_salesforce, analysis_period):
+    return initial_investment + ongoing_costs_salesforce * analysis_period
+
+
+@MODEL.node
+def total_savings(cumulative_savings, ongoing_costs, analysis_period):
+    return (float(cumulative_savings[-1]) if analysis_period else 0) - (ongoing_costs * analysis_period)
+
+
+@MODEL.node
+def total_savings_salesforce(cumulative_savings_salesforce, analysis_period):
+    return float(cumulative_savings_salesforce[-1]) if analysis_period else 0
+
+
+@MODEL.node
+def roi(total_savings, total_investment):
+    return (total_savings / total_investment) * 100 if total_investment != 0 else 0
+
+
+@MODEL.node
+def roi_salesforce(total_savings_salesforce, total_investment_salesforce):
+    return (total_savings_salesforce / total_investment_salesforce) * 100 if total_investment_salesforce != 0 else 0
+
+
+# --- Discounted Cash Flow Metrics ---
+def _irr(cash_flows, periods_per_year):
+    """
+    IRR percentage and its IRR_STATUS name; the rate is None unless the solver converged.
+    """
+    rate, status = irr(cash_flows, periods_per_year)
+    return (float(rate[0]) if np.isfinite(rate[0]) else None), IRR_STATUS[status[0]]
+
+
+@MODEL.node
+def discounted_cash_flows(cash_flows, discount_rate, periods_per_year):
+    return cash_flows * discount_factors(discount_rate, len(cash_flows) - 1, periods_per_year)
+
+
+@MODEL.node
+def discounted_cash_flows_salesforce(cash_flows_salesforce, discount_rate, periods_per_year):
+    return cash_flows_salesforce * discount_factors(discount_rate, len(cash_flows_salesforce) - 1, periods_per_year)
+
+
+@MODEL.node
+def npv(discounted_cash_flows):
+    return float(discounted_cash_flows.sum())
+
+
+@MODEL.node
+def npv_salesforce(discounted_cash_flows_salesforce):
+    return float(discounted_cash_flows_salesforce.sum())
+
+
+@MODEL.node
+def irr_result(cash_flows, periods_per_year):
+    return _irr(cash_flows, periods_per_year)
+
+
+@MODEL.node
+def irr_result_salesforce(cash_flows_salesforce, periods_per_year):
+    return _irr(cash_flows_salesforce, periods_per_year)
+
+
+@MODEL.node
+def discounted_payback_period(discounted_cash_flows, periods_per_year):
+    return _payback(discounted_cash_flows, periods_per_year)
+
+
+@MODEL.node
+def discounted_payback_period_salesforce(discounted_cash_flows_salesforce, periods_per_year):
+    return _payback(discounted_cash_flows_salesforce, periods_per_year)
+
+
+# --- Tables ---
+def time_columns(n_periods, periods_per_year):
+    """
+    Leading columns of a per-period table: Year alone for annual periods, otherwise
+    Period (numbered from 1) and the Year it falls in.
+    """
+    if periods_per_year == 1:
+        return {"Year": range(1, n_periods + 1)}
+    return {"Period": range(1, n_periods + 1), "Year": np.arange(n_periods) // periods_per_year + 1}
+
+
+@MODEL.node
+def financial_df(
+    premiums, profit_current, profit_new, annual_savings, cumulative_savings,
+    annual_savings_salesforce, cumulative_savings_salesforce, periods_per_year
+):
+    series = (
+        premiums, profit_current, profit_new, annual_savings, cumulative_savings,
+        annual_savings_salesforce, cumulative_savings_salesforce,
+    )
+    data = time_columns(len(premiums), periods_per_year)
+    data.update((column, values) for (_, column), values in zip(ProjectionResult.SERIES, series))
+    return pd.DataFrame(data)
+
+
+# Nodes in the order of the tuple project_financials unpacks to
+PROJECTION_NODES = ProjectionResult.FIELDS
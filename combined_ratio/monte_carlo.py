@@ -0,0 +1,111 @@
+import numpy as np
+
+from .batch import project_financials_arrays
+
+# --- Distributions ---
+# An uncertain input is given as a tuple of a distribution name and its parameters,
+# e.g. ("triangular", 0.25, 0.5, 1.0). A plain number is treated as a fixed value.
+DISTRIBUTIONS = {
+    "fixed": lambda rng, size, value: np.full(size, float(value)),
+    "uniform": lambda rng, size, low, high: rng.uniform(low, high, size),
+    "triangular": lambda rng, size, low, mode, high: (
+        rng.triangular(low, mode, high, size) if low < high else np.full(size, float(mode))
+    ),
+    "normal": lambda rng, size, mean, std: rng.normal(mean, std, size),
+}
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+# --- Helper Functions ---
+def draw_samples(distribution, size, rng):
+    """
+    Draw samples for one uncertain input.
+
+    Parameters:
+        distribution (tuple or float): Distribution name and parameters, or a fixed value.
+        size (int): Number of samples to draw.
+        rng (Generator): NumPy random generator.
+
+    Returns:
+        ndarray: Samples of the input.
+    """
+    if np.isscalar(distribution):
+        distribution = ("fixed", distribution)
+    name, *params = distribution
+    if name not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution '{name}'. Expected one of: {', '.join(DISTRIBUTIONS)}")
+    return DISTRIBUTIONS[name](rng, size, *params)
+
+
+def _percentiles(values, percentiles):
+    """
+    Percentiles taken from the observed samples; infinite values map to None.
+    """
+    result = np.percentile(values, percentiles, method="inverted_cdf")
+    return {p: (float(v) if np.isfinite(v) else None) for p, v in zip(percentiles, result)}
+
+
+def simulate_financials(
+    current_gwp, current_loss_ratio, current_expense_ratio, analysis_period, ongoing_costs,
+    initial_investment, ongoing_costs_salesforce, loss_ratio_reduction, expense_ratio_reduction,
+    premium_growth_rate, salesforce_loss_share=0.0, salesforce_expense_share=0.0,
+    n_trials=100_000, chunk_size=25_000, percentiles=DEFAULT_PERCENTILES, seed=None
+):
+    """
+    Run a Monte Carlo simulation of project_financials over uncertain improvements.
+
+    The reductions and growth rate are drawn from their distributions and evaluated in
+    chunks of chunk_size trials, so the scenarios x years working arrays never exceed
+    one chunk; only the per-trial ROI and payback values are kept. Each input draws
+    from its own stream of the seed, so the results do not depend on chunk_size.
+
+    Parameters:
+        current_gwp, current_loss_ratio, current_expense_ratio, analysis_period, ongoing_costs,
+        initial_investment, ongoing_costs_salesforce: Fixed inputs as in project_financials.
+        loss_ratio_reduction (tuple or float): Distribution of the loss ratio reduction.
+        expense_ratio_reduction (tuple or float): Distribution of the expense ratio reduction.
+        premium_growth_rate (tuple or float): Distribution of the annual premium growth rate.
+        salesforce_loss_share (float): Share of the loss ratio reduction attributable to Salesforce.
+        salesforce_expense_share (float): Share of the expense ratio reduction attributable to Salesforce.
+        n_trials (int): Number of trials.
+        chunk_size (int): Number of trials evaluated per vectorized pass.
+        percentiles (sequence): Percentiles to report.
+        seed (int): Seed for reproducible draws.
+
+    Returns:
+        dict: ROI and payback percentiles and the probability of payback, for the total
+        investment and for Salesforce. Payback percentiles are None where payback is
+        not achieved within the analysis period.
+    """
+    loss_rng, expense_rng, growth_rng = (np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(3))
+    outcomes = {
+        name: np.empty(n_trials)
+        for name in ("roi", "payback_period", "roi_salesforce", "payback_period_salesforce")
+    }
+
+    for start in range(0, n_trials, chunk_size):
+        size = min(chunk_size, n_trials - start)
+        loss_reduction = draw_samples(loss_ratio_reduction, size, loss_rng)
+        expense_reduction = draw_samples(expense_ratio_reduction, size, expense_rng)
+        growth = draw_samples(premium_growth_rate, size, growth_rng)
+
+        _, summary = project_financials_arrays(
+            current_gwp, growth, current_loss_ratio, current_expense_ratio,
+            current_loss_ratio - loss_reduction, current_expense_ratio - expense_reduction,
+            analysis_period, ongoing_costs, initial_investment,
+            loss_reduction * salesforce_loss_share, expense_reduction * salesforce_expense_share,
+            ongoing_costs_salesforce,
+        )
+        for name, values in outcomes.items():
+            values[start:start + size] = summary[name]
+
+    results = {}
+    for suffix in ("", "_salesforce"):
+        payback = outcomes["payback_period" + suffix]
+        achieved = ~np.isnan(payback)
+        results["roi" + suffix] = _percentiles(outcomes["roi" + suffix], percentiles)
+        results["payback_period" + suffix] = _percentiles(np.where(achieved, payback, np.inf), percentiles)
+        results["probability_of_payback" + suffix] = float(achieved.mean()) if n_trials else 0.0
+    results["n_trials"] = n_trials
+    return results
@@ -0,0 +1,288 @@
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from .batch import IRR_STATUS_COLUMNS, SCENARIO_COLUMNS, project_financials_arrays, scenario_inputs, summary_columns
+
+# --- Configurations ---
+# Scenarios per task sent to a worker; large enough that a task is dominated by the
+# vectorized pass rather than by scheduling
+DEFAULT_SHARD_SIZE = 100_000
+# Worker processes when not given: CALCULATOR_WORKERS, else the CPUs this process may run on
+WORKERS = int(os.getenv("CALCULATOR_WORKERS", "0"))
+# project_financials_arrays options that may hold one row per scenario
+CURVE_OPTIONS = ("improvement_curve", "cost_curve")
+
+
+# --- Helper Functions ---
+def available_cpus():
+    """
+    Number of CPUs this process may run on.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+# --- Shared Blocks ---
+def _create_block(shape):
+    """
+    Allocate a float64 array in a new shared memory block.
+
+    Returns:
+        tuple: The SharedMemory block and an ndarray view of it.
+    """
+    block = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * 8, 1))
+    return block, np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+
+
+def _attach_block(name, shape):
+    # Pool workers share the parent's resource tracker, so attaching registers nothing
+    # new and the block is unlinked once, by the parent
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+
+
+def _shard_options(options, start, stop):
+    """
+    Options for rows [start, stop): per-scenario curves are cut to the shard's rows,
+    shared ones pass as they are.
+    """
+    return {
+        name: value[start:stop] if name in CURVE_OPTIONS and np.ndim(value) == 2 and len(value) > 1 else value
+        for name, value in options.items()
+    }
+
+
+def _table_inputs(table, start, stop):
+    """
+    Inputs of rows [start, stop) of an Arrow table, as scenario_inputs returns them.
+    """
+    shard = table.slice(start, stop - start)
+    return scenario_inputs({name: shard.column(name).to_numpy() for name in shard.column_names})
+
+
+# --- Worker Side ---
+# The source the worker is attached to, reused across the shards of one run
+_attached = {"key": None}
+
+
+def _attach(source):
+    """
+    Attach the worker to a run's inputs and output block, once per run.
+
+    Parameters:
+        source (tuple): ("shared", input block name, output block name, rows, output
+            columns) or ("arrow", path, output block name, rows, output columns).
+    """
+    if _attached["key"] == source:
+        return _attached
+    _detach()
+    kind, location, output_name, rows, n_columns = source
+    if kind == "arrow":
+        import pyarrow as pa
+
+        # Memory-mapped, so shard slices read straight from the page cache
+        _attached["table"] = pa.ipc.open_file(pa.memory_map(location)).read_all()
+    else:
+        _attached["input_block"], _attached["inputs"] = _attach_block(location, (len(SCENARIO_COLUMNS), rows))
+    _attached["output_block"], _attached["output"] = _attach_block(output_name, (n_columns, rows))
+    _attached["key"] = source
+    return _attached
+
+
+def _detach():
+    for name in ("inputs", "output", "table"):
+        _attached.pop(name, None)
+    for name in ("input_block", "output_block"):
+        block = _attached.pop(name, None)
+        if block is not None:
+            block.close()
+    _attached["key"] = None
+
+
+def _run_shard(task):
+    """
+    Project the scenarios in rows [start, stop) and write their summary metrics to the
+    output block.
+
+    Returns:
+        tuple: (start, stop), so the parent knows which rows are ready.
+    """
+    source, start, stop, options = task
+    attached = _attach(source)
+    if "table" in attached:
+        inputs = _table_inputs(attached["table"], start, stop)
+    else:
+        inputs = list(attached["inputs"][:, start:stop])
+        inputs[SCENARIO_COLUMNS.index("analysis_period")] = inputs[SCENARIO_COLUMNS.index("analysis_period")].astype(np.int64)
+    _, summary = project_financials_arrays(*inputs, **_shard_options(options, start, stop))
+    for i, name in enumerate(summary_columns(options["discount_rate"])):
+        attached["output"][i, start:stop] = summary[name]
+    return start, stop
+
+
+# --- Executor ---
+class ShardedExecutor:
+    """
+    Evaluates large scenario tables across a pool of worker processes.
+
+    The table is split into shards of consecutive rows. Workers read their shard from
+    shared memory (or from a memory-mapped Arrow IPC file) and write the summary metrics
+    to a shared output block, so neither inputs nor results are pickled; only row
+    ranges pass between processes. Shards are yielded in table order as they complete.
+
+    Parameters:
+        workers (int): Worker processes; 1 evaluates in this process without a pool.
+        shard_size (int): Scenarios per shard.
+        start_method (str): multiprocessing start method, or None for the platform default.
+        periods_per_year (int): Cash flow periods per year (see project_financials_arrays).
+        interpolate_payback (bool): Interpolate payback within its period.
+        discount_rate (float): Annual discount rate percentage for the discounted metrics.
+        improvement_curve (ndarray): Per-period share of the ratio reductions realized,
+            shared or one row per scenario in table order (see project_financials_arrays).
+            Each task carries the curve, or its shard's rows of it.
+        cost_curve (ndarray): Per-period multiplier of the ongoing costs, shaped likewise.
+    """
+
+    def __init__(
+        self, workers=None, shard_size=DEFAULT_SHARD_SIZE, start_method=None,
+        periods_per_year=1, interpolate_payback=False, discount_rate=None, improvement_curve=None, cost_curve=None
+    ):
+        if shard_size < 1:
+            raise ValueError("shard_size must be positive")
+        self.workers = max(1, workers or WORKERS or available_cpus())
+        self.shard_size = shard_size
+        self.options = {
+            "periods_per_year": periods_per_year, "interpolate_payback": interpolate_payback, "discount_rate": discount_rate,
+            "improvement_curve": improvement_curve, "cost_curve": cost_curve,
+        }
+        self.columns = summary_columns(discount_rate)
+        self._context = multiprocessing.get_context(start_method)
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = self._context.Pool(self.workers)
+        return self._pool
+
+    def map(self, scenarios, progress=None):
+        """
+        Project every scenario, yielding summary metrics shard by shard in table order.
+
+        Parameters:
+            scenarios (DataFrame, dict or str): Scenario table as accepted by
+                project_financials_batch, or the path of an Arrow IPC file, which the
+                workers memory-map instead of receiving a copy.
+            progress (callable): Called as progress(rows done, total rows) after each shard.
+
+        Yields:
+            DataFrame: Summary metrics (self.columns) of one shard, indexed like the
+            input table (by row number for an Arrow file).
+        """
+        if isinstance(scenarios, (str, os.PathLike)):
+            import pyarrow as pa
+
+            path = os.fspath(scenarios)
+            table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+            _table_inputs(table, 0, 0)  # fail early on missing columns
+            index = pd.RangeIndex(table.num_rows)
+            inputs = None
+        else:
+            scenarios = pd.DataFrame(scenarios)
+            index = scenarios.index
+            inputs = scenario_inputs(scenarios)
+
+        rows = len(index)
+        shards = [(start, min(start + self.shard_size, rows)) for start in range(0, rows, self.shard_size)]
+
+        if self.workers == 1:
+            for start, stop in shards:
+                if inputs is None:
+                    shard_inputs = _table_inputs(table, start, stop)
+                else:
+                    shard_inputs = [values[start:stop] for values in inputs]
+                _, summary = project_financials_arrays(*shard_inputs, **_shard_options(self.options, start, stop))
+                if progress is not None:
+                    progress(stop, rows)
+                yield pd.DataFrame(summary, index=index[start:stop], columns=self.columns)
+            return
+
+        blocks = []
+        try:
+            output_block, output = _create_block((len(self.columns), rows))
+            blocks.append(output_block)
+            if inputs is None:
+                source = ("arrow", path, output_block.name, rows, len(self.columns))
+            else:
+                input_block, shared_inputs = _create_block((len(SCENARIO_COLUMNS), rows))
+                blocks.append(input_block)
+                for i, values in enumerate(inputs):
+                    shared_inputs[i] = values
+                del shared_inputs
+                source = ("shared", input_block.name, output_block.name, rows, len(self.columns))
+
+            pool = self._get_pool()
+            for start, stop in pool.imap(_run_shard, [(source, start, stop, self.options) for start, stop in shards]):
+                if progress is not None:
+                    progress(stop, rows)
+                # The output block is float64; status codes go back to their integer type
+                yield pd.DataFrame(
+                    {
+                        name: output[i, start:stop].astype(np.int8) if name in IRR_STATUS_COLUMNS else output[i, start:stop].copy()
+                        for i, name in enumerate(self.columns)
+                    },
+                    index=index[start:stop],
+                )
+        finally:
+            output = None
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+
+def project_financials_parallel(
+    scenarios, workers=None, shard_size=DEFAULT_SHARD_SIZE, progress=None,
+    periods_per_year=1, interpolate_payback=False, discount_rate=None, improvement_curve=None, cost_curve=None
+):
+    """
+    Project a scenario table across worker processes.
+
+    Parameters:
+        scenarios (DataFrame, dict or str): Scenario table, or the path of an Arrow IPC file.
+        workers (int): Worker processes (default: CALCULATOR_WORKERS or the CPU count).
+        shard_size (int): Scenarios per shard.
+        progress (callable): Called as progress(rows done, total rows) after each shard.
+        periods_per_year (int): Cash flow periods per year (see project_financials_arrays).
+        interpolate_payback (bool): Interpolate payback within its period.
+        discount_rate (float): Annual discount rate percentage for the discounted metrics.
+        improvement_curve (ndarray): Per-period share of the ratio reductions realized,
+            shared or one row per scenario in table order (see project_financials_arrays).
+        cost_curve (ndarray): Per-period multiplier of the ongoing costs, shaped likewise.
+
+    Returns:
+        DataFrame: Summary metrics, one row per scenario, matching project_financials_batch.
+    """
+    with ShardedExecutor(
+        workers, shard_size, periods_per_year=periods_per_year, interpolate_payback=interpolate_payback,
+        discount_rate=discount_rate, improvement_curve=improvement_curve, cost_curve=cost_curve,
+    ) as executor:
+        shards = list(executor.map(scenarios, progress))
+    if not shards:
+        return pd.DataFrame(columns=summary_columns(discount_rate), dtype=np.float64)
+    return pd.concat(shards)
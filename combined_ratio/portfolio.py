@@ -0,0 +1,212 @@
+import numpy as np
+import pandas as pd
+
+from .batch import payback_period, project_financials_arrays
+
+# --- Column Layout ---
+# A line table has one row per line of business. Reductions may be given instead as
+# new_loss_ratio / new_expense_ratio; Salesforce attributions and segment are optional.
+LINE_COLUMNS = [
+    "line",
+    "current_gwp",
+    "premium_growth_rate",
+    "current_loss_ratio",
+    "current_expense_ratio",
+    "loss_ratio_reduction",
+    "expense_ratio_reduction",
+]
+OPTIONAL_LINE_COLUMNS = {
+    "loss_ratio_reduction_salesforce": 0.0,
+    "expense_ratio_reduction_salesforce": 0.0,
+}
+
+LINE_SUMMARY_COLUMNS = [
+    "current_gwp",
+    "cost_share",
+    "total_premiums",
+    "current_combined_ratio",
+    "new_combined_ratio",
+    "total_investment",
+    "total_savings",
+    "roi",
+    "payback_period",
+    "total_savings_salesforce",
+    "roi_salesforce",
+    "payback_period_salesforce",
+]
+
+COMBINED_RATIO_COLUMNS = ["Current Combined Ratio (%)", "Projected Combined Ratio (%)"]
+
+
+# --- Helper Functions ---
+def read_lines(source, name=None):
+    """
+    Read a line table from CSV, Parquet or Arrow IPC.
+
+    Parameters:
+        source (str or file): Path or file-like object (e.g. a Streamlit upload).
+        name (str): File name used to pick the format; defaults to the path or source.name.
+
+    Returns:
+        DataFrame: The line table.
+    """
+    from .export import infer_format
+
+    fmt = infer_format(name or getattr(source, "name", None) or str(source))
+    if fmt == "parquet":
+        return pd.read_parquet(source)
+    if fmt == "arrow":
+        import pyarrow as pa
+
+        return pa.ipc.open_file(source).read_all().to_pandas()
+    return pd.read_csv(source)
+
+
+def prepare_lines(lines):
+    """
+    Validate a line table and fill in defaults.
+
+    Returns:
+        DataFrame: Copy of the table with reduction and Salesforce columns present.
+    """
+    lines = pd.DataFrame(lines).copy()
+    if "loss_ratio_reduction" not in lines and "new_loss_ratio" in lines:
+        lines["loss_ratio_reduction"] = lines["current_loss_ratio"] - lines["new_loss_ratio"]
+    if "expense_ratio_reduction" not in lines and "new_expense_ratio" in lines:
+        lines["expense_ratio_reduction"] = lines["current_expense_ratio"] - lines["new_expense_ratio"]
+    if "line" not in lines:
+        lines["line"] = [f"Line {i + 1}" for i in range(len(lines))]
+
+    missing = [name for name in LINE_COLUMNS if name not in lines]
+    if missing:
+        raise ValueError(f"Line table is missing columns: {', '.join(missing)}")
+    if lines.empty:
+        raise ValueError("Line table has no rows.")
+    if lines["line"].duplicated().any():
+        raise ValueError("Line names must be unique.")
+    for name, default in OPTIONAL_LINE_COLUMNS.items():
+        if name not in lines:
+            lines[name] = default
+    numeric = LINE_COLUMNS[1:] + list(OPTIONAL_LINE_COLUMNS)
+    lines[numeric] = lines[numeric].astype(np.float64)
+    if lines[numeric].isna().any(axis=None) or lines["line"].isna().any():
+        raise ValueError("Line table has missing values.")
+    if (lines["current_gwp"] < 0).any():
+        raise ValueError("current_gwp must not be negative.")
+    return lines
+
+
+def project_portfolio(
+    lines, analysis_period, ongoing_costs=0.0, initial_investment=0.0, ongoing_costs_salesforce=0.0,
+    interpolate_payback=False,
+):
+    """
+    Project every line of business in one pass and roll the results up to the enterprise.
+
+    Enterprise costs are allocated to the lines pro rata to current GWP, so each line gets
+    its own ROI and payback and the line totals add up to the enterprise totals. Combined
+    ratios are premium-weighted.
+
+    Parameters:
+        lines (DataFrame or dict): Line table (see LINE_COLUMNS).
+        analysis_period (int): Number of years to analyze.
+        ongoing_costs (float): Total annual ongoing costs in millions.
+        initial_investment (float): Initial investment cost in millions.
+        ongoing_costs_salesforce (float): Annual ongoing costs for Salesforce in millions.
+        interpolate_payback (bool): Interpolate line and enterprise payback within the year.
+
+    Returns:
+        tuple: Line summary DataFrame (indexed by line, see LINE_SUMMARY_COLUMNS), the
+        enterprise financial DataFrame (as from project_financials, plus premium-weighted
+        combined ratios by year) and a dict of enterprise summary metrics.
+    """
+    lines = prepare_lines(lines)
+    gwp = lines["current_gwp"].to_numpy()
+    total_gwp = gwp.sum()
+    cost_share = gwp / total_gwp if total_gwp > 0 else np.full(len(gwp), 1 / len(gwp))
+
+    current_loss_ratio = lines["current_loss_ratio"].to_numpy()
+    current_expense_ratio = lines["current_expense_ratio"].to_numpy()
+    new_loss_ratio = current_loss_ratio - lines["loss_ratio_reduction"].to_numpy()
+    new_expense_ratio = current_expense_ratio - lines["expense_ratio_reduction"].to_numpy()
+    series, summary = project_financials_arrays(
+        gwp, lines["premium_growth_rate"].to_numpy(), current_loss_ratio, current_expense_ratio,
+        new_loss_ratio, new_expense_ratio, analysis_period, ongoing_costs * cost_share,
+        initial_investment * cost_share, lines["loss_ratio_reduction_salesforce"].to_numpy(),
+        lines["expense_ratio_reduction_salesforce"].to_numpy(), ongoing_costs_salesforce * cost_share,
+        interpolate_payback=interpolate_payback,
+    )
+
+    # Line Summary
+    premiums = series["Projected Premiums ($M)"]
+    total_premiums = premiums.sum(axis=1)
+    line_summary = pd.DataFrame({
+        "current_gwp": gwp,
+        "cost_share": cost_share,
+        "total_premiums": total_premiums,
+        "current_combined_ratio": current_loss_ratio + current_expense_ratio,
+        "new_combined_ratio": new_loss_ratio + new_expense_ratio,
+        **{name: summary[name] for name in LINE_SUMMARY_COLUMNS[5:]},
+    }, index=pd.Index(lines["line"], name="line"))
+    if "segment" in lines:
+        line_summary.insert(0, "segment", lines["segment"].to_numpy())
+
+    # Enterprise Series: sums over lines, with premium-weighted combined ratios
+    totals = {name: values.sum(axis=0) for name, values in series.items()}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        current_ratio = (premiums * line_summary["current_combined_ratio"].to_numpy()[:, None]).sum(axis=0) / totals["Projected Premiums ($M)"]
+        new_ratio = (premiums * line_summary["new_combined_ratio"].to_numpy()[:, None]).sum(axis=0) / totals["Projected Premiums ($M)"]
+    financial_df = pd.DataFrame({
+        "Year": np.arange(1, analysis_period + 1),
+        **totals,
+        COMBINED_RATIO_COLUMNS[0]: current_ratio,
+        COMBINED_RATIO_COLUMNS[1]: new_ratio,
+    })
+
+    # Enterprise Summary
+    cumulative_cash_flow = np.cumsum(totals["Annual Savings ($M)"] - ongoing_costs) - initial_investment
+    cumulative_cash_flow_salesforce = totals["Cumulative Salesforce Savings ($M)"] - initial_investment
+    total_investment = float(initial_investment + ongoing_costs * analysis_period)
+    total_investment_salesforce = float(initial_investment + ongoing_costs_salesforce * analysis_period)
+    total_savings = float(summary["total_savings"].sum())
+    total_savings_salesforce = float(summary["total_savings_salesforce"].sum())
+    enterprise = {
+        "current_gwp": float(total_gwp),
+        "current_combined_ratio": float(np.average(line_summary["current_combined_ratio"], weights=total_premiums)) if total_premiums.sum() > 0 else np.nan,
+        "new_combined_ratio": float(np.average(line_summary["new_combined_ratio"], weights=total_premiums)) if total_premiums.sum() > 0 else np.nan,
+        "roi": total_savings / total_investment * 100 if total_investment != 0 else 0.0,
+        "payback_period": payback_period(cumulative_cash_flow, initial_investment, interpolate=interpolate_payback),
+        "total_investment": total_investment,
+        "total_savings": total_savings,
+        "roi_salesforce": total_savings_salesforce / total_investment_salesforce * 100 if total_investment_salesforce != 0 else 0.0,
+        "payback_period_salesforce": payback_period(cumulative_cash_flow_salesforce, initial_investment, interpolate=interpolate_payback),
+        "total_investment_salesforce": total_investment_salesforce,
+        "total_savings_salesforce": total_savings_salesforce,
+    }
+    return line_summary, financial_df, enterprise
+
+
+def summarize_by(line_summary, by="segment"):
+    """
+    Roll a line summary up to groups of lines, e.g. segments.
+
+    Parameters:
+        line_summary (DataFrame): First element returned by project_portfolio.
+        by (str): Column to group on.
+
+    Returns:
+        DataFrame: Per group totals, premium-weighted combined ratios and ROIs.
+    """
+    weighted = line_summary.assign(
+        current_ratio_premiums=line_summary["current_combined_ratio"] * line_summary["total_premiums"],
+        new_ratio_premiums=line_summary["new_combined_ratio"] * line_summary["total_premiums"],
+    )
+    groups = weighted.groupby(by, sort=False)[[
+        "current_gwp", "total_premiums", "current_ratio_premiums", "new_ratio_premiums",
+        "total_investment", "total_savings", "total_savings_salesforce",
+    ]].sum()
+    groups["current_combined_ratio"] = groups.pop("current_ratio_premiums") / groups["total_premiums"]
+    groups["new_combined_ratio"] = groups.pop("new_ratio_premiums") / groups["total_premiums"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        groups["roi"] = np.where(groups["total_investment"] != 0, groups["total_savings"] / groups["total_investment"] * 100, 0.0)
+    return groups
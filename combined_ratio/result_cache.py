@@ -0,0 +1,150 @@
+import os
+import threading
+import time
+
+from cachetools import LRUCache
+
+# --- Configurations ---
+# Maximum entries per cache, and whether caches are shared by every session ("global")
+# or kept separately in each user's session state ("session").
+CACHE_SIZE = int(os.getenv("CALCULATOR_CACHE_SIZE", "256"))
+CACHE_SCOPE = os.getenv("CALCULATOR_CACHE_SCOPE", "global")
+
+_SESSION_KEY = "_result_caches"
+_global_caches = {}
+_global_lock = threading.Lock()
+
+
+class ResultCache:
+    """
+    Bounded LRU cache with hit/miss counters, safe to share between session threads.
+
+    Parameters:
+        maxsize (int): Maximum number of cached entries.
+    """
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self._entries = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.seconds_saved = 0.0
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached value for key, calling compute() and storing its result on a miss.
+
+        Parameters:
+            key (tuple): Normalized cache key (see normalize_key).
+            compute (callable): Zero-argument function producing the value.
+
+        Returns:
+            The cached or freshly computed value.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, cost = entry
+                self.hits += 1
+                self.seconds_saved += cost
+                return value
+            self.misses += 1
+
+        start = time.perf_counter()
+        value = compute()
+        cost = time.perf_counter() - start
+        with self._lock:
+            self._entries[key] = (value, cost)
+        return value
+
+    def clear(self):
+        """
+        Drop every entry and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+            self.seconds_saved = 0.0
+
+    def stats(self):
+        """
+        Returns:
+            dict: Entry count, capacity, hits, misses, hit rate and compute seconds saved by hits.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "maxsize": int(self._entries.maxsize),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "seconds_saved": self.seconds_saved,
+            }
+
+
+# --- Helper Functions ---
+def normalize_key(*values, digits=9):
+    """
+    Build a hashable cache key, rounding floats so equal slider values map to one key.
+
+    Parameters:
+        *values: Inputs identifying the cached result (numbers, strings, tuples, lists).
+        digits (int): Decimal places kept for floats.
+
+    Returns:
+        tuple: Normalized key.
+    """
+    def normalize(value):
+        if isinstance(value, bool) or value is None or isinstance(value, (int, str, bytes)):
+            return value
+        if isinstance(value, float):
+            return round(value, digits) + 0.0  # + 0.0 folds -0.0 into 0.0
+        if isinstance(value, (tuple, list)):
+            return tuple(normalize(item) for item in value)
+        return normalize(value.item()) if hasattr(value, "item") else value
+
+    return tuple(normalize(value) for value in values)
+
+
+def get_cache(name, scope=None, session_state=None, maxsize=CACHE_SIZE):
+    """
+    Look up (or create) a named cache in the global or per-session scope.
+
+    Parameters:
+        name (str): Cache name, e.g. "projections".
+        scope (str): "global" or "session"; defaults to CALCULATOR_CACHE_SCOPE.
+        session_state (MutableMapping): The session's state, required for the session scope.
+        maxsize (int): Capacity used when the cache is created.
+
+    Returns:
+        ResultCache: The cache.
+    """
+    scope = scope or CACHE_SCOPE
+    if scope == "global":
+        with _global_lock:
+            if name not in _global_caches:
+                _global_caches[name] = ResultCache(maxsize)
+            return _global_caches[name]
+    if scope == "session":
+        if session_state is None:
+            raise ValueError("A session_state mapping is required for session-scoped caches.")
+        caches = session_state.setdefault(_SESSION_KEY, {})
+        if name not in caches:
+            caches[name] = ResultCache(maxsize)
+        return caches[name]
+    raise ValueError(f"Unknown cache scope '{scope}'. Expected 'global' or 'session'.")
+
+
+def cache_stats(session_state=None):
+    """
+    Collect counters for every global cache and, if given, the session's caches.
+
+    Returns:
+        dict: Mapping of "scope/name" to that cache's stats().
+    """
+    with _global_lock:
+        caches = {f"global/{name}": cache for name, cache in _global_caches.items()}
+    if session_state is not None:
+        caches.update({f"session/{name}": cache for name, cache in session_state.get(_SESSION_KEY, {}).items()})
+    return {name: cache.stats() for name, cache in caches.items()}
@@ -0,0 +1,171 @@
+import numpy as np
+import pandas as pd
+
+from .batch import project_financials_arrays
+
+# --- Parameters ---
+# Inputs as entered in the app, with the default perturbation for each: ("relative", f)
+# moves the value by +/- f times itself, ("absolute", d) by +/- d percentage points.
+PARAMETERS = {
+    "current_gwp": ("Annual Gross Written Premiums", ("relative", 0.2)),
+    "premium_growth_rate": ("Annual Premium Growth Rate", ("absolute", 2.0)),
+    "current_loss_ratio": ("Current Loss Ratio", ("absolute", 5.0)),
+    "current_expense_ratio": ("Current Expense Ratio", ("absolute", 5.0)),
+    "loss_ratio_reduction": ("Reduction in Loss Ratio", ("relative", 0.5)),
+    "expense_ratio_reduction": ("Reduction in Expense Ratio", ("relative", 0.5)),
+    "initial_investment": ("Initial Investment Cost", ("relative", 0.2)),
+    "ongoing_costs_salesforce": ("Annual Salesforce Ongoing Costs", ("relative", 0.2)),
+    "ongoing_costs_other": ("Annual Other Ongoing Costs", ("relative", 0.2)),
+}
+
+# Valid range of each input, used to clip perturbed values
+BOUNDS = {
+    "current_loss_ratio": (0.0, 100.0),
+    "current_expense_ratio": (0.0, 100.0),
+}
+
+METRICS = ("roi", "total_savings", "payback_period", "roi_salesforce", "total_savings_salesforce", "payback_period_salesforce")
+
+
+# --- Helper Functions ---
+def evaluate_inputs(inputs, base=None, surface=None):
+    """
+    Evaluate app-level inputs (scalars or equal-length arrays) with project_financials_arrays.
+
+    Parameters:
+        inputs (dict): Values for every key of PARAMETERS plus analysis_period,
+            loss_ratio_reduction_salesforce and expense_ratio_reduction_salesforce.
+        base (dict): Inputs whose Salesforce attribution shares apply (defaults to inputs),
+            so attributions keep their share of the total reduction when it is perturbed.
+        surface (ResponseSurface): Estimate the metrics from this response surface instead
+            when it covers the inputs' growth rates and analysis periods.
+
+    Returns:
+        dict: Summary metrics as arrays (see project_financials_arrays).
+    """
+    def share(attributed, total):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(np.asarray(total) != 0, np.asarray(attributed) / np.asarray(total), 0.0)
+
+    base = inputs if base is None else base
+    loss_share = share(base["loss_ratio_reduction_salesforce"], base["loss_ratio_reduction"])
+    expense_share = share(base["expense_ratio_reduction_salesforce"], base["expense_ratio_reduction"])
+    args = (
+        inputs["current_gwp"], inputs["premium_growth_rate"],
+        inputs["current_loss_ratio"], inputs["current_expense_ratio"],
+        np.asarray(inputs["current_loss_ratio"]) - inputs["loss_ratio_reduction"],
+        np.asarray(inputs["current_expense_ratio"]) - inputs["expense_ratio_reduction"],
+        inputs["analysis_period"],
+        np.asarray(inputs["ongoing_costs_salesforce"]) + inputs["ongoing_costs_other"],
+        inputs["initial_investment"],
+        np.asarray(inputs["loss_ratio_reduction"]) * loss_share,
+        np.asarray(inputs["expense_ratio_reduction"]) * expense_share,
+        inputs["ongoing_costs_salesforce"],
+    )
+    if surface is not None and surface.covers(inputs["premium_growth_rate"], inputs["analysis_period"]):
+        return surface.summarize(*args)
+    _, summary = project_financials_arrays(*args)
+    return summary
+
+
+def perturbation_range(name, value, perturbation=None):
+    """
+    Low and high values of an input under its perturbation, clipped to the input's bounds.
+    """
+    kind, amount = perturbation or PARAMETERS[name][1]
+    delta = abs(value) * amount if kind == "relative" else amount
+    low, high = BOUNDS.get(name, (0.0, np.inf))
+    return max(value - delta, low), min(value + delta, high)
+
+
+def _rank_value(summary, metric, analysis_period):
+    values = summary[metric]
+    if metric.startswith("payback_period"):
+        # Rank "not achieved" as one year past the analysis period
+        values = np.where(np.isnan(values), np.asarray(analysis_period) + 1.0, values)
+    return values
+
+
+def tornado(base, metric="roi", parameters=None, perturbations=None):
+    """
+    One-at-a-time sensitivity of a metric to each input, evaluated in a single batch pass.
+
+    Parameters:
+        base (dict): Base inputs (see evaluate_inputs).
+        metric (str): One of METRICS, used to rank the inputs.
+        parameters (list): Inputs to perturb; defaults to every key of PARAMETERS.
+        perturbations (dict): Per-input overrides of the default perturbation.
+
+    Returns:
+        DataFrame: One row per input, sorted by the metric's swing, with the low/high input
+        values and every metric at each end.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric '{metric}'. Expected one of: {', '.join(METRICS)}")
+    parameters = list(parameters or PARAMETERS)
+    perturbations = perturbations or {}
+
+    # Rows 2i and 2i+1 hold the low and high perturbation of parameter i
+    ranges = [perturbation_range(name, base[name], perturbations.get(name)) for name in parameters]
+    inputs = {name: np.full(2 * len(parameters), float(value)) for name, value in base.items()}
+    for i, (name, bounds) in enumerate(zip(parameters, ranges)):
+        inputs[name][2 * i:2 * i + 2] = bounds
+    summary = evaluate_inputs(inputs, base)
+    baseline = evaluate_inputs({name: np.atleast_1d(float(value)) for name, value in base.items()})
+
+    rows = {
+        "parameter": parameters,
+        "label": [PARAMETERS.get(name, (name,))[0] for name in parameters],
+        "low_value": [low for low, _ in ranges],
+        "high_value": [high for _, high in ranges],
+    }
+    for name in METRICS:
+        rows[f"{name}_low"] = summary[name][0::2]
+        rows[f"{name}_high"] = summary[name][1::2]
+    ranked = _rank_value(summary, metric, inputs["analysis_period"])
+    rows["swing"] = np.abs(ranked[1::2] - ranked[0::2])
+
+    result = pd.DataFrame(rows).sort_values("swing", ascending=False, kind="stable").reset_index(drop=True)
+    result.attrs["baseline"] = {name: float(values[0]) for name, values in baseline.items()}
+    result.attrs["metric"] = metric
+    return result
+
+
+def sweep_2d(base, x, x_values, y, y_values, metric="roi", surface=None):
+    """
+    Evaluate a metric over a grid of two inputs in one broadcast pass.
+
+    Parameters:
+        base (dict): Base inputs (see evaluate_inputs).
+        x, y (str): Inputs to sweep.
+        x_values, y_values (array-like): Grid values of each.
+        metric (str): One of METRICS.
+        surface (ResponseSurface): Estimate the grid from this response surface when it
+            covers it (see evaluate_inputs).
+
+    Returns:
+        DataFrame: Metric values indexed by y_values, with x_values as columns. attrs
+        records whether the values were "estimated" from the surface.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric '{metric}'. Expected one of: {', '.join(METRICS)}")
+    if x == y:
+        raise ValueError("Choose two different inputs to sweep.")
+    x_values = np.asarray(x_values, dtype=np.float64)
+    y_values = np.asarray(y_values, dtype=np.float64)
+    grid_y, grid_x = np.meshgrid(y_values, x_values, indexing="ij")
+
+    size = grid_x.size
+    inputs = {name: np.full(size, float(value)) for name, value in base.items()}
+    inputs[x] = grid_x.ravel()
+    inputs[y] = grid_y.ravel()
+    estimated = surface is not None and surface.covers(inputs["premium_growth_rate"], inputs["analysis_period"])
+    summary = evaluate_inputs(inputs, base, surface if estimated else None)
+    values = summary[metric].reshape(grid_x.shape)
+    result = pd.DataFrame(
+        values,
+        index=pd.Index(y_values, name=y),
+        columns=pd.Index(x_values, name=x),
+    )
+    result.attrs["estimated"] = estimated
+    return result
@@ -0,0 +1,433 @@
+import argparse
+import json
+import math
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as ResultTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from .batch import SUMMARY_COLUMNS, SERIES_COLUMNS, project_financials_arrays
+from .core import ProjectionResult, project_financials
+
+# --- Configurations ---
+# Most requests evaluated together, and how long the first request of a batch waits for others
+MAX_BATCH = int(os.getenv("CALCULATOR_SERVICE_MAX_BATCH", "256"))
+MAX_WAIT_MS = float(os.getenv("CALCULATOR_SERVICE_MAX_WAIT_MS", "2"))
+# Batches evaluated at once, and requests allowed to wait for them before new ones are refused
+WORKERS = int(os.getenv("CALCULATOR_SERVICE_WORKERS", "2"))
+QUEUE_SIZE = int(os.getenv("CALCULATOR_SERVICE_QUEUE_SIZE", "4096"))
+# Seconds a request waits for its result before the server gives up on it
+REQUEST_TIMEOUT = float(os.getenv("CALCULATOR_SERVICE_TIMEOUT", "30"))
+# Largest request body accepted; bigger ones get 413 without being read
+MAX_BODY_BYTES = int(os.getenv("CALCULATOR_SERVICE_MAX_BODY_BYTES", str(64 * 1024)))
+# Longest analysis period accepted; a batch allocates scenarios x periods arrays
+MAX_ANALYSIS_PERIOD = 100
+# Smallest batch projected in one vectorized pass; below this the per-call overhead of
+# the array operations exceeds the cost of project_financials' scalar loop
+VECTORIZE_MIN = 24
+# Pending connections the listening socket holds (the standard library default is 5)
+LISTEN_BACKLOG = 128
+
+# Request fields of each endpoint, in the order of the function's parameters
+NEW_RATIOS_FIELDS = ("current_loss_ratio", "loss_ratio_reduction", "current_expense_ratio", "expense_ratio_reduction")
+PROJECTION_FIELDS = (
+    "current_gwp", "premium_growth_rate", "current_loss_ratio", "current_expense_ratio",
+    "new_loss_ratio", "new_expense_ratio", "analysis_period", "ongoing_costs", "initial_investment",
+    "loss_ratio_reduction_salesforce", "expense_ratio_reduction_salesforce", "ongoing_costs_salesforce",
+)
+
+
+class Overloaded(RuntimeError):
+    """
+    Raised when the request queue is full.
+    """
+
+
+# --- Requests ---
+def parse_request(kind, body):
+    """
+    Validate a request body and pull out the function's arguments.
+
+    Parameters:
+        kind (str): "calculate_new_ratios" or "project_financials".
+        body (dict): Decoded JSON body.
+
+    Returns:
+        tuple: Argument values (floats) in parameter order, and options (dict).
+
+    Raises:
+        ValueError: The body is not a valid request.
+    """
+    if not isinstance(body, dict):
+        raise ValueError("The request body must be a JSON object.")
+    fields = NEW_RATIOS_FIELDS if kind == "calculate_new_ratios" else PROJECTION_FIELDS
+    options = {"include_series": False} if kind == "project_financials" else {}
+    missing = [name for name in fields if name not in body]
+    if missing:
+        raise ValueError(f"Missing fields: {', '.join(missing)}")
+    unknown = sorted(set(body) - set(fields) - set(options))
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    values = []
+    for name in fields:
+        value = body[name]
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+            raise ValueError(f"'{name}' must be a finite number.")
+        values.append(float(value))
+    if kind == "project_financials":
+        period = values[PROJECTION_FIELDS.index("analysis_period")]
+        if not period.is_integer() or not 0 <= period <= MAX_ANALYSIS_PERIOD:
+            raise ValueError(f"'analysis_period' must be a whole number of years from 0 to {MAX_ANALYSIS_PERIOD}.")
+        include_series = body.get("include_series", False)
+        if not isinstance(include_series, bool):
+            raise ValueError("'include_series' must be true or false.")
+        options["include_series"] = include_series
+    return tuple(values), options
+
+
+# --- Batch Evaluation ---
+def evaluate_new_ratios(requests):
+    """
+    calculate_new_ratios for a batch of requests.
+
+    Parameters:
+        requests (list): (values, options) pairs from parse_request.
+
+    Returns:
+        list: One result dict per request.
+    """
+    values = np.array([values for values, _ in requests])
+    new_loss_ratio = values[:, 0] - values[:, 1]
+    new_expense_ratio = values[:, 2] - values[:, 3]
+    return [
+        {"new_loss_ratio": loss, "new_expense_ratio": expense}
+        for loss, expense in zip(new_loss_ratio.tolist(), new_expense_ratio.tolist())
+    ]
+
+
+def evaluate_projections(requests):
+    """
+    project_financials for a batch of requests, in one vectorized pass from VECTORIZE_MIN
+    requests up.
+
+    Results are those of project_financials: payback periods are whole years, or None
+    where payback is not achieved. With include_series, the per-year table is added as
+    columns (lists) keyed like project_financials' DataFrame.
+
+    Parameters:
+        requests (list): (values, options) pairs from parse_request.
+
+    Returns:
+        list: One result dict per request.
+    """
+    if len(requests) < VECTORIZE_MIN:
+        return [_project_one(values, options) for values, options in requests]
+    values = np.array([values for values, _ in requests])
+    series, summary = project_financials_arrays(*values.T)
+    columns = {name: summary[name].tolist() for name in SUMMARY_COLUMNS}
+    results = []
+    for i, (row, options) in enumerate(requests):
+        result = {name: columns[name][i] for name in SUMMARY_COLUMNS}
+        for name in ("payback_period", "payback_period_salesforce"):
+            result[name] = None if math.isnan(result[name]) else int(result[name])
+        if options["include_series"]:
+            period = int(row[PROJECTION_FIELDS.index("analysis_period")])
+            result["series"] = {"Year": list(range(1, period + 1))}
+            result["series"].update((name, series[name][i, :period].tolist()) for name in SERIES_COLUMNS)
+        results.append(result)
+    return results
+
+
+def _project_one(values, options):
+    period = PROJECTION_FIELDS.index("analysis_period")
+    projection = project_financials(*values[:period], int(values[period]), *values[period + 1:])
+    result = {
+        name: value if name.startswith("payback_period") else float(value)
+        for name, value in ((name, getattr(projection, name)) for name in SUMMARY_COLUMNS)
+    }
+    if options["include_series"]:
+        result["series"] = {"Year": list(range(1, projection.analysis_period + 1))}
+        result["series"].update((column, list(getattr(projection, name))) for name, column in ProjectionResult.SERIES)
+    return result
+
+
+EVALUATORS = {
+    "calculate_new_ratios": evaluate_new_ratios,
+    "project_financials": evaluate_projections,
+}
+
+
+# --- Micro-Batching ---
+class MicroBatcher:
+    """
+    Coalesces concurrent requests into micro-batches evaluated on a bounded worker pool.
+
+    Requests wait in a bounded queue. A dispatcher thread waits for a free worker, then
+    takes the first waiting request and gathers more until max_batch are collected or
+    max_wait has passed, and hands the batch to the worker. While every worker is busy,
+    requests accumulate into the next batch; once the queue is full, submit raises
+    Overloaded so callers can shed load instead of queueing without bound.
+
+    Parameters:
+        evaluators (dict): Batch function by request kind, taking a list of requests
+            and returning a list of results.
+        max_batch (int): Most requests per batch.
+        max_wait (float): Seconds the first request of a batch waits for others.
+        workers (int): Batches evaluated at once.
+        queue_size (int): Requests allowed to wait.
+    """
+
+    def __init__(self, evaluators=EVALUATORS, max_batch=MAX_BATCH, max_wait=MAX_WAIT_MS / 1000,
+                 workers=WORKERS, queue_size=QUEUE_SIZE):
+        if max_batch < 1 or workers < 1 or queue_size < 1:
+            raise ValueError("max_batch, workers and queue_size must be positive")
+        self.evaluators = evaluators
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.workers = workers
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._slots = threading.BoundedSemaphore(workers)
+        self._pool = ThreadPoolExecutor(workers, thread_name_prefix="batch-worker")
+        self._lock = threading.Lock()
+        self._counts = {"requests": 0, "rejected": 0, "batches": 0, "batched_requests": 0, "largest_batch": 0}
+        self._closed = False
+        self._dispatcher = threading.Thread(target=self._dispatch, name="batch-dispatcher", daemon=True)
+        self._dispatcher.start()
+
+    def submit(self, kind, request):
+        """
+        Queue a request for the next batch of its kind.
+
+        Parameters:
+            kind (str): Key of evaluators.
+            request: Request passed to the evaluator (see parse_request).
+
+        Returns:
+            Future: Resolves to the request's result.
+
+        Raises:
+            Overloaded: The queue is full.
+        """
+        if self._closed:
+            raise RuntimeError("MicroBatcher is closed")
+        future = Future()
+        try:
+            self._queue.put_nowait((kind, request, future))
+        except queue.Full:
+            with self._lock:
+                self._counts["rejected"] += 1
+            raise Overloaded("Too many requests are waiting; retry shortly.") from None
+        with self._lock:
+            self._counts["requests"] += 1
+        return future
+
+    def close(self):
+        """
+        Stop taking requests, finish those queued and shut the worker pool down.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._dispatcher.join()
+        self._pool.shutdown(wait=True)
+
+    def stats(self):
+        """
+        Counters since start: requests, rejected, batches, mean and largest batch size,
+        and the requests waiting now.
+        """
+        with self._lock:
+            counts = dict(self._counts)
+        counts["mean_batch"] = counts.pop("batched_requests") / counts["batches"] if counts["batches"] else 0.0
+        counts["queued"] = self._queue.qsize()
+        return counts
+
+    def _dispatch(self):
+        stopping = False
+        while not stopping:
+            # Wait for a free worker first, so requests arriving meanwhile join this batch
+            self._slots.acquire()
+            item = self._queue.get()
+            if item is None:
+                self._slots.release()
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True  # after this batch
+                    break
+                batch.append(item)
+            with self._lock:
+                self._counts["batches"] += 1
+                self._counts["batched_requests"] += len(batch)
+                self._counts["largest_batch"] = max(self._counts["largest_batch"], len(batch))
+            self._pool.submit(self._run, batch)
+
+    def _run(self, batch):
+        try:
+            by_kind = {}
+            for kind, request, future in batch:
+                if future.set_running_or_notify_cancel():
+                    by_kind.setdefault(kind, []).append((request, future))
+            for kind, items in by_kind.items():
+                try:
+                    results = self.evaluators[kind]([request for request, _ in items])
+                except Exception as e:
+                    for _, future in items:
+                        future.set_exception(e)
+                    continue
+                for (_, future), result in zip(items, results):
+                    future.set_result(result)
+        finally:
+            self._slots.release()
+
+
+# --- HTTP Server ---
+class ProjectionServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = LISTEN_BACKLOG
+
+
+class ProjectionHandler(BaseHTTPRequestHandler):
+    """
+    JSON endpoints:
+
+        POST /v1/calculate_new_ratios  - body: NEW_RATIOS_FIELDS
+        POST /v1/project_financials    - body: PROJECTION_FIELDS, optional include_series
+        GET  /v1/stats                 - micro-batching counters
+        GET  /healthz                  - liveness
+
+    Errors are returned as {"error": message} with status 400 (invalid request), 404,
+    413 (body too large), 500 (evaluation failed), 503 (overloaded, with Retry-After) or
+    504 (timed out).
+    """
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; with Nagle's algorithm on, the body
+    # waits for the client's delayed ACK of the headers (about 40 ms)
+    disable_nagle_algorithm = True
+    batcher = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload, headers=()):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/healthz":
+            self._send_json(200, {"status": "ok"})
+        elif self.path == "/v1/stats":
+            self._send_json(200, self.batcher.stats())
+        else:
+            self._send_json(404, {"error": f"No such endpoint: {self.path}"})
+
+    def do_POST(self):
+        kind = self.path.removeprefix("/v1/")
+        if kind not in EVALUATORS:
+            self.close_connection = True  # the body is left unread
+            self._send_json(404, {"error": f"No such endpoint: {self.path}"})
+            return
+        length = (self.headers.get("Content-Length") or "0").strip()
+        if not (length.isascii() and length.isdigit()):
+            self.close_connection = True  # where the body ends is unknown
+            self._send_json(400, {"error": "Content-Length must be a non-negative integer."})
+            return
+        length = int(length)
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self._send_json(413, {"error": f"Request bodies are limited to {MAX_BODY_BYTES} bytes."})
+            return
+        try:
+            request = parse_request(kind, json.loads(self.rfile.read(length) or b"null"))
+        except ValueError as e:  # includes JSONDecodeError
+            self._send_json(400, {"error": str(e)})
+            return
+
+        try:
+            future = self.batcher.submit(kind, request)
+            result = future.result(timeout=REQUEST_TIMEOUT)
+        except Overloaded as e:
+            self._send_json(503, {"error": str(e)}, headers=[("Retry-After", "1")])
+        except ResultTimeout:
+            # Still queued: drop it, so no worker evaluates a result nobody will read
+            future.cancel()
+            self._send_json(504, {"error": "The request timed out."})
+        except Exception as e:
+            self._send_json(500, {"error": f"The request could not be evaluated: {e}"})
+        else:
+            self._send_json(200, result)
+
+
+def start_server(host="127.0.0.1", port=0, **batcher_options):
+    """
+    Start the projection service on a background thread.
+
+    Parameters:
+        host (str): Interface to listen on.
+        port (int): Port; 0 picks a free one.
+        **batcher_options: MicroBatcher parameters (max_batch, max_wait, workers, queue_size).
+
+    Returns:
+        tuple: The server (stop it with stop_server) and its base URL.
+    """
+    batcher = MicroBatcher(**batcher_options)
+    handler = type("Handler", (ProjectionHandler,), {"batcher": batcher})
+    server = ProjectionServer((host, port), handler)
+    server.batcher = batcher
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def stop_server(server):
+    """
+    Stop accepting connections and finish the requests already queued.
+    """
+    server.shutdown()
+    server.server_close()
+    server.batcher.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve calculate_new_ratios and project_financials as a JSON HTTP API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on; 0 picks a free one.")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH, help="Most requests evaluated together.")
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS, help="How long a batch waits to fill.")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="Batches evaluated at once.")
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE, help="Waiting requests before new ones get 503.")
+    args = parser.parse_args(argv)
+
+    server, url = start_server(
+        args.host, args.port, max_batch=args.max_batch, max_wait=args.max_wait_ms / 1000,
+        workers=args.workers, queue_size=args.queue_size,
+    )
+    print(f"Serving on {url}", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        stop_server(server)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+import os
+import threading
+from collections import OrderedDict
+
+# --- Configurations ---
+# Sessions that keep their recomputable state (the view graph's values, charts and
+# downloads, and session-scoped result caches) between reruns, across the server
+# process. Beyond this, the least recently active session's state is dropped and is
+# rebuilt from its inputs on its next rerun.
+MAX_WARM_SESSIONS = int(os.getenv("CALCULATOR_MAX_WARM_SESSIONS", "64"))
+# Chat messages kept per session after the system prompt. Older turns are dropped once
+# they are folded into the conversation summary (see ConversationHistory.trim).
+MAX_CHAT_MESSAGES = int(os.getenv("CALCULATOR_SESSION_MAX_MESSAGES", "100"))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+class WarmSessions:
+    """
+    Per-session recomputable state with least-recently-used eviction across sessions.
+
+    Each session's state is a dict handed out by get(). The pool holds at most
+    max_sessions of them, so their memory stays bounded however many sessions are open
+    or were closed without the pool noticing. Evicting a session only drops the pool's
+    reference: a rerun still holding the dict keeps using it, and it is freed when that
+    run ends. Safe to share between session threads.
+
+    Parameters:
+        max_sessions (int): Sessions whose state is kept.
+    """
+
+    def __init__(self, max_sessions=MAX_WARM_SESSIONS):
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1")
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, session_id):
+        """
+        Return the session's state, marking the session as the most recently active.
+
+        Parameters:
+            session_id (str): Identifier of the session.
+
+        Returns:
+            dict: The session's state, empty for a new or evicted session.
+        """
+        with self._lock:
+            state = self._sessions.pop(session_id, None)
+            if state is None:
+                state = {}
+                self.misses += 1
+            else:
+                self.hits += 1
+            self._sessions[session_id] = state
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evictions += 1
+            return state
+
+    def discard(self, session_id):
+        """
+        Drop a session's state, for example when the session ends.
+        """
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def stats(self):
+        """
+        Returns:
+            dict: Warm session count, capacity, hits, misses (new or evicted sessions) and evictions.
+        """
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "max_sessions": self.max_sessions,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# --- Helper Functions ---
+def get_warm_sessions():
+    """
+    The server process's pool of warm session state, created on first use.
+
+    Returns:
+        WarmSessions: Pool shared by all sessions, holding MAX_WARM_SESSIONS sessions.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = WarmSessions()
+        return _pool
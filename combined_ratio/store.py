@@ -0,0 +1,471 @@
+import datetime
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from .batch import IRR_STATUS_COLUMNS, project_financials_batch, summary_columns
+from .model import INPUTS
+
+# --- Configurations ---
+# SQLite file holding saved scenarios; ":memory:" keeps them for the life of the process
+STORE_PATH = os.getenv(
+    "CALCULATOR_STORE_PATH", os.path.join(os.path.expanduser("~"), ".combined_ratio", "scenarios.sqlite3")
+)
+# Rows per parameter list in IN (...) queries, below SQLite's variable limit
+_CHUNK = 900
+
+# --- Column Layout ---
+# A saved scenario holds the calculator's inputs (model.INPUTS, as entered in the
+# sidebar) and the summary metrics projected from them
+RESULT_COLUMNS = summary_columns(discount_rate=0.0)
+ENTRY_COLUMNS = ["id", "name", "carrier", "as_of", "saved_at", "tags"]
+INTEGER_INPUTS = ("analysis_period", "periods_per_year")
+# Inputs that may be left out when saving
+INPUT_DEFAULTS = {"ongoing_costs_other": 0.0, "periods_per_year": 1, "discount_rate": 0.0}
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS scenarios (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    carrier TEXT NOT NULL DEFAULT '',
+    as_of TEXT NOT NULL,
+    saved_at REAL NOT NULL,
+    input_key TEXT NOT NULL,
+    {", ".join(f"{name} {'INTEGER' if name in INTEGER_INPUTS else 'REAL'} NOT NULL" for name in INPUTS)},
+    {", ".join(f"{name} {'INTEGER' if name in IRR_STATUS_COLUMNS else 'REAL'}" for name in RESULT_COLUMNS)}
+);
+CREATE INDEX IF NOT EXISTS scenarios_carrier_as_of ON scenarios (carrier, as_of);
+CREATE INDEX IF NOT EXISTS scenarios_as_of ON scenarios (as_of);
+CREATE INDEX IF NOT EXISTS scenarios_input_key ON scenarios (input_key);
+CREATE TABLE IF NOT EXISTS scenario_tags (
+    tag TEXT NOT NULL,
+    scenario_id INTEGER NOT NULL REFERENCES scenarios (id) ON DELETE CASCADE,
+    PRIMARY KEY (tag, scenario_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS scenario_tags_scenario ON scenario_tags (scenario_id);
+"""
+
+
+# --- Helper Functions ---
+def input_keys(inputs, digits=9):
+    """
+    Hash of each scenario's inputs, equal for inputs that would project identically.
+
+    Floats are rounded as for the result cache keys (see result_cache.normalize_key), so
+    inputs differing only in float noise share a key.
+
+    Parameters:
+        inputs (DataFrame or dict): Values keyed by model.INPUTS, a column or a scalar each.
+        digits (int): Decimal places kept.
+
+    Returns:
+        list: Hex digests, one per scenario.
+    """
+    # + 0.0 folds -0.0 into 0.0
+    values = np.round(np.column_stack([np.asarray(inputs[name], dtype=np.float64) for name in INPUTS]), digits) + 0.0
+    values = np.ascontiguousarray(np.atleast_2d(values))
+    return [hashlib.blake2b(row.tobytes(), digest_size=16).hexdigest() for row in values]
+
+
+def parse_tags(tags):
+    """
+    Tags as a sorted list without duplicates, from a list or a comma-separated string.
+    """
+    if tags is None or (not isinstance(tags, (str, list, tuple, set)) and pd.isna(tags)):
+        return []
+    if isinstance(tags, str):
+        tags = tags.split(",")
+    return sorted({str(tag).strip() for tag in tags} - {""})
+
+
+def _as_of(value):
+    """
+    An as-of date as an ISO string; today when None.
+    """
+    if value is None or (not isinstance(value, (str, datetime.date)) and pd.isna(value)):
+        return datetime.date.today().isoformat()
+    if isinstance(value, datetime.datetime):
+        return value.date().isoformat()
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    try:
+        return datetime.date.fromisoformat(str(value)[:10]).isoformat()
+    except ValueError:
+        raise ValueError(f"'{value}' is not a date (expected YYYY-MM-DD).") from None
+
+
+def _chunks(values, size=_CHUNK):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def project_inputs(table):
+    """
+    Project the summary metrics of a table of calculator inputs.
+
+    Rows are grouped by periods_per_year and each group is projected in one
+    vectorized pass, with its own discount rate per row.
+
+    Parameters:
+        table (DataFrame): Columns named as in model.INPUTS.
+
+    Returns:
+        DataFrame: RESULT_COLUMNS, indexed like table.
+    """
+    table = table.assign(ongoing_costs=table["ongoing_costs_salesforce"] + table["ongoing_costs_other"])
+    parts = []
+    for periods_per_year, group in table.groupby("periods_per_year", sort=False):
+        summary, _ = project_financials_batch(
+            group, periods_per_year=int(periods_per_year), discount_rate=group["discount_rate"].to_numpy(),
+        )
+        parts.append(summary)
+    if not parts:
+        return pd.DataFrame(columns=RESULT_COLUMNS, dtype=np.float64)
+    return pd.concat(parts).reindex(table.index)
+
+
+# --- Store ---
+class ScenarioStore:
+    """
+    Named calculator scenarios and their projected summary metrics, kept in SQLite.
+
+    Scenarios are indexed by carrier, as-of date and tags, so filtered lookups stay
+    fast with hundreds of thousands of entries. Results are projected once, when a
+    scenario is saved (or copied from a saved scenario with identical inputs), and are
+    served from the store afterwards. One store may be shared by every session thread.
+
+    Parameters:
+        path (str): SQLite file; created, with its directory, if missing.
+    """
+
+    def __init__(self, path=STORE_PATH):
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        if path != ":memory:":
+            # Readers in other processes do not block a writer
+            self._connection.execute("PRAGMA journal_mode = WAL")
+            self._connection.execute("PRAGMA synchronous = NORMAL")
+        with self._connection:
+            self._connection.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._connection.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM scenarios").fetchone()[0]
+
+    # --- Writing ---
+    def save(self, name, inputs, carrier="", as_of=None, tags=(), replace=True):
+        """
+        Save one scenario, projecting its results unless identical inputs are already saved.
+
+        Parameters:
+            name (str): Unique scenario name.
+            inputs (dict): Calculator inputs keyed by model.INPUTS.
+            carrier (str): Carrier the scenario belongs to.
+            as_of (date or str): As-of date (default: today).
+            tags (list or str): Tags, as a list or comma-separated.
+            replace (bool): Overwrite a scenario of the same name; otherwise raise ValueError.
+
+        Returns:
+            int: The scenario's id.
+        """
+        row = dict(inputs, name=name, carrier=carrier, as_of=as_of, tags=parse_tags(tags))
+        return self.save_many(pd.DataFrame([row]), replace=replace)[0]
+
+    def save_many(self, table, replace=True):
+        """
+        Save a table of scenarios in one transaction.
+
+        Parameters:
+            table (DataFrame): A name column, the model.INPUTS columns (INPUT_DEFAULTS
+                fill any left out) and optional carrier, as_of and tags columns.
+            replace (bool): Overwrite scenarios of the same name; otherwise raise ValueError.
+
+        Returns:
+            list: Scenario ids, in table order.
+        """
+        table = pd.DataFrame(table).reset_index(drop=True)
+        if "name" not in table:
+            raise ValueError("Scenario table is missing columns: name")
+        table = table.assign(**{name: value for name, value in INPUT_DEFAULTS.items() if name not in table})
+        missing = [name for name in INPUTS if name not in table]
+        if missing:
+            raise ValueError(f"Scenario table is missing columns: {', '.join(missing)}")
+        names = table["name"].astype(str).str.strip()
+        if (names == "").any():
+            raise ValueError("Scenario names must not be empty.")
+        if names.duplicated().any():
+            raise ValueError(f"Duplicate scenario names: {', '.join(names[names.duplicated()].unique()[:5])}")
+
+        incomplete = [name for name in INPUTS if table[name].isna().any()]
+        if incomplete:
+            raise ValueError(f"Scenario table has missing values in: {', '.join(incomplete)}")
+        inputs = table[list(INPUTS)].astype({name: np.int64 for name in INTEGER_INPUTS})
+        keys = input_keys(inputs)
+        names = names.tolist()
+        carriers = table["carrier"].fillna("").astype(str).str.strip().tolist() if "carrier" in table else [""] * len(table)
+        as_of = [_as_of(value) for value in table["as_of"]] if "as_of" in table else [_as_of(None)] * len(table)
+        tags = [parse_tags(value) for value in table["tags"]] if "tags" in table else [[]] * len(table)
+
+        with self._lock, self._connection:
+            # Results of identical inputs already in the store are reused, not recomputed
+            results = self._results_for_keys(sorted(set(keys)))
+            pending = [i for i, key in enumerate(keys) if key not in results]
+            if pending:
+                projected = project_inputs(inputs.iloc[pending])
+                # As stored: Python numbers, with NaN as NULL
+                projected = projected.astype(object).where(projected.notna(), None)
+                for i, row in zip(pending, projected.itertuples(index=False, name=None)):
+                    results.setdefault(keys[i], row)
+
+            columns = ["name", "carrier", "as_of", "saved_at", "input_key"] + list(INPUTS) + RESULT_COLUMNS
+            sql = f"INSERT INTO scenarios ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+            if replace:
+                sql += " ON CONFLICT (name) DO UPDATE SET " + ", ".join(f"{name} = excluded.{name}" for name in columns[1:])
+            saved_at = time.time()
+            rows = (
+                (name, carrier, date, saved_at, key) + values + results[key]
+                for name, carrier, date, key, values in zip(
+                    names, carriers, as_of, keys, inputs.itertuples(index=False, name=None)
+                )
+            )
+            try:
+                self._connection.executemany(sql, rows)
+            except sqlite3.IntegrityError:
+                raise ValueError("A scenario with one of these names is already saved.") from None
+
+            ids = self._ids(names)
+            id_list = [ids[name] for name in names]
+            for chunk in _chunks(id_list):
+                self._connection.execute(
+                    f"DELETE FROM scenario_tags WHERE scenario_id IN ({', '.join('?' * len(chunk))})", chunk
+                )
+            self._connection.executemany(
+                "INSERT INTO scenario_tags (tag, scenario_id) VALUES (?, ?)",
+                ((tag, scenario_id) for scenario_id, scenario_tags in zip(id_list, tags) for tag in scenario_tags),
+            )
+        return id_list
+
+    def delete(self, names):
+        """
+        Delete scenarios by name.
+
+        Returns:
+            int: Number of scenarios deleted.
+        """
+        names = [names] if isinstance(names, str) else list(names)
+        deleted = 0
+        with self._lock, self._connection:
+            for chunk in _chunks(names):
+                deleted += self._connection.execute(
+                    f"DELETE FROM scenarios WHERE name IN ({', '.join('?' * len(chunk))})", chunk
+                ).rowcount
+        return deleted
+
+    # --- Reading ---
+    def load(self, name):
+        """
+        A saved scenario's inputs and results.
+
+        Returns:
+            dict: id, name, carrier, as_of, saved_at, tags (list), inputs (dict keyed by
+            model.INPUTS) and results (dict keyed by RESULT_COLUMNS).
+
+        Raises:
+            KeyError: No scenario has this name.
+        """
+        entries = self._select("WHERE s.name = ?", [name])
+        if entries.empty:
+            raise KeyError(name)
+        entry = {
+            column: values.iloc[0].item() if hasattr(values.iloc[0], "item") else values.iloc[0]
+            for column, values in entries.items()
+        }
+        return {
+            **{column: entry[column] for column in ENTRY_COLUMNS},
+            "tags": parse_tags(entry["tags"]),
+            "inputs": {name: entry[name] for name in INPUTS},
+            "results": {name: entry[name] for name in RESULT_COLUMNS},
+        }
+
+    def lookup(self, inputs):
+        """
+        Saved results for inputs identical to these, without projecting anything.
+
+        Returns:
+            dict: Results keyed by RESULT_COLUMNS, or None when no such inputs are saved.
+        """
+        with self._lock:
+            results = self._results_for_keys(input_keys(inputs))
+        if not results:
+            return None
+        return {name: _from_sql(name, value) for name, value in zip(RESULT_COLUMNS, next(iter(results.values())))}
+
+    def find(self, carrier=None, since=None, until=None, tags=None, name=None, limit=1000, offset=0):
+        """
+        Saved scenarios matching every filter given, newest as-of date first.
+
+        Parameters:
+            carrier (str or list): Carrier, or any of several carriers.
+            since (date or str): Earliest as-of date.
+            until (date or str): Latest as-of date.
+            tags (list or str): Tags the scenario must all carry.
+            name (str): Text the name must contain (case-insensitive).
+            limit (int): Most scenarios returned (None for all).
+            offset (int): Matches skipped before the first returned.
+
+        Returns:
+            DataFrame: ENTRY_COLUMNS, model.INPUTS and RESULT_COLUMNS, one row per scenario.
+        """
+        where, params = self._filters(carrier, since, until, tags, name)
+        # Walking the as_of index in order suits selective or no filters; a name filter
+        # tests every row anyway, so scanning the table and sorting the matches is faster
+        order = "+s.as_of" if name else "s.as_of"
+        return self._select(
+            where + f" ORDER BY {order} DESC, s.id DESC LIMIT ? OFFSET ?",
+            params + [-1 if limit is None else limit, offset],
+        )
+
+    def count(self, carrier=None, since=None, until=None, tags=None, name=None):
+        """
+        Number of saved scenarios matching the filters (see find).
+        """
+        where, params = self._filters(carrier, since, until, tags, name)
+        with self._lock:
+            return self._connection.execute(f"SELECT COUNT(*) FROM scenarios s {where}", params).fetchone()[0]
+
+    def compare(self, names):
+        """
+        Saved scenarios side by side: one column per scenario, in the order named.
+
+        Returns:
+            DataFrame: Rows carrier, as_of, tags, model.INPUTS and RESULT_COLUMNS;
+            columns are the scenario names found.
+        """
+        names = list(dict.fromkeys(names))
+        entries = pd.concat(
+            [self._select(f"WHERE s.name IN ({', '.join('?' * len(chunk))})", chunk) for chunk in _chunks(names)]
+            or [self._select("WHERE 0", [])]
+        )
+        found = set(entries["name"])
+        entries = entries.set_index("name").reindex([name for name in names if name in found])
+        return entries[["carrier", "as_of", "tags"] + list(INPUTS) + RESULT_COLUMNS].T
+
+    def carriers(self):
+        """
+        Carriers with saved scenarios, sorted.
+        """
+        with self._lock:
+            return [row[0] for row in self._connection.execute("SELECT DISTINCT carrier FROM scenarios ORDER BY carrier")]
+
+    def tag_counts(self):
+        """
+        Number of scenarios carrying each tag.
+
+        Returns:
+            dict: Scenario count keyed by tag, sorted by tag.
+        """
+        with self._lock:
+            return dict(self._connection.execute("SELECT tag, COUNT(*) FROM scenario_tags GROUP BY tag ORDER BY tag"))
+
+    def date_range(self):
+        """
+        Earliest and latest as-of dates saved, as dates (None, None when empty).
+        """
+        with self._lock:
+            # Separate queries, so each is answered from the as_of index
+            first = self._connection.execute("SELECT MIN(as_of) FROM scenarios").fetchone()[0]
+            last = self._connection.execute("SELECT MAX(as_of) FROM scenarios").fetchone()[0]
+        if first is None:
+            return None, None
+        return datetime.date.fromisoformat(first), datetime.date.fromisoformat(last)
+
+    # --- Queries ---
+    def _filters(self, carrier, since, until, tags, name):
+        clauses, params = [], []
+        if carrier is not None:
+            carriers = [carrier] if isinstance(carrier, str) else list(carrier)
+            clauses.append(f"s.carrier IN ({', '.join('?' * len(carriers))})")
+            params += carriers
+        if since is not None:
+            clauses.append("s.as_of >= ?")
+            params.append(_as_of(since))
+        if until is not None:
+            clauses.append("s.as_of <= ?")
+            params.append(_as_of(until))
+        tags = parse_tags(tags)
+        if tags:
+            clauses.append(
+                "s.id IN (SELECT scenario_id FROM scenario_tags "
+                f"WHERE tag IN ({', '.join('?' * len(tags))}) GROUP BY scenario_id HAVING COUNT(*) = ?)"
+            )
+            params += tags + [len(tags)]
+        if name:
+            clauses.append("instr(lower(s.name), ?) > 0")
+            params.append(name.lower())
+        return ("WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def _select(self, clause, params):
+        """
+        Rows of ENTRY_COLUMNS, model.INPUTS and RESULT_COLUMNS for the scenarios clause selects.
+        """
+        columns = ENTRY_COLUMNS + list(INPUTS) + RESULT_COLUMNS
+        sql = (
+            "SELECT s.id, s.name, s.carrier, s.as_of, s.saved_at, "
+            "(SELECT group_concat(tag, ', ') FROM (SELECT tag FROM scenario_tags t WHERE t.scenario_id = s.id ORDER BY tag)), "
+            f"{', '.join('s.' + name for name in list(INPUTS) + RESULT_COLUMNS)} FROM scenarios s {clause}"
+        )
+        with self._lock:
+            rows = self._connection.execute(sql, params).fetchall()
+        entries = pd.DataFrame.from_records(rows, columns=columns)
+        entries["tags"] = entries["tags"].fillna("")
+        return entries.astype({
+            "id": np.int64, "saved_at": np.float64,
+            **{name: np.int64 if name in INTEGER_INPUTS else np.float64 for name in INPUTS},
+            **{name: np.int8 if name in IRR_STATUS_COLUMNS else np.float64 for name in RESULT_COLUMNS},
+        })
+
+    def _results_for_keys(self, keys):
+        """
+        Saved result rows keyed by input_key, for those of keys that are saved.
+        """
+        results = {}
+        for chunk in _chunks(keys):
+            for key, *values in self._connection.execute(
+                f"SELECT input_key, {', '.join(RESULT_COLUMNS)} FROM scenarios "
+                f"WHERE input_key IN ({', '.join('?' * len(chunk))}) GROUP BY input_key",
+                chunk,
+            ):
+                results[key] = tuple(values)
+        return results
+
+    def _ids(self, names):
+        ids = {}
+        for chunk in _chunks(names):
+            ids.update(self._connection.execute(
+                f"SELECT name, id FROM scenarios WHERE name IN ({', '.join('?' * len(chunk))})", chunk
+            ))
+        return ids
+
+
+def _from_sql(name, value):
+    if value is None:
+        return np.nan
+    return int(value) if name in IRR_STATUS_COLUMNS else float(value)
@@ -0,0 +1,502 @@
+import argparse
+import json
+import math
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+from .batch import SUMMARY_COLUMNS
+
+# --- Configurations ---
+# Response surface file loaded (memory-mapped) on first use; unset leaves every metric
+# on the exact path. Build one with `python -m combined_ratio.surface PATH`.
+SURFACE_PATH = os.getenv("CALCULATOR_SURFACE_PATH")
+
+# Default grid: the growth slider's range and step, widened to the +/- 2 point
+# perturbation of the sensitivity analysis, and the longest analysis period
+GROWTH_STEP = 0.01
+MAX_GROWTH = 15.0
+MAX_PERIOD = 30
+
+_surface = None
+_surface_lock = threading.Lock()
+
+
+# --- Response Surface ---
+# Savings are linear in every input except the growth rate: each year's premium is
+# current_gwp * (1 + g)^(year - 1), the ratio reductions scale it, and the ongoing costs
+# and initial investment are subtracted. So the surface only tabulates the cumulative
+# premium multiplier F[g, Y] = sum((1 + g)^y for y < Y), and its derivative with respect
+# to g, on a grid of growth rates; the premium, ratio and cost terms are applied exactly
+# afterwards.
+class ResponseSurface:
+    """
+    Precomputed cumulative premium multipliers for approximating project_financials summaries.
+
+    Multipliers are interpolated between growth rates on the grid with cubic Hermite
+    splines using their exact slopes. Ratios, premiums and costs are applied exactly, so
+    the error comes only from the growth interpolation (none at growth rates on the
+    grid). Use it for interactive previews and keep the exact path for reported figures.
+
+    Parameters:
+        table (ndarray): 2 x growth rates x (max_period + 1): the multipliers F (column Y
+            for Y years) and their derivatives per growth rate point. May be a read-only
+            memory map.
+        growth_step (float): Growth rate percentage between rows; row 0 is 0%.
+        accuracy (dict): Errors measured against project_financials (see check_accuracy).
+    """
+
+    def __init__(self, table, growth_step=GROWTH_STEP, accuracy=None):
+        if table.ndim != 3 or table.shape[0] != 2 or table.shape[1] < 2 or table.shape[2] < 2:
+            raise ValueError("A response surface needs at least two growth rates and one year")
+        self.table = table
+        self.growth_step = growth_step
+        self.accuracy = accuracy
+
+    @property
+    def max_growth(self):
+        return (self.table.shape[1] - 1) * self.growth_step
+
+    @property
+    def max_period(self):
+        return self.table.shape[2] - 1
+
+    @classmethod
+    def build(cls, growth_step=GROWTH_STEP, max_growth=MAX_GROWTH, max_period=MAX_PERIOD):
+        """
+        Tabulate the multipliers for growth rates 0..max_growth and periods up to max_period years.
+        """
+        growth = np.arange(round(max_growth / growth_step) + 1) * growth_step
+        # float_power matches project_financials' ** (see batch.project_financials_arrays)
+        years = np.arange(max_period)
+        premiums = np.float_power(1 + growth[:, None] / 100, years)
+        slopes = years * np.float_power(1 + growth[:, None] / 100, np.maximum(years - 1, 0)) / 100
+        zeros = np.zeros((growth.size, 1))
+        table = np.stack([
+            np.concatenate([zeros, np.cumsum(premiums, axis=1)], axis=1),
+            np.concatenate([zeros, np.cumsum(slopes, axis=1)], axis=1),
+        ])
+        return cls(table, growth_step)
+
+    def save(self, path):
+        """
+        Write the table to path (.npy) and the grid and accuracy next to it (.json).
+        """
+        np.save(path, np.ascontiguousarray(self.table, dtype=np.float64))
+        with open(_metadata_path(path), "w") as f:
+            json.dump({"growth_step": self.growth_step, "accuracy": self.accuracy}, f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Memory-map a surface written by save; pages are read as lookups touch them.
+        """
+        with open(_metadata_path(path)) as f:
+            metadata = json.load(f)
+        # A plain ndarray view of the map: np.memmap indexes through a Python-level __getitem__
+        table = np.load(path, mmap_mode="r").view(np.ndarray)
+        if table.dtype != np.float64 or "growth_step" not in metadata:
+            raise ValueError(f"{path} does not hold a response surface")
+        return cls(table, metadata["growth_step"], metadata.get("accuracy"))
+
+    def covers(self, premium_growth_rate, analysis_period):
+        """
+        Whether every growth rate and analysis period lies within the grid.
+        """
+        premium_growth_rate = np.asarray(premium_growth_rate)
+        analysis_period = np.asarray(analysis_period)
+        return bool(
+            (premium_growth_rate >= 0).all() and (premium_growth_rate <= self.max_growth).all()
+            and (analysis_period >= 0).all() and (analysis_period <= self.max_period).all()
+        )
+
+    def _multipliers(self, premium_growth_rate, n_years):
+        """
+        Interpolate F for years 0..n_years at each growth rate (scenarios x (n_years + 1)).
+        """
+        position = premium_growth_rate / self.growth_step
+        row = np.clip(np.floor(position).astype(np.int64), 0, self.table.shape[1] - 2)
+        t = (position - row)[:, None]
+        (lower, lower_slope), (upper, upper_slope) = self.table[:, row, :n_years + 1], self.table[:, row + 1, :n_years + 1]
+        # Slopes per grid step
+        lower_slope, upper_slope = lower_slope * self.growth_step, upper_slope * self.growth_step
+        # Cubic Hermite basis on the unit interval
+        t2, t3 = t * t, t * t * t
+        return (
+            (2 * t3 - 3 * t2 + 1) * lower + (t3 - 2 * t2 + t) * lower_slope
+            + (3 * t2 - 2 * t3) * upper + (t3 - t2) * upper_slope
+        )
+
+    def summarize(
+        self, current_gwp, premium_growth_rate, current_loss_ratio, current_expense_ratio,
+        new_loss_ratio, new_expense_ratio, analysis_period, ongoing_costs, initial_investment,
+        loss_ratio_reduction_salesforce, expense_ratio_reduction_salesforce, ongoing_costs_salesforce,
+        periods_per_year=1
+    ):
+        """
+        Approximate the summary metrics of project_financials_arrays.
+
+        Takes the same parameters, each as a scalar or a 1-D array. Work per scenario grows
+        with the analysis period in years, not with the number of cash flow periods.
+
+        Returns:
+            dict: Summary metrics as 1-D arrays keyed by SUMMARY_COLUMNS; payback periods
+            are NaN where payback is not achieved.
+
+        Raises:
+            ValueError: If a growth rate or analysis period lies outside the grid.
+        """
+        (
+            current_gwp, premium_growth_rate, current_loss_ratio, current_expense_ratio,
+            new_loss_ratio, new_expense_ratio, ongoing_costs, initial_investment,
+            loss_ratio_reduction_salesforce, expense_ratio_reduction_salesforce, ongoing_costs_salesforce,
+            analysis_period,
+        ) = np.broadcast_arrays(*(np.atleast_1d(np.asarray(value, dtype=np.float64)) for value in (
+            current_gwp, premium_growth_rate, current_loss_ratio, current_expense_ratio,
+            new_loss_ratio, new_expense_ratio, ongoing_costs, initial_investment,
+            loss_ratio_reduction_salesforce, expense_ratio_reduction_salesforce, ongoing_costs_salesforce,
+        )), np.atleast_1d(np.asarray(analysis_period, dtype=np.int64)))
+        if not self.covers(premium_growth_rate, analysis_period):
+            raise ValueError(
+                f"The response surface covers growth rates 0-{self.max_growth:g}% and "
+                f"analysis periods up to {self.max_period} years"
+            )
+
+        n_years = int(analysis_period.max(initial=0))
+        # Sweeps repeat a few growth rates many times; interpolate each once
+        growth, inverse = np.unique(premium_growth_rate, return_inverse=True)
+        multipliers = _Multipliers(self._multipliers(growth, n_years), inverse.ravel())
+        total_multiplier = multipliers.at(analysis_period)
+
+        # Savings per unit of premium: the reductions, and the Salesforce share of them
+        reduction = ((current_loss_ratio - new_loss_ratio) + (current_expense_ratio - new_expense_ratio)) / 100
+        reduction_salesforce = (loss_ratio_reduction_salesforce + expense_ratio_reduction_salesforce) / 100
+
+        summary = {}
+        for suffix, savings_rate, costs in (
+            ("", current_gwp * reduction, ongoing_costs),
+            ("_salesforce", current_gwp * reduction_salesforce, ongoing_costs_salesforce),
+        ):
+            total_costs = costs * analysis_period
+            total_investment = initial_investment + total_costs
+            total_savings = savings_rate * total_multiplier - total_costs
+            with np.errstate(divide="ignore", invalid="ignore"):
+                roi = np.where(total_investment != 0, (total_savings / total_investment) * 100, 0.0)
+            summary["roi" + suffix] = roi
+            summary["payback_period" + suffix] = _payback_period(
+                multipliers, savings_rate, costs, initial_investment, analysis_period, periods_per_year
+            )
+            summary["total_investment" + suffix] = total_investment
+            summary["total_savings" + suffix] = total_savings
+        return {name: summary[name] for name in SUMMARY_COLUMNS}
+
+    def estimate(
+        self, current_gwp, premium_growth_rate, current_loss_ratio, current_expense_ratio,
+        new_loss_ratio, new_expense_ratio, analysis_period, ongoing_costs, initial_investment,
+        loss_ratio_reduction_salesforce, expense_ratio_reduction_salesforce, ongoing_costs_salesforce,
+        periods_per_year=1
+    ):
+        """
+        Approximate the summary metrics of one project_financials call in plain Python.
+
+        Answers in a few microseconds, where summarize's array overhead dominates for a
+        single scenario. Takes the same parameters as project_financials.
+
+        Returns:
+            dict: Summary metrics keyed by SUMMARY_COLUMNS; payback periods are None where
+            payback is not achieved.
+
+        Raises:
+            ValueError: If the growth rate or analysis period lies outside the grid.
+        """
+        if not (0 <= premium_growth_rate <= self.max_growth and 0 <= analysis_period <= self.max_period):
+            raise ValueError(
+                f"The response surface covers growth rates 0-{self.max_growth:g}% and "
+                f"analysis periods up to {self.max_period} years"
+            )
+        position = premium_growth_rate / self.growth_step
+        row = min(int(position), self.table.shape[1] - 2)
+        t = position - row
+        (lower, lower_slope), (upper, upper_slope) = self.table[:, row:row + 2, :analysis_period + 1].transpose(1, 0, 2).tolist()
+        # Cubic Hermite weights on the unit interval, slopes scaled to one grid step
+        t2, t3 = t * t, t * t * t
+        weights = (
+            2 * t3 - 3 * t2 + 1, (t3 - 2 * t2 + t) * self.growth_step,
+            3 * t2 - 2 * t3, (t3 - t2) * self.growth_step,
+        )
+
+        def multiplier(years):
+            return (
+                weights[0] * lower[years] + weights[1] * lower_slope[years]
+                + weights[2] * upper[years] + weights[3] * upper_slope[years]
+            )
+
+        result = {}
+        for suffix, savings_rate, costs in (
+            ("", current_gwp * ((current_loss_ratio - new_loss_ratio) + (current_expense_ratio - new_expense_ratio)) / 100, ongoing_costs),
+            ("_salesforce", current_gwp * (loss_ratio_reduction_salesforce + expense_ratio_reduction_salesforce) / 100, ongoing_costs_salesforce),
+        ):
+            total_investment = initial_investment + costs * analysis_period
+            total_savings = savings_rate * multiplier(analysis_period) - costs * analysis_period
+            result["roi" + suffix] = (total_savings / total_investment) * 100 if total_investment != 0 else 0
+            result["total_investment" + suffix] = total_investment
+            result["total_savings" + suffix] = total_savings
+
+            result["payback_period" + suffix] = _estimate_payback(
+                multiplier, savings_rate, costs, initial_investment, analysis_period, periods_per_year, total_savings
+            )
+        return {name: result[name] for name in SUMMARY_COLUMNS}
+
+
+# --- Helper Functions ---
+def _metadata_path(path):
+    return os.path.splitext(path)[0] + ".json"
+
+
+class _Multipliers:
+    """
+    Interpolated F per distinct growth rate, looked up for each scenario.
+    """
+
+    def __init__(self, rows, inverse):
+        self.rows = rows
+        self.inverse = inverse
+
+    @property
+    def n_years(self):
+        return self.rows.shape[1] - 1
+
+    def at(self, years):
+        return self.rows[self.inverse, years]
+
+    def all(self):
+        return self.rows[self.inverse]
+
+
+def _payback_period(multipliers, savings_rate, costs, initial_investment, analysis_period, periods_per_year):
+    """
+    Payback in years, to the period, from the cumulative cash flow at each year end.
+
+    Within a year every period has the same net cash flow, so the cumulative cash flow is
+    linear between year ends and the first period at or above zero in a year is solved
+    for directly. With growing premiums, non-negative savings and an investment up front,
+    the cumulative cash flow is also convex and starts at or below zero, so once a year
+    ends at or above zero every later year does: the year ends are bisected for the first.
+    """
+    def year_end(years):
+        return savings_rate * multipliers.at(years) - costs * years - initial_investment
+
+    if (savings_rate >= 0).all() and (initial_investment >= 0).all():
+        # Negative at the end means negative throughout
+        reached = (year_end(analysis_period) >= 0) & (analysis_period > 0)
+        low, high = np.zeros_like(analysis_period), analysis_period.copy()
+        for _ in range(max(multipliers.n_years, 1).bit_length()):
+            middle = (low + high) // 2
+            paid_back = year_end(middle) >= 0
+            open_interval = high - low > 1
+            high = np.where(open_interval & paid_back, middle, high)
+            low = np.where(open_interval & ~paid_back, middle, low)
+        start, end = year_end(low), year_end(high)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            period = np.where(start >= 0, 1.0, np.minimum(np.ceil(-start * periods_per_year / (end - start)), periods_per_year))
+        return np.where(reached, ((high - 1) * periods_per_year + period) / periods_per_year, np.nan)
+
+    if multipliers.n_years == 0:
+        return np.full(len(savings_rate), np.nan)
+    years = np.arange(multipliers.n_years + 1)
+    all_multipliers = multipliers.all()
+    start = savings_rate[:, None] * all_multipliers[:, :-1] - costs[:, None] * years[:-1] - initial_investment[:, None]
+    per_period = (savings_rate[:, None] * np.diff(all_multipliers, axis=1) - costs[:, None]) / periods_per_year
+    with np.errstate(divide="ignore", invalid="ignore"):
+        needed = np.where(
+            start + per_period >= 0, 1.0,
+            np.where(per_period > 0, np.ceil(-start / per_period), np.inf),
+        )
+    reached = (needed <= periods_per_year) & (years[1:] <= analysis_period[:, None])
+    year = reached.argmax(axis=1)
+    period = np.take_along_axis(needed, year[:, None], axis=1)[:, 0]
+    return np.where(reached.any(axis=1), (year * periods_per_year + period) / periods_per_year, np.nan)
+
+
+def _estimate_payback(multiplier, savings_rate, costs, initial_investment, analysis_period, periods_per_year, total_savings):
+    """
+    _payback_period for one scenario, with multiplier(years) giving its interpolated F.
+
+    Bisects the year ends when the cumulative cash flow is convex, else walks them.
+
+    Returns:
+        int or float: Payback in years (a whole year number with one period per year),
+        or None if payback is not achieved.
+    """
+    def year_end(year):
+        return savings_rate * multiplier(year) - costs * year - initial_investment if year else -initial_investment
+
+    if analysis_period == 0:
+        return None
+    if savings_rate >= 0 and initial_investment >= 0:
+        # Convex from at most 0: negative at the end means negative throughout
+        if total_savings < initial_investment:
+            return None
+        low, high = 0, analysis_period
+        while high - low > 1:
+            middle = (low + high) // 2
+            if year_end(middle) >= 0:
+                high = middle
+            else:
+                low = middle
+        start, end = year_end(low), year_end(high)
+        period = 1 if start >= 0 else min(math.ceil(-start * periods_per_year / (end - start)), periods_per_year)
+        return _years(high, period, periods_per_year)
+
+    start = -initial_investment
+    for year in range(1, analysis_period + 1):
+        end = year_end(year)
+        per_period = (end - start) / periods_per_year
+        if start + per_period >= 0:
+            return _years(year, 1, periods_per_year)
+        if per_period > 0 and -start / per_period <= periods_per_year:
+            return _years(year, math.ceil(-start / per_period), periods_per_year)
+        start = end
+    return None
+
+
+def _years(year, period, periods_per_year):
+    """
+    Payback at the given period of the given year (counted from 1), in years.
+    """
+    return year if periods_per_year == 1 else ((year - 1) * periods_per_year + period) / periods_per_year
+
+
+def random_inputs(n, max_growth=MAX_GROWTH, max_period=MAX_PERIOD, seed=0):
+    """
+    Scenarios drawn uniformly over the app's input ranges, as project_financials arguments.
+
+    Returns:
+        dict: 1-D arrays keyed by project_financials parameter name.
+    """
+    rng = np.random.default_rng(seed)
+    current_loss_ratio = rng.uniform(0, 100, n)
+    current_expense_ratio = rng.uniform(0, 100, n)
+    loss_ratio_reduction = rng.uniform(0, 5, n)
+    expense_ratio_reduction = rng.uniform(0, 5, n)
+    ongoing_costs_salesforce = rng.uniform(0, 3, n)
+    return {
+        "current_gwp": rng.uniform(10, 2_000, n),
+        "premium_growth_rate": rng.uniform(0, max_growth, n),
+        "current_loss_ratio": current_loss_ratio,
+        "current_expense_ratio": current_expense_ratio,
+        "new_loss_ratio": current_loss_ratio - loss_ratio_reduction,
+        "new_expense_ratio": current_expense_ratio - expense_ratio_reduction,
+        "analysis_period": rng.integers(1, max_period + 1, n),
+        "ongoing_costs": ongoing_costs_salesforce + rng.uniform(0, 3, n),
+        "initial_investment": rng.uniform(0, 20, n),
+        "loss_ratio_reduction_salesforce": loss_ratio_reduction * rng.uniform(0, 1, n),
+        "expense_ratio_reduction_salesforce": expense_ratio_reduction * rng.uniform(0, 1, n),
+        "ongoing_costs_salesforce": ongoing_costs_salesforce,
+    }
+
+
+def check_accuracy(surface, n=20_000, seed=0, periods_per_year=1):
+    """
+    Compare the surface with project_financials on random scenarios over the grid.
+
+    Growth rates are drawn between grid points, where interpolation errs most. Both
+    summarize and estimate are checked, against project_financials_arrays (which is
+    project_financials with one period per year).
+
+    Parameters:
+        surface (ResponseSurface): Surface to check.
+        n (int): Scenarios to compare.
+        seed (int): Random seed.
+        periods_per_year (int): Cash flow periods per year, to which payback is resolved.
+
+    Returns:
+        dict: Largest ROI error in percentage points ("roi_error_points"), largest total
+        savings error relative to the exact value, or to $1M when that is smaller
+        ("savings_relative_error"), the share of paybacks that differ
+        ("payback_mismatch_share") and by how many years at most ("payback_error_years"),
+        over the overall and Salesforce metrics of both methods.
+    """
+    from .batch import project_financials_arrays
+
+    inputs = random_inputs(n, surface.max_growth, surface.max_period, seed)
+    _, exact = project_financials_arrays(**inputs, periods_per_year=periods_per_year)
+    approximations = [surface.summarize(**inputs, periods_per_year=periods_per_year), {name: np.empty(n) for name in SUMMARY_COLUMNS}]
+    for i in range(n):
+        result = surface.estimate(**{name: values[i].item() for name, values in inputs.items()}, periods_per_year=periods_per_year)
+        for name in SUMMARY_COLUMNS:
+            approximations[1][name][i] = np.nan if result[name] is None else result[name]
+
+    # Not achieved counts as one year past the analysis period
+    def payback(values):
+        return np.where(np.isnan(values), inputs["analysis_period"] + 1.0, values)
+
+    report = {"scenarios": n, "roi_error_points": 0.0, "savings_relative_error": 0.0, "payback_mismatch_share": 0.0, "payback_error_years": 0.0}
+    for approximation in approximations:
+        for suffix in ("", "_salesforce"):
+            savings = exact["total_savings" + suffix]
+            payback_error = np.abs(payback(approximation["payback_period" + suffix]) - payback(exact["payback_period" + suffix]))
+            for key, error in (
+                ("roi_error_points", np.abs(approximation["roi" + suffix] - exact["roi" + suffix]).max()),
+                ("savings_relative_error", (np.abs(approximation["total_savings" + suffix] - savings) / np.maximum(np.abs(savings), 1.0)).max()),
+                ("payback_mismatch_share", (payback_error > 0).mean()),
+                ("payback_error_years", payback_error.max()),
+            ):
+                report[key] = max(report[key], float(error))
+    return report
+
+
+def get_surface():
+    """
+    The response surface at CALCULATOR_SURFACE_PATH, memory-mapped once per process.
+
+    Returns:
+        ResponseSurface: The shared surface, or None when no path is configured.
+    """
+    global _surface
+    if SURFACE_PATH is None:
+        return None
+    with _surface_lock:
+        if _surface is None:
+            _surface = ResponseSurface.load(SURFACE_PATH)
+        return _surface
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m combined_ratio.surface",
+        description=(
+            "Build a response surface for fast approximate summaries, check it against "
+            "project_financials and write it for CALCULATOR_SURFACE_PATH."
+        ),
+    )
+    parser.add_argument("output", help="Surface file (.npy); the grid and accuracy are written next to it as .json.")
+    parser.add_argument("--growth-step", type=float, default=GROWTH_STEP, help="Growth rate points between rows (default: %(default)s).")
+    parser.add_argument("--max-growth", type=float, default=MAX_GROWTH, help="Highest growth rate percentage (default: %(default)s).")
+    parser.add_argument("--max-period", type=int, default=MAX_PERIOD, help="Longest analysis period in years (default: %(default)s).")
+    parser.add_argument("--samples", type=int, default=20_000, help="Scenarios compared with project_financials (default: %(default)s).")
+    args = parser.parse_args(argv)
+    if args.growth_step <= 0 or args.max_growth < args.growth_step or args.max_period < 1:
+        print("error: the grid needs a positive growth step, at least two growth rates and one year", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    surface = ResponseSurface.build(args.growth_step, args.max_growth, args.max_period)
+    built = time.perf_counter() - start
+    surface.accuracy = check_accuracy(surface, args.samples)
+    try:
+        surface.save(args.output)
+    except OSError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Built {surface.table.shape[1]:,} x {surface.table.shape[2]} surface in {built * 1000:.1f} ms", file=sys.stderr)
+    print(json.dumps(surface.accuracy, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,33 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
+import numpy as np
 from streamlit_chat import message
 import openai
 import os
+import textwrap
+import uuid
+import datetime
+from collections import deque
+
+from combined_ratio.assistant import ASSISTANT_BACKEND, AssistantClient, make_backend
+from combined_ratio import charts
+from combined_ratio.diagnostics import DIAGNOSTICS, METRICS, PROFILER, start_run
+from combined_ratio.batch import IRR_STATUS_COLUMNS
+from combined_ratio.discounting import IRR_STATUS
+from combined_ratio.export import financial_df_to_parquet
+from combined_ratio.graph import Evaluator
+from combined_ratio.goal_seek import solve_required_reduction
+from combined_ratio.ingest import RATIO_COLUMNS, calculator_inputs as extract_calculator_inputs, ingest, ratio_table
+from combined_ratio.history import HISTORY_SUMMARIZER, ConversationHistory, extractive_summary, make_assistant_summarizer
+from combined_ratio.core import GRANULARITIES
+from combined_ratio.model import MODEL, PROJECTION_NODES, time_columns
+from combined_ratio.monte_carlo import simulate_financials
+from combined_ratio.portfolio import project_portfolio, read_lines, summarize_by
+from combined_ratio.sensitivity import PARAMETERS, perturbation_range, sweep_2d, tornado
+from combined_ratio.store import ScenarioStore
+from combined_ratio.result_cache import get_cache, normalize_key, cache_stats
+from combined_ratio.sessions import MAX_CHAT_MESSAGES, get_warm_sessions
+from combined_ratio.surface import get_surface
 
 # --- Configurations ---
 st.set_page_config(
@@ -12,160 +36,51 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+# Timing spans for each stage of this run, enabled by CALCULATOR_DIAGNOSTICS=1 or the
+# ?diagnostics=1 URL parameter; a no-op recorder otherwise
+run = start_run(
+    enabled=DIAGNOSTICS or st.query_params.get("diagnostics") == "1",
+    profiler=PROFILER if st.session_state.get("profile_runs") else None,
+)
+
 # --- Set up OpenAI API Key ---
 # Use an environment variable to keep your API key secure
 openai.api_key = os.getenv("OPENAI_API_KEY")
 
-# Check if the API key was successfully loaded
-if openai.api_key is None:
+# Check if the API key was successfully loaded (not needed for the offline fake backend)
+if ASSISTANT_BACKEND == "openai" and openai.api_key is None:
     st.error("Error: OpenAI API key is missing. Please set the OPENAI_API_KEY environment variable.")
     st.stop()
 
 # --- Helper Functions ---
-def calculate_combined_ratio(loss_ratio, expense_ratio):
-    """
-    Calculate the combined ratio by summing the loss and expense ratios.
-    
-    Parameters:
-        loss_ratio (float): Current loss ratio percentage.
-        expense_ratio (float): Current expense ratio percentage.
-    
-    Returns:
-        float: Combined ratio percentage.
+@st.cache_resource
+def get_assistant():
     """
-    return loss_ratio + expense_ratio
+    Create the assistant client once per server process, so its response cache is shared by all sessions.
 
-def calculate_new_ratios(current_loss_ratio, loss_ratio_reduction, current_expense_ratio, expense_ratio_reduction):
-    """
-    Calculate the new loss and expense ratios after reductions.
-    
-    Parameters:
-        current_loss_ratio (float): Current loss ratio percentage.
-        loss_ratio_reduction (float): Reduction in loss ratio percentage.
-        current_expense_ratio (float): Current expense ratio percentage.
-        expense_ratio_reduction (float): Reduction in expense ratio percentage.
-    
     Returns:
-        tuple: New loss ratio and new expense ratio percentages.
+        AssistantClient: Client for the backend selected by CALCULATOR_ASSISTANT_BACKEND.
     """
-    new_loss_ratio = current_loss_ratio - loss_ratio_reduction
-    new_expense_ratio = current_expense_ratio - expense_ratio_reduction
-    return new_loss_ratio, new_expense_ratio
+    return AssistantClient(make_backend())
 
-def project_financials(
-    current_gwp, premium_growth_rate, current_loss_ratio, current_expense_ratio,
-    new_loss_ratio, new_expense_ratio, analysis_period, ongoing_costs, initial_investment,
-    loss_ratio_reduction_salesforce, expense_ratio_reduction_salesforce, ongoing_costs_salesforce
-):
+def get_history():
     """
-    Project financial metrics over the analysis period.
-    
-    Parameters:
-        current_gwp (float): Current Gross Written Premiums in millions.
-        premium_growth_rate (float): Annual premium growth rate percentage.
-        current_loss_ratio (float): Current loss ratio percentage.
-        current_expense_ratio (float): Current expense ratio percentage.
-        new_loss_ratio (float): New loss ratio percentage after reduction.
-        new_expense_ratio (float): New expense ratio percentage after reduction.
-        analysis_period (int): Number of years to analyze.
-        ongoing_costs (float): Total annual ongoing costs in millions.
-        initial_investment (float): Initial investment cost in millions.
-        loss_ratio_reduction_salesforce (float): Loss ratio reduction attributable to Salesforce.
-        expense_ratio_reduction_salesforce (float): Expense ratio reduction attributable to Salesforce.
-        ongoing_costs_salesforce (float): Annual ongoing costs for Salesforce in millions.
-    
-    Returns:
-        tuple: Financial DataFrame and various financial metrics.
-    """
-    years = list(range(1, analysis_period + 1))
-    gwp_list = []
-    profit_current_list = []
-    profit_new_list = []
-    annual_savings = []
-    cumulative_savings = []
-    annual_savings_salesforce = []
-    cumulative_savings_salesforce = []
-    cumulative_cash_flow = -initial_investment
-    cumulative_cash_flow_salesforce = -initial_investment
-    payback_period = None
-    payback_period_salesforce = None
-
-    running_cumulative_savings = 0
-    running_cumulative_savings_salesforce = 0
-
-    for year in years:
-        gwp = current_gwp * (1 + premium_growth_rate / 100) ** (year - 1)
-        gwp_list.append(gwp)
-
-        # Current Scenario
-        loss_current = gwp * current_loss_ratio / 100
-        expense_current = gwp * current_expense_ratio / 100
-        profit_current = gwp - loss_current - expense_current
-        profit_current_list.append(profit_current)
-
-        # New Scenario
-        loss_new = gwp * new_loss_ratio / 100
-        expense_new = gwp * new_expense_ratio / 100
-        profit_new = gwp - loss_new - expense_new
-        profit_new_list.append(profit_new)
-
-        # Total Savings
-        savings = profit_new - profit_current
-        annual_savings.append(savings)
-        running_cumulative_savings += savings
-        cumulative_savings.append(running_cumulative_savings)
-
-        # Savings Attributable to Salesforce
-        loss_savings_salesforce = gwp * loss_ratio_reduction_salesforce / 100
-        expense_savings_salesforce = gwp * expense_ratio_reduction_salesforce / 100
-        savings_salesforce = loss_savings_salesforce + expense_savings_salesforce
-        savings_salesforce -= ongoing_costs_salesforce  # Subtract ongoing Salesforce costs
-        annual_savings_salesforce.append(savings_salesforce)
-        running_cumulative_savings_salesforce += savings_salesforce
-        cumulative_savings_salesforce.append(running_cumulative_savings_salesforce)
-
-        # Cumulative Cash Flow
-        cumulative_cash_flow += savings - ongoing_costs  # Subtract total ongoing costs
-        cumulative_cash_flow_salesforce += savings_salesforce
-
-        # Payback Periods
-        if cumulative_cash_flow >= 0 and payback_period is None:
-            payback_period = year
-        if cumulative_cash_flow_salesforce >= 0 and payback_period_salesforce is None:
-            payback_period_salesforce = year
-
-    # Total Investments
-    total_investment = initial_investment + ongoing_costs * analysis_period
-    total_investment_salesforce = initial_investment + ongoing_costs_salesforce * analysis_period
-
-    # Total Savings
-    total_savings = running_cumulative_savings - (ongoing_costs * analysis_period)
-    total_savings_salesforce = running_cumulative_savings_salesforce
-
-    # ROI Calculations
-    roi = (total_savings / total_investment) * 100 if total_investment != 0 else 0
-    roi_salesforce = (total_savings_salesforce / total_investment_salesforce) * 100 if total_investment_salesforce != 0 else 0
-
-    # Create DataFrame
-    financial_df = pd.DataFrame({
-        "Year": years,
-        "Projected Premiums ($M)": gwp_list,
-        "Current Operating Profit ($M)": profit_current_list,
-        "Projected Operating Profit ($M)": profit_new_list,
-        "Annual Savings ($M)": annual_savings,
-        "Cumulative Savings ($M)": cumulative_savings,
-        "Annual Savings from Salesforce ($M)": annual_savings_salesforce,
-        "Cumulative Salesforce Savings ($M)": cumulative_savings_salesforce,
-    })
+    The session's history manager, which keeps each request within the token budget.
 
-    return (
-        financial_df, roi, payback_period, total_investment, total_savings,
-        roi_salesforce, payback_period_salesforce, total_investment_salesforce, total_savings_salesforce
-    )
+    Returns:
+        ConversationHistory: Manager stored in the session state.
+    """
+    if 'history' not in st.session_state:
+        st.session_state['history'] = ConversationHistory(
+            summarizer=make_assistant_summarizer(get_assistant()) if HISTORY_SUMMARIZER == "assistant" else extractive_summary
+        )
+    return st.session_state['history']
 
 def get_ai_response(messages):
     """
-    Sends the conversation messages to OpenAI's ChatCompletion API and retrieves the assistant's response.
+    Streams the assistant's reply to the conversation, rendering tokens as they arrive.
+
+    Older turns are folded into a summary so the request stays within the token budget.
 
     Parameters:
         messages (list): A list of dictionaries containing the conversation history.
@@ -174,117 +89,465 @@ def get_ai_response(messages):
         str: The assistant's reply.
     """
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=messages
-        )
-        return response['choices'][0]['message']['content']
+        request, _ = get_history().compact(messages)
+        reply = st.write_stream(get_assistant().stream(request))
+        return reply if isinstance(reply, str) else ""
     except Exception as e:
         st.error(f"An error occurred with the OpenAI API: {e}")
         return ""
 
+def queue_question():
+    """
+    Chat form callback: queue the submitted question under a new message ID.
+
+    Callbacks run once per submission, so a question is queued exactly once no matter how
+    many reruns follow (for example from moving a calculator slider).
+    """
+    question = st.session_state['input'].strip()
+    if question:
+        st.session_state['pending_questions'].append({"id": uuid.uuid4().hex, "content": question})
+
+@st.cache_resource
+def get_store():
+    """
+    Open the scenario store once per server process (file set by CALCULATOR_STORE_PATH).
+
+    Returns:
+        ScenarioStore: Store shared by all sessions.
+    """
+    return ScenarioStore()
+
+def warm_state():
+    """
+    The session's recomputable state, which is dropped when too many other sessions were active since.
+
+    Fetched once per run and passed to what needs it, so the pool counts one use per rerun.
+
+    Returns:
+        dict: State kept under the session's ID in the process-wide pool (size set by
+        CALCULATOR_MAX_WARM_SESSIONS).
+    """
+    if 'session_id' not in st.session_state:
+        st.session_state['session_id'] = uuid.uuid4().hex
+    return get_warm_sessions().get(st.session_state['session_id'])
+
+def load_scenario():
+    """
+    Load button callback: put the selected saved scenario's inputs into the sidebar.
+
+    Bumping the input generation gives every sidebar input a new key, so each is
+    recreated with the loaded value instead of keeping what was last entered.
+    """
+    entry = get_store().load(st.session_state['scenario_to_load'])
+    st.session_state['loaded_inputs'] = entry["inputs"]
+    st.session_state['input_generation'] = st.session_state.get('input_generation', 0) + 1
+
+def ingest_extracts(extracts):
+    """
+    Stream uploaded premium, claims and expense extracts into sums per line of business and period.
+
+    Returns:
+        tuple: Sums (see RatioAggregator.totals), rows read and rows without a line or period.
+    """
+    aggregator = ingest(extracts)
+    return aggregator.totals(), aggregator.rows, aggregator.skipped_rows
+
+def use_derived_metrics(metrics):
+    """
+    Button callback: put current financial metrics derived from extracts into the sidebar.
+
+    Works like load_scenario, with the other inputs keeping the values of the last run.
+    """
+    st.session_state['loaded_inputs'] = {**st.session_state['entered_inputs'], **metrics}
+    st.session_state['input_generation'] = st.session_state.get('input_generation', 0) + 1
+
+def initial_value(name, default, min_value=None, max_value=None):
+    """
+    A sidebar input's starting value: the loaded scenario's, kept within the widget's range, or default.
+    """
+    value = st.session_state.get('loaded_inputs', {}).get(name, default)
+    if min_value is not None:
+        value = max(value, min_value)
+    if max_value is not None:
+        value = min(value, max_value)
+    return value
+
+def input_key(name):
+    """
+    Key of a sidebar input for the current input generation (see load_scenario).
+    """
+    return f"{name}-{st.session_state.get('input_generation', 0)}"
+
+def cached(warm, name, key, compute):
+    """
+    Fetch a result from the named cache (scope set by CALCULATOR_CACHE_SCOPE), computing it on a miss.
+
+    Parameters:
+        warm (dict): This run's warm state (see warm_state), holding the session-scoped caches.
+    """
+    return get_cache(name, session_state=warm).get_or_compute(key, compute)
+
+def format_payback(years):
+    """
+    Format a payback period in years: whole years as before, otherwise with months.
+    """
+    if years is None:
+        return "Not Achieved"
+    if float(years).is_integer():
+        return f"{years:.0f} years"
+    return f"{years:.2f} years ({years * 12:.1f} months)"
+
+def format_irr(irr_result):
+    """
+    Format an (IRR percentage, status) pair from the model, naming why there is no rate.
+    """
+    rate, status = irr_result
+    if rate is not None:
+        return f"{rate:.2f}%"
+    return {"no_root": "No IRR", "ambiguous": "Multiple IRRs possible"}.get(status, "Did not converge")
+
+@st.cache_resource
+def get_view_graph():
+    """
+    The calculator graph extended with the app's charts, downloads and narrative text.
+
+    Returns:
+        Graph: Graph shared by all sessions (each session evaluates it separately).
+    """
+    graph = MODEL.extend()
+
+    @graph.node
+    def combined_ratio_chart(current_combined_ratio, new_combined_ratio):
+        return charts.combined_ratio_chart(current_combined_ratio, new_combined_ratio)
+
+    @graph.node
+    def operating_profit_chart(profit_current, profit_new, periods_per_year):
+        return charts.operating_profit_chart(pd.DataFrame({
+            **time_columns(len(profit_current), periods_per_year),
+            "Current Operating Profit ($M)": profit_current,
+            "Projected Operating Profit ($M)": profit_new,
+        }))
+
+    @graph.node
+    def cumulative_savings_chart(cumulative_savings, periods_per_year):
+        return charts.cumulative_savings_chart(pd.DataFrame({
+            **time_columns(len(cumulative_savings), periods_per_year),
+            "Cumulative Savings ($M)": cumulative_savings,
+        }))
+
+    @graph.node
+    def csv_download(financial_df):
+        return financial_df.to_csv(index=False).encode("utf-8")
+
+    @graph.node
+    def parquet_download(financial_df):
+        return financial_df_to_parquet(financial_df)
+
+    @graph.node
+    def executive_summary(
+        current_combined_ratio, new_combined_ratio, total_investment, total_savings, analysis_period, roi, payback_period,
+        npv, irr_result, discount_rate
+    ):
+        return textwrap.dedent(f"""
+        **Projected Improvement in Combined Ratio:**
+
+        - The combined ratio is projected to improve from **{current_combined_ratio:.2f}%** to **{new_combined_ratio:.2f}%**, indicating enhanced profitability.
+
+        **Total Financial Impact:**
+
+        - **Total Investment:** \${total_investment:.2f} million
+        - **Total Savings Over {analysis_period} Years:** \${total_savings:.2f} million
+        - **Return on Investment (ROI):** {roi:.2f}%
+        - **Payback Period:** {format_payback(payback_period)}
+        - **Net Present Value (NPV) at {discount_rate:.1f}%:** \${npv:.2f} million
+        - **Internal Rate of Return (IRR):** {format_irr(irr_result)}
+        """)
+
+    @graph.node
+    def narrative(
+        loss_ratio_reduction_salesforce, expense_ratio_reduction_salesforce, premium_growth_rate,
+        analysis_period, total_savings, roi, payback_period
+    ):
+        return textwrap.dedent(f"""
+        **The Challenge:**
+
+        Our company is seeking ways to improve profitability and operational efficiency in a competitive market.
+
+        **The Salesforce Solution:**
+
+        By investing in **Salesforce Financial Services Cloud (FSC)**, we leverage cutting-edge technology to address these challenges.
+
+        - **Advanced Data Analytics:** Enables better underwriting decisions, directly reducing our Loss Ratio by **{loss_ratio_reduction_salesforce:.2f}%**.
+
+        - **Process Automation:** Streamlines operations, reducing our Expense Ratio by **{expense_ratio_reduction_salesforce:.2f}%**.
+
+        - **Unified Customer View:** Enhances customer relationships, contributing to a Premium Growth Rate of **{premium_growth_rate:.2f}%**.
+
+        **Financial Impact:**
+
+        Over the next **{analysis_period} years**, these improvements result in:
+
+        - **Total Savings:** \${total_savings:.2f} million
+        - **Return on Investment:** {roi:.2f}%
+        - **Payback Period:** {format_payback(payback_period)}
+
+        **Conclusion:**
+
+        Investing in Salesforce FSC not only improves our financial performance but also positions us for sustainable growth and competitive advantage.
+        """)
+
+    return graph
+
+def get_model(warm):
+    """
+    The session's evaluator of the view graph, which recomputes only values downstream of changed inputs.
+
+    Parameters:
+        warm (dict): This run's warm state (see warm_state).
+
+    Returns:
+        Evaluator: Evaluator kept in the session's warm state (see warm_state); a new one
+        recomputes every value.
+    """
+    if 'model' not in warm:
+        warm['model'] = Evaluator(get_view_graph())
+    return warm['model']
+
+# --- Warm State ---
+# Fetched once for this run and passed down (see warm_state)
+warm = warm_state()
+
 # --- Create Tabs ---
 tab1, tab2 = st.tabs(["Calculator", "User Guide & AI Assistant"])
 
 with tab1:
     # --- Sidebar for User Inputs ---
+    run.stage("inputs")
     st.sidebar.header("User Inputs")
 
     # Current Financial Metrics
     st.sidebar.subheader("Current Financial Metrics")
     current_gwp = st.sidebar.number_input(
-        "Annual Gross Written Premiums (in millions $):", min_value=0.0, value=500.0
+        "Annual Gross Written Premiums (in millions $):", min_value=0.0,
+        value=initial_value("current_gwp", 500.0, 0.0), key=input_key("current_gwp")
     )
     current_loss_ratio = st.sidebar.slider(
-        "Current Loss Ratio (%):", min_value=0.0, max_value=100.0, value=65.0
+        "Current Loss Ratio (%):", min_value=0.0, max_value=100.0,
+        value=initial_value("current_loss_ratio", 65.0, 0.0, 100.0), key=input_key("current_loss_ratio")
     )
     current_expense_ratio = st.sidebar.slider(
-        "Current Expense Ratio (%):", min_value=0.0, max_value=100.0, value=30.0
+        "Current Expense Ratio (%):", min_value=0.0, max_value=100.0,
+        value=initial_value("current_expense_ratio", 30.0, 0.0, 100.0), key=input_key("current_expense_ratio")
     )
+    with st.sidebar.expander("Derive From Premium and Claims Extracts"):
+        uploaded_extracts = st.file_uploader(
+            "Upload Extracts (CSV, Parquet or Arrow)", type=["csv", "parquet", "pq", "arrow", "feather", "ipc"],
+            accept_multiple_files=True,
+            help=(
+                "Rows need `line` and `period` (or `date`) columns and any of `written_premium`, `earned_premium`, "
+                "`incurred_loss` and `expenses`; they are summed per line and period as the files stream in. "
+                "For multi-gigabyte extracts, use `python -m combined_ratio.ingest`."
+            ),
+        )
+        if uploaded_extracts:
+            try:
+                extract_totals, extract_rows, skipped_rows = cached(
+                    warm, "ingest", normalize_key([extract.file_id for extract in uploaded_extracts]),
+                    lambda: ingest_extracts(uploaded_extracts),
+                )
+            except (ValueError, KeyError) as e:
+                st.error(f"The extracts could not be read: {e}")
+            else:
+                st.caption(f"{extract_rows:,} rows read" + (f", {skipped_rows:,} without a line or period skipped." if skipped_rows else "."))
+                periods = extract_totals.index.get_level_values("period").unique().tolist()
+                extract_period = st.selectbox("Period:", periods, index=len(periods) - 1)
+                extract_line = st.selectbox("Line of Business:", ["All lines"] + extract_totals.index.get_level_values("line").unique().tolist())
+                extract_units = st.selectbox("Amounts In:", ["Dollars", "Thousands", "Millions"])
+                period_totals = extract_totals.xs(extract_period, level="period", drop_level=False)
+                st.dataframe(ratio_table(period_totals)[RATIO_COLUMNS].style.format("{:.2f}", na_rep="n/a"))
+                derived = extract_calculator_inputs(
+                    period_totals, extract_period, None if extract_line == "All lines" else extract_line,
+                    {"Dollars": 1e6, "Thousands": 1e3, "Millions": 1.0}[extract_units],
+                )
+                # Metrics the extracts lack are left as entered; ratios are kept within the sliders' range
+                derived = {name: round(value, 2) for name, value in derived.items() if value is not None}
+                for name in ("current_loss_ratio", "current_expense_ratio"):
+                    if derived.get(name, 0.0) > 100.0:
+                        st.warning(f"The derived {name.replace('_', ' ')} of {derived[name]:.2f}% is above the slider's 100% limit.")
+                        derived[name] = 100.0
+                st.caption(", ".join(f"{name.replace('current_', '').replace('_', ' ')}: {value:,.2f}" for name, value in derived.items()))
+                st.button("Use These Metrics", on_click=use_derived_metrics, args=(derived,), disabled=not derived)
+
 
     # Expected Improvements
     st.sidebar.subheader("Expected Improvements After Investment")
     loss_ratio_reduction = st.sidebar.slider(
-        "Expected Reduction in Loss Ratio (%):", min_value=0.0, max_value=5.0, value=0.5
+        "Expected Reduction in Loss Ratio (%):", min_value=0.0, max_value=5.0,
+        value=initial_value("loss_ratio_reduction", 0.5, 0.0, 5.0), key=input_key("loss_ratio_reduction")
     )
     expense_ratio_reduction = st.sidebar.slider(
-        "Expected Reduction in Expense Ratio (%):", min_value=0.0, max_value=5.0, value=1.0
+        "Expected Reduction in Expense Ratio (%):", min_value=0.0, max_value=5.0,
+        value=initial_value("expense_ratio_reduction", 1.0, 0.0, 5.0), key=input_key("expense_ratio_reduction")
     )
     premium_growth_rate = st.sidebar.slider(
-        "Annual Premium Growth Rate (%):", min_value=0.0, max_value=10.0, value=2.0
+        "Annual Premium Growth Rate (%):", min_value=0.0, max_value=10.0,
+        value=initial_value("premium_growth_rate", 2.0, 0.0, 10.0), key=input_key("premium_growth_rate")
     )
     analysis_period = st.sidebar.slider(
-        "Analysis Period (Years):", min_value=1, max_value=10, value=5
+        "Analysis Period (Years):", min_value=1, max_value=30,
+        value=initial_value("analysis_period", 5, 1, 30), key=input_key("analysis_period")
+    )
+    granularity = st.sidebar.selectbox(
+        "Cash Flow Periods:", list(GRANULARITIES), format_func=str.title,
+        index=list(GRANULARITIES.values()).index(initial_value("periods_per_year", 1)), key=input_key("periods_per_year"),
+        help="Spread each year's premiums and costs over quarters or months, measuring payback to the quarter or month.",
     )
+    periods_per_year = GRANULARITIES[granularity]
 
     # Salesforce Expense Inputs
     st.sidebar.subheader("Salesforce FSC Investment Costs")
     initial_investment = st.sidebar.number_input(
-        "Initial Investment Cost (in millions $):", min_value=0.0, value=7.0
+        "Initial Investment Cost (in millions $):", min_value=0.0,
+        value=initial_value("initial_investment", 7.0, 0.0), key=input_key("initial_investment")
     )
     ongoing_costs_salesforce = st.sidebar.number_input(
-        "Annual Ongoing Costs (in millions $):", min_value=0.0, value=1.5
+        "Annual Ongoing Costs (in millions $):", min_value=0.0,
+        value=initial_value("ongoing_costs_salesforce", 1.5, 0.0), key=input_key("ongoing_costs_salesforce")
     )
 
     # Other Ongoing Costs (if any)
     st.sidebar.subheader("Other Ongoing Costs")
     ongoing_costs_other = st.sidebar.number_input(
-        "Annual Other Ongoing Costs (in millions $):", min_value=0.0, value=0.0
+        "Annual Other Ongoing Costs (in millions $):", min_value=0.0,
+        value=initial_value("ongoing_costs_other", 0.0, 0.0), key=input_key("ongoing_costs_other")
     )
 
-    # Total Ongoing Costs
-    ongoing_costs = ongoing_costs_salesforce + ongoing_costs_other
+    # Discounting
+    st.sidebar.subheader("Time Value of Money")
+    discount_rate = st.sidebar.number_input(
+        "Discount Rate (%):", min_value=0.0, max_value=50.0,
+        value=initial_value("discount_rate", 8.0, 0.0, 50.0), key=input_key("discount_rate"),
+        help="Annual rate used for the net present value and discounted payback, typically the cost of capital."
+    )
 
-    # Attribution of Improvements to Salesforce
+    # Attribution of Improvements to Salesforce. Each defaults to 80% of its reduction and
+    # resets when the reduction changes; a loaded scenario's attribution applies while its
+    # reduction is unchanged.
     st.sidebar.subheader("Attribution of Improvements to Salesforce")
+    loaded_inputs = st.session_state.get('loaded_inputs', {})
     loss_ratio_reduction_salesforce = st.sidebar.number_input(
         "Loss Ratio Reduction Attributable to Salesforce (%):",
         min_value=0.0,
         max_value=loss_ratio_reduction,
-        value=loss_ratio_reduction * 0.8,
+        value=initial_value("loss_ratio_reduction_salesforce", loss_ratio_reduction * 0.8, 0.0, loss_ratio_reduction)
+        if loaded_inputs.get("loss_ratio_reduction") == loss_ratio_reduction else loss_ratio_reduction * 0.8,
+        key=input_key(f"loss_ratio_reduction_salesforce-{loss_ratio_reduction}"),
         help="Portion of Loss Ratio Reduction directly due to Salesforce investment."
     )
     expense_ratio_reduction_salesforce = st.sidebar.number_input(
         "Expense Ratio Reduction Attributable to Salesforce (%):",
         min_value=0.0,
         max_value=expense_ratio_reduction,
-        value=expense_ratio_reduction * 0.8,
+        value=initial_value("expense_ratio_reduction_salesforce", expense_ratio_reduction * 0.8, 0.0, expense_ratio_reduction)
+        if loaded_inputs.get("expense_ratio_reduction") == expense_ratio_reduction else expense_ratio_reduction * 0.8,
+        key=input_key(f"expense_ratio_reduction_salesforce-{expense_ratio_reduction}"),
         help="Portion of Expense Ratio Reduction directly due to Salesforce investment."
     )
 
-    # --- Calculations ---
-    current_combined_ratio = calculate_combined_ratio(current_loss_ratio, current_expense_ratio)
-    new_loss_ratio, new_expense_ratio = calculate_new_ratios(
-        current_loss_ratio, loss_ratio_reduction, current_expense_ratio, expense_ratio_reduction
+    # Uncertainty Simulation (optional)
+    st.sidebar.subheader("Uncertainty Simulation")
+    simulation_mode = st.sidebar.checkbox(
+        "Simulate a range of outcomes",
+        value=False,
+        help="Draw the improvements and growth rate from triangular distributions (low, expected, high) and run a Monte Carlo simulation."
     )
-    new_combined_ratio = calculate_combined_ratio(new_loss_ratio, new_expense_ratio)
+    if simulation_mode:
+        loss_ratio_reduction_range = st.sidebar.slider(
+            "Loss Ratio Reduction Range (%):", min_value=0.0, max_value=5.0,
+            value=(loss_ratio_reduction * 0.5, min(loss_ratio_reduction * 1.5, 5.0))
+        )
+        expense_ratio_reduction_range = st.sidebar.slider(
+            "Expense Ratio Reduction Range (%):", min_value=0.0, max_value=5.0,
+            value=(expense_ratio_reduction * 0.5, min(expense_ratio_reduction * 1.5, 5.0))
+        )
+        premium_growth_rate_range = st.sidebar.slider(
+            "Premium Growth Rate Range (%):", min_value=0.0, max_value=10.0,
+            value=(premium_growth_rate * 0.5, min(premium_growth_rate * 1.5, 10.0))
+        )
+        n_trials = st.sidebar.number_input(
+            "Number of Trials:", min_value=1_000, max_value=1_000_000, value=100_000, step=10_000
+        )
 
-    # Perform financial projections
+    # --- Calculations ---
+    run.stage("calculations")
+    # Derived values are nodes of a dependency graph; only those downstream of the inputs
+    # that changed since the last rerun are recomputed
+    model = get_model(warm)
+    calculator_inputs = {
+        "current_gwp": current_gwp, "premium_growth_rate": premium_growth_rate,
+        "current_loss_ratio": current_loss_ratio, "current_expense_ratio": current_expense_ratio,
+        "loss_ratio_reduction": loss_ratio_reduction, "expense_ratio_reduction": expense_ratio_reduction,
+        "analysis_period": analysis_period, "initial_investment": initial_investment,
+        "ongoing_costs_salesforce": ongoing_costs_salesforce, "ongoing_costs_other": ongoing_costs_other,
+        "loss_ratio_reduction_salesforce": loss_ratio_reduction_salesforce,
+        "expense_ratio_reduction_salesforce": expense_ratio_reduction_salesforce,
+        "periods_per_year": periods_per_year, "discount_rate": discount_rate,
+    }
+    model.update(calculator_inputs)
+    st.session_state['entered_inputs'] = calculator_inputs
+    current_combined_ratio = model["current_combined_ratio"]
+    new_loss_ratio, new_expense_ratio = model["new_loss_ratio"], model["new_expense_ratio"]
+    new_combined_ratio = model["new_combined_ratio"]
+    ongoing_costs = model["ongoing_costs"]
     (
         financial_df, roi, payback_period, total_investment, total_savings,
         roi_salesforce, payback_period_salesforce, total_investment_salesforce, total_savings_salesforce
-    ) = project_financials(
+    ) = (model[name] for name in PROJECTION_NODES)
+
+    # Key of the projection inputs, for the cached scenario-level results below
+    projection_key = normalize_key(
         current_gwp, premium_growth_rate, current_loss_ratio, current_expense_ratio,
         new_loss_ratio, new_expense_ratio, analysis_period, ongoing_costs, initial_investment,
         loss_ratio_reduction_salesforce, expense_ratio_reduction_salesforce, ongoing_costs_salesforce
     )
 
+    # Inputs as entered, for the scenario-level tools (goal seek and sensitivity analysis)
+    scenario_inputs = {
+        "current_gwp": current_gwp, "premium_growth_rate": premium_growth_rate,
+        "current_loss_ratio": current_loss_ratio, "current_expense_ratio": current_expense_ratio,
+        "loss_ratio_reduction": loss_ratio_reduction, "expense_ratio_reduction": expense_ratio_reduction,
+        "analysis_period": analysis_period, "initial_investment": initial_investment,
+        "ongoing_costs": ongoing_costs, "ongoing_costs_salesforce": ongoing_costs_salesforce,
+        "ongoing_costs_other": ongoing_costs_other,
+        "loss_ratio_reduction_salesforce": loss_ratio_reduction_salesforce,
+        "expense_ratio_reduction_salesforce": expense_ratio_reduction_salesforce,
+    }
+
+    # --- Save Scenario ---
+    # The inputs as entered and their projected results, kept for later sessions
+    with st.sidebar.form("save_scenario"):
+        st.subheader("Save This Scenario")
+        scenario_name = st.text_input("Scenario Name:")
+        scenario_carrier = st.text_input("Carrier:")
+        scenario_as_of = st.date_input("As-of Date:", value=datetime.date.today())
+        scenario_tags = st.text_input("Tags (comma-separated):")
+        replace_scenario = st.checkbox("Replace a saved scenario of the same name")
+        if st.form_submit_button("Save Scenario"):
+            try:
+                get_store().save(
+                    scenario_name.strip(), calculator_inputs, carrier=scenario_carrier,
+                    as_of=scenario_as_of, tags=scenario_tags, replace=replace_scenario,
+                )
+                st.success(f"Saved '{scenario_name.strip()}'.")
+            except ValueError as e:
+                st.error(f"The scenario could not be saved: {e}")
+
     # --- Display Results ---
+    run.stage("summary")
     st.header("Executive Summary")
 
     # Summarize key improvements and financial impacts
-    st.markdown(f"""
-    **Projected Improvement in Combined Ratio:**
-
-    - The combined ratio is projected to improve from **{current_combined_ratio:.2f}%** to **{new_combined_ratio:.2f}%**, indicating enhanced profitability.
-
-    **Total Financial Impact:**
-
-    - **Total Investment:** \${total_investment:.2f} million
-    - **Total Savings Over {analysis_period} Years:** \${total_savings:.2f} million
-    - **Return on Investment (ROI):** {roi:.2f}%
-    - **Payback Period:** {payback_period if payback_period else 'Not Achieved'} years
-    """)
+    st.markdown(model["executive_summary"])
 
     # --- Financial Highlights ---
     st.subheader("Financial Highlights")
@@ -296,11 +559,269 @@ with tab1:
         st.metric("Annual Premium Growth Rate (%)", f"{premium_growth_rate:.2f}%")
     with col4:
         st.metric("Return on Investment (ROI)", f"{roi:.2f}%", help="Overall ROI from the investment.")
-        st.metric("Payback Period", f"{payback_period if payback_period else 'Not Achieved'} years")
+        st.metric("Payback Period", format_payback(payback_period), help=f"Interpolated within the {granularity} period: {format_payback(model['payback_period_interpolated'])}.")
         st.metric("Salesforce ROI", f"{roi_salesforce:.2f}%")
-        st.metric("Salesforce Payback Period", f"{payback_period_salesforce if payback_period_salesforce else 'Not Achieved'} years")
+        st.metric("Salesforce Payback Period", format_payback(payback_period_salesforce), help=f"Interpolated within the {granularity} period: {format_payback(model['payback_period_salesforce_interpolated'])}.")
+
+    # Discounted cash flow metrics
+    irr_help = (
+        "No IRR: the net present value does not change sign, e.g. when the investment is never recovered. "
+        "Multiple IRRs possible: the cash flows change sign more than once, so no single rate is reported."
+    )
+    col5, col6 = st.columns(2)
+    with col5:
+        st.metric(f"Net Present Value at {discount_rate:.1f}%", f"${model['npv']:,.2f}M")
+        st.metric("Internal Rate of Return (IRR)", format_irr(model["irr_result"]), help=irr_help)
+        st.metric("Discounted Payback Period", format_payback(model["discounted_payback_period"]))
+    with col6:
+        st.metric(f"Salesforce NPV at {discount_rate:.1f}%", f"${model['npv_salesforce']:,.2f}M")
+        st.metric("Salesforce IRR", format_irr(model["irr_result_salesforce"]), help=irr_help)
+        st.metric("Salesforce Discounted Payback Period", format_payback(model["discounted_payback_period_salesforce"]))
+
+    # --- Range of Outcomes ---
+    run.stage("simulation")
+    if simulation_mode:
+        st.subheader("Range of Outcomes")
+
+        def triangular(value_range, expected):
+            low, high = value_range
+            return ("triangular", low, min(max(expected, low), high), high)
+
+        simulation_inputs = dict(
+            loss_ratio_reduction=triangular(loss_ratio_reduction_range, loss_ratio_reduction),
+            expense_ratio_reduction=triangular(expense_ratio_reduction_range, expense_ratio_reduction),
+            premium_growth_rate=triangular(premium_growth_rate_range, premium_growth_rate),
+            salesforce_loss_share=loss_ratio_reduction_salesforce / loss_ratio_reduction if loss_ratio_reduction else 0.0,
+            salesforce_expense_share=expense_ratio_reduction_salesforce / expense_ratio_reduction if expense_ratio_reduction else 0.0,
+            n_trials=int(n_trials),
+        )
+        simulation = cached(
+            warm, "simulations",
+            normalize_key(projection_key, *simulation_inputs.values()),
+            lambda: simulate_financials(
+                current_gwp, current_loss_ratio, current_expense_ratio, analysis_period, ongoing_costs,
+                initial_investment, ongoing_costs_salesforce, **simulation_inputs
+            ),
+        )
+
+        col5, col6 = st.columns(2)
+        with col5:
+            st.metric("Probability of Payback", f"{simulation['probability_of_payback']:.1%}", help=f"Share of {simulation['n_trials']:,} trials that pay back within {analysis_period} years.")
+        with col6:
+            st.metric("Salesforce Probability of Payback", f"{simulation['probability_of_payback_salesforce']:.1%}")
+
+        percentile_df = pd.DataFrame({
+            "Percentile": [f"P{p}" for p in simulation['roi']],
+            "ROI (%)": list(simulation['roi'].values()),
+            "Payback Period (Years)": [f"{v:.0f}" if v is not None else 'Not Achieved' for v in simulation['payback_period'].values()],
+            "Salesforce ROI (%)": list(simulation['roi_salesforce'].values()),
+            "Salesforce Payback Period (Years)": [f"{v:.0f}" if v is not None else 'Not Achieved' for v in simulation['payback_period_salesforce'].values()],
+        })
+        st.table(percentile_df.style.format({"ROI (%)": "{:,.2f}", "Salesforce ROI (%)": "{:,.2f}"}))
+
+    # --- Goal Seek ---
+    run.stage("goal_seek")
+    with st.expander("Goal Seek: Required Improvement"):
+        st.markdown("Find the reduction needed to reach a target, keeping every other input as entered.")
+        col7, col8 = st.columns(2)
+        with col7:
+            goal = st.radio("Target", ["Payback Period", "Return on Investment"], horizontal=True)
+            if goal == "Payback Period":
+                target_payback = st.number_input("Payback Within (Years):", min_value=1, max_value=30, value=min(3, analysis_period))
+                target_roi = None
+            else:
+                target_roi = st.number_input("Target ROI (%):", value=100.0, step=10.0)
+                target_payback = None
+        with col8:
+            solve_options = {
+                "Reduction in Loss Ratio": "loss_ratio_reduction",
+                "Reduction in Expense Ratio": "expense_ratio_reduction",
+                "Salesforce Loss Ratio Reduction (Salesforce ROI/Payback)": "loss_ratio_reduction_salesforce",
+                "Salesforce Expense Ratio Reduction (Salesforce ROI/Payback)": "expense_ratio_reduction_salesforce",
+            }
+            solve_label = st.selectbox("Solve For", list(solve_options))
+
+        solve_for = solve_options[solve_label]
+        required = solve_required_reduction(
+            pd.DataFrame([scenario_inputs]), solve_for, target_roi=target_roi, target_payback=target_payback
+        ).iloc[0]
+
+        if pd.isna(required):
+            st.warning("The target cannot be reached by reducing this ratio alone.")
+        else:
+            st.metric(
+                f"Required {solve_label.split(' (')[0]} (%)",
+                f"{required:.2f}%",
+                delta=f"{required - scenario_inputs[solve_for]:+.2f} pts vs. current input",
+                delta_color="inverse",
+            )
+
+    # --- Sensitivity Analysis ---
+    run.stage("sensitivity")
+    with st.expander("Sensitivity Analysis"):
+        metric_labels = {
+            "Return on Investment (%)": "roi",
+            "Total Savings ($M)": "total_savings",
+            "Payback Period (Years)": "payback_period",
+        }
+        metric_label = st.selectbox("Metric", list(metric_labels))
+        metric = metric_labels[metric_label]
+        inputs_key = normalize_key(*scenario_inputs.values())
+
+        # Tornado: each input moved to its low and high value, one at a time
+        tornado_df = cached(warm, "sensitivity", ("tornado", metric) + inputs_key, lambda: tornado(scenario_inputs, metric))
+        baseline_value = tornado_df.attrs["baseline"][metric]
+        if np.isnan(baseline_value):
+            st.info("Payback is not achieved at the current inputs; bars start from one year past the analysis period.")
+            baseline_value = analysis_period + 1.0
+        st.altair_chart(cached(
+            warm, "charts", ("tornado", metric) + inputs_key,
+            lambda: charts.tornado_chart(tornado_df.fillna({f"{metric}_low": analysis_period + 1.0, f"{metric}_high": analysis_period + 1.0}), baseline_value, metric_label),
+        ), use_container_width=True)
+
+        # Heatmap: two inputs swept together over a 50 x 50 grid
+        parameter_labels = {label: name for name, (label, _) in PARAMETERS.items()}
+        col9, col10 = st.columns(2)
+        with col9:
+            x_label = st.selectbox("Horizontal Axis", list(parameter_labels), index=list(PARAMETERS).index("loss_ratio_reduction"))
+        with col10:
+            y_label = st.selectbox("Vertical Axis", list(parameter_labels), index=list(PARAMETERS).index("expense_ratio_reduction"))
+        x_name, y_name = parameter_labels[x_label], parameter_labels[y_label]
+        x_values = np.linspace(*perturbation_range(x_name, scenario_inputs[x_name]), 50)
+        y_values = np.linspace(*perturbation_range(y_name, scenario_inputs[y_name]), 50)
+        if x_name == y_name:
+            st.warning("Choose two different inputs for the heatmap.")
+        elif x_values[0] == x_values[-1] or y_values[0] == y_values[-1]:
+            st.info("An input at zero has no range to sweep; choose another input or change its value.")
+        else:
+            # Estimated from the precomputed response surface when one is configured
+            # (CALCULATOR_SURFACE_PATH) and covers the grid; the figures above stay exact
+            try:
+                surface = get_surface()
+            except (OSError, ValueError) as e:
+                st.caption(f"The response surface could not be loaded ({e}); the heatmap is computed exactly.")
+                surface = None
+            heatmap_key = ("heatmap", metric, x_name, y_name, surface is not None) + inputs_key
+            grid_df = cached(warm, "sensitivity", heatmap_key, lambda: sweep_2d(scenario_inputs, x_name, x_values, y_name, y_values, metric, surface))
+            st.altair_chart(cached(
+                warm, "charts", heatmap_key, lambda: charts.heatmap_chart(grid_df, x_label, y_label, metric_label)
+            ), use_container_width=True)
+            if grid_df.attrs["estimated"]:
+                st.caption("Estimated from the precomputed response surface; the financial highlights above are exact.")
+
+    # --- Portfolio Analysis ---
+    run.stage("portfolio")
+    with st.expander("Portfolio Analysis: Lines of Business"):
+        st.markdown(
+            "Model each line of business separately and roll the results up to the enterprise. "
+            "The analysis period and investment costs come from the sidebar and are allocated to lines by GWP. "
+            "Add a `segment` column to also see totals by segment."
+        )
+        uploaded_lines = st.file_uploader("Upload a Line Table (CSV, Parquet or Arrow)", type=["csv", "parquet", "pq", "arrow", "feather", "ipc"])
+        if uploaded_lines is not None:
+            try:
+                lines_df = read_lines(uploaded_lines)
+            except ValueError as e:
+                st.error(f"The file could not be read: {e}")
+                lines_df = None
+        else:
+            # Starting point: the sidebar book split into three lines, editable in place
+            lines_df = st.data_editor(pd.DataFrame({
+                "line": ["Personal Auto", "Homeowners", "Commercial Property"],
+                "current_gwp": [current_gwp * 0.5, current_gwp * 0.3, current_gwp * 0.2],
+                "premium_growth_rate": [premium_growth_rate] * 3,
+                "current_loss_ratio": [current_loss_ratio] * 3,
+                "current_expense_ratio": [current_expense_ratio] * 3,
+                "loss_ratio_reduction": [loss_ratio_reduction] * 3,
+                "expense_ratio_reduction": [expense_ratio_reduction] * 3,
+                "loss_ratio_reduction_salesforce": [loss_ratio_reduction_salesforce] * 3,
+                "expense_ratio_reduction_salesforce": [expense_ratio_reduction_salesforce] * 3,
+            }), num_rows="dynamic", key="portfolio_lines")
+
+        try:
+            if lines_df is None:
+                raise ValueError("no line table loaded.")
+            line_summary, portfolio_df, enterprise = cached(
+                warm, "portfolio",
+                normalize_key(lines_df.to_csv(index=False), analysis_period, ongoing_costs, initial_investment, ongoing_costs_salesforce),
+                lambda: project_portfolio(lines_df, analysis_period, ongoing_costs, initial_investment, ongoing_costs_salesforce),
+            )
+        except (ValueError, KeyError) as e:
+            st.error(f"The line table could not be used: {e}")
+        else:
+            col11, col12, col13 = st.columns(3)
+            with col11:
+                st.metric(
+                    "Enterprise Combined Ratio",
+                    f"{enterprise['new_combined_ratio']:.2f}%",
+                    delta=f"{enterprise['new_combined_ratio'] - enterprise['current_combined_ratio']:+.2f} pts",
+                    delta_color="inverse",
+                    help="Premium-weighted over the analysis period.",
+                )
+            with col12:
+                st.metric("Enterprise ROI", f"{enterprise['roi']:.2f}%")
+            with col13:
+                st.metric("Enterprise Payback Period", f"{enterprise['payback_period']:.0f} years" if not np.isnan(enterprise['payback_period']) else "Not Achieved")
+
+            st.dataframe(line_summary.style.format({
+                "current_gwp": "{:,.2f}", "cost_share": "{:.1%}", "total_premiums": "{:,.2f}",
+                "current_combined_ratio": "{:.2f}", "new_combined_ratio": "{:.2f}",
+                "total_investment": "{:,.2f}", "total_savings": "{:,.2f}", "roi": "{:,.2f}",
+                "payback_period": "{:.0f}", "total_savings_salesforce": "{:,.2f}", "roi_salesforce": "{:,.2f}",
+                "payback_period_salesforce": "{:.0f}",
+            }, na_rep="Not Achieved"))
+            if "segment" in line_summary:
+                st.dataframe(summarize_by(line_summary).style.format("{:,.2f}"))
+            st.dataframe(portfolio_df.style.format({name: "{:,.2f}" for name in portfolio_df.columns if name != "Year"}))
+
+    # --- Saved Scenarios ---
+    run.stage("scenarios")
+    with st.expander("Saved Scenarios: Compare and Load"):
+        st.markdown(
+            "Find scenarios saved from the sidebar, compare them side by side, or load one back into the calculator. "
+            "Saved results are shown without recomputing."
+        )
+        store = get_store()
+        col14, col15 = st.columns(2)
+        with col14:
+            carrier_filter = st.multiselect("Carriers", store.carriers())
+            tag_filter = st.multiselect("Tags (all required)", list(store.tag_counts()))
+        with col15:
+            first_as_of, last_as_of = store.date_range()
+            # A range picker returns one date while the second is being chosen
+            as_of_filter = st.date_input("As-of Dates", value=(first_as_of, last_as_of)) if first_as_of else ()
+            name_filter = st.text_input("Name Contains")
+
+        filters = {
+            "carrier": carrier_filter or None, "tags": tag_filter, "name": name_filter.strip() or None,
+            "since": as_of_filter[0] if len(as_of_filter) > 0 else None,
+            "until": as_of_filter[1] if len(as_of_filter) > 1 else None,
+        }
+        # Only the newest matches are listed, so the page stays quick with a large store
+        matches = store.find(**filters, limit=200)
+        st.caption(f"{store.count(**filters):,} saved scenarios match; showing up to 200 with the latest as-of dates.")
+        st.dataframe(
+            matches[["name", "carrier", "as_of", "tags", "roi", "payback_period", "npv", "irr"]].style.format({
+                "roi": "{:,.2f}", "payback_period": "{:.2f}", "npv": "{:,.2f}", "irr": "{:,.2f}",
+            }, na_rep="-"),
+            hide_index=True,
+        )
+
+        if not matches.empty:
+            compared = st.multiselect("Scenarios to Compare", matches["name"], default=list(matches["name"][:2]))
+            if compared:
+                comparison = store.compare(compared)
+                comparison.loc[IRR_STATUS_COLUMNS] = comparison.loc[IRR_STATUS_COLUMNS].map(lambda code: IRR_STATUS[code])
+                st.dataframe(comparison.map(lambda value: f"{value:,.2f}" if isinstance(value, float) else str(value)).replace("nan", "-"))
+
+            col16, col17 = st.columns([3, 1])
+            with col16:
+                st.selectbox("Scenario to Load", matches["name"], key="scenario_to_load")
+            with col17:
+                st.button("Load into the Calculator", on_click=load_scenario)
 
     # --- Salesforce Feature Impact ---
+    run.stage("tables")
     st.subheader("How Salesforce FSC Drives These Improvements")
 
     feature_impact_df = pd.DataFrame({
@@ -327,6 +848,8 @@ with tab1:
     st.subheader("Detailed Financial Projections")
 
     # Display the financial projections
+    if periods_per_year > 1:
+        st.caption(f"Premiums, profits and savings are per {granularity.removesuffix('ly')}; the annual savings columns hold each period's savings.")
     st.dataframe(
         financial_df.style.format({
             "Projected Premiums ($M)": "{:,.2f}",
@@ -340,111 +863,42 @@ with tab1:
     )
 
     # --- Visualization ---
+    run.stage("charts")
     st.header("Visualizing the Impact")
 
+    # Charts are Vega-Lite specs drawn in the browser; each is rebuilt only when its series change
     # Combined Ratio Comparison
-    fig1, ax1 = plt.subplots()
-    bars = ax1.bar(
-        ['Current Combined Ratio', 'Projected Combined Ratio'],
-        [current_combined_ratio, new_combined_ratio],
-        color=['#1f77b4', '#ff7f0e']
-    )
-    ax1.set_ylabel('Combined Ratio (%)')
-    ax1.set_title('Improvement in Combined Ratio')
-    ax1.bar_label(bars, fmt='%.2f%%')
-    st.pyplot(fig1)
+    st.altair_chart(model["combined_ratio_chart"], use_container_width=True)
 
     # Operating Profit Over Time
-    fig2, ax2 = plt.subplots()
-    ax2.plot(
-        financial_df["Year"],
-        financial_df["Current Operating Profit ($M)"],
-        label='Current Operating Profit',
-        marker='o',
-        linestyle='--'
-    )
-    ax2.plot(
-        financial_df["Year"],
-        financial_df["Projected Operating Profit ($M)"],
-        label='Projected Operating Profit',
-        marker='o'
-    )
-    ax2.set_xlabel('Year')
-    ax2.set_ylabel('Operating Profit ($M)')
-    ax2.set_title('Operating Profit Over Time')
-    ax2.legend()
-    st.pyplot(fig2)
+    st.altair_chart(model["operating_profit_chart"], use_container_width=True)
 
     # Cumulative Savings Over Time
-    fig3, ax3 = plt.subplots()
-    ax3.plot(
-        financial_df["Year"],
-        financial_df["Cumulative Savings ($M)"],
-        label='Cumulative Savings',
-        marker='o',
-        color='green'
-    )
-    ax3.set_xlabel('Year')
-    ax3.set_ylabel('Cumulative Savings ($M)')
-    ax3.set_title('Cumulative Savings Over Time')
-    ax3.legend()
-    st.pyplot(fig3)
+    st.altair_chart(model["cumulative_savings_chart"], use_container_width=True)
 
     # --- Narrative Explanation ---
+    run.stage("narrative")
     st.header("Transforming Our Business with Salesforce FSC")
 
-    st.markdown(f"""
-    **The Challenge:**
-
-    Our company is seeking ways to improve profitability and operational efficiency in a competitive market.
-
-    **The Salesforce Solution:**
-
-    By investing in **Salesforce Financial Services Cloud (FSC)**, we leverage cutting-edge technology to address these challenges.
-
-    - **Advanced Data Analytics:** Enables better underwriting decisions, directly reducing our Loss Ratio by **{loss_ratio_reduction_salesforce:.2f}%**.
-
-    - **Process Automation:** Streamlines operations, reducing our Expense Ratio by **{expense_ratio_reduction_salesforce:.2f}%**.
-
-    - **Unified Customer View:** Enhances customer relationships, contributing to a Premium Growth Rate of **{premium_growth_rate:.2f}%**.
-
-    **Financial Impact:**
-
-    Over the next **{analysis_period} years**, these improvements result in:
-
-    - **Total Savings:** \${total_savings:.2f} million
-    - **Return on Investment:** {roi:.2f}%
-    - **Payback Period:** {payback_period if payback_period else 'Not Achieved'} years
-
-    **Conclusion:**
-
-    Investing in Salesforce FSC not only improves our financial performance but also positions us for sustainable growth and competitive advantage.
-    """)
+    st.markdown(model["narrative"])
 
     # --- Download Options ---
+    run.stage("downloads")
     st.subheader("Download Your Results")
 
-    csv = financial_df.to_csv(index=False)
     st.download_button(
         label="Download Financial Projections as CSV",
-        data=csv,
+        data=model["csv_download"],
         file_name='financial_projections.csv',
         mime='text/csv',
     )
-
-    # Save the executive summary text for copying
-    executive_summary_text = f"""
-    **Projected Improvement in Combined Ratio:**
-
-    - The combined ratio is projected to improve from **{current_combined_ratio:.2f}%** to **{new_combined_ratio:.2f}%**, indicating enhanced profitability.
-
-    **Total Financial Impact:**
-
-    - **Total Investment:** \${total_investment:.2f} million
-    - **Total Savings Over {analysis_period} Years:** \${total_savings:.2f} million
-    - **Return on Investment (ROI):** {roi:.2f}%
-    - **Payback Period:** {payback_period if payback_period else 'Not Achieved'} years
-    """
+    st.download_button(
+        label="Download Financial Projections as Parquet",
+        data=model["parquet_download"],
+        file_name='financial_projections.parquet',
+        mime='application/vnd.apache.parquet',
+        help="Typed columnar format. For large scenario portfolios, use `python -m combined_ratio` to stream projections to Parquet or Arrow files.",
+    )
 
     st.markdown("""
     ### **Copy of Executive Summary for Reports**
@@ -452,10 +906,30 @@ with tab1:
     *You can copy the text below for use in your presentations or reports.*
 
     ---
-    """ + executive_summary_text)
+    """)
+    st.markdown(model["executive_summary"])
+
+    # --- Cache Statistics ---
+    run.stage("statistics")
+    with st.sidebar.expander("Cache Statistics"):
+        st.caption("Reuse of simulations, sensitivity and portfolio results across reruns.")
+        st.dataframe(pd.DataFrame(cache_stats(warm)).T)
+        st.caption("Sessions keeping their results between reruns:")
+        st.dataframe(pd.DataFrame([get_warm_sessions().stats()]), hide_index=True)
+
+    # --- Recomputation ---
+    with st.sidebar.expander("Recomputation"):
+        model_stats = model.stats()
+        st.caption(f"Rerun {model_stats['run']}: changed inputs: {', '.join(model_stats['changed_inputs']) or 'none'}.")
+        st.dataframe(pd.DataFrame({
+            "Node": model_stats["recomputed"],
+            "Time (ms)": [model_stats["seconds"][name] * 1000 for name in model_stats["recomputed"]],
+        }).style.format({"Time (ms)": "{:.3f}"}), hide_index=True)
+        st.caption(f"Reused without recomputing: {len(model_stats['reused'])} nodes.")
 
 with tab2:
     # --- User Guide Content ---
+    run.stage("guide")
     st.title("User Guide & AI Assistant")
 
     st.header("Introduction")
@@ -466,6 +940,7 @@ with tab2:
     """)
 
     # --- AI Assistant Section ---
+    run.stage("chat")
     st.header("Chat with the AI Assistant")
     st.markdown("""
     **Need help estimating input values?** Ask our AI assistant for suggestions and guidance.
@@ -476,32 +951,63 @@ with tab2:
         st.session_state['messages'] = [
             {"role": "system", "content": "You are an AI assistant that helps users estimate reasonable values for financial metrics in an insurance calculator. Provide clear and helpful suggestions based on industry standards and best practices."}
         ]
+    if 'pending_questions' not in st.session_state:
+        st.session_state['pending_questions'] = []
+        st.session_state['answered_ids'] = deque(maxlen=MAX_CHAT_MESSAGES)
 
     # Display previous messages
+    if get_history().dropped_turns:
+        st.caption(
+            f"{get_history().dropped_turns} earlier messages are no longer shown; "
+            "the assistant still has a summary of them."
+        )
     for i, msg in enumerate(st.session_state['messages'][1:]):  # Skip the system prompt
         if msg['role'] == 'user':
             message(msg['content'], is_user=True, key=str(i) + '_user')
         else:
             message(msg['content'], key=str(i))
 
-    # User input
-    user_input = st.text_input("Type your question here...", key='input')
+    # User input: submitted through a form so each question is sent once, not on every rerun
+    with st.form("chat_form", clear_on_submit=True):
+        st.text_input("Type your question here...", key='input')
+        st.form_submit_button("Send", on_click=queue_question)
+
+    while st.session_state['pending_questions']:
+        question = st.session_state['pending_questions'].pop(0)
+        if question['id'] in st.session_state['answered_ids']:
+            continue
+        # Mark the question before calling the backend, so an interrupted rerun cannot send it again
+        st.session_state['answered_ids'].append(question['id'])
 
-    if user_input:
         # Append user message to the session state
-        st.session_state['messages'].append({"role": "user", "content": user_input})
+        st.session_state['messages'].append({"role": "user", "content": question['content']})
+        message(question['content'], is_user=True, key=question['id'] + '_user')
 
-        # Generate AI response
-        ai_message = get_ai_response(st.session_state['messages'])
+        # Generate AI response, streamed into a placeholder until it is complete
+        placeholder = st.empty()
+        with placeholder.container(), run.span("assistant"):
+            ai_message = get_ai_response(st.session_state['messages'])
 
         if ai_message:
+            placeholder.empty()
+
             # Append assistant's response to the session state
             st.session_state['messages'].append({"role": "assistant", "content": ai_message})
 
             # Display assistant's response
-            message(ai_message, key=str(len(st.session_state['messages'])))
+            message(ai_message, key=question['id'])
+
+            request_stats = get_history().last_stats
+            st.caption(
+                f"Request size: {request_stats['tokens']:,} tokens "
+                f"(full conversation: {request_stats['full_tokens']:,}; {request_stats['folded_turns']} earlier messages summarized)"
+            )
+
+    # Keep the session's chat within its cap (CALCULATOR_SESSION_MAX_MESSAGES)
+    get_history().trim(st.session_state['messages'], MAX_CHAT_MESSAGES)
 
     # --- User Guide Sections ---
+    run.stage("guide_footer")
     st.header("How the Calculator Works")
     st.markdown("""
     The calculator uses a financial model that projects the impact of changes in loss ratio and expense ratio on your company's profitability over a specified analysis period. It takes into account:
@@ -534,6 +1040,8 @@ with tab2:
     - **Expected Reduction in Expense Ratio (%):** Estimate the percentage reduction in the expense ratio.
     - **Annual Premium Growth Rate (%):** Enter the expected annual growth rate of premiums.
     - **Analysis Period (Years):** Choose the number of years over which to analyze the impact.
+    - **Cash Flow Periods:** Choose annual, quarterly or monthly cash flows. Finer periods spread each year's premiums and costs evenly, leaving totals and ROI unchanged, and measure the payback period to the quarter or month.
+    - **Discount Rate (%):** Enter the annual rate used to discount future cash flows, typically your cost of capital or hurdle rate.
 
     **Step 3: Provide Salesforce FSC Investment Costs**
 
@@ -558,8 +1066,13 @@ with tab2:
 
     **Step 7: Download Your Results**
 
-    - Use the **Download** option to export the financial projections as a CSV file.
+    - Use the **Download** options to export the financial projections as a CSV or Parquet file.
     - Copy the **Executive Summary** for use in reports or presentations.
+
+    **Step 8: Save and Compare Scenarios (Optional)**
+
+    - Use **Save This Scenario** in the sidebar to keep the current inputs and results under a name, with a carrier, an as-of date and tags.
+    - In **Saved Scenarios: Compare and Load**, filter saved scenarios by carrier, as-of date, tags or name, compare several side by side, or load one back into the sidebar.
     """)
 
     st.header("Understanding the Model")
@@ -574,6 +1087,9 @@ with tab2:
     - **Cumulative Savings:** The total savings accumulated over the analysis period.
     - **Return on Investment (ROI):** Calculated by dividing the total savings by the total investment cost.
     - **Payback Period:** The time it takes for cumulative savings to equal the total investment cost.
+    - **Net Present Value (NPV):** The investment and every period's net savings, discounted back to today at the **Discount Rate**; a positive NPV means the project earns more than that rate.
+    - **Internal Rate of Return (IRR):** The annual discount rate at which the NPV is zero. "No IRR" is shown when the NPV does not change sign, for example when the investment is never recovered.
+    - **Discounted Payback Period:** The time it takes for discounted cumulative savings to recover the investment; it is never shorter than the payback period.
 
     **Attribution to Salesforce:**
 
@@ -587,6 +1103,10 @@ with tab2:
     - **Use Realistic Estimates:** Input conservative and realistic numbers for expected improvements.
     - **Understand Attribution:** Carefully consider what portion of improvements can be directly attributed to Salesforce FSC.
     - **Explore Scenarios:** Try different inputs to see how changes affect the financial outcomes.
+    - **Work Backwards:** Use **Goal Seek** to find the loss or expense ratio reduction needed to pay back within a given number of years or to reach a target ROI.
+    - **Find the Key Drivers:** Open **Sensitivity Analysis** to rank inputs by their effect on ROI, savings or payback and to sweep two inputs together.
+    - **Model Your Portfolio:** Open **Portfolio Analysis** to edit or upload a table of lines of business and see enterprise-level combined ratios, ROI and payback.
+    - **Explore Uncertainty:** Enable **Uncertainty Simulation** in the sidebar to see ROI and payback percentiles across a range of improvements and growth rates.
     - **Consult Stakeholders:** Engage with your finance and operations teams to gather accurate data.
     """)
 
@@ -603,4 +1123,26 @@ with tab2:
 
     st.markdown("""
     This calculator is a decision-support tool intended to provide estimates based on the inputs provided. Actual results may vary. Always consult with a financial professional before making investment decisions.
-    """)
\ No newline at end of file
+    """)
+
+# --- Diagnostics ---
+run.finish()
+if run.enabled:
+    with st.sidebar.expander("Diagnostics"):
+        st.checkbox(
+            "Profile each rerun", key="profile_runs",
+            help=f"Capture a {PROFILER} profile of the whole script, shown here from the next rerun on.",
+        )
+        st.caption(f"Script run: {run.total * 1000:.1f} ms (this panel not included).")
+        st.dataframe(pd.DataFrame({
+            "Span": [name for name, _ in run.spans],
+            "Time (ms)": [seconds * 1000 for _, seconds in run.spans],
+        }).style.format({"Time (ms)": "{:.2f}"}), hide_index=True)
+        if run.profile:
+            st.code(run.profile, language=None)
+        st.download_button(
+            label="Download Metrics (Prometheus)",
+            data=METRICS.prometheus_text(),
+            file_name="calculator_metrics.prom",
+            mime="text/plain",
+        )
@@ -0,0 +1,57 @@
+import os
+import sys
+
+import pytest
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+import combined_ratio.assistant
+from combined_ratio.assistant import FakeBackend
+from combined_ratio.sessions import get_warm_sessions
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "combined_ratio_calculator.py")
+
+
+@pytest.fixture
+def backend(monkeypatch, tmp_path):
+    backend = FakeBackend()
+    monkeypatch.setattr(combined_ratio.assistant, "ASSISTANT_BACKEND", "fake")
+    monkeypatch.setattr(combined_ratio.assistant, "make_backend", lambda name=None: backend)
+    # The store reads CALCULATOR_STORE_PATH on import, so the app imports it afresh
+    monkeypatch.setenv("CALCULATOR_STORE_PATH", str(tmp_path / "scenarios.sqlite3"))
+    monkeypatch.delitem(sys.modules, "combined_ratio.store", raising=False)
+    st.cache_resource.clear()
+    yield backend
+    st.cache_resource.clear()
+
+
+def ask(at, question):
+    at.text_input(key="input").input(question)
+    next(button for button in at.button if button.label == "Send").click().run()
+
+
+def test_question_is_answered_once(backend):
+    at = AppTest.from_file(APP, default_timeout=60).run()
+    assert not at.exception
+
+    ask(at, "What drives the combined ratio?")
+    assert backend.calls == 1
+
+    # Reruns and widget changes replay the stored answer rather than asking again
+    for _ in range(3):
+        at.run()
+    at.sidebar.slider[0].set_value(at.sidebar.slider[0].value + 1).run()
+    assert not at.exception
+    assert backend.calls == 1
+
+    ask(at, "How is payback measured?")
+    assert backend.calls == 2
+
+
+def test_warm_state_is_fetched_once_per_run(backend):
+    at = AppTest.from_file(APP, default_timeout=60).run()
+    hits = get_warm_sessions().stats()["hits"]
+    for _ in range(3):
+        at.run()
+    assert not at.exception
+    assert get_warm_sessions().stats()["hits"] - hits == 3
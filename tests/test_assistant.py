@@ -0,0 +1,54 @@
+import time
+
+import pytest
+
+from combined_ratio.assistant import AssistantClient, FakeBackend, conversation_key
+
+QUESTION = [{"role": "user", "content": "What drives the combined ratio?"}]
+
+
+def test_transient_failures_are_retried():
+    backend = FakeBackend(reply="Losses and expenses.", failures=1)
+    client = AssistantClient(backend, max_attempts=3)
+
+    assert client.complete(QUESTION) == "Losses and expenses."
+    assert backend.calls == 2
+    assert client.stats()["backend_calls"] == 2
+
+
+def test_retries_give_up_after_max_attempts():
+    backend = FakeBackend(failures=5)
+    client = AssistantClient(backend, max_attempts=2)
+
+    with pytest.raises(ConnectionError):
+        client.complete(QUESTION)
+    assert backend.calls == 2
+    assert client.stats()["entries"] == 0
+
+
+def test_repeated_question_is_answered_from_the_cache():
+    backend = FakeBackend()
+    client = AssistantClient(backend)
+
+    reply = client.complete(QUESTION)
+    # Case and whitespace differences map to the same conversation
+    assert client.complete([{"role": "user", "content": "what drives  the COMBINED ratio?"}]) == reply
+    assert backend.calls == 1
+    assert client.stats() == {"entries": 1, "hits": 1, "misses": 1, "backend_calls": 1}
+
+
+def test_cached_reply_expires_after_the_ttl():
+    backend = FakeBackend()
+    client = AssistantClient(backend, cache_ttl=0.05)
+
+    client.complete(QUESTION)
+    client.complete(QUESTION)
+    assert backend.calls == 1
+    time.sleep(0.1)
+    client.complete(QUESTION)
+    assert backend.calls == 2
+
+
+def test_conversation_key_separates_models_and_roles():
+    assert conversation_key(QUESTION, "a") != conversation_key(QUESTION, "b")
+    assert conversation_key(QUESTION) != conversation_key([{"role": "assistant", "content": QUESTION[0]["content"]}])
@@ -0,0 +1,105 @@
+import math
+
+import numpy as np
+import pytest
+
+from combined_ratio.batch import SERIES_COLUMNS, project_financials_arrays
+from combined_ratio.core import GRANULARITIES, ProjectionResult, project_financials
+
+SERIES_FIELDS = dict((column, name) for name, column in ProjectionResult.SERIES)
+
+
+def random_scenarios(n, seed=0):
+    """
+    Scenario parameters in project_financials order, with analysis periods of 1 to 30
+    years, some rows without investment and some that never pay back.
+    """
+    rng = np.random.default_rng(seed)
+    current_loss_ratio = rng.uniform(50, 80, n)
+    current_expense_ratio = rng.uniform(20, 40, n)
+    initial_investment = rng.uniform(0, 50, n)
+    initial_investment[::7] = 0.0
+    ongoing_costs = rng.uniform(0, 5, n)
+    # Improvements too small to cover the costs: payback is never reached
+    loss_ratio_reduction = np.where(np.arange(n) % 5 == 0, 0.0, rng.uniform(0, 5, n))
+    expense_ratio_reduction = np.where(np.arange(n) % 5 == 0, 0.0, rng.uniform(0, 3, n))
+    return (
+        rng.uniform(100, 2000, n),
+        rng.uniform(-5, 10, n),
+        current_loss_ratio,
+        current_expense_ratio,
+        current_loss_ratio - loss_ratio_reduction,
+        current_expense_ratio - expense_ratio_reduction,
+        np.arange(n) % 30 + 1,
+        ongoing_costs,
+        initial_investment,
+        loss_ratio_reduction * rng.uniform(0, 1, n),
+        expense_ratio_reduction * rng.uniform(0, 1, n),
+        ongoing_costs * rng.uniform(0, 1, n),
+    )
+
+
+def scalar_args(scenarios, i):
+    args = [float(values[i]) for values in scenarios]
+    args[6] = int(args[6])
+    return args
+
+
+@pytest.fixture(scope="module")
+def scenarios():
+    return random_scenarios(600)
+
+
+@pytest.fixture(scope="module")
+def expected(scenarios):
+    return [project_financials(*scalar_args(scenarios, i)) for i in range(len(scenarios[0]))]
+
+
+def test_scenarios_cover_edge_cases(expected, scenarios):
+    assert set(scenarios[6]) == set(range(1, 31))
+    assert any(result.payback_period is None for result in expected)
+    assert any(result.payback_period is not None for result in expected)
+    assert (scenarios[8] == 0).any()
+
+
+def test_annual_matches_project_financials(scenarios, expected):
+    series, summary = project_financials_arrays(*scenarios)
+
+    for i, result in enumerate(expected):
+        period = result.analysis_period
+        for column in SERIES_COLUMNS:
+            row = series[column][i]
+            np.testing.assert_allclose(row[:period], getattr(result, SERIES_FIELDS[column]), rtol=1e-12, atol=1e-9)
+            assert np.isnan(row[period:]).all()
+        for name in ("roi", "total_investment", "total_savings", "roi_salesforce", "total_investment_salesforce", "total_savings_salesforce"):
+            assert summary[name][i] == pytest.approx(getattr(result, name), rel=1e-12, abs=1e-9), name
+        for name in ("payback_period", "payback_period_salesforce"):
+            value = getattr(result, name)
+            if value is None:
+                assert np.isnan(summary[name][i]), name
+            else:
+                assert summary[name][i] == value, name
+
+
+@pytest.mark.parametrize("granularity", list(GRANULARITIES))
+def test_periods_keep_yearly_totals(scenarios, expected, granularity):
+    periods_per_year = GRANULARITIES[granularity]
+    series, summary = project_financials_arrays(*scenarios, periods_per_year=periods_per_year)
+
+    for i, result in enumerate(expected):
+        period = result.analysis_period
+        premiums = series["Projected Premiums ($M)"][i, :period * periods_per_year]
+        np.testing.assert_allclose(premiums.reshape(period, periods_per_year).sum(axis=1), result.premiums, rtol=1e-12)
+        year_ends = series["Cumulative Savings ($M)"][i, periods_per_year - 1:period * periods_per_year:periods_per_year]
+        np.testing.assert_allclose(year_ends, result.cumulative_savings, rtol=1e-12, atol=1e-9)
+        for name in ("roi", "total_investment", "total_savings", "roi_salesforce", "total_savings_salesforce"):
+            assert summary[name][i] == pytest.approx(getattr(result, name), rel=1e-12, abs=1e-9), name
+
+        # Payback resolved to the period falls within the year the annual projection reports
+        for name in ("payback_period", "payback_period_salesforce"):
+            value, annual = summary[name][i], getattr(result, name)
+            if annual is None:
+                assert np.isnan(value), name
+            else:
+                assert annual - 1 < value <= annual, name
+                assert math.isclose(value * periods_per_year, round(value * periods_per_year)), name
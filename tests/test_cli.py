@@ -0,0 +1,18 @@
+import pandas as pd
+import pyarrow as pa
+
+from combined_ratio.cli import write_results
+
+
+def test_csv_header_is_written_once_after_an_empty_batch(tmp_path):
+    schema = pa.schema([("scenario", pa.int64()), ("roi", pa.float64())])
+    batches = [
+        pa.RecordBatch.from_pylist([], schema=schema),
+        pa.RecordBatch.from_pylist([{"scenario": 0, "roi": 1.5}], schema=schema),
+        pa.RecordBatch.from_pylist([{"scenario": 1, "roi": 2.5}], schema=schema),
+    ]
+    path = tmp_path / "results.csv"
+
+    assert write_results(batches, str(path)) == 2
+    assert path.read_text().splitlines() == ["scenario,roi", "0,1.5", "1,2.5"]
+    pd.testing.assert_frame_equal(pd.read_csv(path), pd.DataFrame({"scenario": [0, 1], "roi": [1.5, 2.5]}))
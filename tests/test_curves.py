@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from combined_ratio.batch import SCENARIO_COLUMNS, project_financials_arrays, project_financials_batch
+from combined_ratio.cli import main
+from combined_ratio.curves import escalation_curve, projection_curves, ramp_curve
+from combined_ratio.parallel import project_financials_parallel
+
+from .test_batch import random_scenarios
+
+
+def scenario_table(n):
+    return pd.DataFrame(dict(zip(SCENARIO_COLUMNS, random_scenarios(n))))
+
+
+@pytest.mark.parametrize("periods_per_year", [1, 4, 12])
+def test_flat_curves_reproduce_uncurved_results(periods_per_year):
+    scenarios = random_scenarios(300)
+    n_periods = 30 * periods_per_year
+    expected_series, expected_summary = project_financials_arrays(*scenarios, periods_per_year=periods_per_year)
+    for curves in (
+        {"improvement_curve": np.ones(n_periods), "cost_curve": np.ones(n_periods)},
+        {"improvement_curve": np.ones((300, 5)), "cost_curve": escalation_curve(0.0, 3)},
+        projection_curves(n_periods, periods_per_year),
+    ):
+        series, summary = project_financials_arrays(*scenarios, periods_per_year=periods_per_year, **curves)
+        for name, values in expected_series.items():
+            np.testing.assert_array_equal(series[name], values, err_msg=name)
+        for name, values in expected_summary.items():
+            np.testing.assert_array_equal(summary[name], values, err_msg=name)
+
+
+def test_parallel_applies_curves_per_shard():
+    scenarios = scenario_table(500)
+    ramp_years = np.linspace(0, 3, len(scenarios))
+    curves = {"improvement_curve": ramp_curve("s_curve", ramp_years, 30), "cost_curve": escalation_curve(3.0, 30)}
+    expected, _ = project_financials_batch(scenarios, **curves)
+    actual = project_financials_parallel(scenarios, workers=2, shard_size=120, **curves)
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_cli_applies_ramp_and_escalation(tmp_path, workers):
+    scenarios = scenario_table(200)
+    scenarios.to_csv(tmp_path / "scenarios.csv", index=False)
+    status = main([
+        str(tmp_path / "scenarios.csv"), str(tmp_path / "summary.csv"), "--granularity", "quarterly",
+        "--ramp", "linear", "--ramp-years", "2", "--cost-escalation", "3", "--workers", str(workers), "--quiet",
+    ])
+    assert status == 0
+
+    expected, _ = project_financials_batch(
+        scenarios, periods_per_year=4, **projection_curves(30 * 4, 4, "linear", 2.0, 3.0)
+    )
+    actual = pd.read_csv(tmp_path / "summary.csv")
+    np.testing.assert_allclose(actual[expected.columns].to_numpy(), expected.to_numpy(), rtol=1e-12)
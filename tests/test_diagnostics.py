@@ -0,0 +1,63 @@
+import re
+
+from combined_ratio.diagnostics import DISABLED, METRICS, RunRecorder, SpanMetrics, start_run
+
+
+def bucket_counts(text, span):
+    return {
+        bound: int(count)
+        for bound, count in re.findall(rf'calculator_span_seconds_bucket{{span="{span}",le="([^"]+)"}} (\d+)', text)
+    }
+
+
+def test_histogram_buckets_are_cumulative():
+    metrics = SpanMetrics(buckets=(0.01, 0.1, 1.0))
+    for seconds in (0.005, 0.05, 0.05, 0.5, 5.0):
+        metrics.observe("projection", seconds)
+    text = metrics.prometheus_text()
+
+    assert bucket_counts(text, "projection") == {"0.01": 1, "0.1": 3, "1": 4, "+Inf": 5}
+    assert 'calculator_span_seconds_count{span="projection"} 5' in text
+    assert 'calculator_span_seconds_sum{span="projection"} 5.605000' in text
+
+
+def test_bucket_bounds_are_inclusive():
+    metrics = SpanMetrics(buckets=(0.01, 0.1))
+    metrics.observe("stage", 0.1)
+    assert bucket_counts(metrics.prometheus_text(), "stage") == {"0.01": 0, "0.1": 1, "+Inf": 1}
+
+
+def test_finished_run_records_stages_spans_and_total(tmp_path):
+    metrics = SpanMetrics()
+    run = RunRecorder(metrics=metrics)
+    run.stage("inputs")
+    with run.span("project_financials"):
+        pass
+    run.stage("charts")
+    assert run.finish() is run
+    run.finish()  # a second finish does not record the run again
+
+    assert [name for name, _ in run.spans] == ["project_financials", "inputs", "charts"]
+    assert run.total >= sum(seconds for name, seconds in run.spans if name != "project_financials")
+    text = metrics.prometheus_text()
+    assert "calculator_runs_total 1" in text
+    for name in ("inputs", "charts", "project_financials", "total"):
+        assert f'calculator_span_seconds_count{{span="{name}"}} 1' in text
+
+    path = tmp_path / "calculator.prom"
+    metrics.write_textfile(str(path))
+    assert path.read_text() == text
+
+
+def test_disabled_recorder_is_a_no_op():
+    runs = METRICS.runs
+    run = start_run(enabled=False)
+    assert run is DISABLED and not run.enabled
+
+    run.stage("inputs")
+    with run.span("project_financials"):
+        pass
+    assert run.finish() is run
+    assert run.spans == () and run.total is None and run.profile is None
+    assert METRICS.runs == runs
+    assert start_run(enabled=True).enabled
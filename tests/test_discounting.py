@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+from combined_ratio.batch import project_financials_arrays
+from combined_ratio.discounting import (
+    IRR_AMBIGUOUS, IRR_BOUNDS, IRR_CONVERGED, IRR_NO_ROOT, IRR_NOT_CONVERGED, IRR_STATUS, irr, npv,
+)
+
+
+def reference_irr(cash_flows, periods_per_year=1):
+    """
+    Every IRR of one cash flow row from the roots of NPV as a polynomial in the per-period
+    discount factor, as sorted annual percentages.
+    """
+    roots = np.roots(np.trim_zeros(np.asarray(cash_flows, dtype=np.float64)[::-1], "f"))
+    roots = roots[(np.abs(roots.imag) < 1e-9) & (roots.real > 0)].real
+    return np.sort((roots ** -periods_per_year - 1) * 100)
+
+
+def calculator_cash_flows(n, periods, seed=0):
+    """
+    An investment at time 0, then growing net savings that change sign at most once.
+    """
+    rng = np.random.default_rng(seed)
+    cash_flows = np.empty((n, periods + 1))
+    cash_flows[:, 0] = -rng.uniform(1, 50, n)
+    cash_flows[:, 1:] = rng.uniform(0.5, 15, n)[:, None] * (1 + rng.uniform(0, 0.1, n)[:, None]) ** np.arange(periods)
+    return cash_flows
+
+
+def test_status_codes():
+    assert IRR_STATUS[IRR_CONVERGED] == "converged"
+    assert IRR_STATUS[IRR_NO_ROOT] == "no_root"
+    assert IRR_STATUS[IRR_NOT_CONVERGED] == "not_converged"
+    assert IRR_STATUS[IRR_AMBIGUOUS] == "ambiguous"
+
+
+@pytest.mark.parametrize("periods_per_year", [1, 4, 12])
+def test_irr_matches_polynomial_roots(periods_per_year):
+    cash_flows = calculator_cash_flows(300, 20, seed=periods_per_year)
+    cash_flows[:, 1:] /= periods_per_year
+    rates, status = irr(cash_flows, periods_per_year)
+
+    converged = status == IRR_CONVERGED
+    assert converged.mean() > 0.9
+    assert np.abs(npv(cash_flows[converged], rates[converged], periods_per_year)).max() < 1e-8 * np.abs(cash_flows).sum(axis=1).max()
+    for row, rate, code in zip(cash_flows, rates, status):
+        (expected,) = reference_irr(row, periods_per_year)
+        if code == IRR_CONVERGED:
+            assert rate == pytest.approx(expected, rel=1e-8, abs=1e-8)
+        else:
+            # Paid back so fast that the IRR lies beyond IRR_BOUNDS
+            assert code == IRR_NO_ROOT and np.isnan(rate) and expected > IRR_BOUNDS[1]
+
+
+def test_single_rows_agree_with_the_batch():
+    cash_flows = calculator_cash_flows(50, 10)
+    rates, status = irr(cash_flows)
+    for row, rate, code in zip(cash_flows, rates, status):
+        row_rate, row_status = irr(row)
+        assert (row_rate[0], row_status[0]) == (rate, code)
+
+
+@pytest.mark.parametrize("cash_flows", [
+    [0.0, 0.0, 0.0, 0.0],  # nothing invested or saved
+    [-100.0, -5.0, 0.0, -1.0],  # never recovered
+    [0.0, 10.0, 10.0, 0.0],  # savings without investment
+    [-100.0, 0.5, 0.0, 0.0],  # the root lies below IRR_BOUNDS
+])
+def test_rows_without_a_root(cash_flows):
+    rates, status = irr(cash_flows)
+    assert np.isnan(rates[0])
+    assert status[0] == IRR_NO_ROOT
+
+
+def test_projection_without_cash_flows_has_no_irr():
+    _, summary = project_financials_arrays(500, 2, 65, 30, 65, 30, 5, 0, 0, 0, 0, 0, discount_rate=8)
+    assert np.isnan(summary["irr"][0]) and summary["irr_status"][0] == IRR_NO_ROOT
+    assert summary["npv"][0] == 0.0
+
+
+@pytest.mark.parametrize("cash_flows", [
+    [-100.0, 230.0, -132.0],  # IRRs of 10% and 20%
+    [-100.0, 20.0, -10.0],  # no real IRR at all
+    [-100.0, 50.0, 0.0, 80.0, -1.0],  # one IRR within the bounds, but the sign changes twice
+])
+def test_multiple_sign_changes_are_ambiguous(cash_flows):
+    rates, status = irr(cash_flows)
+    assert np.isnan(rates[0])
+    assert status[0] == IRR_AMBIGUOUS
+
+
+def test_two_root_reference():
+    np.testing.assert_allclose(reference_irr([-100.0, 230.0, -132.0]), [10.0, 20.0])
+
+
+def test_zeros_do_not_count_as_sign_changes():
+    rates, status = irr([[0.0, -100.0, 0.0, 60.0, 0.0, 60.0]])
+    assert status[0] == IRR_CONVERGED
+    assert rates[0] == pytest.approx(reference_irr([0.0, -100.0, 0.0, 60.0, 0.0, 60.0])[0])
+
+
+def test_npv_matches_a_scalar_sum():
+    cash_flows = calculator_cash_flows(20, 8)
+    expected = [sum(flow / 1.07 ** (t / 4) for t, flow in enumerate(row)) for row in cash_flows]
+    np.testing.assert_allclose(npv(cash_flows, 7.0, periods_per_year=4), expected, rtol=1e-12)
+    np.testing.assert_allclose(npv(cash_flows, np.full(20, 7.0), periods_per_year=4), expected, rtol=1e-12)
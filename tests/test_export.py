@@ -0,0 +1,47 @@
+import numpy as np
+import pyarrow.parquet as pq
+
+from combined_ratio.batch import project_financials_batch
+from combined_ratio.export import PROJECTION_PERIODS_SCHEMA, SUMMARY_SCHEMA, export_projections
+
+SCENARIOS = {
+    "current_gwp": [500.0, 800.0, 300.0],
+    "premium_growth_rate": [2.0, 0.0, 5.0],
+    "current_loss_ratio": [65.0, 70.0, 60.0],
+    "current_expense_ratio": [30.0, 28.0, 32.0],
+    "loss_ratio_reduction": [2.0, 1.5, 0.0],
+    "expense_ratio_reduction": [1.0, 0.5, 0.0],
+    "analysis_period": [5, 10, 3],
+    "ongoing_costs": [2.0, 3.0, 1.0],
+    "initial_investment": [10.0, 25.0, 5.0],
+    "loss_ratio_reduction_salesforce": [1.0, 1.0, 0.0],
+    "expense_ratio_reduction_salesforce": [0.5, 0.5, 0.0],
+    "ongoing_costs_salesforce": [1.0, 2.0, 0.5],
+}
+
+
+def test_summary_keeps_fractional_payback(tmp_path):
+    path = tmp_path / "summary.parquet"
+    export_projections(SCENARIOS, path, summary=True, periods_per_year=12, interpolate_payback=True)
+    table = pq.read_table(path)
+    expected, _ = project_financials_batch(SCENARIOS, periods_per_year=12, interpolate_payback=True)
+
+    assert table.schema == SUMMARY_SCHEMA
+    payback = table.column("payback_period").to_numpy(zero_copy_only=False)
+    np.testing.assert_array_equal(payback, expected["payback_period"].to_numpy())
+    assert not float(payback[0]).is_integer()
+    assert table.column("payback_period").null_count == 1  # the scenario without improvements
+
+
+def test_projections_are_written_per_period(tmp_path):
+    path = tmp_path / "projections.parquet"
+    rows = export_projections(SCENARIOS, path, periods_per_year=12)
+    table = pq.read_table(path)
+
+    assert table.schema == PROJECTION_PERIODS_SCHEMA
+    assert rows == table.num_rows == 12 * sum(SCENARIOS["analysis_period"])
+    first = table.filter(table.column("scenario").to_numpy() == 0)
+    assert first.column("Period").to_pylist() == list(range(1, 61))
+    assert first.column("Year").to_pylist() == [year for year in range(1, 6) for _ in range(12)]
+    premiums = first.column("Projected Premiums ($M)").to_numpy()
+    np.testing.assert_allclose(premiums[:12].sum(), 500.0)
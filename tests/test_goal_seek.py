@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from combined_ratio.batch import project_financials_batch
+from combined_ratio.goal_seek import SOLVE_FOR, solve_required_reduction
+
+# Bisection stops at a 1e-9 bracket; the closed form is exact up to rounding
+TOLERANCE = 1e-6
+
+
+@pytest.fixture(scope="module")
+def scenarios():
+    rng = np.random.default_rng(0)
+    n = 400
+    loss_ratio_reduction = rng.uniform(0, 5, n)
+    expense_ratio_reduction = rng.uniform(0, 5, n)
+    ongoing_costs_salesforce = rng.uniform(0, 5, n)
+    return pd.DataFrame({
+        "current_gwp": rng.uniform(50, 2000, n),
+        "premium_growth_rate": np.where(np.arange(n) % 9 == 0, 0.0, rng.uniform(-5, 10, n)),
+        "current_loss_ratio": rng.uniform(40, 90, n),
+        "current_expense_ratio": rng.uniform(15, 45, n),
+        "loss_ratio_reduction": loss_ratio_reduction,
+        "expense_ratio_reduction": expense_ratio_reduction,
+        "analysis_period": rng.integers(1, 16, n),
+        "ongoing_costs": ongoing_costs_salesforce + rng.uniform(0, 2, n),
+        "initial_investment": rng.uniform(1, 50, n),
+        "loss_ratio_reduction_salesforce": loss_ratio_reduction * 0.8,
+        "expense_ratio_reduction_salesforce": expense_ratio_reduction * 0.8,
+        "ongoing_costs_salesforce": ongoing_costs_salesforce,
+    })
+
+
+def assert_same_solutions(closed_form, bisection):
+    assert np.array_equal(np.isnan(closed_form), np.isnan(bisection))
+    np.testing.assert_allclose(closed_form, bisection, rtol=0, atol=TOLERANCE, equal_nan=True)
+
+
+@pytest.mark.parametrize("solve_for", SOLVE_FOR)
+@pytest.mark.parametrize("target_roi", [-50.0, 0.0, 100.0, 400.0])
+def test_closed_form_matches_bisection_for_roi(scenarios, solve_for, target_roi):
+    closed_form = solve_required_reduction(scenarios, solve_for, target_roi=target_roi)
+    bisection = solve_required_reduction(scenarios, solve_for, target_roi=target_roi, method="bisection")
+    assert_same_solutions(closed_form.to_numpy(), bisection.to_numpy())
+
+
+@pytest.mark.parametrize("solve_for", SOLVE_FOR)
+@pytest.mark.parametrize("target_payback", [1, 3, 8])
+def test_closed_form_matches_bisection_for_payback(scenarios, solve_for, target_payback):
+    closed_form = solve_required_reduction(scenarios, solve_for, target_payback=target_payback)
+    bisection = solve_required_reduction(scenarios, solve_for, target_payback=target_payback, method="bisection")
+    assert_same_solutions(closed_form.to_numpy(), bisection.to_numpy())
+
+
+def test_solution_reaches_the_target(scenarios):
+    required = solve_required_reduction(scenarios, target_roi=100.0)
+    solved = scenarios[required.notna().to_numpy()].assign(loss_ratio_reduction=required.dropna().to_numpy())
+    summary, _ = project_financials_batch(solved)
+    np.testing.assert_allclose(summary["roi"].to_numpy()[solved["loss_ratio_reduction"].to_numpy() > 0], 100.0, atol=1e-6)
+    assert (summary["roi"] >= 100.0 - 1e-6).all()
+
+
+def test_invalid_requests_are_rejected(scenarios):
+    with pytest.raises(ValueError, match="Cannot solve"):
+        solve_required_reduction(scenarios, "premium_growth_rate", target_roi=10.0)
+    with pytest.raises(ValueError, match="exactly one"):
+        solve_required_reduction(scenarios, target_roi=10.0, target_payback=3)
+    with pytest.raises(ValueError, match="Unknown method"):
+        solve_required_reduction(scenarios, target_roi=10.0, method="newton")
@@ -0,0 +1,66 @@
+from combined_ratio.history import SUMMARY_PREFIX, ConversationHistory, count_message_tokens
+
+SYSTEM = {"role": "system", "content": "You are an insurance finance assistant."}
+
+
+def conversation(n_turns):
+    turns = []
+    for i in range(n_turns):
+        role = "user" if i % 2 == 0 else "assistant"
+        turns.append({"role": role, "content": f"Turn {i}. " + "The combined ratio moved by a few points. " * 10})
+    return [SYSTEM] + turns
+
+
+def test_short_conversation_is_sent_unchanged():
+    messages = conversation(4)
+    request, stats = ConversationHistory(budget=2_000).compact(messages)
+
+    assert request == messages
+    assert stats["folded_turns"] == 0
+    assert stats["tokens"] == stats["full_tokens"] == count_message_tokens(messages)
+
+
+def test_request_stays_within_the_budget_and_keeps_the_newest_turns():
+    history = ConversationHistory(budget=600, summary_budget=100)
+    messages = conversation(40)
+    request, stats = history.compact(messages)
+
+    assert stats["tokens"] <= 600 < stats["full_tokens"]
+    assert request[0] == SYSTEM
+    assert request[1]["content"].startswith(SUMMARY_PREFIX)
+    # The kept turns are the newest ones, in order
+    kept = request[2:]
+    assert kept == messages[-len(kept):]
+    assert stats["folded_turns"] == 40 - len(kept)
+
+
+def test_summary_is_reused_until_the_window_overflows_again():
+    history = ConversationHistory(budget=600, summary_budget=100)
+    messages = conversation(40)
+    history.compact(messages)
+    assert history.summaries_built == 1
+
+    messages.append({"role": "user", "content": "And the expense ratio?"})
+    request, stats = history.compact(messages)
+    assert history.summaries_built == 1
+    assert request[-1] == messages[-1]
+    assert stats["tokens"] <= 600
+
+    for _ in range(20):
+        messages.extend(conversation(2)[1:])
+        _, stats = history.compact(messages)
+        assert stats["tokens"] <= 600
+    assert history.summaries_built > 1
+
+
+def test_trim_drops_the_oldest_turns_and_keeps_the_system_prompt():
+    history = ConversationHistory(budget=600, summary_budget=100)
+    messages = conversation(10)
+    newest = messages[-4:]
+
+    assert history.trim(messages, max_turns=4) == 6
+    assert messages == [SYSTEM] + newest
+    assert history.dropped_turns == 6
+    # The dropped turns still reach later requests through the summary
+    request, _ = history.compact(messages)
+    assert request[1]["content"].startswith(SUMMARY_PREFIX + "- user: Turn 0.")
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from combined_ratio.ingest import calculator_inputs, ingest, ratio_table
+
+
+@pytest.fixture
+def extracts(tmp_path):
+    """
+    A premium extract dated through 2023 and 2024 and a claims extract keyed by accounting year 2023.
+    """
+    premiums = tmp_path / "premiums.csv"
+    pd.DataFrame({
+        "line": ["Auto", "Auto", "Home"],
+        "date": ["2023-02-10", "2024-03-01", "2023-07-15"],
+        "written_premium": [1_000_000.0, 1_200_000.0, 500_000.0],
+        "earned_premium": [900_000.0, 1_100_000.0, 450_000.0],
+        "expenses": [250_000.0, 300_000.0, 150_000.0],
+    }).to_csv(premiums, index=False)
+    claims = tmp_path / "claims.csv"
+    pd.DataFrame({
+        "line": ["Auto", "Home"],
+        "period": [2023, 2023],
+        "incurred_loss": [600_000.0, 300_000.0],
+    }).to_csv(claims, index=False)
+    return [str(premiums), str(claims)]
+
+
+@pytest.mark.parametrize("period_frequency", ["quarter", "month"])
+def test_period_column_must_match_date_periods(extracts, period_frequency):
+    with pytest.raises(ValueError, match="does not match"):
+        ingest(extracts, period_frequency=period_frequency)
+    with pytest.raises(ValueError, match="does not match"):
+        ingest(extracts[::-1], period_frequency=period_frequency)
+
+
+def test_uncovered_measures_stay_missing(extracts):
+    totals = ingest(extracts).totals()
+
+    assert list(totals.index) == [("Auto", "2023"), ("Auto", "2024"), ("Home", "2023")]
+    assert totals.loc[("Auto", "2023"), "incurred_loss"] == 600_000.0
+    # No claims extract covered 2024: its losses are unknown, not zero
+    assert np.isnan(totals.loc[("Auto", "2024"), "incurred_loss"])
+
+    assert calculator_inputs(totals) == {"current_gwp": 1.2, "current_loss_ratio": None, "current_expense_ratio": pytest.approx(300 / 11)}
+    assert calculator_inputs(totals, period="2023")["current_loss_ratio"] == pytest.approx(900 / 13.5)
+
+
+def test_ratios_skip_lines_without_claims(tmp_path):
+    premiums = tmp_path / "premiums.csv"
+    pd.DataFrame({
+        "line": ["Auto", "Home"],
+        "period": [2023, 2023],
+        "earned_premium": [100.0, 100.0],
+        "expenses": [30.0, 20.0],
+    }).to_csv(premiums, index=False)
+    claims = tmp_path / "claims.csv"
+    pd.DataFrame({"line": ["Auto"], "period": [2023], "incurred_loss": [60.0]}).to_csv(claims, index=False)
+    totals = ingest([str(premiums), str(claims)]).totals()
+
+    # Home's losses are unknown, so its premium does not dilute the loss ratio
+    book = ratio_table(totals, by=None).iloc[0]
+    assert book["loss_ratio"] == pytest.approx(60.0)
+    assert book["expense_ratio"] == pytest.approx(25.0)
+    assert book["earned_premium"] == 200.0 and book["incurred_loss"] == 60.0
+    assert np.isnan(ratio_table(totals).loc["Home", "loss_ratio"])
+    assert calculator_inputs(totals, units=1)["current_loss_ratio"] == pytest.approx(60.0)
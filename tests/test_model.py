@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from combined_ratio.batch import SERIES_COLUMNS, project_financials_arrays
+from combined_ratio.core import GRANULARITIES, calculate_new_ratios, project_financials
+from combined_ratio.graph import Evaluator
+from combined_ratio.model import MODEL, PROJECTION_NODES
+
+
+def random_inputs(n, seed=0):
+    """
+    Calculator inputs with analysis periods of 1 to 30 years, some without investment
+    and some that never pay back.
+    """
+    rng = np.random.default_rng(seed)
+    for i in range(n):
+        reduction = 0.0 if i % 5 == 0 else 1.0
+        yield {
+            "current_gwp": float(rng.uniform(100, 2000)),
+            "premium_growth_rate": float(rng.uniform(-5, 10)),
+            "current_loss_ratio": float(rng.uniform(50, 80)),
+            "current_expense_ratio": float(rng.uniform(20, 40)),
+            "loss_ratio_reduction": reduction * float(rng.uniform(0, 5)),
+            "expense_ratio_reduction": reduction * float(rng.uniform(0, 3)),
+            "analysis_period": i % 30 + 1,
+            "initial_investment": 0.0 if i % 7 == 0 else float(rng.uniform(0, 50)),
+            "ongoing_costs_salesforce": float(rng.uniform(0, 3)),
+            "ongoing_costs_other": float(rng.uniform(0, 2)),
+            "loss_ratio_reduction_salesforce": reduction * float(rng.uniform(0, 2)),
+            "expense_ratio_reduction_salesforce": reduction * float(rng.uniform(0, 1)),
+            "periods_per_year": 1,
+            "discount_rate": 8.0,
+        }
+
+
+def projection_args(inputs):
+    new_loss_ratio, new_expense_ratio = calculate_new_ratios(
+        inputs["current_loss_ratio"], inputs["loss_ratio_reduction"],
+        inputs["current_expense_ratio"], inputs["expense_ratio_reduction"],
+    )
+    return (
+        inputs["current_gwp"], inputs["premium_growth_rate"], inputs["current_loss_ratio"], inputs["current_expense_ratio"],
+        new_loss_ratio, new_expense_ratio, inputs["analysis_period"],
+        inputs["ongoing_costs_salesforce"] + inputs["ongoing_costs_other"], inputs["initial_investment"],
+        inputs["loss_ratio_reduction_salesforce"], inputs["expense_ratio_reduction_salesforce"],
+        inputs["ongoing_costs_salesforce"],
+    )
+
+
+def test_projection_nodes_match_project_financials():
+    evaluator = Evaluator(MODEL)
+    for inputs in random_inputs(120):
+        evaluator.update(inputs)
+        expected = project_financials(*projection_args(inputs))
+        pd.testing.assert_frame_equal(evaluator["financial_df"], expected.financial_df, check_exact=True)
+        for name in PROJECTION_NODES[1:]:
+            assert evaluator[name] == getattr(expected, name), name
+
+
+@pytest.mark.parametrize("granularity", list(GRANULARITIES))
+@pytest.mark.parametrize("interpolate", [False, True])
+def test_period_nodes_match_project_financials_arrays(granularity, interpolate):
+    periods_per_year = GRANULARITIES[granularity]
+    suffix = "_interpolated" if interpolate else ""
+    evaluator = Evaluator(MODEL)
+    for inputs in random_inputs(60, seed=1):
+        evaluator.update(dict(inputs, periods_per_year=periods_per_year))
+        series, summary = project_financials_arrays(
+            *projection_args(inputs), periods_per_year=periods_per_year, interpolate_payback=interpolate
+        )
+        n_periods = inputs["analysis_period"] * periods_per_year
+        financial_df = evaluator["financial_df"]
+        for column in SERIES_COLUMNS:
+            np.testing.assert_array_equal(financial_df[column].to_numpy(), series[column][0, :n_periods], err_msg=column)
+        for name in ("payback_period", "payback_period_salesforce"):
+            value = evaluator[name + suffix]
+            assert (np.nan if value is None else value) == pytest.approx(summary[name][0], nan_ok=True), name
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from combined_ratio.batch import project_financials_arrays
+from combined_ratio.monte_carlo import draw_samples, simulate_financials
+
+FIXED = {
+    "current_gwp": 500.0, "current_loss_ratio": 65.0, "current_expense_ratio": 30.0, "analysis_period": 10,
+    "ongoing_costs": 2.0, "initial_investment": 10.0, "ongoing_costs_salesforce": 1.0,
+}
+
+
+def test_fixed_inputs_give_the_projection_at_every_percentile():
+    results = simulate_financials(
+        **FIXED, loss_ratio_reduction=2.0, expense_ratio_reduction=1.0, premium_growth_rate=3.0,
+        salesforce_loss_share=0.5, salesforce_expense_share=0.5, n_trials=1_000, seed=1,
+    )
+    _, summary = project_financials_arrays(500.0, 3.0, 65.0, 30.0, 63.0, 29.0, 10, 2.0, 10.0, 1.0, 0.5, 1.0)
+
+    for name in ("roi", "payback_period", "roi_salesforce", "payback_period_salesforce"):
+        assert set(results[name]) == {5, 25, 50, 75, 95}
+        for value in results[name].values():
+            assert value == pytest.approx(summary[name][0], rel=1e-12)
+    assert results["probability_of_payback"] == 1.0
+    assert results["n_trials"] == 1_000
+
+
+def test_payback_not_reached_reports_none():
+    results = simulate_financials(
+        **FIXED, loss_ratio_reduction=0.0, expense_ratio_reduction=0.0, premium_growth_rate=0.0, n_trials=100, seed=1,
+    )
+    assert all(value is None for value in results["payback_period"].values())
+    assert results["probability_of_payback"] == 0.0
+
+
+def test_percentiles_follow_the_drawn_trials():
+    results = simulate_financials(
+        **FIXED, loss_ratio_reduction=("uniform", 0.0, 4.0), expense_ratio_reduction=("triangular", 0.0, 1.0, 2.0),
+        premium_growth_rate=("normal", 3.0, 1.0), n_trials=20_000, seed=7,
+    )
+    roi = results["roi"]
+    assert roi[5] < roi[25] < roi[50] < roi[75] < roi[95]
+    assert 0.0 < results["probability_of_payback"] < 1.0
+
+
+@pytest.mark.parametrize("chunk_size", [1_000, 2_500, 7_000])
+def test_chunking_does_not_change_the_results(chunk_size):
+    inputs = dict(
+        FIXED, loss_ratio_reduction=("uniform", 0.0, 4.0), expense_ratio_reduction=("triangular", 0.0, 1.0, 2.0),
+        premium_growth_rate=("normal", 3.0, 1.0), n_trials=10_000, seed=3,
+    )
+    assert simulate_financials(**inputs, chunk_size=chunk_size) == simulate_financials(**inputs, chunk_size=10_000)
+
+
+def test_unknown_distribution_is_rejected():
+    with pytest.raises(ValueError, match="Unknown distribution"):
+        draw_samples(("lognormal", 0.0, 1.0), 10, np.random.default_rng())
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from combined_ratio.batch import SCENARIO_COLUMNS, project_financials_batch
+from combined_ratio.curves import escalation_curve, ramp_curve
+from combined_ratio.parallel import project_financials_parallel
+
+from .test_batch import random_scenarios
+
+ROWS = 1_000
+SHARD_SIZE = 150
+
+
+@pytest.fixture(scope="module")
+def scenarios():
+    table = pd.DataFrame(dict(zip(SCENARIO_COLUMNS, random_scenarios(ROWS, seed=5))))
+    # A non-default index must come back unchanged
+    table.index = pd.RangeIndex(100, 100 + ROWS * 2, 2)
+    return table
+
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"periods_per_year": 4, "interpolate_payback": True},
+    {"discount_rate": 8.0},
+])
+def test_parallel_matches_batch(scenarios, options):
+    expected, _ = project_financials_batch(scenarios, **options)
+    progress = []
+    result = project_financials_parallel(
+        scenarios, workers=2, shard_size=SHARD_SIZE, progress=lambda done, total: progress.append((done, total)), **options
+    )
+
+    pd.testing.assert_frame_equal(result, expected)
+    assert progress[-1] == (ROWS, ROWS) and len(progress) == -(-ROWS // SHARD_SIZE)
+
+
+def test_per_scenario_curves_follow_their_rows(scenarios):
+    # Each scenario gets its own ramp and escalation, so a shard reading another shard's
+    # rows would give different results
+    rng = np.random.default_rng(0)
+    ramp_years = rng.uniform(0, 5, ROWS)
+    curves = {
+        "improvement_curve": np.stack([ramp_curve("linear", years, 30) for years in ramp_years]),
+        "cost_curve": np.stack([escalation_curve(rate, 30) for rate in rng.uniform(0, 6, ROWS)]),
+    }
+    expected, _ = project_financials_batch(scenarios, discount_rate=5.0, **curves)
+    result = project_financials_parallel(scenarios, workers=2, shard_size=SHARD_SIZE, discount_rate=5.0, **curves)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_arrow_file_input(scenarios, tmp_path):
+    path = tmp_path / "scenarios.arrow"
+    table = pa.Table.from_pandas(scenarios, preserve_index=False)
+    with pa.ipc.new_file(str(path), table.schema) as writer:
+        writer.write_table(table)
+
+    expected, _ = project_financials_batch(scenarios.reset_index(drop=True), discount_rate=8.0)
+    for workers in (1, 2):
+        result = project_financials_parallel(str(path), workers=workers, shard_size=SHARD_SIZE, discount_rate=8.0)
+        pd.testing.assert_frame_equal(result, expected)
+
+
+def test_empty_table(scenarios):
+    result = project_financials_parallel(scenarios.iloc[:0], workers=2)
+    assert result.empty
+    assert list(result.columns) == list(project_financials_batch(scenarios.iloc[:1])[0].columns)
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from combined_ratio.batch import payback_period, project_financials_arrays
+from combined_ratio.portfolio import project_portfolio, summarize_by
+
+LINES = pd.DataFrame({
+    "line": ["Auto", "Home", "Commercial", "Specialty"],
+    "segment": ["Personal", "Personal", "Commercial", "Commercial"],
+    "current_gwp": [800.0, 300.0, 600.0, 100.0],
+    "premium_growth_rate": [3.0, 5.0, 1.0, -2.0],
+    "current_loss_ratio": [70.0, 60.0, 65.0, 80.0],
+    "current_expense_ratio": [28.0, 32.0, 30.0, 25.0],
+    "loss_ratio_reduction": [2.0, 1.0, 3.0, 0.5],
+    "expense_ratio_reduction": [1.0, 0.5, 1.5, 0.0],
+    "loss_ratio_reduction_salesforce": [1.0, 0.5, 1.0, 0.0],
+})
+COSTS = {"ongoing_costs": 6.0, "initial_investment": 40.0, "ongoing_costs_salesforce": 3.0}
+
+
+@pytest.fixture(scope="module")
+def portfolio():
+    return project_portfolio(LINES, 8, **COSTS)
+
+
+def test_line_totals_add_up_to_the_enterprise(portfolio):
+    line_summary, financial_df, enterprise = portfolio
+
+    assert line_summary["cost_share"].sum() == pytest.approx(1.0)
+    assert enterprise["current_gwp"] == LINES["current_gwp"].sum()
+    for name in ("total_investment", "total_savings", "total_savings_salesforce"):
+        assert line_summary[name].sum() == pytest.approx(enterprise[name])
+    assert enterprise["total_investment"] == 40.0 + 6.0 * 8
+    assert financial_df["Projected Premiums ($M)"].sum() == pytest.approx(line_summary["total_premiums"].sum())
+    assert enterprise["roi"] == pytest.approx(enterprise["total_savings"] / enterprise["total_investment"] * 100)
+
+
+def test_combined_ratios_are_premium_weighted(portfolio):
+    line_summary, financial_df, enterprise = portfolio
+
+    weights = line_summary["total_premiums"]
+    assert enterprise["current_combined_ratio"] == pytest.approx(np.average(line_summary["current_combined_ratio"], weights=weights))
+    assert enterprise["new_combined_ratio"] == pytest.approx(np.average(line_summary["new_combined_ratio"], weights=weights))
+    # Each year's ratio weights the lines by that year's premiums
+    premiums = LINES["current_gwp"] * (1 + LINES["premium_growth_rate"] / 100) ** 2
+    expected = np.average(LINES["current_loss_ratio"] + LINES["current_expense_ratio"], weights=premiums)
+    assert financial_df["Current Combined Ratio (%)"].iloc[2] == pytest.approx(expected)
+
+    segments = summarize_by(line_summary)
+    personal = line_summary[line_summary["segment"] == "Personal"]
+    assert segments.loc["Personal", "new_combined_ratio"] == pytest.approx(
+        np.average(personal["new_combined_ratio"], weights=personal["total_premiums"])
+    )
+    assert segments["total_savings"].sum() == pytest.approx(enterprise["total_savings"])
+
+
+@pytest.mark.parametrize("interpolate", [False, True])
+def test_single_line_portfolio_matches_the_projection(interpolate):
+    line = LINES.iloc[:1]
+    _, _, enterprise = project_portfolio(line, 8, **COSTS, interpolate_payback=interpolate)
+    _, summary = project_financials_arrays(
+        800.0, 3.0, 70.0, 28.0, 68.0, 27.0, 8, 6.0, 40.0, 1.0, 0.0, 3.0, interpolate_payback=interpolate
+    )
+    for name in ("roi", "payback_period", "roi_salesforce", "payback_period_salesforce"):
+        assert enterprise[name] == pytest.approx(summary[name][0])
+
+
+def test_enterprise_payback_is_interpolated():
+    _, _, whole_years = project_portfolio(LINES, 8, **COSTS)
+    _, _, interpolated = project_portfolio(LINES, 8, **COSTS, interpolate_payback=True)
+
+    assert whole_years["payback_period"] == np.ceil(interpolated["payback_period"])
+    assert interpolated["payback_period"] < whole_years["payback_period"]
+
+
+def test_payback_period_helper():
+    # 10 invested, 4 recovered per year: paid back 2.5 years in
+    cumulative_cash_flow = np.array([-6.0, -2.0, 2.0, 6.0])
+    assert payback_period(cumulative_cash_flow, 10.0) == 3.0
+    assert payback_period(cumulative_cash_flow, 10.0, interpolate=True) == 2.5
+    assert payback_period(cumulative_cash_flow, 10.0, periods_per_year=4, interpolate=True) == 0.625
+    assert np.isnan(payback_period(np.array([-6.0, -5.0]), 10.0))
+    np.testing.assert_array_equal(
+        payback_period(np.array([[-6.0, 1.0, np.nan], [-6.0, -1.0, 1.0]]), np.array([10.0, 10.0])), [2.0, 3.0]
+    )
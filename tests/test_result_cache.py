@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from combined_ratio.result_cache import ResultCache, cache_stats, get_cache, normalize_key
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResultCache(maxsize=2)
+    calls = []
+
+    def compute(key):
+        return lambda: calls.append(key) or key * 10
+
+    assert cache.get_or_compute(1, compute(1)) == 10
+    assert cache.get_or_compute(2, compute(2)) == 20
+    assert cache.get_or_compute(1, compute(1)) == 10  # 1 is now the most recently used
+    cache.get_or_compute(3, compute(3))  # evicts 2
+    cache.get_or_compute(1, compute(1))
+    cache.get_or_compute(2, compute(2))
+
+    assert calls == [1, 2, 3, 2]
+    stats = cache.stats()
+    assert (stats["entries"], stats["maxsize"], stats["hits"], stats["misses"]) == (2, 2, 2, 4)
+    assert stats["hit_rate"] == pytest.approx(2 / 6)
+
+
+def test_hits_count_the_compute_time_saved():
+    cache = ResultCache()
+    cache.get_or_compute("key", lambda: sum(range(100_000)))
+    cache.get_or_compute("key", lambda: pytest.fail("recomputed"))
+    cache.get_or_compute("key", lambda: pytest.fail("recomputed"))
+    assert cache.stats()["seconds_saved"] > 0
+
+    cache.clear()
+    assert cache.stats() == {"entries": 0, "maxsize": cache.stats()["maxsize"], "hits": 0, "misses": 0, "hit_rate": 0.0, "seconds_saved": 0.0}
+
+
+def test_normalize_key_rounds_floats():
+    assert normalize_key(0.1 + 0.2, 3) == normalize_key(0.3, 3)
+    assert normalize_key(-0.0) == normalize_key(0.0)
+    assert normalize_key(np.float64(1.5), [1, 2], np.int64(3)) == (1.5, (1, 2), 3)
+    assert normalize_key(0.3) != normalize_key(0.31)
+
+
+def test_session_caches_live_in_the_session_state():
+    session_state = {}
+    cache = get_cache("projections", scope="session", session_state=session_state)
+    assert get_cache("projections", scope="session", session_state=session_state) is cache
+    assert get_cache("projections", scope="session", session_state={}) is not cache
+    cache.get_or_compute("key", lambda: 1)
+    assert cache_stats(session_state)["session/projections"]["misses"] == 1
+
+    with pytest.raises(ValueError):
+        get_cache("projections", scope="session")
+    with pytest.raises(ValueError):
+        get_cache("projections", scope="process")
+
+
+def test_global_caches_are_shared():
+    cache = get_cache("test-global", scope="global")
+    assert get_cache("test-global", scope="global") is cache
+    assert "global/test-global" in cache_stats()
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from combined_ratio.sensitivity import PARAMETERS, evaluate_inputs, perturbation_range, sweep_2d, tornado
+
+BASE = {
+    "current_gwp": 500.0,
+    "premium_growth_rate": 3.0,
+    "current_loss_ratio": 65.0,
+    "current_expense_ratio": 30.0,
+    "loss_ratio_reduction": 2.0,
+    "expense_ratio_reduction": 1.0,
+    "initial_investment": 10.0,
+    "ongoing_costs_salesforce": 1.0,
+    "ongoing_costs_other": 1.0,
+    "analysis_period": 10,
+    "loss_ratio_reduction_salesforce": 1.0,
+    "expense_ratio_reduction_salesforce": 0.5,
+}
+
+
+def evaluate_one(**changes):
+    summary = evaluate_inputs({name: np.atleast_1d(float(value)) for name, value in dict(BASE, **changes).items()}, BASE)
+    return {name: values[0] for name, values in summary.items()}
+
+
+def test_tornado_is_sorted_by_swing():
+    result = tornado(BASE, metric="roi")
+
+    assert sorted(result["parameter"]) == sorted(PARAMETERS)
+    assert list(result["swing"]) == sorted(result["swing"], reverse=True)
+    assert np.allclose(result["swing"], (result["roi_high"] - result["roi_low"]).abs())
+    # Savings scale with GWP and the reductions; the investment matters much less over ten years
+    assert result["parameter"].iloc[0] in ("current_gwp", "loss_ratio_reduction")
+    assert result.attrs["baseline"]["roi"] == pytest.approx(evaluate_one()["roi"])
+
+
+def test_tornado_rows_match_one_at_a_time_evaluation():
+    result = tornado(BASE, metric="payback_period").set_index("parameter")
+
+    for name in PARAMETERS:
+        low, high = perturbation_range(name, BASE[name])
+        assert (result.loc[name, "low_value"], result.loc[name, "high_value"]) == (low, high)
+        assert result.loc[name, "roi_low"] == pytest.approx(evaluate_one(**{name: low})["roi"])
+        assert result.loc[name, "roi_high"] == pytest.approx(evaluate_one(**{name: high})["roi"])
+
+
+def test_perturbation_is_clipped_to_the_bounds():
+    assert perturbation_range("current_loss_ratio", 98.0) == (93.0, 100.0)
+    assert perturbation_range("premium_growth_rate", 1.0) == (0.0, 3.0)
+    assert perturbation_range("current_gwp", 500.0, ("relative", 0.1)) == (450.0, 550.0)
+
+
+def test_sweep_has_one_row_per_y_value():
+    x_values = [0.0, 1.0, 2.0, 3.0]
+    y_values = [100.0, 500.0, 900.0]
+    result = sweep_2d(BASE, "loss_ratio_reduction", x_values, "current_gwp", y_values)
+
+    assert result.shape == (3, 4)
+    assert list(result.index) == y_values and result.index.name == "current_gwp"
+    assert list(result.columns) == x_values and result.columns.name == "loss_ratio_reduction"
+    assert result.loc[900.0, 2.0] == pytest.approx(evaluate_one(current_gwp=900.0, loss_ratio_reduction=2.0)["roi"])
+    assert result.attrs["estimated"] is False
+    # ROI rises with both the reduction and the premium base
+    assert (np.diff(result.to_numpy(), axis=1) >= 0).all()
+    assert (np.diff(result.to_numpy(), axis=0) >= 0).all()
+
+
+def test_invalid_requests_are_rejected():
+    with pytest.raises(ValueError, match="Unknown metric"):
+        tornado(BASE, metric="npv")
+    with pytest.raises(ValueError, match="two different inputs"):
+        sweep_2d(BASE, "current_gwp", [1.0], "current_gwp", [1.0])
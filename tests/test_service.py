@@ -0,0 +1,144 @@
+import http.client
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import pytest
+
+from combined_ratio import service
+from combined_ratio.service import (
+    EVALUATORS, MAX_BODY_BYTES, VECTORIZE_MIN, _project_one, evaluate_projections, parse_request,
+    start_server, stop_server,
+)
+
+
+def post(url, path, body=b"", content_length=None):
+    connection = http.client.HTTPConnection(urlsplit(url).netloc, timeout=10)
+    try:
+        connection.putrequest("POST", path)
+        connection.putheader("Content-Length", str(len(body)) if content_length is None else content_length)
+        connection.endheaders(body)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+@pytest.fixture
+def server():
+    server, url = start_server()
+    yield url
+    stop_server(server)
+
+
+@pytest.mark.parametrize("content_length", ["abc", "-1", "1_0", "1.5"])
+def test_malformed_content_length_is_rejected(server, content_length):
+    status, payload = post(server, "/v1/calculate_new_ratios", content_length=content_length)
+    assert status == 400
+    assert "Content-Length" in payload["error"]
+
+
+def test_oversized_body_is_rejected_unread(server):
+    status, _ = post(server, "/v1/calculate_new_ratios", content_length=str(MAX_BODY_BYTES + 1))
+    assert status == 413
+
+
+def test_valid_request(server):
+    body = json.dumps({
+        "current_loss_ratio": 65.0, "loss_ratio_reduction": 2.0, "current_expense_ratio": 30.0, "expense_ratio_reduction": 1.0,
+    }).encode()
+    status, payload = post(server, "/v1/calculate_new_ratios", body)
+    assert status == 200, payload
+    assert payload == {"new_loss_ratio": 63.0, "new_expense_ratio": 29.0}
+
+
+def projection_bodies(n):
+    """
+    project_financials request bodies; every third has no reductions and never pays back,
+    and every other one asks for the per-year series.
+    """
+    bodies = []
+    for i in range(n):
+        reduction = 0.0 if i % 3 == 0 else 2.0 + i / 10
+        bodies.append({
+            "current_gwp": 500.0 + 25 * i, "premium_growth_rate": i % 7 - 2.0,
+            "current_loss_ratio": 65.0, "current_expense_ratio": 30.0,
+            "new_loss_ratio": 65.0 - reduction, "new_expense_ratio": 30.0 - reduction / 2,
+            "analysis_period": i % 12 + 3, "ongoing_costs": 2.0, "initial_investment": 10.0 + i,
+            "loss_ratio_reduction_salesforce": reduction / 2, "expense_ratio_reduction_salesforce": reduction / 4,
+            "ongoing_costs_salesforce": 1.0, "include_series": i % 2 == 0,
+        })
+    return bodies
+
+
+def assert_same_result(result, expected):
+    assert list(result) == list(expected)
+    for name in ("payback_period", "payback_period_salesforce"):
+        assert result[name] == expected[name] and type(result[name]) is type(expected[name])
+    for name, value in expected.items():
+        if isinstance(value, float):
+            assert result[name] == pytest.approx(value, rel=1e-12)
+    if "series" in expected:
+        assert list(result["series"]) == list(expected["series"])
+        for column, values in expected["series"].items():
+            assert result["series"][column] == pytest.approx(values, rel=1e-12)
+
+
+def test_vectorized_projections_match_the_scalar_path():
+    requests = [parse_request("project_financials", body) for body in projection_bodies(VECTORIZE_MIN + 6)]
+    results = evaluate_projections(requests)
+
+    assert {result["payback_period"] is None for result in results} == {True, False}
+    for (values, options), result in zip(requests, results):
+        assert_same_result(result, _project_one(values, options))
+
+
+def test_concurrent_projection_requests_are_batched():
+    batches = []
+
+    def evaluate(requests):
+        batches.append(len(requests))
+        return evaluate_projections(requests)
+
+    bodies = projection_bodies(VECTORIZE_MIN + 6)
+    server, url = start_server(evaluators=dict(EVALUATORS, project_financials=evaluate), workers=1, max_wait=2.0)
+    try:
+        with ThreadPoolExecutor(len(bodies)) as pool:
+            responses = list(pool.map(lambda body: post(url, "/v1/project_financials", json.dumps(body).encode()), bodies))
+    finally:
+        stop_server(server)
+
+    assert max(batches) >= VECTORIZE_MIN
+    for body, (status, payload) in zip(bodies, responses):
+        assert status == 200, payload
+        assert_same_result(payload, _project_one(*parse_request("project_financials", body)))
+
+
+def test_timed_out_request_is_not_evaluated(monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    evaluated = []
+
+    def evaluate(requests):
+        evaluated.extend(requests)
+        started.set()
+        release.wait(10)
+        return [{"ok": True} for _ in requests]
+
+    monkeypatch.setattr(service, "REQUEST_TIMEOUT", 0.2)
+    server, url = start_server(evaluators={"calculate_new_ratios": evaluate}, workers=1, max_wait=0)
+    try:
+        # The first request occupies the only worker; the second times out while queued
+        body = json.dumps({
+            "current_loss_ratio": 65.0, "loss_ratio_reduction": 2.0, "current_expense_ratio": 30.0, "expense_ratio_reduction": 1.0,
+        }).encode()
+        first = threading.Thread(target=post, args=(url, "/v1/calculate_new_ratios", body))
+        first.start()
+        assert started.wait(10)
+        status, _ = post(url, "/v1/calculate_new_ratios", body)
+        assert status == 504
+        release.set()
+        first.join()
+    finally:
+        stop_server(server)
+    assert len(evaluated) == 1
@@ -0,0 +1,26 @@
+from combined_ratio.sessions import WarmSessions
+
+
+def test_eviction_drops_the_least_recently_active_session():
+    sessions = WarmSessions(max_sessions=2)
+    first = sessions.get("a")
+    first["model"] = "kept"
+    sessions.get("b")
+    sessions.get("a")
+    sessions.get("c")  # evicts b
+
+    assert len(sessions) == 2
+    assert sessions.get("a") is first
+    assert sessions.stats() == {"sessions": 2, "max_sessions": 2, "hits": 2, "misses": 3, "evictions": 1}
+
+
+def test_evicted_state_stays_intact_for_its_run():
+    sessions = WarmSessions(max_sessions=1)
+    running = sessions.get("a")
+    running["model"] = "in use"
+    sessions.get("b")  # evicts a while its run still holds the state
+    sessions.discard("b")
+
+    assert running == {"model": "in use"}
+    assert sessions.get("a") == {}
+    assert sessions.stats()["evictions"] == 1
@@ -0,0 +1,107 @@
+import datetime
+
+import numpy as np
+import pytest
+
+import combined_ratio.store as store_module
+from combined_ratio.batch import project_financials_arrays
+from combined_ratio.discounting import IRR_NO_ROOT
+from combined_ratio.store import RESULT_COLUMNS, ScenarioStore
+
+INPUTS = {
+    "current_gwp": 500.0,
+    "premium_growth_rate": 3.0,
+    "current_loss_ratio": 65.0,
+    "current_expense_ratio": 30.0,
+    "loss_ratio_reduction": 2.0,
+    "expense_ratio_reduction": 1.0,
+    "analysis_period": 10,
+    "initial_investment": 10.0,
+    "ongoing_costs_salesforce": 1.0,
+    "ongoing_costs_other": 1.0,
+    "loss_ratio_reduction_salesforce": 1.0,
+    "expense_ratio_reduction_salesforce": 0.5,
+    "periods_per_year": 1,
+    "discount_rate": 8.0,
+}
+
+
+@pytest.fixture
+def store(tmp_path):
+    with ScenarioStore(str(tmp_path / "scenarios.sqlite3")) as store:
+        yield store
+
+
+def test_saved_scenario_loads_with_its_projection(store):
+    store.save("Base", INPUTS, carrier="Acme", as_of="2024-06-30", tags="plan, 2024")
+    entry = store.load("Base")
+
+    assert (entry["name"], entry["carrier"], entry["as_of"], entry["tags"]) == ("Base", "Acme", "2024-06-30", ["2024", "plan"])
+    assert entry["inputs"] == INPUTS
+    _, summary = project_financials_arrays(500.0, 3.0, 65.0, 30.0, 63.0, 29.0, 10, 2.0, 10.0, 1.0, 0.5, 1.0, discount_rate=8.0)
+    assert entry["results"] == pytest.approx({name: summary[name][0] for name in RESULT_COLUMNS})
+    assert store.lookup(INPUTS) == pytest.approx(entry["results"])
+    with pytest.raises(KeyError):
+        store.load("Missing")
+
+
+def test_store_reopens_from_its_file(tmp_path):
+    path = str(tmp_path / "nested" / "scenarios.sqlite3")
+    with ScenarioStore(path) as store:
+        store.save("Base", INPUTS)
+    with ScenarioStore(path) as store:
+        assert len(store) == 1
+        assert store.load("Base")["inputs"] == INPUTS
+
+
+def test_save_replaces_or_rejects_a_taken_name(store):
+    store.save("Base", INPUTS, tags=["old"])
+    store.save("Base", dict(INPUTS, loss_ratio_reduction=3.0), tags=["new"])
+    assert len(store) == 1
+    assert store.load("Base")["inputs"]["loss_ratio_reduction"] == 3.0
+    assert store.tag_counts() == {"new": 1}
+
+    with pytest.raises(ValueError, match="already saved"):
+        store.save("Base", INPUTS, replace=False)
+
+
+def test_find_filters_and_orders_by_as_of(store):
+    store.save("Acme 2023", INPUTS, carrier="Acme", as_of="2023-12-31", tags=["plan"])
+    store.save("Acme 2024", INPUTS, carrier="Acme", as_of=datetime.date(2024, 12, 31), tags=["plan", "stretch"])
+    store.save("Beta 2024", INPUTS, carrier="Beta", as_of="2024-06-30")
+
+    assert list(store.find()["name"]) == ["Acme 2024", "Beta 2024", "Acme 2023"]
+    assert list(store.find(carrier="Acme")["name"]) == ["Acme 2024", "Acme 2023"]
+    assert list(store.find(since="2024-01-01", until="2024-07-01")["name"]) == ["Beta 2024"]
+    assert list(store.find(tags="plan, stretch")["name"]) == ["Acme 2024"]
+    assert list(store.find(name="beta")["name"]) == ["Beta 2024"]
+    assert list(store.find(limit=1, offset=1)["name"]) == ["Beta 2024"]
+    assert store.count(carrier=["Acme", "Beta"]) == 3
+    assert store.carriers() == ["Acme", "Beta"]
+    assert store.date_range() == (datetime.date(2023, 12, 31), datetime.date(2024, 12, 31))
+
+    assert store.delete(["Acme 2023", "Missing"]) == 1
+    assert store.tag_counts() == {"plan": 1, "stretch": 1}
+
+
+def test_compare_puts_scenarios_side_by_side(store):
+    store.save("Base", INPUTS, carrier="Acme")
+    store.save("No change", dict(INPUTS, loss_ratio_reduction=0.0, expense_ratio_reduction=0.0,
+                                 loss_ratio_reduction_salesforce=0.0, expense_ratio_reduction_salesforce=0.0,
+                                 initial_investment=0.0, ongoing_costs_salesforce=0.0, ongoing_costs_other=0.0))
+
+    comparison = store.compare(["No change", "Base", "Missing", "Base"])
+    assert list(comparison.columns) == ["No change", "Base"]
+    assert comparison.loc["carrier", "Base"] == "Acme"
+    assert comparison.loc["roi", "Base"] == store.load("Base")["results"]["roi"]
+    # Nothing invested and nothing saved: no IRR
+    assert np.isnan(comparison.loc["irr", "No change"])
+    assert comparison.loc["irr_status", "No change"] == IRR_NO_ROOT
+
+
+def test_identical_inputs_reuse_saved_results(store, monkeypatch):
+    store.save("Base", INPUTS)
+    monkeypatch.setattr(store_module, "project_inputs", lambda table: pytest.fail("projected again"))
+    # Float noise in the inputs still matches the saved scenario
+    store.save("Copy", dict(INPUTS, current_gwp=500.0 + 1e-12))
+    assert store.load("Copy")["results"] == store.load("Base")["results"]
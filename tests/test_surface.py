@@ -0,0 +1,23 @@
+import pytest
+
+from combined_ratio.surface import ResponseSurface, check_accuracy
+
+# Largest errors accepted from a coarse grid, ten times the default growth step
+ROI_TOLERANCE_POINTS = 1e-3
+SAVINGS_RELATIVE_TOLERANCE = 1e-7
+
+
+@pytest.fixture(scope="module")
+def surface():
+    return ResponseSurface.build(growth_step=0.1, max_growth=15.0, max_period=30)
+
+
+@pytest.mark.parametrize("periods_per_year", [1, 4, 12])
+def test_surface_matches_exact_projection(surface, periods_per_year):
+    report = check_accuracy(surface, n=2_000, periods_per_year=periods_per_year)
+
+    assert report["scenarios"] == 2_000
+    assert report["roi_error_points"] < ROI_TOLERANCE_POINTS
+    assert report["savings_relative_error"] < SAVINGS_RELATIVE_TOLERANCE
+    assert report["payback_mismatch_share"] == 0.0
+    assert report["payback_error_years"] == 0.0